@@ -0,0 +1,197 @@
+"""
+교사 대시보드 DB 벤치마크 스크립트
+학급 100개 × 학생 30명 × 활동 200개 규모의 데이터로 대시보드 조회 시간을 측정합니다.
+
+사용법:
+    python benchmark_database.py [--classes 100] [--students 30] [--activities 200]
+                                 [--repeat 5] [--no-index] [--db 경로] [--json]
+
+--no-index를 주면 마이그레이션으로 추가된 인덱스를 지운 상태로 측정합니다 (비교용).
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# src 디렉토리를 Python 경로에 추가
+src_dir = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from database import DatabaseManager, MIGRATIONS
+
+
+def seed(db: DatabaseManager, classes: int, students: int, activities: int):
+    """테스트 데이터 생성 (학생마다 모든 활동에 진도 기록 1건)"""
+    rng = random.Random(42)
+    conn = db._connect()
+
+    conn.executemany(
+        "INSERT INTO classes (grade, class_number, class_name, teacher_name) VALUES (?, ?, ?, ?)",
+        [(c // 10 + 1, c % 10 + 1, f"{c // 10 + 1}학년 {c % 10 + 1}반", f"교사{c}")
+         for c in range(classes)],
+    )
+    class_ids = [row[0] for row in conn.execute("SELECT id FROM classes ORDER BY id")]
+
+    conn.executemany(
+        "INSERT INTO students (class_id, student_name, student_number, notes) VALUES (?, ?, ?, '')",
+        [(class_id, f"학생{class_id}-{n}", n + 1) for class_id in class_ids for n in range(students)],
+    )
+    conn.executemany(
+        "INSERT INTO activities (class_id, activity_date, activity_type, song_title, description, file_path) "
+        "VALUES (?, ?, ?, ?, '', '')",
+        [(class_id, f"2024-{(n % 12) + 1:02d}-{(n % 28) + 1:02d}", "노래", f"곡{n}")
+         for class_id in class_ids for n in range(activities)],
+    )
+
+    students_by_class = {}
+    for student_id, class_id in conn.execute("SELECT id, class_id FROM students"):
+        students_by_class.setdefault(class_id, []).append(student_id)
+
+    def progress_rows():
+        for activity_id, class_id in conn.execute("SELECT id, class_id FROM activities").fetchall():
+            for student_id in students_by_class[class_id]:
+                yield (student_id, activity_id, "완료", rng.randint(50, 100), "")
+
+    conn.executemany(
+        "INSERT INTO student_progress (student_id, activity_id, progress_status, score, notes) "
+        "VALUES (?, ?, ?, ?, ?)",
+        progress_rows(),
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+
+
+def drop_indexes(db: DatabaseManager):
+    """마이그레이션 인덱스 제거 (인덱스 없는 기존 스키마와 비교용)"""
+    conn = db._connect()
+    for statements in MIGRATIONS:
+        for statement in statements:
+            if statement.startswith("CREATE INDEX IF NOT EXISTS "):
+                name = statement.split()[5]
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.commit()
+
+
+def measure(func, repeat: int) -> dict:
+    """func를 repeat번 실행한 시간(ms) 통계"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "mean_ms": round(statistics.mean(timings), 2),
+        "min_ms": round(timings[0], 2),
+        "max_ms": round(timings[-1], 2),
+    }
+
+
+def run_benchmarks(db: DatabaseManager, repeat: int) -> dict:
+    """대시보드 화면별 조회 시간 측정"""
+    classes = db.get_all_classes()
+    class_id = classes[len(classes) // 2]["id"]
+    student_id = db.get_students_by_class(class_id)[0]["id"]
+
+    class_students = db.get_students_by_class(class_id)
+    activity_id = db.get_activities_by_class(class_id)[0]["id"]
+
+    def progress_records():
+        return [{"student_id": s["id"], "activity_id": activity_id,
+                 "progress_status": "완료", "score": 90} for s in class_students]
+
+    def record_progress_one_by_one():
+        for r in progress_records():
+            db.record_progress(r["student_id"], r["activity_id"], r["progress_status"], r["score"])
+
+    def dashboard_overview_per_class():
+        # 학급마다 따로 조회하는 방식 (N+1)
+        for c in db.get_all_classes():
+            len(db.get_students_by_class(c["id"]))
+            len(db.get_activities_by_class(c["id"]))
+            db.get_class_statistics(c["id"])
+
+    return {
+        "dashboard_overview_per_class": measure(dashboard_overview_per_class, repeat),
+        # 교사 대시보드 첫 화면 (학급별 요약 한 번에 집계)
+        "dashboard_overview": measure(db.get_class_summaries, repeat),
+        "class_statistics": measure(lambda: db.get_class_statistics(class_id), repeat * 10),
+        "activity_statistics": measure(lambda: db.get_activity_statistics(class_id), repeat * 10),
+        "class_trend": measure(lambda: db.get_class_trend(class_id), repeat * 10),
+        "students_by_class": measure(lambda: db.get_students_by_class(class_id), repeat * 10),
+        "activities_by_class": measure(lambda: db.get_activities_by_class(class_id), repeat * 10),
+        "activities_date_range": measure(
+            lambda: db.get_activities_by_class(class_id, "2024-03-01", "2024-05-31"), repeat * 10
+        ),
+        "activities_first_page": measure(
+            lambda: db.get_activities_page(class_id, limit=20, row_type="tuple"), repeat * 10
+        ),
+        "student_progress": measure(lambda: db.get_student_progress(student_id), repeat * 10),
+        "student_progress_first_page": measure(
+            lambda: db.get_student_progress_page(student_id, limit=20,
+                                                 columns=["song_title", "score"], row_type="tuple"),
+            repeat * 10
+        ),
+        # 한 활동에 대한 학급 전체(학생 수만큼) 진도 입력
+        "record_progress_one_by_one": measure(record_progress_one_by_one, repeat),
+        "record_progress_bulk": measure(lambda: db.record_progress_bulk(progress_records()), repeat),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="교사 대시보드 DB 조회 벤치마크")
+    parser.add_argument("--classes", type=int, default=100, help="학급 수")
+    parser.add_argument("--students", type=int, default=30, help="학급당 학생 수")
+    parser.add_argument("--activities", type=int, default=200, help="학급당 활동 수")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수")
+    parser.add_argument("--no-index", action="store_true", help="인덱스를 제거하고 측정")
+    parser.add_argument("--db", help="DB 파일 경로 (기본값: 임시 파일)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="music_helper_bench_"), "bench.db")
+    if os.path.exists(db_path):
+        print(f"[ERROR] 이미 존재하는 DB 파일입니다: {db_path}")
+        return 1
+
+    db = DatabaseManager(db_path)
+    started = time.perf_counter()
+    seed(db, args.classes, args.students, args.activities)
+    seed_seconds = time.perf_counter() - started
+    if args.no_index:
+        drop_indexes(db)
+
+    results = {
+        "config": {
+            "classes": args.classes,
+            "students_per_class": args.students,
+            "activities_per_class": args.activities,
+            "progress_rows": args.classes * args.students * args.activities,
+            "indexes": not args.no_index,
+        },
+        "seed_seconds": round(seed_seconds, 2),
+        "benchmarks": run_benchmarks(db, args.repeat),
+    }
+    db.close()
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        config = results["config"]
+        print(f"학급 {config['classes']} × 학생 {config['students_per_class']} × "
+              f"활동 {config['activities_per_class']} (진도 {config['progress_rows']:,}건, "
+              f"인덱스 {'사용' if config['indexes'] else '없음'}) - 데이터 생성 {results['seed_seconds']}초")
+        for name, timing in results["benchmarks"].items():
+            print(f"  {name:<30} 평균 {timing['mean_ms']:>9.2f} ms  "
+                  f"(최소 {timing['min_ms']:.2f} / 최대 {timing['max_ms']:.2f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
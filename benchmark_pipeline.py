@@ -0,0 +1,382 @@
+"""
+오디오 → 악보 → 화음 파이프라인 벤치마크 스크립트
+항상 같은 합성 음원(사인파/피아노 음색 멜로디)과 MIDI/MusicXML 악보를 만들어
+채보, 악보 변환, 반주 생성, 화음 분석, 내보내기의 실행 시간/최대 메모리(RSS)/처리량을 측정합니다.
+
+사용법:
+    python benchmark_pipeline.py [--durations 10,60,300] [--notes 64,512,2048] [--repeat 3]
+                                 [--only transcription,transform,...] [--no-isolate]
+                                 [--output 결과.json] [--compare 기준.json] [--threshold 0.2]
+
+각 측정은 새 프로세스에서 실행하므로 최대 RSS가 측정 항목별로 분리됩니다 (--no-isolate로 끄기).
+--output으로 저장한 JSON을 다른 커밋에서 --compare로 주면 평균 시간이 threshold 이상
+늘어난 항목을 표시하고 종료 코드 1을 반환합니다 (회귀 확인용).
+"""
+
+import argparse
+import copy
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# src 디렉토리를 Python 경로에 추가
+src_dir = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_dir))
+
+SAMPLE_RATE = 22050
+# 4분음표 길이(초) - 120 BPM
+BEAT_SECONDS = 0.5
+SEED = 42
+
+# 측정 그룹 (--only)
+GROUPS = ("transcription", "load", "transform", "accompaniment", "chord_analysis", "export")
+
+
+# 픽스처 생성
+
+def melody(count: int, seed: int = SEED) -> list:
+    """
+    결정적 멜로디 (G장조 음계 위를 주로 순차 진행)
+
+    Returns:
+        [(MIDI 음높이, 박 수), ...]
+    """
+    rng = random.Random(seed)
+    scale = [67, 69, 71, 72, 74, 76, 78, 79]  # G4 ~ G5
+    index = 0
+    notes = []
+    for _ in range(count):
+        index = max(0, min(len(scale) - 1, index + rng.choice([-2, -1, -1, 1, 1, 2])))
+        notes.append((scale[index], rng.choice([0.5, 1.0, 1.0, 2.0])))
+    return notes
+
+
+def synthesize(duration: float, timbre: str = "sine", sample_rate: int = SAMPLE_RATE):
+    """
+    멜로디를 duration초 길이의 모노 음원으로 합성
+
+    Args:
+        duration: 길이(초)
+        timbre: "sine" 또는 "piano" (배음 + 감쇠)
+
+    Returns:
+        float32 numpy 배열
+    """
+    import numpy as np
+
+    total = int(duration * sample_rate)
+    y = np.zeros(total, dtype=np.float32)
+    position = 0
+    # 멜로디가 끝까지 채우도록 충분히 생성
+    for pitch, beats in melody(int(duration / BEAT_SECONDS) + 1):
+        length = min(int(beats * BEAT_SECONDS * sample_rate), total - position)
+        if length <= 0:
+            break
+        t = np.arange(length) / sample_rate
+        frequency = 440.0 * 2 ** ((pitch - 69) / 12)
+        if timbre == "piano":
+            tone = sum(np.sin(2 * np.pi * frequency * k * t) / k for k in range(1, 7))
+            envelope = np.exp(-3.0 * t)
+        else:
+            tone = np.sin(2 * np.pi * frequency * t)
+            envelope = np.ones(length)
+        # 클릭 잡음이 생기지 않도록 앞뒤 10ms 페이드
+        fade = min(int(0.01 * sample_rate), length // 2)
+        if fade:
+            envelope[:fade] *= np.linspace(0, 1, fade)
+            envelope[-fade:] *= np.linspace(1, 0, fade)
+        y[position:position + length] = 0.4 * tone * envelope / (np.max(np.abs(tone)) or 1)
+        position += length
+    return y
+
+
+def write_wav(path: str, y, sample_rate: int = SAMPLE_RATE):
+    """16비트 PCM WAV 저장 (표준 라이브러리 wave 사용)"""
+    import numpy as np
+
+    pcm = (np.clip(y, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+
+
+def build_score(note_count: int):
+    """note_count개 음표의 G장조 멜로디 악보 (music21)"""
+    from music21 import stream, note, meter, key, tempo
+
+    part = stream.Part()
+    part.append(tempo.MetronomeMark(number=120))
+    part.append(meter.TimeSignature("4/4"))
+    part.append(key.Key("G"))
+    for pitch, beats in melody(note_count):
+        part.append(note.Note(pitch, quarterLength=beats))
+    score = stream.Score()
+    score.insert(0, part.makeMeasures())
+    return score
+
+
+def score_fixture(note_count: int, fmt: str, directory: str) -> str:
+    """악보 픽스처 파일 생성 (fmt: "musicxml" 또는 "midi")"""
+    suffix = ".musicxml" if fmt == "musicxml" else ".mid"
+    path = os.path.join(directory, f"melody_{note_count}{suffix}")
+    if not os.path.exists(path):
+        build_score(note_count).write(fmt, fp=path)
+    return path
+
+
+# 측정
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS(MB) - 측정할 수 없으면 None"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 바이트 단위
+        return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return round(getattr(info, "peak_wset", info.rss) / (1024 * 1024), 1)
+    except ImportError:
+        return None
+
+
+def cases(durations: list, note_counts: list, only: list) -> list:
+    """측정 항목 목록 (프로세스 간에 넘길 수 있도록 딕셔너리)"""
+    result = []
+    if "transcription" in only:
+        for duration in durations:
+            for timbre in ("sine", "piano"):
+                result.append({"group": "transcription", "name": f"transcription/{timbre}_{duration}s",
+                               "duration": duration, "timbre": timbre})
+    for count in note_counts:
+        if "load" in only:
+            for fmt in ("musicxml", "midi"):
+                result.append({"group": "load", "name": f"load/{fmt}_{count}", "notes": count, "format": fmt})
+        if "transform" in only:
+            for transform in ("simplify_rhythm", "transpose_to_c_major", "add_solfege"):
+                result.append({"group": "transform", "name": f"transform/{transform}_{count}",
+                               "notes": count, "method": transform})
+        if "accompaniment" in only:
+            result.append({"group": "accompaniment", "name": f"accompaniment/add_accompaniment_{count}",
+                           "notes": count})
+        if "chord_analysis" in only:
+            result.append({"group": "chord_analysis", "name": f"chord_analysis/analyze_midi_chords_{count}",
+                           "notes": count})
+        if "export" in only:
+            for method in ("export_midi", "export_musicxml"):
+                result.append({"group": "export", "name": f"export/{method}_{count}",
+                               "notes": count, "method": method})
+    return result
+
+
+def prepare(case: dict, workdir: str):
+    """
+    측정할 함수와 매 실행 전 인자를 만드는 함수 준비 (시간 측정에서 제외)
+
+    Returns:
+        (func, make_args, units, unit, extra) - 처리량 = units / 평균 시간
+    """
+    group = case["group"]
+    if group == "transcription":
+        from audio_processor import AudioProcessor
+        processor = AudioProcessor()
+        path = os.path.join(workdir, f"{case['timbre']}_{case['duration']}s.wav")
+        write_wav(path, synthesize(case["duration"], case["timbre"]))
+        engine = "basic_pitch" if processor.get_basic_pitch_predict() is not None else "librosa"
+        # 모델 로드 등 첫 호출 비용은 제외 (1초 음원으로 한 번 실행)
+        warm_path = os.path.join(workdir, "warmup.wav")
+        write_wav(warm_path, synthesize(1.0, case["timbre"]))
+        processor.process_audio_from_path(warm_path)
+        return (processor.process_audio_from_path, lambda: (path,),
+                case["duration"], "audio_seconds/s", {"engine": engine})
+
+    from score_processor import ScoreProcessor
+    processor = ScoreProcessor()
+    count = case["notes"]
+
+    if group == "load":
+        path = score_fixture(count, case["format"], workdir)
+        return processor.load_score_from_path, lambda: (path,), count, "notes/s", {}
+
+    score = build_score(count)
+    # 변환 함수가 악보를 직접 바꿀 수 있으므로 실행마다 복사본 사용
+    make_args = lambda: (copy.deepcopy(score),)
+    if group == "transform":
+        return getattr(processor, case["method"]), make_args, count, "notes/s", {}
+    if group == "accompaniment":
+        from chord_generator import ChordGenerator
+        return ChordGenerator().add_accompaniment, make_args, count, "notes/s", {}
+    if group == "chord_analysis":
+        from chord_analyzer import ChordAnalyzer
+        return ChordAnalyzer().analyze_midi_chords, make_args, count, "notes/s", {}
+    if group == "export":
+        return getattr(processor, case["method"]), make_args, count, "notes/s", {}
+    raise ValueError(f"알 수 없는 측정 그룹: {group}")
+
+
+def run_case(case: dict, repeat: int) -> dict:
+    """측정 항목 하나 실행 (격리 모드에서는 새 프로세스에서 호출됨)"""
+    with tempfile.TemporaryDirectory(prefix="music_helper_bench_") as workdir:
+        try:
+            func, make_args, units, unit, extra = prepare(case, workdir)
+        except Exception as e:
+            return {"name": case["name"], "group": case["group"], "error": f"{type(e).__name__}: {e}"}
+
+        rss_before = peak_rss_mb()
+        timings = []
+        result = None
+        for _ in range(repeat):
+            args = make_args()
+            started = time.perf_counter()
+            result = func(*args)
+            timings.append(time.perf_counter() - started)
+
+    mean = statistics.mean(timings)
+    return {
+        "name": case["name"],
+        "group": case["group"],
+        "mean_ms": round(mean * 1000, 2),
+        "min_ms": round(min(timings) * 1000, 2),
+        "max_ms": round(max(timings) * 1000, 2),
+        "stdev_ms": round(statistics.stdev(timings) * 1000, 2) if len(timings) > 1 else 0.0,
+        "throughput": round(units / mean, 2) if mean > 0 else None,
+        "throughput_unit": unit,
+        "peak_rss_mb": peak_rss_mb(),
+        "rss_before_mb": rss_before,
+        "ok": result is not None,
+        **extra,
+    }
+
+
+def environment() -> dict:
+    """결과 비교용 실행 환경 정보"""
+    def version(module):
+        try:
+            return __import__(module).__version__
+        except Exception:
+            return None
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=Path(__file__).parent, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "music21": version("music21"),
+        "numpy": version("numpy"),
+        "librosa": version("librosa"),
+        "basic_pitch": version("basic_pitch"),
+    }
+
+
+def compare(results: dict, baseline_path: str, threshold: float) -> list:
+    """기준 결과와 평균 시간 비교 - threshold 이상 느려진 항목 이름 목록 반환"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {item["name"]: item for item in json.load(f)["benchmarks"]}
+    regressions = []
+    print(f"\n기준 결과와 비교 ({baseline_path}, 허용 {threshold:.0%})")
+    for item in results["benchmarks"]:
+        old = baseline.get(item["name"])
+        if not old or "mean_ms" not in old or "mean_ms" not in item:
+            continue
+        change = item["mean_ms"] / old["mean_ms"] - 1 if old["mean_ms"] else 0.0
+        mark = ""
+        if change > threshold:
+            regressions.append(item["name"])
+            mark = "  <- 느려짐"
+        print(f"  {item['name']:<45} {old['mean_ms']:>10.2f} → {item['mean_ms']:>10.2f} ms ({change:+.1%}){mark}")
+    return regressions
+
+
+def parse_list(value: str, cast=float) -> list:
+    return [cast(v) for v in value.split(",") if v.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="오디오→악보→화음 파이프라인 벤치마크")
+    parser.add_argument("--durations", default="10,60,300", help="합성 음원 길이(초), 쉼표로 구분")
+    parser.add_argument("--notes", default="64,512,2048", help="악보 픽스처 음표 수, 쉼표로 구분")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수")
+    parser.add_argument("--only", default=",".join(GROUPS), help=f"측정할 그룹 ({', '.join(GROUPS)})")
+    parser.add_argument("--no-isolate", action="store_true", help="모든 측정을 현재 프로세스에서 실행")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 볼 평균 시간 증가 비율")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    only = [g.strip() for g in args.only.split(",") if g.strip()]
+    unknown = set(only) - set(GROUPS)
+    if unknown:
+        print(f"[ERROR] 알 수 없는 그룹: {', '.join(sorted(unknown))}")
+        return 1
+
+    durations = [int(d) if float(d).is_integer() else d for d in parse_list(args.durations)]
+    case_list = cases(durations, parse_list(args.notes, int), only)
+    benchmarks = []
+    for case in case_list:
+        if args.no_isolate:
+            item = run_case(case, args.repeat)
+        else:
+            # 새 프로세스에서 실행해야 최대 RSS가 항목별로 분리됨
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                item = executor.submit(run_case, case, args.repeat).result()
+        benchmarks.append(item)
+        if not args.json:
+            if "error" in item:
+                print(f"  {item['name']:<45} 실패: {item['error']}")
+            else:
+                print(f"  {item['name']:<45} 평균 {item['mean_ms']:>10.2f} ms  "
+                      f"{str(item['throughput']):>10} {item['throughput_unit']:<16} "
+                      f"최대 RSS {item['peak_rss_mb']} MB")
+
+    results = {
+        "environment": environment(),
+        "config": {
+            "durations": durations,
+            "notes": parse_list(args.notes, int),
+            "repeat": args.repeat,
+            "isolated": not args.no_isolate,
+            "sample_rate": SAMPLE_RATE,
+            "seed": SEED,
+        },
+        "benchmarks": benchmarks,
+    }
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"[OK] 결과 저장: {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"[WARN] {len(regressions)}개 항목이 {args.threshold:.0%} 이상 느려졌습니다.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""
+Gunicorn 설정 (Linux 멀티 워커 배포용)
+
+사용법:
+    pip install gunicorn
+    gunicorn -c gunicorn_conf.py api_server:app
+
+워커마다 API 서버를 따로 불러오고, 악보/대화 기록/응답 캐시는 SHARED_STATE_DIR
+(기본: data/shared)의 SQLite와 디스크 캐시로 공유합니다.
+"""
+
+import multiprocessing
+import os
+from pathlib import Path
+
+project_root = Path(__file__).parent
+
+# 워커가 환경 변수를 물려받아 같은 공유 저장소를 씀 (워커를 만들기 전에 설정)
+os.environ.setdefault("SHARED_STATE_DIR", str(project_root / "data" / "shared"))
+
+chdir = str(project_root)
+# src의 모듈(api_server 등)을 바로 import
+pythonpath = str(project_root / "src")
+
+bind = os.getenv("API_BIND", "0.0.0.0:8501")
+workers = int(os.getenv("API_WORKERS", str(max(2, multiprocessing.cpu_count()))))
+# 워커마다 일괄 채보 풀이 생기므로 BATCH_WORKERS를 워커 수로 나누도록 알려줌
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# 채보/OMR 요청은 수십 초 걸릴 수 있음
+timeout = int(os.getenv("API_WORKER_TIMEOUT", "300"))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("API_LOG_LEVEL", "info")
@@ -0,0 +1,612 @@
+"""
+API 서버 부하 테스트 스크립트 (수업 시간 트래픽 재현)
+학생들이 동시에 악보를 올리고, 변환된 악보를 내려받고, 화음 분석과 녹음 채보를 요청하는
+상황을 /api/score/process, /api/score/{id}/export/*, /api/chord/analyze, /api/audio/process
+요청 비율로 재현하고, 워커 수와 동시 사용자 수별 p50/p95/p99 응답 시간, 오류율,
+포화 지점(처리량이 더 늘지 않거나 응답 시간 목표를 넘는 동시 사용자 수)을 측정합니다.
+
+사용법:
+    python loadtest_api.py [--workers 1,2,4] [--concurrency 1,2,4,8,16,32] [--step-seconds 20]
+                           [--mix score=35,export=30,chord=20,audio=15] [--slo 2.0]
+                           [--url http://서버주소] [--output 결과.json] [--json]
+
+--url이 없으면 워커 수마다 uvicorn 서버를 새로 띄워 측정합니다. 외부 API(OpenAI,
+Perplexity, YouTube)는 스크립트가 띄우는 로컬 목 서버로 향하게 하므로 네트워크 없이
+실행되고 API 사용량도 생기지 않습니다. 픽스처(MusicXML 악보, WAV 녹음)는 표준
+라이브러리만으로 만들기 때문에 클라이언트 쪽에는 httpx만 있으면 됩니다.
+워커가 2개 이상이면 SHARED_STATE_DIR(없으면 임시 디렉토리)로 상태를 공유하는 멀티 워커
+모드로 띄웁니다. 내보내기 요청의 404 비율이 높으면 점수 ID가 워커 사이에 공유되지 않는다는 뜻입니다.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import platform
+import random
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+try:
+    import httpx
+except ImportError:
+    print("[ERROR] httpx가 필요합니다: pip install httpx")
+    sys.exit(1)
+
+project_root = Path(__file__).parent
+
+SEED = 42
+SAMPLE_RATE = 22050
+
+# 시나리오별 기본 비율 (수업 중 관찰한 요청 비율 기준)
+DEFAULT_MIX = "score=35,export=30,chord=20,audio=15"
+SCENARIOS = ("score", "export", "chord", "audio")
+EXPORT_FORMATS = ("midi", "musicxml")
+
+# 내보내기 시나리오가 고를 최근 점수 ID 개수
+SCORE_ID_POOL = 200
+
+
+# 픽스처 생성 (numpy/music21 없이)
+
+def melody(count: int, seed: int = SEED) -> list:
+    """
+    결정적 멜로디 (G장조 음계 위를 주로 순차 진행)
+
+    Returns:
+        [(음이름, 옥타브, 변화표, MIDI 음높이), ...]
+    """
+    rng = random.Random(seed)
+    scale = [("G", 4, 0, 67), ("A", 4, 0, 69), ("B", 4, 0, 71), ("C", 5, 0, 72),
+             ("D", 5, 0, 74), ("E", 5, 0, 76), ("F", 5, 1, 78), ("G", 5, 0, 79)]
+    index = 0
+    notes = []
+    for _ in range(count):
+        index = max(0, min(len(scale) - 1, index + rng.choice([-2, -1, -1, 1, 1, 2])))
+        notes.append(scale[index])
+    return notes
+
+
+def musicxml_fixture(measures: int = 16) -> bytes:
+    """G장조 4/4 한 성부 MusicXML (마디마다 4분음표 4개)"""
+    notes = melody(measures * 4)
+    parts = []
+    for m in range(measures):
+        attributes = ""
+        if m == 0:
+            attributes = ("<attributes><divisions>1</divisions><key><fifths>1</fifths></key>"
+                          "<time><beats>4</beats><beat-type>4</beat-type></time>"
+                          "<clef><sign>G</sign><line>2</line></clef></attributes>")
+        body = []
+        for step, octave, alter, _ in notes[m * 4:(m + 1) * 4]:
+            alter_tag = f"<alter>{alter}</alter>" if alter else ""
+            body.append(f"<note><pitch><step>{step}</step>{alter_tag}<octave>{octave}</octave></pitch>"
+                        f"<duration>1</duration><type>quarter</type></note>")
+        parts.append(f'<measure number="{m + 1}">{attributes}{"".join(body)}</measure>')
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<!DOCTYPE score-partwise PUBLIC "-//Recordare//DTD MusicXML 3.1 Partwise//EN" '
+        '"http://www.musicxml.org/dtds/partwise.dtd">\n'
+        '<score-partwise version="3.1"><part-list><score-part id="P1"><part-name>Melody</part-name>'
+        f'</score-part></part-list><part id="P1">{"".join(parts)}</part></score-partwise>\n'
+    ).encode("utf-8")
+
+
+def wav_fixture(seconds: float = 10.0, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """학생 녹음을 흉내 낸 사인파 멜로디 WAV (16-bit 모노, 120 BPM 4분음표)"""
+    beat = 0.5
+    notes = melody(max(1, int(seconds / beat)))
+    frames = bytearray()
+    for _, _, _, pitch in notes:
+        frequency = 440.0 * 2 ** ((pitch - 69) / 12)
+        length = int(beat * sample_rate)
+        for i in range(length):
+            # 음 끝을 짧게 줄여 음 경계를 분명히 함
+            envelope = min(1.0, (length - i) / (0.02 * sample_rate))
+            value = 0.4 * envelope * math.sin(2 * math.pi * frequency * i / sample_rate)
+            frames += struct.pack("<h", int(value * 32767))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+# 외부 API 목 서버
+
+class StubHandler(BaseHTTPRequestHandler):
+    """OpenAI/Perplexity 채팅 응답과 YouTube 검색 응답을 흉내 내는 목 서버"""
+
+    hits = 0
+    hits_lock = threading.Lock()
+
+    def _reply(self, payload: dict):
+        with StubHandler.hits_lock:
+            StubHandler.hits += 1
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self._reply({
+            "id": "chatcmpl-loadtest",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "loadtest",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "부하 테스트용 응답입니다."},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            "citations": [],
+        })
+
+    def do_GET(self):
+        self._reply({"items": [], "pageInfo": {"totalResults": 0, "resultsPerPage": 0}})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server():
+    """목 서버를 백그라운드 스레드로 시작하고 (서버, 주소) 반환"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="stub-api").start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def stub_environment(stub_url: str) -> dict:
+    """외부 API를 목 서버로 돌리는 서버 프로세스 환경 변수"""
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_API_KEY": "loadtest",
+        "OPENAI_BASE_URL": f"{stub_url}/v1",
+        "PERPLEXITY_API_KEY": "loadtest",
+        "PERPLEXITY_API_URL": f"{stub_url}/chat/completions",
+        "YOUTUBE_API_KEY": "loadtest",
+        "YOUTUBE_API_BASE_URL": f"{stub_url}/youtube/v3",
+        "PYTHONIOENCODING": "utf-8",
+    })
+    return env
+
+
+# API 서버 실행
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_api_server(workers: int, env: dict, log_path: str, timeout: float):
+    """
+    uvicorn으로 API 서버를 띄우고 준비 확인(/api/ready)이 200을 반환할 때까지 대기
+
+    Returns:
+        (프로세스, 기본 URL)
+    """
+    port = free_port()
+    # src 패키지 __init__(music21 등 즉시 import)을 거치지 않도록 src를 앱 디렉토리로 지정
+    cmd = [sys.executable, "-m", "uvicorn", "api_server:app", "--app-dir", "src",
+           "--host", "127.0.0.1", "--port", str(port),
+           "--workers", str(workers), "--log-level", "warning"]
+    with open(log_path, "w", encoding="utf-8") as log:
+        process = subprocess.Popen(cmd, cwd=str(project_root), env=env, stdout=log, stderr=subprocess.STDOUT)
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = time.time() + timeout
+    with httpx.Client(timeout=2.0) as client:
+        while time.time() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"서버가 종료되었습니다 (로그: {log_path})")
+            try:
+                if client.get(f"{base_url}/api/ready").status_code == 200:
+                    return process, base_url
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.3)
+    stop_api_server(process)
+    raise RuntimeError(f"{timeout:.0f}초 안에 서버가 준비되지 않았습니다 (로그: {log_path})")
+
+
+def stop_api_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+# 시나리오
+
+class LoadState:
+    """가상 사용자들이 공유하는 상태 (픽스처, 내보내기에 쓸 점수 ID)"""
+
+    def __init__(self, score_xml: bytes, recording: bytes, options: dict):
+        self.score_xml = score_xml
+        self.recording = recording
+        self.options = json.dumps(options)
+        self.score_ids = []
+
+    def remember(self, response):
+        try:
+            score_id = response.json().get("scoreId")
+        except ValueError:
+            return
+        if score_id:
+            self.score_ids.append(score_id)
+            del self.score_ids[:-SCORE_ID_POOL]
+
+
+async def scenario_score(client, state: LoadState, rng: random.Random):
+    response = await client.post(
+        "/api/score/process",
+        files={"file": ("assignment.musicxml", state.score_xml, "application/xml")},
+        data={"options": state.options},
+    )
+    if response.status_code == 200:
+        state.remember(response)
+    return response
+
+
+async def scenario_export(client, state: LoadState, rng: random.Random):
+    if not state.score_ids:
+        # 아직 변환된 악보가 없으면 먼저 악보를 올림
+        return await scenario_score(client, state, rng)
+    score_id = rng.choice(state.score_ids)
+    fmt = rng.choice(EXPORT_FORMATS)
+    return await client.get(f"/api/score/{score_id}/export/{fmt}")
+
+
+async def scenario_chord(client, state: LoadState, rng: random.Random):
+    return await client.post(
+        "/api/chord/analyze",
+        files={"file": ("song.musicxml", state.score_xml, "application/xml")},
+        data={"fileType": "musicxml"},
+    )
+
+
+async def scenario_audio(client, state: LoadState, rng: random.Random):
+    response = await client.post(
+        "/api/audio/process",
+        files={"file": ("recording.wav", state.recording, "audio/wav")},
+    )
+    if response.status_code == 200:
+        state.remember(response)
+    return response
+
+
+SCENARIO_FUNCS = {
+    "score": scenario_score,
+    "export": scenario_export,
+    "chord": scenario_chord,
+    "audio": scenario_audio,
+}
+
+
+async def timed_request(name: str, client, state: LoadState, rng: random.Random) -> dict:
+    """시나리오 하나 실행 (예외도 오류로 기록)"""
+    started = time.perf_counter()
+    status, error = 0, None
+    try:
+        response = await SCENARIO_FUNCS[name](client, state, rng)
+        status = response.status_code
+    except httpx.HTTPError as e:
+        error = type(e).__name__
+    return {"scenario": name, "status": status, "seconds": time.perf_counter() - started, "error": error}
+
+
+async def virtual_user(user_id: int, client, state: LoadState, mix: dict, deadline: float,
+                       think_time: float, samples: list):
+    """제한 시간까지 요청 비율대로 시나리오를 반복하는 가상 사용자 (응답을 받은 뒤 다음 요청)"""
+    rng = random.Random(SEED + user_id)
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        samples.append(await timed_request(name, client, state, rng))
+        if think_time > 0:
+            await asyncio.sleep(rng.uniform(0, 2 * think_time))
+
+
+# 통계
+
+def percentile(values: list, q: float):
+    """최근접 순위 백분위수 (값이 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def is_error(sample: dict) -> bool:
+    return sample["error"] is not None or sample["status"] >= 400 or sample["status"] == 0
+
+
+def summarize(samples: list) -> dict:
+    """요청 목록의 응답 시간 백분위수(ms)와 오류율 (오류 응답도 응답 시간에 포함)"""
+    latencies = [s["seconds"] * 1000 for s in samples]
+    errors = sum(1 for s in samples if is_error(s))
+
+    def ms(value):
+        return round(value, 1) if value is not None else None
+
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(max(latencies) if latencies else None),
+    }
+
+
+async def run_step(base_url: str, state: LoadState, mix: dict, concurrency: int,
+                   seconds: float, think_time: float, timeout: float) -> dict:
+    """동시 사용자 수 하나로 정해진 시간 동안 부하를 걸고 결과 요약"""
+    samples = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        started = time.perf_counter()
+        deadline = started + seconds
+        await asyncio.gather(*(
+            virtual_user(i, client, state, mix, deadline, think_time, samples)
+            for i in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    statuses = {}
+    for s in samples:
+        key = s["error"] or str(s["status"])
+        statuses[key] = statuses.get(key, 0) + 1
+    step = {"concurrency": concurrency, "seconds": round(elapsed, 2)}
+    step.update(summarize(samples))
+    step["throughput_rps"] = round(len(samples) / elapsed, 2) if elapsed > 0 else 0.0
+    step["statuses"] = dict(sorted(statuses.items()))
+    step["scenarios"] = {
+        name: summarize([s for s in samples if s["scenario"] == name])
+        for name in mix if any(s["scenario"] == name for s in samples)
+    }
+    return step
+
+
+async def warm_up(base_url: str, state: LoadState, mix: dict, rounds: int, timeout: float):
+    """측정 전 시나리오별로 몇 번씩 요청 (지연 로딩과 점수 ID 준비, 결과에는 포함하지 않음)"""
+    rng = random.Random(SEED)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        for _ in range(rounds):
+            for name in mix:
+                await timed_request(name, client, state, rng)
+
+
+def find_saturation(steps: list, slo_seconds: float, max_error_rate: float, min_gain: float) -> dict:
+    """
+    포화 지점 찾기
+
+    동시 사용자 수를 늘렸을 때 처리량이 min_gain 비율 이상 늘지 않거나, p95가 목표를
+    넘거나, 오류율이 한도를 넘는 첫 단계 바로 앞 단계를 포화 지점으로 봅니다.
+
+    Returns:
+        concurrency/throughput_rps(포화 지점), limited_by(원인, 끝까지 포화되지 않으면 None),
+        at_concurrency(원인이 나타난 동시 사용자 수)
+    """
+    best = None
+    for step in steps:
+        reason = None
+        if step["error_rate"] > max_error_rate:
+            reason = "error_rate"
+        elif step["p95_ms"] is not None and step["p95_ms"] > slo_seconds * 1000:
+            reason = "p95_latency"
+        elif best is not None and step["throughput_rps"] < best["throughput_rps"] * (1 + min_gain):
+            reason = "throughput_plateau"
+        if reason:
+            return {
+                "concurrency": best["concurrency"] if best else None,
+                "throughput_rps": best["throughput_rps"] if best else None,
+                "limited_by": reason,
+                "at_concurrency": step["concurrency"],
+            }
+        best = step
+    return {
+        "concurrency": best["concurrency"] if best else None,
+        "throughput_rps": best["throughput_rps"] if best else None,
+        "limited_by": None,
+        "at_concurrency": None,
+    }
+
+
+def run_load(base_url: str, args, mix: dict, concurrency_levels: list, quiet: bool) -> dict:
+    """워밍업 후 동시 사용자 수를 차례로 늘리며 측정"""
+    state = LoadState(musicxml_fixture(args.measures), wav_fixture(args.audio_seconds), {
+        "addSolfege": True, "simplifyRhythm": True, "transposeC": True, "addChords": False,
+    })
+    if args.warmup_rounds > 0:
+        asyncio.run(warm_up(base_url, state, mix, args.warmup_rounds, args.timeout))
+
+    steps = []
+    for concurrency in concurrency_levels:
+        step = asyncio.run(run_step(base_url, state, mix, concurrency, args.step_seconds,
+                                    args.think_time, args.timeout))
+        steps.append(step)
+        if not quiet:
+            print(f"  동시 {concurrency:>3}명: {step['requests']:>6}건 {step['throughput_rps']:>8.2f} req/s  "
+                  f"p50 {step['p50_ms']} / p95 {step['p95_ms']} / p99 {step['p99_ms']} ms  "
+                  f"오류율 {step['error_rate']:.1%}")
+        # 이미 목표를 크게 넘었으면 더 올려도 의미가 없음
+        if not args.full_sweep and (step["error_rate"] > 0.5 or
+                                    (step["p95_ms"] or 0) > args.slo * 1000 * 3):
+            if not quiet:
+                print("  [INFO] 응답 시간/오류율이 한도를 크게 넘어 이후 단계는 건너뜁니다 (--full-sweep으로 끄기)")
+            break
+
+    return {
+        "steps": steps,
+        "saturation": find_saturation(steps, args.slo, args.max_error_rate, args.min_gain),
+    }
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=str(project_root),
+                                capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "httpx": httpx.__version__,
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def parse_mix(value: str) -> dict:
+    """"score=35,export=30" 형식의 요청 비율 해석"""
+    mix = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"알 수 없는 시나리오: {name} ({', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("요청 비율이 비어 있습니다")
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def parse_list(value: str, cast=int) -> list:
+    return [cast(v) for v in value.split(",") if v.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="API 서버 부하 테스트 (수업 시간 트래픽 재현)")
+    parser.add_argument("--url", help="이미 실행 중인 서버 주소 (없으면 워커 수별로 서버를 띄움)")
+    parser.add_argument("--workers", default="1,2,4", help="서버 워커 수, 쉼표로 구분")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32", help="동시 사용자 수 단계, 쉼표로 구분")
+    parser.add_argument("--step-seconds", type=float, default=20.0, help="단계별 측정 시간(초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"시나리오별 요청 비율 ({', '.join(SCENARIOS)})")
+    parser.add_argument("--think-time", type=float, default=0.0, help="요청 사이 평균 대기 시간(초)")
+    parser.add_argument("--measures", type=int, default=16, help="업로드할 MusicXML 악보 마디 수")
+    parser.add_argument("--audio-seconds", type=float, default=10.0, help="업로드할 녹음 길이(초)")
+    parser.add_argument("--warmup-rounds", type=int, default=2, help="측정 전 시나리오별 워밍업 요청 횟수")
+    parser.add_argument("--timeout", type=float, default=120.0, help="요청 제한 시간(초)")
+    parser.add_argument("--slo", type=float, default=2.0, help="p95 응답 시간 목표(초)")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="포화로 볼 오류율")
+    parser.add_argument("--min-gain", type=float, default=0.1, help="포화로 볼 처리량 증가율 하한")
+    parser.add_argument("--full-sweep", action="store_true", help="한도를 넘어도 모든 단계를 측정")
+    parser.add_argument("--startup-timeout", type=float, default=120.0, help="서버 준비 대기 시간(초)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 1
+    concurrency_levels = sorted(set(parse_list(args.concurrency)))
+    quiet = args.json
+
+    runs = []
+    if args.url:
+        if not quiet:
+            print(f"[INFO] 대상 서버: {args.url}")
+        run = run_load(args.url.rstrip("/"), args, mix, concurrency_levels, quiet)
+        run["workers"] = None
+        runs.append(run)
+    else:
+        stub, stub_url = start_stub_server()
+        env = stub_environment(stub_url)
+        log_dir = tempfile.mkdtemp(prefix="loadtest_")
+        try:
+            for workers in parse_list(args.workers):
+                if not quiet:
+                    print(f"[INFO] 워커 {workers}개로 서버 시작 중...")
+                log_path = os.path.join(log_dir, f"server_w{workers}.log")
+                worker_env = dict(env, WEB_CONCURRENCY=str(workers))
+                if workers > 1 and not worker_env.get("SHARED_STATE_DIR"):
+                    # 멀티 워커 모드: 악보/캐시를 워커끼리 공유 (측정마다 빈 저장소로 시작)
+                    worker_env["SHARED_STATE_DIR"] = os.path.join(log_dir, f"shared_w{workers}")
+                try:
+                    process, base_url = start_api_server(workers, worker_env, log_path, args.startup_timeout)
+                except RuntimeError as e:
+                    print(f"[ERROR] {e}")
+                    runs.append({"workers": workers, "error": str(e)})
+                    continue
+                try:
+                    run = run_load(base_url, args, mix, concurrency_levels, quiet)
+                finally:
+                    stop_api_server(process)
+                run["workers"] = workers
+                run["server_log"] = log_path
+                runs.append(run)
+        finally:
+            stub.shutdown()
+        if not quiet:
+            print(f"[INFO] 목 서버 요청 수: {StubHandler.hits} (외부 API 호출 없음)")
+
+    results = {
+        "environment": environment(),
+        "config": {
+            "mix": mix,
+            "concurrency": concurrency_levels,
+            "step_seconds": args.step_seconds,
+            "think_time": args.think_time,
+            "measures": args.measures,
+            "audio_seconds": args.audio_seconds,
+            "slo_seconds": args.slo,
+            "max_error_rate": args.max_error_rate,
+            "min_gain": args.min_gain,
+        },
+        "runs": runs,
+    }
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print()
+        print("포화 지점 (워커 수별)")
+        for run in runs:
+            label = f"워커 {run['workers']}개" if run.get("workers") else "대상 서버"
+            if "error" in run:
+                print(f"  {label:<10} 실패: {run['error']}")
+                continue
+            sat = run["saturation"]
+            reason = sat["limited_by"] or "측정 범위 안에서 포화되지 않음"
+            if sat["concurrency"] is None:
+                print(f"  {label:<10} 첫 단계(동시 {sat['at_concurrency']}명)부터 한도 초과 (원인: {reason})")
+            else:
+                print(f"  {label:<10} 동시 {sat['concurrency']}명, {sat['throughput_rps']} req/s "
+                      f"(원인: {reason})")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"[OK] 결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,7 @@ Manage classes, students, and track progress
 
 import streamlit as st
 from database import DatabaseManager
+from class_io import export_class, import_roster, import_progress
 from datetime import datetime, date
 import pandas as pd
 
@@ -19,6 +20,29 @@ st.set_page_config(
 if 'db' not in st.session_state:
     st.session_state.db = DatabaseManager()
 
+# 선택 목록/이력은 한 번에 이만큼씩 불러옴
+ACTIVITY_CHOICE_PAGE = 50
+PROGRESS_HISTORY_PAGE = 20
+
+
+def activity_choices(class_id, state_key):
+    """활동 선택 목록 (최근 활동부터 필요한 컬럼만, '더 불러오기'로 늘림)"""
+    limit_key = f"{state_key}_limit_{class_id}"
+    limit = st.session_state.get(limit_key, ACTIVITY_CHOICE_PAGE)
+    activity_page = st.session_state.db.get_activities_page(
+        class_id,
+        limit=limit,
+        columns=['id', 'activity_date', 'song_title']
+    )
+    options = {f"{a['activity_date']} - {a['song_title']}": a['id']
+               for a in activity_page["items"]}
+    if activity_page["next_cursor"]:
+        st.caption(f"최근 활동 {limit}개만 표시합니다.")
+        if st.button("이전 활동 더 불러오기", key=f"{state_key}_more"):
+            st.session_state[limit_key] = limit + ACTIVITY_CHOICE_PAGE
+            st.rerun()
+    return options
+
 st.title("👨‍🏫 교사용 대시보드")
 st.markdown("---")
 
@@ -34,8 +58,8 @@ page = st.sidebar.selectbox(
 if page == "📊 대시보드 홈":
     st.header("📊 대시보드 개요")
     
-    # Get all classes
-    classes = st.session_state.db.get_all_classes()
+    # Get all classes with counts/statistics (한 번의 집계 쿼리)
+    classes = st.session_state.db.get_class_summaries()
     
     if not classes:
         st.info("👋 학급을 먼저 등록하세요! 왼쪽 메뉴에서 '🏫 학급 관리'를 선택하세요.")
@@ -47,17 +71,11 @@ if page == "📊 대시보드 홈":
             st.metric("전체 학급 수", len(classes))
         
         with col2:
-            total_students = sum(
-                len(st.session_state.db.get_students_by_class(c['id'])) 
-                for c in classes
-            )
+            total_students = sum(c['total_students'] for c in classes)
             st.metric("전체 학생 수", total_students)
         
         with col3:
-            total_activities = sum(
-                len(st.session_state.db.get_activities_by_class(c['id']))
-                for c in classes
-            )
+            total_activities = sum(c['total_activities'] for c in classes)
             st.metric("총 수업 기록", total_activities)
         
         with col4:
@@ -76,15 +94,12 @@ if page == "📊 대시보드 홈":
                 
                 with col1:
                     st.write(f"**담임 교사**: {cls['teacher_name'] or '미지정'}")
-                    students = st.session_state.db.get_students_by_class(cls['id'])
-                    st.write(f"**학생 수**: {len(students)}명")
+                    st.write(f"**학생 수**: {cls['total_students']}명")
                 
                 with col2:
-                    activities = st.session_state.db.get_activities_by_class(cls['id'])
-                    st.write(f"**수업 기록**: {len(activities)}회")
-                    stats = st.session_state.db.get_class_statistics(cls['id'])
-                    if stats['average_score'] > 0:
-                        st.write(f"**평균 점수**: {stats['average_score']}점")
+                    st.write(f"**수업 기록**: {cls['total_activities']}회")
+                    if cls['average_score'] > 0:
+                        st.write(f"**평균 점수**: {cls['average_score']}점")
 
 # ============================================
 # 학급 관리
@@ -148,7 +163,7 @@ elif page == "👥 학생 관리":
         selected_class = st.selectbox("학급 선택", list(class_options.keys()))
         class_id = class_options[selected_class]
         
-        tab1, tab2 = st.tabs(["➕ 학생 추가", "📋 학생 목록"])
+        tab1, tab2, tab3 = st.tabs(["➕ 학생 추가", "📋 학생 목록", "📤 일괄 등록/내보내기"])
         
         with tab1:
             st.subheader("새 학생 등록")
@@ -187,15 +202,6 @@ elif page == "👥 학생 관리":
                 
                 st.dataframe(df, use_container_width=True, hide_index=True)
                 
-                # Download as CSV
-                csv = df.to_csv(index=False).encode('utf-8-sig')
-                st.download_button(
-                    label="📥 명단 다운로드 (CSV)",
-                    data=csv,
-                    file_name=f"{selected_class}_명단.csv",
-                    mime="text/csv"
-                )
-                
                 # Edit/Delete students
                 st.markdown("---")
                 st.subheader("학생 정보 수정")
@@ -233,6 +239,37 @@ elif page == "👥 학생 관리":
                             st.session_state.db.delete_student(student['id'])
                             st.success("✅ 삭제되었습니다!")
                             st.rerun()
+        
+        with tab3:
+            st.subheader("명단 일괄 등록")
+            st.caption("머리글: 번호, 이름, 특이사항 (CSV 또는 XLSX)")
+            
+            roster_file = st.file_uploader("명단 파일", type=["csv", "xlsx"], key="roster_upload")
+            if roster_file and st.button("📤 명단 가져오기", type="primary"):
+                try:
+                    result = import_roster(
+                        st.session_state.db, class_id, roster_file,
+                        roster_file.name.rsplit(".", 1)[-1]
+                    )
+                    st.success(f"✅ {result['imported']}명 등록 (건너뜀 {result['skipped']}행)")
+                except Exception as e:
+                    st.error(f"오류: {str(e)}")
+            
+            st.markdown("---")
+            st.subheader("명단 내보내기")
+            
+            export_format = st.radio("파일 형식", ["csv", "xlsx"], horizontal=True, key="roster_format")
+            if st.button("📥 명단 파일 만들기"):
+                try:
+                    st.download_button(
+                        label=f"📥 명단 다운로드 ({export_format.upper()})",
+                        data=b"".join(export_class(st.session_state.db, class_id, "roster", export_format)),
+                        file_name=f"{selected_class}_명단.{export_format}",
+                        mime="text/csv" if export_format == "csv" else
+                             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
+                except Exception as e:
+                    st.error(f"오류: {str(e)}")
 
 # ============================================
 # 수업 기록
@@ -250,7 +287,12 @@ elif page == "📅 수업 기록":
         selected_class = st.selectbox("학급 선택", list(class_options.keys()))
         class_id = class_options[selected_class]
         
-        tab1, tab2, tab3 = st.tabs(["➕ 활동 추가", "📋 활동 목록", "✏️ 학생별 기록"])
+        tab1, tab2, tab3, tab4 = st.tabs(
+            ["➕ 활동 추가", "📋 활동 목록", "✏️ 학생별 기록", "👥 학급 일괄 기록"]
+        )
+        
+        # 탭은 매번 모두 그려지므로 학생 명단은 한 번만 조회해 함께 사용
+        students = st.session_state.db.get_students_by_class(class_id)
         
         with tab1:
             st.subheader("새 수업/활동 기록")
@@ -295,15 +337,37 @@ elif page == "📅 수업 기록":
             with col2:
                 end_date = st.date_input("종료 날짜", value=None)
             
-            activities = st.session_state.db.get_activities_by_class(
+            # 페이지 단위 조회 (커서 목록으로 이전/다음 페이지 이동)
+            page_key = (class_id, start_date, end_date)
+            if st.session_state.get("activity_page_key") != page_key:
+                st.session_state.activity_page_key = page_key
+                st.session_state.activity_cursors = [None]
+            cursors = st.session_state.activity_cursors
+            
+            activity_page = st.session_state.db.get_activities_page(
                 class_id,
-                start_date.strftime("%Y-%m-%d") if start_date else None,
-                end_date.strftime("%Y-%m-%d") if end_date else None
+                limit=20,
+                cursor=cursors[-1],
+                start_date=start_date.strftime("%Y-%m-%d") if start_date else None,
+                end_date=end_date.strftime("%Y-%m-%d") if end_date else None
             )
+            activities = activity_page["items"]
             
             if not activities:
                 st.info("기록된 활동이 없습니다.")
             else:
+                col_prev, col_page, col_next = st.columns([1, 2, 1])
+                with col_prev:
+                    if len(cursors) > 1 and st.button("◀ 이전", key="activity_prev"):
+                        cursors.pop()
+                        st.rerun()
+                with col_page:
+                    st.caption(f"{len(cursors)} 페이지")
+                with col_next:
+                    if activity_page["next_cursor"] and st.button("다음 ▶", key="activity_next"):
+                        cursors.append(activity_page["next_cursor"])
+                        st.rerun()
+                
                 for activity in activities:
                     with st.expander(
                         f"{activity['activity_date']} - {activity['activity_type']}: {activity['song_title'] or '(제목 없음)'}"
@@ -320,12 +384,11 @@ elif page == "📅 수업 기록":
         with tab3:
             st.subheader("학생별 진도 기록")
             
-            students = st.session_state.db.get_students_by_class(class_id)
-            activities = st.session_state.db.get_activities_by_class(class_id)
+            activity_options = activity_choices(class_id, "progress_activity")
             
             if not students:
                 st.info("먼저 학생을 등록하세요.")
-            elif not activities:
+            elif not activity_options:
                 st.info("먼저 활동을 기록하세요.")
             else:
                 # Select student and activity
@@ -338,8 +401,6 @@ elif page == "📅 수업 기록":
                     student_id = student_options[selected_student]
                 
                 with col2:
-                    activity_options = {f"{a['activity_date']} - {a['song_title']}": a['id']
-                                      for a in activities}
                     selected_activity = st.selectbox("활동 선택", list(activity_options.keys()))
                     activity_id = activity_options[selected_activity]
                 
@@ -366,13 +427,121 @@ elif page == "📅 수업 기록":
                 st.markdown("---")
                 st.subheader(f"{selected_student} 학습 이력")
                 
-                progress = st.session_state.db.get_student_progress(student_id)
+                # 필요한 컬럼만 페이지 단위로 조회 (커서 목록으로 이전/다음 페이지 이동)
+                if st.session_state.get("progress_page_key") != student_id:
+                    st.session_state.progress_page_key = student_id
+                    st.session_state.progress_cursors = [None]
+                progress_cursors = st.session_state.progress_cursors
+                
+                progress_page = st.session_state.db.get_student_progress_page(
+                    student_id,
+                    limit=PROGRESS_HISTORY_PAGE,
+                    cursor=progress_cursors[-1],
+                    columns=['activity_date', 'song_title', 'progress_status', 'score']
+                )
+                progress = progress_page["items"]
                 
                 if progress:
                     df = pd.DataFrame(progress)
                     df = df[['activity_date', 'song_title', 'progress_status', 'score']]
                     df.columns = ['날짜', '곡', '상태', '점수']
                     st.dataframe(df, use_container_width=True, hide_index=True)
+                    
+                    col_prev, col_page, col_next = st.columns([1, 2, 1])
+                    with col_prev:
+                        if len(progress_cursors) > 1 and st.button("◀ 이전", key="progress_prev"):
+                            progress_cursors.pop()
+                            st.rerun()
+                    with col_page:
+                        st.caption(f"{len(progress_cursors)} 페이지")
+                    with col_next:
+                        if progress_page["next_cursor"] and st.button("다음 ▶", key="progress_next"):
+                            progress_cursors.append(progress_page["next_cursor"])
+                            st.rerun()
+
+        with tab4:
+            st.subheader("활동 결과 일괄 입력")
+            
+            activity_options = activity_choices(class_id, "bulk_activity")
+            
+            if not students:
+                st.info("먼저 학생을 등록하세요.")
+            elif not activity_options:
+                st.info("먼저 활동을 기록하세요.")
+            else:
+                selected_activity = st.selectbox(
+                    "활동 선택", list(activity_options.keys()), key="bulk_activity"
+                )
+                activity_id = activity_options[selected_activity]
+                
+                # 학급 전체를 한 표에서 입력하고 한 번에 저장
+                entry_df = pd.DataFrame([{
+                    "student_id": s['id'],
+                    "번호": s['student_number'],
+                    "이름": s['student_name'],
+                    "상태": "완료",
+                    "점수": 80,
+                    "메모": ""
+                } for s in students])
+                
+                edited = st.data_editor(
+                    entry_df,
+                    column_config={
+                        "student_id": None,
+                        "상태": st.column_config.SelectboxColumn(
+                            options=["완료", "진행중", "미완료", "보충 필요"]
+                        ),
+                        "점수": st.column_config.NumberColumn(min_value=0, max_value=100, step=5),
+                    },
+                    disabled=["번호", "이름"],
+                    hide_index=True,
+                    use_container_width=True,
+                    key="bulk_progress_editor"
+                )
+                
+                if st.button("✅ 학급 전체 기록", type="primary"):
+                    count = st.session_state.db.record_progress_bulk(
+                        {
+                            "student_id": int(row["student_id"]),
+                            "activity_id": activity_id,
+                            "progress_status": row["상태"],
+                            "score": None if pd.isna(row["점수"]) else int(row["점수"]),
+                            "notes": row["메모"] or ""
+                        }
+                        for _, row in edited.iterrows()
+                    )
+                    st.success(f"✅ {count}명의 진도가 기록되었습니다!")
+            
+            st.markdown("---")
+            st.subheader("진도 기록 가져오기/내보내기")
+            st.caption("머리글: 번호, 이름, 날짜, 활동 유형, 곡, 상태, 점수, 메모 (CSV 또는 XLSX)")
+            
+            progress_file = st.file_uploader("진도 기록 파일", type=["csv", "xlsx"], key="progress_upload")
+            if progress_file and st.button("📤 진도 기록 가져오기"):
+                try:
+                    result = import_progress(
+                        st.session_state.db, class_id, progress_file,
+                        progress_file.name.rsplit(".", 1)[-1]
+                    )
+                    st.success(
+                        f"✅ {result['imported']}건 기록 (새 활동 {result['activities_created']}개, "
+                        f"건너뜀 {result['skipped']}행)"
+                    )
+                except Exception as e:
+                    st.error(f"오류: {str(e)}")
+            
+            progress_format = st.radio("파일 형식", ["csv", "xlsx"], horizontal=True, key="progress_format")
+            if st.button("📥 진도 기록 파일 만들기"):
+                try:
+                    st.download_button(
+                        label=f"📥 진도 기록 다운로드 ({progress_format.upper()})",
+                        data=b"".join(export_class(st.session_state.db, class_id, "progress", progress_format)),
+                        file_name=f"{selected_class}_진도.{progress_format}",
+                        mime="text/csv" if progress_format == "csv" else
+                             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
+                except Exception as e:
+                    st.error(f"오류: {str(e)}")
 
 # ============================================
 # 통계 및 리포트
@@ -396,14 +565,9 @@ elif page == "📈 통계 및 리포트":
             # Overall statistics
             st.subheader("📊 전체 통계")
             
-            total_students = sum(
-                len(st.session_state.db.get_students_by_class(c['id']))
-                for c in classes
-            )
-            total_activities = sum(
-                len(st.session_state.db.get_activities_by_class(c['id']))
-                for c in classes
-            )
+            summaries = st.session_state.db.get_class_summaries()
+            total_students = sum(c['total_students'] for c in summaries)
+            total_activities = sum(c['total_activities'] for c in summaries)
             
             col1, col2, col3 = st.columns(3)
             
@@ -419,13 +583,13 @@ elif page == "📈 통계 및 리포트":
             st.subheader("학급별 요약")
             
             summary_data = []
-            for cls in classes:
-                stats = st.session_state.db.get_class_statistics(cls['id'])
+            for cls in summaries:
                 summary_data.append({
                     "학급": f"{cls['grade']}학년 {cls['class_number']}반",
-                    "학생수": stats['total_students'],
-                    "활동수": stats['total_activities'],
-                    "평균점수": stats['average_score']
+                    "학생수": cls['total_students'],
+                    "활동수": cls['total_activities'],
+                    "평균점수": cls['average_score'],
+                    "완료율(%)": cls['completion_rate']
                 })
             
             df = pd.DataFrame(summary_data)
@@ -435,7 +599,7 @@ elif page == "📈 통계 및 리포트":
             # Single class statistics
             stats = st.session_state.db.get_class_statistics(class_id)
             
-            col1, col2, col3 = st.columns(3)
+            col1, col2, col3, col4 = st.columns(4)
             
             with col1:
                 st.metric("학생 수", stats['total_students'])
@@ -443,14 +607,41 @@ elif page == "📈 통계 및 리포트":
                 st.metric("활동 수", stats['total_activities'])
             with col3:
                 st.metric("평균 점수", f"{stats['average_score']}점")
+            with col4:
+                st.metric("완료율", f"{stats['completion_rate']}%")
+            
+            # Monthly trend
+            trend = st.session_state.db.get_class_trend(class_id)
+            if trend:
+                st.markdown("---")
+                st.subheader("월별 추이")
+                trend_df = pd.DataFrame(trend).set_index('month')
+                trend_df = trend_df[['average_score', 'completion_rate']]
+                trend_df.columns = ['평균 점수', '완료율(%)']
+                st.line_chart(trend_df)
+            
+            # Per-activity statistics
+            activity_stats = st.session_state.db.get_activity_statistics(class_id)
+            if activity_stats:
+                st.markdown("---")
+                st.subheader("활동별 통계")
+                activity_df = pd.DataFrame(activity_stats)
+                activity_df = activity_df[['activity_date', 'activity_type', 'song_title',
+                                           'progress_count', 'average_score', 'completion_rate']]
+                activity_df.columns = ['날짜', '유형', '곡', '기록 수', '평균 점수', '완료율(%)']
+                st.dataframe(activity_df, use_container_width=True, hide_index=True)
             
             # Recent activities
             st.markdown("---")
             st.subheader("최근 활동")
             
-            activities = st.session_state.db.get_activities_by_class(class_id)
-            if activities:
-                recent = activities[:5]
+            # 최근 5개만 필요한 컬럼으로 조회
+            recent = st.session_state.db.get_activities_page(
+                class_id,
+                limit=5,
+                columns=['activity_date', 'activity_type', 'song_title']
+            )["items"]
+            if recent:
                 for act in recent:
                     st.write(f"• {act['activity_date']} - {act['activity_type']}: {act['song_title']}")
             else:
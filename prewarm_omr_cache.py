@@ -0,0 +1,59 @@
+"""
+OMR 캐시 미리 채우기 스크립트
+교과서 스캔 이미지 폴더를 오프라인으로 일괄 OMR 처리하여 캐시에 저장합니다.
+
+사용법:
+    python prewarm_omr_cache.py <스캔 폴더> [--recursive] [--audiveris 경로]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# src 디렉토리를 Python 경로에 추가
+src_dir = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from omr_service import AudiverisOmr, OmrError, get_audiveris_path, create_omr_cache
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="스캔 악보 폴더를 미리 OMR 처리하여 캐시에 저장")
+    parser.add_argument("folder", help="스캔 이미지(PNG/JPG/PDF)가 있는 폴더")
+    parser.add_argument("--recursive", action="store_true", help="하위 폴더까지 처리")
+    parser.add_argument("--audiveris", help="Audiveris 실행 파일 경로 (기본값: 자동 탐색)")
+    args = parser.parse_args()
+
+    folder = Path(args.folder)
+    if not folder.is_dir():
+        print(f"[ERROR] 폴더를 찾을 수 없습니다: {folder}")
+        return 1
+
+    audiveris_path = args.audiveris or get_audiveris_path()
+    if not audiveris_path:
+        print("[ERROR] Audiveris 경로를 찾을 수 없습니다. --audiveris 옵션으로 지정하세요.")
+        return 1
+
+    cache = create_omr_cache()
+    if cache is None:
+        print("[ERROR] OMR 캐시가 비활성화되어 있습니다. OMR_CACHE_MAX_MB 설정을 확인하세요.")
+        return 1
+
+    try:
+        omr = AudiverisOmr(audiveris_path, cache=cache)
+        result = omr.prewarm(folder, recursive=args.recursive)
+    except OmrError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    print()
+    print(f"[완료] 새로 처리: {result['processed']}개, 이미 캐시됨: {result['cached']}개, "
+          f"실패: {result['failed']}개")
+    stats = cache.stats()
+    print(f"[캐시] {stats['entries']}개 항목, {stats['bytes'] / (1024 * 1024):.1f} MB "
+          f"(최대 {stats['max_bytes'] / (1024 * 1024):.0f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,9 +10,12 @@ except ImportError:
     HAS_STREAMLIT = False
     st = None
 
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, AsyncIterator
+import asyncio
 import json
 import os
+import threading
+import weakref
 from pathlib import Path
 
 # Load environment variables from .env file in project root
@@ -31,13 +34,44 @@ except ImportError:
 except Exception:
     pass
 
+try:
+    from response_cache import SemanticCache
+    from resilience import get_breaker, is_upstream_failure
+except ImportError:
+    from .response_cache import SemanticCache
+    from .resilience import get_breaker, is_upstream_failure
+
+# OpenAI 요청 타임아웃(초)과 프로세스당 동시 요청 수
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "30"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+OPENAI_MAX_RETRIES = 2
+
+
 class AIAssistant:
     """AI Assistant using OpenAI API"""
     
     def __init__(self):
         """Initialize AI Assistant"""
         self.api_key = os.getenv("OPENAI_API_KEY")
+        # OPENAI_BASE_URL로 OpenAI 호환 서버(로컬 목 서버 등)를 지정할 수 있음
+        self.base_url = os.getenv("OPENAI_BASE_URL") or None
         self.conversation_history: List[Dict[str, str]] = []  # 대화 기록 저장
+        
+        # 클라이언트는 처음 사용할 때 한 번만 만들고 연결 풀을 계속 재사용
+        self._client = None
+        self._client_lock = threading.Lock()
+        # 이벤트 루프별 (AsyncOpenAI, Semaphore) - httpx 연결은 생성된 루프에 묶임
+        self._async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        
+        # 이론 설명/수업 계획 응답 캐시 (같은 요청은 LLM 호출 없이 반환)
+        # 비슷한 요청까지 묶으려면 AI_CACHE_SIMILARITY(예: 0.9)를 지정 - 기본은 정확 일치만
+        self.response_cache = SemanticCache(
+            max_entries=int(os.getenv("AI_CACHE_MAX_ENTRIES", "500")),
+            default_ttl=float(os.getenv("AI_CACHE_TTL", str(7 * 24 * 3600))),
+            threshold=float(os.getenv("AI_CACHE_SIMILARITY", "1.0")),
+            sqlite_path=os.getenv("AI_CACHE_DB") or None,
+            namespace="ai",
+        )
         if not self.api_key:
             if HAS_STREAMLIT and st:
                 st.warning("OpenAI API 키가 설정되지 않았습니다. .env 파일에 OPENAI_API_KEY를 추가하세요.")
@@ -48,6 +82,140 @@ class AIAssistant:
         """대화 기록 초기화"""
         self.conversation_history = []
     
+    @property
+    def client(self):
+        """공유 동기 OpenAI 클라이언트 (Streamlit 등 동기 코드용)"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    self._client = OpenAI(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        timeout=OPENAI_TIMEOUT,
+                        max_retries=OPENAI_MAX_RETRIES,
+                    )
+        return self._client
+    
+    def _get_async_client(self):
+        """현재 이벤트 루프의 공유 AsyncOpenAI 클라이언트와 동시 요청 제한 세마포어"""
+        loop = asyncio.get_running_loop()
+        entry = self._async_clients.get(loop)
+        if entry is None:
+            import httpx
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=OPENAI_TIMEOUT,
+                max_retries=OPENAI_MAX_RETRIES,
+                http_client=httpx.AsyncClient(
+                    timeout=OPENAI_TIMEOUT,
+                    limits=httpx.Limits(
+                        max_connections=OPENAI_MAX_CONCURRENCY * 2,
+                        max_keepalive_connections=OPENAI_MAX_CONCURRENCY,
+                        keepalive_expiry=60.0,
+                    ),
+                ),
+            )
+            entry = (client, asyncio.Semaphore(OPENAI_MAX_CONCURRENCY))
+            self._async_clients[loop] = entry
+        return entry
+    
+    @staticmethod
+    def _breaker(endpoint: str):
+        """
+        용도별 서킷 브레이커 (예: openai:chat, openai:lesson_plan)
+        
+        짧은 채팅과 긴 수업 계획은 응답 시간이 크게 다르므로, 지연 시간 기록과
+        적응형 타임아웃을 따로 두어 채팅 기준 타임아웃으로 긴 응답이 취소되지 않게 합니다.
+        """
+        return get_breaker(f"openai:{endpoint}")
+    
+    async def acomplete(self, messages: List[Dict[str, str]], model: str = "gpt-4o-mini",
+                        max_tokens: int = 500, temperature: float = 0.7,
+                        endpoint: str = "chat") -> str:
+        """
+        Chat completion 요청 (async, 공유 클라이언트 사용)
+        
+        동시 요청 수는 OPENAI_MAX_CONCURRENCY로 제한되어, 느린 응답이 몰려도
+        연결 풀과 이벤트 루프를 다른 요청과 함께 쓸 수 있습니다.
+        OpenAI가 연속으로 실패하면 서킷이 열려 요청 없이 바로 CircuitOpenError가 발생합니다.
+        
+        Args:
+            messages: 대화 메시지 목록
+            model: 모델 이름
+            max_tokens: 최대 토큰 수
+            temperature: 샘플링 온도
+            endpoint: 용도 (chat, theory, lesson_plan 등) - 서킷/타임아웃을 용도별로 관리
+            
+        Returns:
+            응답 텍스트
+        """
+        client, semaphore = self._get_async_client()
+        async with semaphore:
+            response = await self._breaker(endpoint).call(
+                lambda timeout: client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    timeout=timeout,
+                ),
+                OPENAI_TIMEOUT,
+                is_failure=is_upstream_failure,
+            )
+        return (response.choices[0].message.content or "").strip()
+    
+    async def astream(self, messages: List[Dict[str, str]], model: str = "gpt-4o-mini",
+                      max_tokens: int = 500, temperature: float = 0.7,
+                      endpoint: str = "chat") -> AsyncIterator[str]:
+        """
+        Chat completion 스트리밍 요청 - 토큰이 도착하는 대로 조각을 반환
+        
+        호출한 쪽이 반복을 중단하면(클라이언트 연결 종료 등) 업스트림 응답도 바로 닫습니다.
+        
+        Args:
+            messages: 대화 메시지 목록
+            model: 모델 이름
+            max_tokens: 최대 토큰 수
+            temperature: 샘플링 온도
+            endpoint: 용도 (chat, theory, lesson_plan 등) - 서킷/타임아웃을 용도별로 관리
+            
+        Yields:
+            응답 텍스트 조각
+        """
+        client, semaphore = self._get_async_client()
+        async with semaphore:
+            # 서킷 브레이커/적응형 타임아웃은 첫 응답(헤더)까지 적용
+            stream = await self._breaker(endpoint).call(
+                lambda timeout: client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True,
+                    timeout=timeout,
+                ),
+                OPENAI_TIMEOUT,
+                is_failure=is_upstream_failure,
+            )
+            try:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            finally:
+                await stream.response.aclose()
+    
+    async def aclose(self):
+        """현재 이벤트 루프의 AsyncOpenAI 클라이언트 종료 (서버 종료 시 호출)"""
+        entry = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[0].close()
+    
     def chat(self, message: str, context: Optional[str] = None) -> Optional[str]:
         """
         Chat with AI assistant
@@ -63,8 +231,7 @@ class AIAssistant:
             return None
         
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=self.api_key)
+            client = self.client
             
             messages = [
                 {"role": "system", "content": "당신은 초등학교 음악 교육 전문가입니다. 학생과 교사를 도와주세요."}
@@ -91,12 +258,13 @@ class AIAssistant:
                 print(f"AI 응답 오류: {str(e)}")
             return None
     
-    def explain_theory(self, concept: str) -> Optional[str]:
+    def explain_theory(self, concept: str, use_cache: bool = True) -> Optional[str]:
         """
         Explain music theory concept
         
         Args:
             concept: Music theory concept to explain
+            use_cache: False면 캐시를 건너뛰고 새로 생성
             
         Returns:
             Explanation or None
@@ -104,9 +272,16 @@ class AIAssistant:
         if not self.api_key:
             return None
         
+        cache_scope = "assistant.theory"
+        if use_cache:
+            cached = self.response_cache.lookup(cache_scope, concept)
+            if cached is not None:
+                return cached
+        else:
+            self.response_cache.record_bypass()
+        
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=self.api_key)
+            client = self.client
             
             prompt = f"""
             초등학생이 이해할 수 있도록 다음 음악 이론 개념을 설명해주세요:
@@ -127,7 +302,10 @@ class AIAssistant:
                 max_tokens=500
             )
             
-            return response.choices[0].message.content
+            explanation = response.choices[0].message.content
+            if explanation:
+                self.response_cache.store(cache_scope, concept, explanation)
+            return explanation
             
         except Exception as e:
             if HAS_STREAMLIT and st:
@@ -136,13 +314,15 @@ class AIAssistant:
                 print(f"이론 설명 오류: {str(e)}")
             return None
     
-    def generate_lesson_plan(self, topic: str, grade: int = 3) -> Optional[Dict]:
+    def generate_lesson_plan(self, topic: str, grade: int = 3,
+                             use_cache: bool = True) -> Optional[Dict]:
         """
         Generate lesson plan for music education
         
         Args:
             topic: Lesson topic
             grade: Grade level (1-6)
+            use_cache: False면 캐시를 건너뛰고 새로 생성
             
         Returns:
             Lesson plan dictionary or None
@@ -150,9 +330,16 @@ class AIAssistant:
         if not self.api_key:
             return None
         
+        cache_scope = f"assistant.lesson_plan|grade={grade}"
+        if use_cache:
+            cached = self.response_cache.lookup(cache_scope, topic)
+            if cached is not None:
+                return cached
+        else:
+            self.response_cache.record_bypass()
+        
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=self.api_key)
+            client = self.client
             
             prompt = f"""
             {grade}학년 초등학생을 위한 음악 수업 계획안을 작성해주세요.
@@ -179,9 +366,12 @@ class AIAssistant:
             
             # Try to parse JSON
             try:
-                return json.loads(content)
+                plan = json.loads(content)
             except:
-                return {"plan": content}
+                plan = {"plan": content}
+            
+            self.response_cache.store(cache_scope, topic, plan)
+            return plan
             
         except Exception as e:
             if HAS_STREAMLIT and st:
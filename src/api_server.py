@@ -3,10 +3,13 @@ FastAPI REST API Server
 Provides REST endpoints for the React frontend
 """
 
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks, Request
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks, Request, Header, Body
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse, Response
-from typing import Optional
+from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
+from typing import List, Optional
 import os
 import sys
 from pathlib import Path
@@ -15,6 +18,7 @@ import json
 import asyncio
 import subprocess
 import shutil
+import uuid
 
 # Windows 콘솔 인코딩 설정 (이모지 출력 오류 방지)
 if sys.platform == 'win32':
@@ -68,42 +72,31 @@ except ImportError:
 except Exception as e:
     print(f"[WARN] .env 파일 로드 중 오류: {str(e)}")
 
-# Optional imports with error handling
-# 먼저 필수 의존성 확인
-try:
+# 여러 워커로 실행할 때 공유할 저장소 위치 (SHARED_STATE_DIR) - 다른 모듈이 환경 변수를 읽기 전에 설정
+from shared_state import configure_shared_state, shared_state_report
+_shared_paths = configure_shared_state()
+if _shared_paths:
+    print(f"[OK] 공유 상태 디렉토리: {os.environ['SHARED_STATE_DIR']} (PID {os.getpid()})")
+
+# 무거운 구성 요소는 처음 사용할 때 불러옴 (서버가 바로 요청을 받을 수 있도록)
+# 구성 요소별 불러오기 시간은 /api/startup/report에서 확인
+from lazy_loader import (
+    lazy_component, component_names, component_report, parse_component_list, prewarm,
+    PREWARM_COMPONENTS,
+)
+from warmup import (
+    WarmupState, parse_step_list, warm_basic_pitch, warm_music21, warm_paths,
+    warm_transcription, WARMUP_STEPS, WARMUP_REQUIRED,
+)
+
+
+def _load_music21():
     import music21
     print(f"[OK] music21 모듈 로드 성공 (버전: {music21.__version__})")
-except ImportError as e:
-    print(f"[WARN] music21이 설치되지 않았습니다: {e}")
-    print("   설치 방법: pip install music21")
-    music21 = None
-except Exception as e:
-    print(f"[WARN] music21 로드 중 오류: {e}")
-    music21 = None
+    return music21
 
-try:
-    # Ensure src directory is in path before importing
-    src_dir = Path(__file__).parent
-    if str(src_dir) not in sys.path:
-        sys.path.insert(0, str(src_dir))
-    
-    from audio_processor import AudioProcessor
-    HAS_AUDIO_PROCESSOR = True
-    print("[OK] audio_processor 모듈 로드 성공")
-except ImportError as e:
-    import traceback
-    print(f"[WARN] audio_processor를 불러올 수 없습니다: {e}")
-    print(f"[WARN] 상세 오류:")
-    traceback.print_exc()
-    HAS_AUDIO_PROCESSOR = False
-    AudioProcessor = None
-except Exception as e:
-    import traceback
-    print(f"[WARN] audio_processor 로드 중 예상치 못한 오류: {e}")
-    print(f"[WARN] 상세 오류:")
-    traceback.print_exc()
-    HAS_AUDIO_PROCESSOR = False
-    AudioProcessor = None
+
+music21_module = lazy_component("music21", _load_music21)
 
 # 필수 라이브러리 체크 함수
 def check_required_libraries():
@@ -136,107 +129,46 @@ def check_required_libraries():
     
     return missing_libs
 
-try:
-    # Ensure src directory is in path
-    src_dir = Path(__file__).parent
-    if str(src_dir) not in sys.path:
-        sys.path.insert(0, str(src_dir))
-    
+
+def _load_audio_processor():
+    from audio_processor import AudioProcessor
+    return AudioProcessor()
+
+
+def _load_score_processor():
     from score_processor import ScoreProcessor
-    HAS_SCORE_PROCESSOR = True
-    print("[OK] score_processor 모듈 로드 성공")
-except ImportError as e:
-    import traceback
-    print(f"[WARN] score_processor를 불러올 수 없습니다: {e}")
-    print(f"[WARN] 상세 오류:")
-    traceback.print_exc()
-    HAS_SCORE_PROCESSOR = False
-    ScoreProcessor = None
-except Exception as e:
-    import traceback
-    print(f"[WARN] score_processor 로드 중 예상치 못한 오류: {e}")
-    print(f"[WARN] 상세 오류:")
-    traceback.print_exc()
-    HAS_SCORE_PROCESSOR = False
-    ScoreProcessor = None
+    return ScoreProcessor()
 
-try:
-    # Ensure src directory is in path
-    src_dir = Path(__file__).parent
-    if str(src_dir) not in sys.path:
-        sys.path.insert(0, str(src_dir))
-    
+
+def _load_chord_generator():
     from chord_generator import ChordGenerator
-    HAS_CHORD_GENERATOR = True
-    print("[OK] chord_generator 모듈 로드 성공")
-except ImportError as e:
-    import traceback
-    print(f"[WARN] chord_generator를 불러올 수 없습니다: {e}")
-    print(f"[WARN] 상세 오류:")
-    traceback.print_exc()
-    HAS_CHORD_GENERATOR = False
-    ChordGenerator = None
-except Exception as e:
-    import traceback
-    print(f"[WARN] chord_generator 로드 중 예상치 못한 오류: {e}")
-    print(f"[WARN] 상세 오류:")
-    traceback.print_exc()
-    HAS_CHORD_GENERATOR = False
-    ChordGenerator = None
+    return ChordGenerator()
 
-try:
+
+def _load_ai_assistant():
     from ai_assistant import AIAssistant
-    HAS_AI_ASSISTANT = True
-except ImportError as e:
-    print(f"[WARN] ai_assistant를 불러올 수 없습니다: {e}")
-    HAS_AI_ASSISTANT = False
-    AIAssistant = None
+    return AIAssistant()
 
-try:
+
+def _load_perplexity_assistant():
     from perplexity_assistant import PerplexityAssistant
-    HAS_PERPLEXITY_ASSISTANT = True
-except ImportError as e:
-    print(f"[WARN] perplexity_assistant를 불러올 수 없습니다: {e}")
-    HAS_PERPLEXITY_ASSISTANT = False
-    PerplexityAssistant = None
+    return PerplexityAssistant()
 
-try:
+
+def _load_youtube_helper():
     from youtube_helper import YouTubeHelper
-    HAS_YOUTUBE_HELPER = True
-except ImportError as e:
-    print(f"[WARN] youtube_helper를 불러올 수 없습니다: {e}")
-    HAS_YOUTUBE_HELPER = False
-    YouTubeHelper = None
+    return YouTubeHelper()
 
-try:
-    # Ensure src directory is in path
-    src_dir = Path(__file__).parent
-    if str(src_dir) not in sys.path:
-        sys.path.insert(0, str(src_dir))
-    
+
+def _load_chord_analyzer():
     from chord_analyzer import ChordAnalyzer
-    HAS_CHORD_ANALYZER = True
-    print("[OK] chord_analyzer 모듈 로드 성공")
-except ImportError as e:
-    import traceback
-    print(f"[WARN] chord_analyzer를 불러올 수 없습니다: {e}")
-    print(f"[WARN] 상세 오류:")
-    traceback.print_exc()
-    HAS_CHORD_ANALYZER = False
-    ChordAnalyzer = None
-except Exception as e:
-    import traceback
-    print(f"[WARN] chord_analyzer 로드 중 예상치 못한 오류: {e}")
-    print(f"[WARN] 상세 오류:")
-    traceback.print_exc()
-    HAS_CHORD_ANALYZER = False
-    ChordAnalyzer = None
+    return ChordAnalyzer()
+
 
-# OMR Service (optional)
+# OMR Service (optional) - 모듈 자체는 가볍고 OmrError를 except 절에서 쓰므로 바로 import
 try:
-    from omr_service import AudiverisOmr, OmrError
+    from omr_service import AudiverisOmr, OmrError, get_audiveris_path, create_omr_cache
     HAS_OMR_SERVICE = True
-    print("[OK] omr_service 모듈 로드 성공")
 except ImportError as e:
     print(f"[WARN] omr_service를 불러올 수 없습니다: {e}")
     HAS_OMR_SERVICE = False
@@ -248,69 +180,28 @@ except Exception as e:
     AudiverisOmr = None
     OmrError = None
 
-def get_audiveris_path() -> Optional[str]:
-    """Audiveris 실행 파일 경로 찾기"""
-    import shutil
-    
-    # 1. 하드코딩된 경로 확인 (우선순위)
-    hardcoded_paths = [
-        r"C:\audiveris\bin\audiveris.bat",
-        r"C:\audiveris\bin\audiveris.exe",
-    ]
-    
-    for path_str in hardcoded_paths:
-        path = Path(path_str)
-        if path.exists():
-            return str(path)
-    
-    # 2. PATH에서 찾기
-    audiveris_exe = shutil.which("audiveris")
-    if audiveris_exe:
-        return audiveris_exe
-    
-    # 3. 일반적인 Windows 경로 확인
-    common_paths = [
-        r"C:\Program Files\Audiveris\bin\audiveris.exe",
-        r"C:\Program Files (x86)\Audiveris\bin\audiveris.exe",
-        r"C:\Audiveris\bin\audiveris.exe",
-    ]
-    
-    for path_str in common_paths:
-        path = Path(path_str)
-        if path.exists():
-            return str(path)
-    
-    return None
+if OmrError is None:
+    class OmrError(Exception):
+        """omr_service가 없을 때 except 절용 자리 표시"""
 
-# OMR 엔진 초기화
-omr_engine = None
-OMR_AVAILABLE = False
 
-if HAS_OMR_SERVICE and AudiverisOmr:
+def _load_omr_engine():
+    """OMR 엔진 초기화 (Audiveris 경로 탐색은 처음 사용할 때 한 번만)"""
+    if not HAS_OMR_SERVICE:
+        raise RuntimeError("OMR 서비스가 사용할 수 없습니다.")
     audiveris_path = get_audiveris_path()
-    if audiveris_path:
-        try:
-            omr_engine = AudiverisOmr(Path(audiveris_path))
-            OMR_AVAILABLE = True
-            print(f"[OK] OMR 엔진 초기화 성공: {audiveris_path}")
-        except OmrError as e:
-            print(f"[WARN] OMR 엔진 초기화 실패: {e}")
-            OMR_AVAILABLE = False
-        except Exception as e:
-            print(f"[WARN] OMR 엔진 초기화 중 예상치 못한 오류: {e}")
-            OMR_AVAILABLE = False
-    else:
-        print("[WARN] Audiveris 경로를 찾을 수 없습니다. OMR 기능이 비활성화됩니다.")
-else:
-    print("[WARN] OMR 서비스가 사용할 수 없습니다.")
+    if not audiveris_path:
+        raise RuntimeError("Audiveris 경로를 찾을 수 없습니다. OMR 기능이 비활성화됩니다.")
+    # 같은 스캔 이미지는 캐시된 MusicXML을 재사용
+    engine = AudiverisOmr(Path(audiveris_path), cache=create_omr_cache())
+    print(f"[OK] OMR 엔진 초기화 성공: {audiveris_path}")
+    return engine
 
-# PDF Parser (optional)
-try:
+
+def _load_pdf_parser():
+    # PDF Parser (optional) - streamlit 등을 불러오므로 필요할 때만
     from pdf_parser import PDFScoreParser
-    HAS_PDF_PARSER = True
-except ImportError:
-    HAS_PDF_PARSER = False
-    PDFScoreParser = None
+    return PDFScoreParser
 
 # Initialize FastAPI app
 app = FastAPI(title="초등 음악 도우미 API", version="1.0.0")
@@ -353,22 +244,168 @@ async def global_exception_handler(request, exc):
         }
     )
 
-# Initialize processors (singleton pattern) with error handling
-try:
-    audio_processor = AudioProcessor() if HAS_AUDIO_PROCESSOR else None
-except (ImportError, Exception) as e:
-    print(f"[WARN] AudioProcessor 초기화 실패: {e}")
-    print("[WARN] 서버는 계속 실행되지만 오디오 처리 기능은 사용할 수 없습니다.")
-    audio_processor = None
-score_processor = ScoreProcessor() if HAS_SCORE_PROCESSOR else None
-chord_generator = ChordGenerator() if HAS_CHORD_GENERATOR else None
-ai_assistant = AIAssistant() if HAS_AI_ASSISTANT else None
-perplexity_assistant = PerplexityAssistant() if HAS_PERPLEXITY_ASSISTANT else None
-youtube_helper = YouTubeHelper() if HAS_YOUTUBE_HELPER else None
-chord_analyzer = ChordAnalyzer() if HAS_CHORD_ANALYZER else None
-
-# Temporary storage for processed scores
-score_storage = {}
+# Initialize processors (singleton pattern, 처음 사용할 때 생성)
+# 사용할 수 없는 구성 요소는 `if not audio_processor:`처럼 검사하면 False
+# 비동기 처리기에서는 처음 불러오기가 이벤트 루프를 막지 않도록 `if not await audio_processor.aget():`로 검사
+audio_processor = lazy_component("audio_processor", _load_audio_processor)
+score_processor = lazy_component("score_processor", _load_score_processor)
+chord_generator = lazy_component("chord_generator", _load_chord_generator)
+ai_assistant = lazy_component("ai_assistant", _load_ai_assistant)
+perplexity_assistant = lazy_component("perplexity_assistant", _load_perplexity_assistant)
+youtube_helper = lazy_component("youtube_helper", _load_youtube_helper)
+chord_analyzer = lazy_component("chord_analyzer", _load_chord_analyzer)
+omr_engine = lazy_component("omr_engine", _load_omr_engine)
+pdf_parser_class = lazy_component("pdf_parser", _load_pdf_parser)
+
+# 처리된 악보 저장소 (SCORE_STORE_DB를 지정하면 워커끼리 공유)
+from score_store import ScoreStore, freeze_score, thaw_score
+
+score_storage = ScoreStore(
+    max_scores=int(os.getenv("SCORE_STORE_MAX_SCORES", "500")),
+    ttl=float(os.getenv("SCORE_STORE_TTL", str(24 * 3600))),
+    sqlite_path=os.getenv("SCORE_STORE_DB") or None,
+    serializer=freeze_score,
+    deserializer=thaw_score,
+)
+
+# 일괄 채보 작업자 풀 (BATCH_WORKERS를 API 워커 수로 나눈 만큼, 처음 일괄 요청이나 batch_pool 워밍업 때 시작)
+from batch_transcription import BATCH_MAX_FILES, BATCH_MAX_MB, BatchTranscriber, collect_uploads
+batch_transcriber = BatchTranscriber()
+
+# 외부 API 서킷 브레이커 상태 (헬스 체크용)
+from resilience import breaker_stats
+
+# Prometheus 형식 지표 (/metrics)
+from metrics import REGISTRY, MetricsMiddleware, cache_families, stage_timer
+
+# 관리자용 요청 단위 프로파일링 (X-Profile + X-Admin-Token)
+from profiling import (
+    ProfilingMiddleware, bind_context, is_authorized, list_profiles, load_folded, load_profile,
+)
+
+# 세션별 AI 대화 기록 (교실/사용자끼리 대화가 섞이지 않도록 세션 ID로 분리)
+from conversation_store import ConversationStore, new_session_id
+conversation_store = ConversationStore(
+    max_sessions=int(os.getenv("CHAT_MAX_SESSIONS", "1000")),
+    ttl=float(os.getenv("CHAT_SESSION_TTL", "7200")),
+    sqlite_path=os.getenv("CHAT_HISTORY_DB") or None,
+)
+# 프롬프트에 넣을 대화 기록의 최대 토큰 수
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1200"))
+
+# 라우트별 요청 수/응답 시간 기록
+app.add_middleware(MetricsMiddleware)
+# PROFILE_ADMIN_TOKEN이 설정된 경우에만 동작
+app.add_middleware(ProfilingMiddleware)
+
+# 서킷 상태를 숫자로 (지표용)
+CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+def collect_runtime_metrics():
+    """/metrics 요청 때 읽는 지표 (이미 불러온 구성 요소만 확인하고 새로 불러오지 않음)"""
+    caches = {}
+    if ai_assistant.loaded:
+        caches["openai"] = ai_assistant.response_cache.stats()
+    if perplexity_assistant.loaded:
+        caches["perplexity"] = perplexity_assistant.cache.stats()
+    if youtube_helper.loaded:
+        caches["youtube_api"] = youtube_helper.cache.stats()
+    if omr_engine.loaded and omr_engine.cache is not None:
+        caches["omr"] = omr_engine.cache.stats()
+    downloader = sys.modules.get("youtube_downloader")
+    download_stats = downloader.download_manager_stats() if downloader else None
+    if download_stats:
+        caches["youtube_audio"] = download_stats["audio"]
+        caches["youtube_transcription"] = download_stats["transcriptions"]
+    families = cache_families(caches)
+
+    upstreams = breaker_stats()
+    families.append((
+        "upstream_circuit_state", "gauge", "외부 API 서킷 상태 (0=closed, 1=half_open, 2=open)",
+        [({"upstream": name}, CIRCUIT_STATE_VALUES.get(stats["state"], 0)) for name, stats in upstreams.items()],
+    ))
+    families.append((
+        "upstream_short_circuited_total", "counter", "서킷이 열려 건너뛴 외부 API 요청 수",
+        [({"upstream": name}, stats["short_circuited"]) for name, stats in upstreams.items()],
+    ))
+    families.append((
+        "chat_sessions", "gauge", "메모리에 있는 AI 대화 세션 수",
+        [({}, conversation_store.stats()["active_sessions"])],
+    ))
+    families.append((
+        "stored_scores", "gauge", "이 워커 메모리에 보관 중인 처리된 악보 수",
+        [({}, len(score_storage))],
+    ))
+    batch = batch_transcriber.stats()
+    families.append((
+        "batch_files_total", "counter", "일괄 채보 파일 수",
+        [({"result": "completed"}, batch["files_completed"]), ({"result": "failed"}, batch["files_failed"])],
+    ))
+    families.append((
+        "batch_pool_workers", "gauge", "일괄 채보 작업자 프로세스 수 (풀을 시작하지 않았으면 0)",
+        [({}, batch["workers"] if batch["started"] else 0)],
+    ))
+    families.append((
+        "score_store_shared_hits_total", "counter", "다른 워커가 저장한 악보를 공유 저장소에서 불러온 수",
+        [({}, score_storage.shared_hits)],
+    ))
+    families.append((
+        "component_loaded", "gauge", "구성 요소 불러오기 상태 (1=사용 가능)",
+        [({"component": name}, 1 if status["state"] == "ready" else 0)
+         for name, status in component_report().items()],
+    ))
+    return families
+
+REGISTRY.register_collector(collect_runtime_metrics)
+
+# 서버 시작 후 워밍업 (WARMUP_STEPS, WARMUP_REQUIRED) - 준비 상태는 /api/ready
+warmup_state = WarmupState()
+
+def _warmup_steps() -> dict:
+    """워밍업 단계 이름 → 실행 함수"""
+    prewarm_names = parse_component_list(PREWARM_COMPONENTS) or component_names()
+    return {
+        "components": lambda: prewarm(prewarm_names),
+        "basic_pitch": lambda: warm_basic_pitch(audio_processor),
+        "music21": lambda: warm_music21(score_processor),
+        "paths": lambda: warm_paths(omr_engine),
+        "transcription": lambda: warm_transcription(audio_processor),
+        "batch_pool": batch_transcriber.prewarm,
+    }
+
+# 백그라운드 워밍업 작업 (참조 유지용)
+_warmup_future = None
+
+@app.on_event("startup")
+async def start_warmup():
+    """요청을 받기 시작한 뒤 구성 요소 미리 불러오기와 워밍업을 백그라운드에서 실행"""
+    global _warmup_future
+    steps = parse_step_list(WARMUP_STEPS)
+    # PREWARM_COMPONENTS만 지정한 경우 구성 요소 불러오기만 실행
+    if not steps and parse_component_list(PREWARM_COMPONENTS):
+        steps = ["components"]
+    if steps:
+        # WARMUP_REQUIRED를 비우면 실행하는 모든 단계가 필수
+        required = parse_step_list(WARMUP_REQUIRED) if WARMUP_REQUIRED.strip() else None
+        warmup_state.configure(steps, required)
+        print(f"[INFO] 워밍업 시작: {', '.join(steps)}")
+        # 기다리지 않으므로 startup이 바로 끝나고 서버가 요청을 받기 시작함
+        _warmup_future = asyncio.get_event_loop().run_in_executor(
+            None, warmup_state.run, _warmup_steps()
+        )
+
+@app.on_event("shutdown")
+async def close_shared_clients():
+    """서버 종료 시 공유 HTTP 연결 풀 정리"""
+    try:
+        from http_client import close_async_client
+        await close_async_client()
+    except ImportError:
+        pass
+    # 불러오지 않은 구성 요소를 종료 시점에 새로 불러오지 않도록 loaded로 확인
+    if ai_assistant.loaded:
+        await ai_assistant.aclose()
+    batch_transcriber.shutdown()
 
 @app.get("/")
 async def root():
@@ -379,6 +416,7 @@ async def root():
         "status": "running",
         "endpoints": {
             "health": "/api/health",
+            "ready": "/api/ready",
             "keys": "/api/keys/status",
             "audio": "/api/audio/process",
             "audio_musicxml": "/api/audio/upload-to-musicxml",
@@ -393,28 +431,94 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
-    """헬스 체크 엔드포인트"""
+    """헬스 체크 엔드포인트 (구성 요소를 불러오지 않으므로 항상 빠르게 응답)"""
+    components = component_report()
+    # 아직 불러오지 않은 구성 요소는 실패하기 전까지 사용 가능으로 표시
+    modules = {
+        name: status["state"] != "failed"
+        for name, status in components.items()
+        if name not in ("music21", "omr_engine", "pdf_parser")
+    }
+    modules["omr_service"] = HAS_OMR_SERVICE and components["omr_engine"]["state"] != "failed"
     return {
         "status": "healthy",
         "message": "API is running",
-        "modules": {
-            "audio_processor": HAS_AUDIO_PROCESSOR,
-            "score_processor": HAS_SCORE_PROCESSOR,
-            "chord_generator": HAS_CHORD_GENERATOR,
-            "ai_assistant": HAS_AI_ASSISTANT,
-            "perplexity_assistant": HAS_PERPLEXITY_ASSISTANT,
-            "youtube_helper": HAS_YOUTUBE_HELPER,
-            "chord_analyzer": HAS_CHORD_ANALYZER,
-            "omr_service": OMR_AVAILABLE,
+        "modules": modules,
+        # 외부 API별 서킷 상태와 최근 지연 시간
+        "upstreams": breaker_stats(),
+    }
+
+@app.get("/api/ready")
+async def readiness_check():
+    """준비 상태 확인 (로드 밸런서용) - 워밍업이 끝나고 필수 단계가 성공해야 200"""
+    ready = warmup_state.ready
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "ready": ready,
+            "warmup": warmup_state.snapshot(),
+            "components": component_report(),
         }
+    )
+
+@app.get("/api/startup/report")
+async def startup_report():
+    """서버 import 시간과 구성 요소별 불러오기/워밍업 시간 (시작 지연 분석용)"""
+    return {
+        "import_seconds": round(SERVER_IMPORT_SECONDS, 3),
+        "prewarm": parse_component_list(PREWARM_COMPONENTS),
+        "components": component_report(),
+        "warmup": warmup_state.snapshot(),
+        "shared_state": shared_state_report(),
     }
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 형식 지표 (라우트별 요청/지연, 처리 단계별 시간, 캐시 적중률, 진행 중인 작업 수)"""
+    return Response(
+        content=REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+def require_admin(token: Optional[str]):
+    """관리자 토큰 확인 (PROFILE_ADMIN_TOKEN)"""
+    if not is_authorized(token):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 필요합니다.")
+
+@app.get("/api/admin/profiles")
+async def get_profiles(x_admin_token: Optional[str] = Header(None)):
+    """저장된 요청 프로파일 목록 (최신순)"""
+    require_admin(x_admin_token)
+    return {"success": True, "profiles": list_profiles()}
+
+@app.get("/api/admin/profiles/{profile_id}")
+async def get_profile(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+    """프로파일 요약 (구간별 시간과 cProfile 상위 함수)"""
+    require_admin(x_admin_token)
+    profile = load_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다.")
+    return {"success": True, "profile": profile}
+
+@app.get("/api/admin/profiles/{profile_id}/folded")
+async def get_profile_folded(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+    """folded 스택 (flamegraph.pl, speedscope 등에서 flame graph로 열기)"""
+    require_admin(x_admin_token)
+    folded = load_folded(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다.")
+    return Response(
+        content=folded,
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'}
+    )
+
 @app.get("/api/keys/status")
 async def get_api_keys_status():
     """API 키 상태 확인"""
     statuses = []
     
-    if HAS_AI_ASSISTANT and ai_assistant:
+    if await ai_assistant.aget():
         statuses.append({
             "name": "OpenAI",
             "status": "valid" if ai_assistant.api_key else "not_set",
@@ -427,11 +531,11 @@ async def get_api_keys_status():
             "message": "AI Assistant 모듈을 불러올 수 없습니다"
         })
     
-    if HAS_PERPLEXITY_ASSISTANT and perplexity_assistant:
+    if await perplexity_assistant.aget():
         # API 키 유효성 검증
         if perplexity_assistant.api_key:
-            # 실제 API 호출로 검증
-            validation_result = perplexity_assistant.validate_api_key()
+            # 실제 API 호출로 검증 (결과는 일정 시간 캐시)
+            validation_result = await perplexity_assistant.validate_api_key_async()
             if validation_result.get("valid"):
                 statuses.append({
                     "name": "Perplexity",
@@ -458,7 +562,7 @@ async def get_api_keys_status():
             "message": "Perplexity Assistant 모듈을 불러올 수 없습니다"
         })
     
-    if HAS_YOUTUBE_HELPER and youtube_helper:
+    if await youtube_helper.aget():
         statuses.append({
             "name": "YouTube",
             "status": "valid" if youtube_helper.api_key else "not_set",
@@ -491,15 +595,15 @@ async def process_audio(file: UploadFile = File(...)):
         try:
             # MIDI 파일인 경우 직접 악보로 변환
             if file_ext in ['mid', 'midi']:
-                if not HAS_SCORE_PROCESSOR or not score_processor:
+                if not await score_processor.aget():
                     raise HTTPException(status_code=503, detail="Score Processor 모듈을 사용할 수 없습니다.")
                 
                 from music21 import converter
                 score = converter.parse(tmp_path)
                 score = score_processor.transpose_to_c_major(score)
                 
-                score_id = f"score_{len(score_storage)}"
-                score_storage[score_id] = score
+                score_id = score_storage.new_id("score")
+                await score_storage.aput(score_id, score)
                 
                 return {
                     "success": True,
@@ -513,7 +617,7 @@ async def process_audio(file: UploadFile = File(...)):
                 raise HTTPException(status_code=400, detail="지원하지 않는 파일 형식입니다. MP3, WAV, 또는 MIDI 파일을 업로드하세요.")
             
             # 오디오 처리 모듈 확인
-            if not HAS_AUDIO_PROCESSOR or not audio_processor:
+            if not await audio_processor.aget():
                 # 필수 라이브러리 체크
                 missing_libs = check_required_libraries()
                 if missing_libs:
@@ -555,7 +659,7 @@ async def process_audio(file: UploadFile = File(...)):
                     # 최대 120초 타임아웃
                     future = loop.run_in_executor(
                         executor,
-                        audio_processor.process_audio_from_path,
+                        bind_context(audio_processor.process_audio_from_path),
                         tmp_path
                     )
                     score = await asyncio.wait_for(future, timeout=120.0)
@@ -607,8 +711,8 @@ async def process_audio(file: UploadFile = File(...)):
                 raise HTTPException(status_code=500, detail=error_msg)
             
             if score and len(score.flat.notes) > 0:
-                score_id = f"score_{len(score_storage)}"
-                score_storage[score_id] = score
+                score_id = score_storage.new_id("score")
+                await score_storage.aput(score_id, score)
                 
                 return JSONResponse(
                     status_code=200,
@@ -656,6 +760,131 @@ async def process_audio(file: UploadFile = File(...)):
         print(traceback.format_exc())
         raise HTTPException(status_code=500, detail=error_detail)
 
+def ndjson_line(data: dict) -> str:
+    """NDJSON 한 줄 (줄 단위 스트리밍용)"""
+    return json.dumps(data, ensure_ascii=False) + "\n"
+
+@app.post("/api/audio/batch")
+async def process_audio_batch(request: Request, files: List[UploadFile] = File(...)):
+    """
+    학급 과제 녹음 여러 개(또는 이를 담은 ZIP)를 한 번에 악보로 변환
+    
+    작업자 프로세스 풀에서 동시에 채보하고, 끝나는 순서대로 NDJSON(한 줄에 JSON 하나)으로 전달합니다.
+    
+    응답 형식:
+        {"event": "start", "batchId", "files", "skipped", "workers"}
+        {"event": "file", "index", "filename", "success": true, "scoreId", "stats", "seconds"}
+        {"event": "file", "index", "filename", "success": false, "error"}
+        {"event": "done", "completed", "failed", "seconds", "filesPerMinute"}
+    """
+    missing_libs = check_required_libraries()
+    if missing_libs:
+        lib_names = [lib["name"] for lib in missing_libs]
+        return JSONResponse(
+            status_code=503,
+            content={
+                "success": False,
+                "error": "필수 라이브러리 미설치 / Required Libraries Not Installed",
+                "message_ko": f"오디오 처리를 위해 다음 라이브러리가 필요합니다: {', '.join(lib_names)}",
+                "missing_libraries": missing_libs,
+                "install_commands": [lib["install"] for lib in missing_libs],
+            }
+        )
+    
+    # 한도를 넘는 요청은 저장하기 전에 거절 (전체 크기는 요청 길이로 먼저 확인)
+    max_bytes = BATCH_MAX_MB * 1024 * 1024
+    too_large = f"전체 파일 크기가 {BATCH_MAX_MB:.0f}MB를 넘습니다."
+    if len(files) > BATCH_MAX_FILES:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {BATCH_MAX_FILES}개 파일까지 처리할 수 있습니다.")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + 1024 * 1024:
+        raise HTTPException(status_code=413, detail=too_large)
+    
+    # 업로드를 작업 디렉토리에 저장 (작업자 프로세스가 경로로 읽음)
+    workdir = Path(tempfile.mkdtemp(prefix="batch_"))
+    try:
+        uploads = []
+        written = 0
+        for i, upload in enumerate(files):
+            filename = upload.filename or f"file_{i}"
+            path = workdir / f"upload_{i:03d}{Path(filename).suffix.lower()}"
+            with open(path, "wb") as out:
+                while chunk := await upload.read(1024 * 1024):
+                    written += len(chunk)
+                    if written > max_bytes:
+                        raise ValueError(too_large)
+                    out.write(chunk)
+            uploads.append((filename, str(path)))
+        # ZIP 압축 해제는 시간이 걸리므로 실행기에서 처리
+        batch_files, skipped = await asyncio.get_running_loop().run_in_executor(
+            None, collect_uploads, uploads, workdir
+        )
+    except ValueError as e:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    
+    if not batch_files:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise HTTPException(
+            status_code=400,
+            detail="변환할 파일이 없습니다. MP3, WAV, MIDI 파일 또는 이를 담은 ZIP 파일을 업로드하세요."
+        )
+    
+    batch_id = uuid.uuid4().hex[:12]
+    print(f"[INFO] 일괄 채보 시작: {batch_id} ({len(batch_files)}개, 건너뜀 {len(skipped)}개)")
+    
+    async def lines():
+        started = time.perf_counter()
+        completed = failed = 0
+        results = batch_transcriber.transcribe(batch_files)
+        try:
+            yield ndjson_line({
+                "event": "start",
+                "batchId": batch_id,
+                "files": [name for name, _ in batch_files],
+                "skipped": skipped,
+                "workers": batch_transcriber.max_workers,
+            })
+            async for index, name, result in results:
+                line = {"event": "file", "index": index, "filename": name, "seconds": result.get("seconds")}
+                if "error" in result:
+                    failed += 1
+                    line.update(success=False, error=result["error"])
+                else:
+                    score_id = score_storage.new_id("score")
+                    # 작업자가 직렬화한 바이트를 그대로 저장 (역직렬화는 내보내기 등으로 처음 조회할 때)
+                    await score_storage.aput_frozen(score_id, result["score"])
+                    completed += 1
+                    line.update(success=True, scoreId=score_id, stats=result["stats"])
+                yield ndjson_line(line)
+            
+            elapsed = time.perf_counter() - started
+            print(f"[OK] 일괄 채보 완료: {batch_id} (성공 {completed}, 실패 {failed}, {elapsed:.1f}초)")
+            yield ndjson_line({
+                "event": "done",
+                "batchId": batch_id,
+                "completed": completed,
+                "failed": failed,
+                "seconds": round(elapsed, 2),
+                "filesPerMinute": round((completed + failed) / elapsed * 60, 1) if elapsed > 0 else None,
+            })
+        except Exception as e:
+            print(f"[ERROR] 일괄 채보 오류 ({batch_id}): {str(e)}")
+            yield ndjson_line({"event": "error", "batchId": batch_id, "error": f"일괄 채보 오류: {str(e)}"})
+        finally:
+            # 클라이언트 연결이 끊겨도 아직 시작하지 않은 파일은 취소됨
+            await results.aclose()
+            shutil.rmtree(workdir, ignore_errors=True)
+    
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/api/audio/upload-to-musicxml")
 async def upload_audio_to_musicxml(file: UploadFile = File(...)):
     """
@@ -685,9 +914,10 @@ async def upload_audio_to_musicxml(file: UploadFile = File(...)):
         if file_ext in ['mp3', 'mpeg', 'wma', 'flac', 'ogg']:
             try:
                 from pydub import AudioSegment
-                audio = AudioSegment.from_file(audio_path, format=file_ext)
-                wav_path = audio_path.replace(f".{file_ext}", ".wav")
-                audio.export(wav_path, format="wav")
+                with stage_timer("decode", "pydub"):
+                    audio = AudioSegment.from_file(audio_path, format=file_ext)
+                    wav_path = audio_path.replace(f".{file_ext}", ".wav")
+                    audio.export(wav_path, format="wav")
                 temp_files.append(wav_path)
                 print(f"[INFO] WAV 변환 완료: {wav_path}")
             except ImportError:
@@ -705,9 +935,13 @@ async def upload_audio_to_musicxml(file: UploadFile = File(...)):
         midi_path = wav_path.replace(".wav", ".mid")
         try:
             from basic_pitch.inference import predict as basic_pitch_predict
+            # 오디오 처리기가 있으면 미리 불러온 공유 모델 사용
+            if await audio_processor.aget():
+                basic_pitch_predict = audio_processor.get_basic_pitch_predict() or basic_pitch_predict
             # basic-pitch로 MIDI 생성
             # predict 함수는 (model_output, midi_data, note_events) 튜플을 반환
-            model_output, midi_data, note_events = basic_pitch_predict(wav_path)
+            with stage_timer("transcription", "basic_pitch"):
+                model_output, midi_data, note_events = basic_pitch_predict(wav_path)
             
             # MIDI 데이터를 파일로 저장
             if midi_data is not None:
@@ -741,7 +975,7 @@ async def upload_audio_to_musicxml(file: UploadFile = File(...)):
             )
         
         # 5. MIDI -> MusicXML 변환 (music21)
-        if not HAS_MUSIC21:
+        if not music21_module:
             raise HTTPException(
                 status_code=503,
                 detail="music21이 설치되지 않았습니다. pip install music21을 실행해주세요."
@@ -750,8 +984,9 @@ async def upload_audio_to_musicxml(file: UploadFile = File(...)):
         musicxml_path = midi_path.replace(".mid", ".musicxml")
         try:
             from music21 import converter
-            score = converter.parse(midi_path)
-            score.write("musicxml", fp=musicxml_path)
+            with stage_timer("export", "musicxml"):
+                score = converter.parse(midi_path)
+                score.write("musicxml", fp=musicxml_path)
             temp_files.append(musicxml_path)
             print(f"[INFO] MusicXML 변환 완료: {musicxml_path}")
         except Exception as e:
@@ -813,7 +1048,7 @@ async def convert_image_to_score_endpoint(file: UploadFile = File(...)):
     Returns:
         MusicXML 문자열과 상태 정보
     """
-    if not OMR_AVAILABLE or not omr_engine:
+    if not await omr_engine.aget():
         raise HTTPException(
             status_code=501,
             detail="이미지에서 악보를 인식하는 OMR 기능이 아직 서버에 설치되지 않았습니다."
@@ -837,8 +1072,8 @@ async def convert_image_to_score_endpoint(file: UploadFile = File(...)):
             score = converter.parse(musicxml_text)
             
             # Score ID 생성 및 저장
-            score_id = f"score_{len(score_storage)}"
-            score_storage[score_id] = score
+            score_id = score_storage.new_id("score")
+            await score_storage.aput(score_id, score)
             
             return {
                 "status": "ok",
@@ -906,7 +1141,7 @@ async def process_score(
         
         try:
             # Score Processor 모듈 확인
-            if not HAS_SCORE_PROCESSOR or not score_processor:
+            if not await score_processor.aget():
                 raise HTTPException(status_code=503, detail="Score Processor 모듈을 사용할 수 없습니다.")
             
             # 악보 로드
@@ -926,14 +1161,14 @@ async def process_score(
                 score = score_processor.add_solfege(score)
             
             if addChords:
-                if not HAS_CHORD_GENERATOR or not chord_generator:
+                if not await chord_generator.aget():
                     print("[WARN] Chord Generator를 사용할 수 없어 화음 추가를 건너뜁니다.")
                 else:
                     score = chord_generator.add_accompaniment(score)
             
             # 저장
-            score_id = f"processed_{len(score_storage)}"
-            score_storage[score_id] = score
+            score_id = score_storage.new_id("processed")
+            await score_storage.aput(score_id, score)
             
             return {
                 "success": True,
@@ -966,19 +1201,20 @@ async def process_score(
 @app.get("/api/score/{score_id}/export/midi")
 async def export_midi(score_id: str):
     """MIDI 파일을 MP3로 변환하여 내보내기"""
-    if score_id not in score_storage:
+    score = await score_storage.aget(score_id)
+    if score is None:
         raise HTTPException(status_code=404, detail="악보를 찾을 수 없습니다.")
     
-    if not HAS_SCORE_PROCESSOR or not score_processor:
+    if not await score_processor.aget():
         raise HTTPException(status_code=503, detail="Score Processor 모듈을 사용할 수 없습니다.")
     
     try:
-        score = score_storage[score_id]
         midi_bytes = score_processor.export_midi(score)
         
         if midi_bytes:
             # MIDI를 MP3로 변환
-            mp3_bytes = await convert_midi_to_mp3(midi_bytes)
+            with stage_timer("export", "mp3"):
+                mp3_bytes = await convert_midi_to_mp3(midi_bytes)
             
             if mp3_bytes:
                 with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp_file:
@@ -1010,24 +1246,28 @@ async def convert_pdf_or_image_to_score(file_path: str, file_ext: str):
     """PDF 또는 이미지 파일을 악보로 변환"""
     try:
         from music21 import converter
-        import shutil
         
         # PDF 파일인 경우
         if file_ext == 'pdf':
-            if HAS_PDF_PARSER and PDFScoreParser:
-                pdf_parser = PDFScoreParser()
+            if await pdf_parser_class.aget():
+                pdf_parser = pdf_parser_class.get()()
+                loop = asyncio.get_event_loop()
                 
                 # 방법 1: Audiveris를 사용한 OMR (가능한 경우)
-                xml_path = pdf_parser.parse_pdf_with_audiveris(file_path)
-                if xml_path and os.path.exists(xml_path):
-                    score = converter.parse(xml_path)
+                # 작업별 임시 폴더에서 처리하고 결과는 문자열로 받으므로 동시 요청끼리 섞이지 않음
+                musicxml_text = await loop.run_in_executor(
+                    None, pdf_parser.parse_pdf_to_musicxml, file_path
+                )
+                if musicxml_text:
+                    score = converter.parse(musicxml_text)
                     return score
                 
-                # 방법 2: PDF를 이미지로 변환 후 처리
-                image_paths = pdf_parser.convert_pdf_to_images(file_path)
-                if image_paths:
-                    # 첫 번째 페이지 이미지로 처리
-                    return await convert_image_to_score(image_paths[0])
+                # 방법 2: PDF 첫 페이지를 메모리에서 이미지로 변환 후 처리
+                page_images = await loop.run_in_executor(
+                    None, lambda: pdf_parser.render_pdf_pages(file_path, first_page=1, last_page=1)
+                )
+                if page_images:
+                    return await convert_image_bytes_to_score(page_images[0], ".png")
             else:
                 print("PDF 파서가 사용할 수 없습니다.")
                 return None
@@ -1042,47 +1282,43 @@ async def convert_pdf_or_image_to_score(file_path: str, file_ext: str):
         print(f"PDF/이미지 변환 오류: {str(e)}")
         return None
 
+async def convert_image_bytes_to_score(image_bytes: bytes, suffix: str = ".png"):
+    """이미지 바이너리를 OMR Service(결과 캐시 공유)로 악보로 변환"""
+    if not await omr_engine.aget():
+        return None
+    
+    try:
+        from music21 import converter
+        
+        if suffix not in ['.png', '.jpg', '.jpeg', '.gif', '.bmp']:
+            suffix = '.png'
+        
+        # OMR로 MusicXML 변환 (캐시 미스면 수십 초 걸리므로 별도 스레드에서 실행)
+        loop = asyncio.get_event_loop()
+        musicxml_text = await loop.run_in_executor(
+            None, lambda: omr_engine.image_to_musicxml(image_bytes, suffix=suffix)
+        )
+        
+        # MusicXML 문자열을 music21 Score로 파싱
+        return converter.parse(musicxml_text)
+        
+    except OmrError as e:
+        print(f"[WARN] OMR 변환 실패: {str(e)}")
+    except Exception as e:
+        print(f"[WARN] OMR 처리 중 오류: {str(e)}")
+    return None
+
 async def convert_image_to_score(image_path: str):
     """이미지 파일을 악보로 변환 (OMR 사용)"""
     try:
         from music21 import converter
         
-        # 방법 1: OMR Service를 사용한 Audiveris OMR
-        if HAS_OMR_SERVICE and AudiverisOmr:
-            audiveris_path = get_audiveris_path()
-            if audiveris_path:
-                try:
-                    omr = AudiverisOmr(audiveris_path)
-                    
-                    # 이미지 파일 읽기
-                    image_bytes = Path(image_path).read_bytes()
-                    
-                    # 이미지 확장자 확인
-                    suffix = Path(image_path).suffix.lower()
-                    if suffix not in ['.png', '.jpg', '.jpeg', '.gif', '.bmp']:
-                        suffix = '.png'
-                    
-                    # OMR로 MusicXML 변환
-                    musicxml_text = omr.image_to_musicxml(image_bytes, suffix=suffix)
-                    
-                    # MusicXML 문자열을 임시 파일로 저장
-                    with tempfile.NamedTemporaryFile(mode='w', suffix='.xml', delete=False, encoding='utf-8') as tmp_xml:
-                        tmp_xml.write(musicxml_text)
-                        tmp_xml_path = tmp_xml.name
-                    
-                    try:
-                        # MusicXML을 music21 Score로 파싱
-                        score = converter.parse(tmp_xml_path)
-                        return score
-                    finally:
-                        # 임시 XML 파일 정리
-                        if os.path.exists(tmp_xml_path):
-                            os.unlink(tmp_xml_path)
-                            
-                except OmrError as e:
-                    print(f"[WARN] OMR 변환 실패: {str(e)}")
-                except Exception as e:
-                    print(f"[WARN] OMR 처리 중 오류: {str(e)}")
+        # 방법 1: OMR Service를 사용한 Audiveris OMR (결과 캐시 공유)
+        score = await convert_image_bytes_to_score(
+            Path(image_path).read_bytes(), Path(image_path).suffix.lower()
+        )
+        if score is not None:
+            return score
         
         # 방법 2: 기존 방식 (fallback)
         import subprocess
@@ -1262,19 +1498,20 @@ async def convert_midi_to_mp3(midi_bytes: bytes) -> Optional[bytes]:
 @app.get("/api/score/{score_id}/export/mp3")
 async def export_mp3(score_id: str):
     """MP3 파일로 내보내기 (MIDI를 MP3로 변환)"""
-    if score_id not in score_storage:
+    score = await score_storage.aget(score_id)
+    if score is None:
         raise HTTPException(status_code=404, detail="악보를 찾을 수 없습니다.")
     
-    if not HAS_SCORE_PROCESSOR or not score_processor:
+    if not await score_processor.aget():
         raise HTTPException(status_code=503, detail="Score Processor 모듈을 사용할 수 없습니다.")
     
     try:
-        score = score_storage[score_id]
         midi_bytes = score_processor.export_midi(score)
         
         if midi_bytes:
             # MIDI를 MP3로 변환
-            mp3_bytes = await convert_midi_to_mp3(midi_bytes)
+            with stage_timer("export", "mp3"):
+                mp3_bytes = await convert_midi_to_mp3(midi_bytes)
             
             if mp3_bytes:
                 with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp_file:
@@ -1301,14 +1538,14 @@ async def export_mp3(score_id: str):
 @app.get("/api/score/{score_id}/export/musicxml")
 async def export_musicxml(score_id: str):
     """MusicXML 파일로 내보내기"""
-    if score_id not in score_storage:
+    score = await score_storage.aget(score_id)
+    if score is None:
         raise HTTPException(status_code=404, detail="악보를 찾을 수 없습니다.")
     
-    if not HAS_SCORE_PROCESSOR or not score_processor:
+    if not await score_processor.aget():
         raise HTTPException(status_code=503, detail="Score Processor 모듈을 사용할 수 없습니다.")
     
     try:
-        score = score_storage[score_id]
         xml_bytes = score_processor.export_musicxml(score)
         
         if xml_bytes:
@@ -1328,18 +1565,99 @@ async def export_musicxml(score_id: str):
 
 # ==================== AI Assistant ====================
 
+def resolve_session_id(body_session_id: Optional[str], header_session_id: Optional[str]) -> str:
+    """요청 본문(sessionId) 또는 X-Session-Id 헤더의 세션 ID, 없으면 새로 발급"""
+    session_id = body_session_id or header_session_id
+    if session_id and 0 < len(session_id) <= 128:
+        return session_id
+    return new_session_id()
+
+async def build_chat_messages(question: str, context: Optional[str], session_id: str) -> list:
+    """AI 채팅 요청 메시지 구성 (토큰 예산 안의 최근 대화 기록 포함)"""
+    messages = [
+        {"role": "system", "content": "당신은 초등학교 음악 교육 전문가입니다. 학생과 교사를 도와주세요. 친근하고 이해하기 쉬운 언어로 답변해주세요."}
+    ]
+    
+    if context:
+        messages.append({"role": "system", "content": f"현재 상황: {context}"})
+    
+    messages.extend(await conversation_store.ahistory_for_prompt(session_id, CHAT_HISTORY_TOKEN_BUDGET))
+    
+    messages.append({"role": "user", "content": question})
+    return messages
+
+async def remember_chat_turn(session_id: str, question: str, ai_response: str):
+    """세션 대화 기록 업데이트"""
+    await conversation_store.aadd_turn(session_id, question, ai_response)
+
+def build_theory_messages(topic: str, age) -> list:
+    """음악 이론 설명 요청 메시지 구성"""
+    prompt = f"""{age}살 초등학생에게 '{topic}'에 대해 쉽게 설명해주세요.
+
+요구사항:
+- 쉬운 단어 사용
+- 실생활 예시 포함
+- 3-4문장으로 간단하게
+- 재미있고 이해하기 쉽게"""
+    
+    return [
+        {"role": "system", "content": "당신은 어린이에게 음악을 가르치는 선생님입니다."},
+        {"role": "user", "content": prompt}
+    ]
+
+def build_lesson_plan_messages(song_title: str, grade: str, duration) -> list:
+    """수업 계획 요청 메시지 구성"""
+    prompt = f"""초등학교 {grade} 학생들을 대상으로 '{song_title}'를 가르치는 {duration}분 수업 계획을 작성해주세요.
+
+다음 형식으로 작성:
+도입 (5분): [활동 설명]
+전개 (25분): [단계별 활동]
+정리 (10분): [마무리 활동]
+
+각 부분은 2-3문장으로 간단하게 작성해주세요."""
+    
+    return [
+        {"role": "system", "content": "당신은 경험 많은 초등학교 음악 교사입니다."},
+        {"role": "user", "content": prompt}
+    ]
+
+# 엔드포인트별 모델 설정 (일반/스트리밍 공통, endpoint마다 서킷/적응형 타임아웃을 따로 관리)
+AI_CHAT_OPTIONS = {"model": "gpt-4o-mini", "max_tokens": 400, "temperature": 0.7, "endpoint": "chat"}
+AI_THEORY_OPTIONS = {"model": "gpt-4", "max_tokens": 300, "temperature": 0.8, "endpoint": "theory"}
+AI_LESSON_PLAN_OPTIONS = {"model": "gpt-4o-mini", "max_tokens": 800, "temperature": 0.7, "endpoint": "lesson_plan"}
+
+# 응답 캐시 범위: 범위가 같을 때만 주제/곡 제목의 유사도를 비교
+def theory_cache_scope(age) -> str:
+    return f"theory|age={age}|model={AI_THEORY_OPTIONS['model']}"
+
+def lesson_plan_cache_scope(grade, duration) -> str:
+    return f"lesson-plan|grade={grade}|duration={duration}|model={AI_LESSON_PLAN_OPTIONS['model']}"
+
+async def lookup_ai_cache(scope: str, text: str, no_cache: bool) -> Optional[str]:
+    """AI 응답 캐시 조회 (noCache 요청이면 건너뜀)"""
+    if no_cache:
+        ai_assistant.response_cache.record_bypass()
+        return None
+    return await ai_assistant.response_cache.alookup(scope, text)
+
+async def store_ai_cache(scope: str, text: str, value: str):
+    """AI 응답 캐시 저장 (빈 응답은 저장하지 않음)"""
+    if value:
+        await ai_assistant.response_cache.astore(scope, text, value)
+
 @app.post("/api/ai/chat")
-async def ai_chat(request: dict):
-    """AI 채팅 - 즉시 응답 제공"""
+async def ai_chat(request: dict, x_session_id: Optional[str] = Header(None)):
+    """AI 채팅 - 즉시 응답 제공 (sessionId별로 대화 기록 유지)"""
     question = request.get("question")
     context = request.get("context")
+    session_id = resolve_session_id(request.get("sessionId"), x_session_id)
     
     if not question:
         raise HTTPException(status_code=400, detail="질문을 입력해주세요.")
     
     try:
         # AI Assistant 모듈 확인
-        if not HAS_AI_ASSISTANT or not ai_assistant:
+        if not await ai_assistant.aget():
             return JSONResponse(
                 status_code=503,
                 content={
@@ -1357,50 +1675,19 @@ async def ai_chat(request: dict):
                 }
             )
         
-        from openai import OpenAI
-        client = OpenAI(api_key=ai_assistant.api_key)
+        messages = await build_chat_messages(question, context, session_id)
         
-        # 시스템 메시지 구성
-        messages = [
-            {"role": "system", "content": "당신은 초등학교 음악 교육 전문가입니다. 학생과 교사를 도와주세요. 친근하고 이해하기 쉬운 언어로 답변해주세요."}
-        ]
-        
-        if context:
-            messages.append({"role": "system", "content": f"현재 상황: {context}"})
-        
-        # 대화 기록 추가 (최근 5개만)
-        if hasattr(ai_assistant, 'conversation_history') and ai_assistant.conversation_history:
-            messages.extend(ai_assistant.conversation_history[-5:])
-        
-        messages.append({"role": "user", "content": question})
-        
-        # 빠른 응답을 위해 gpt-4o-mini 사용 및 최적화된 설정
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # 더 빠른 응답을 위해 mini 모델 사용
-            messages=messages,
-            max_tokens=400,  # 응답 길이 제한으로 속도 개선
-            temperature=0.7,
-            stream=False  # 스트리밍 비활성화로 안정성 확보
-        )
+        # 빠른 응답을 위해 gpt-4o-mini 사용 및 최적화된 설정 (공유 AsyncOpenAI 클라이언트)
+        ai_response = await ai_assistant.acomplete(messages, **AI_CHAT_OPTIONS)
         
-        ai_response = response.choices[0].message.content.strip()
-        
-        # 대화 기록 업데이트
-        if not hasattr(ai_assistant, 'conversation_history'):
-            ai_assistant.conversation_history = []
-        
-        ai_assistant.conversation_history.append({"role": "user", "content": question})
-        ai_assistant.conversation_history.append({"role": "assistant", "content": ai_response})
-        
-        # 대화 기록이 너무 길어지면 최근 10개만 유지
-        if len(ai_assistant.conversation_history) > 10:
-            ai_assistant.conversation_history = ai_assistant.conversation_history[-10:]
+        await remember_chat_turn(session_id, question, ai_response)
         
         return JSONResponse(
             status_code=200,
             content={
                 "success": True,
-                "response": ai_response
+                "response": ai_response,
+                "sessionId": session_id
             }
         )
     except Exception as e:
@@ -1418,22 +1705,20 @@ async def ai_chat(request: dict):
         )
 
 @app.post("/api/ai/chat/clear")
-async def clear_chat():
-    """대화 기록 초기화"""
+async def clear_chat(request: Optional[dict] = Body(None), x_session_id: Optional[str] = Header(None)):
+    """대화 기록 초기화 (해당 세션만)"""
     try:
-        if not HAS_AI_ASSISTANT or not ai_assistant:
+        session_id = (request or {}).get("sessionId") or x_session_id
+        if not session_id:
             return JSONResponse(
-                status_code=503,
+                status_code=400,
                 content={
                     "success": False,
-                    "error": "AI Assistant 모듈을 사용할 수 없습니다."
+                    "error": "초기화할 대화 세션(sessionId)을 지정해주세요."
                 }
             )
         
-        if hasattr(ai_assistant, 'clear_history'):
-            ai_assistant.clear_history()
-        elif hasattr(ai_assistant, 'conversation_history'):
-            ai_assistant.conversation_history = []
+        await conversation_store.aclear(session_id)
         
         return JSONResponse(
             status_code=200,
@@ -1456,12 +1741,13 @@ async def explain_theory(request: dict):
     """음악 이론 설명"""
     topic = request.get("topic")
     age = request.get("age", 10)
+    no_cache = bool(request.get("noCache", False))
     
     if not topic:
         raise HTTPException(status_code=400, detail="주제를 입력해주세요.")
     
     try:
-        if not HAS_AI_ASSISTANT or not ai_assistant:
+        if not await ai_assistant.aget():
             return {
                 "success": False,
                 "error": "AI Assistant 모듈을 사용할 수 없습니다."
@@ -1473,32 +1759,24 @@ async def explain_theory(request: dict):
                 "error": "OpenAI API 키가 설정되지 않았습니다."
             }
         
-        from openai import OpenAI
-        client = OpenAI(api_key=ai_assistant.api_key)
+        cache_scope = theory_cache_scope(age)
+        cached = await lookup_ai_cache(cache_scope, topic, no_cache)
+        if cached is not None:
+            return {
+                "success": True,
+                "explanation": cached,
+                "cached": True
+            }
         
-        prompt = f"""{age}살 초등학생에게 '{topic}'에 대해 쉽게 설명해주세요.
-
-요구사항:
-- 쉬운 단어 사용
-- 실생활 예시 포함
-- 3-4문장으로 간단하게
-- 재미있고 이해하기 쉽게"""
-
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "당신은 어린이에게 음악을 가르치는 선생님입니다."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=300,
-            temperature=0.8
+        explanation = await ai_assistant.acomplete(
+            build_theory_messages(topic, age), **AI_THEORY_OPTIONS
         )
-        
-        explanation = response.choices[0].message.content.strip()
+        await store_ai_cache(cache_scope, topic, explanation)
         
         return {
             "success": True,
-            "explanation": explanation
+            "explanation": explanation,
+            "cached": False
         }
     except Exception as e:
         return {
@@ -1512,12 +1790,13 @@ async def generate_lesson_plan(request: dict):
     song_title = request.get("songTitle")
     grade = request.get("grade", "3-4학년")
     duration = request.get("duration", 40)
+    no_cache = bool(request.get("noCache", False))
     
     if not song_title:
         raise HTTPException(status_code=400, detail="곡 제목을 입력해주세요.")
     
     try:
-        if not HAS_AI_ASSISTANT or not ai_assistant:
+        if not await ai_assistant.aget():
             return {
                 "success": False,
                 "error": "AI Assistant 모듈을 사용할 수 없습니다."
@@ -1529,36 +1808,23 @@ async def generate_lesson_plan(request: dict):
                 "error": "OpenAI API 키가 설정되지 않았습니다."
             }
         
-        from openai import OpenAI
-        client = OpenAI(api_key=ai_assistant.api_key)
+        cache_scope = lesson_plan_cache_scope(grade, duration)
+        lesson_plan = await lookup_ai_cache(cache_scope, song_title, no_cache)
+        cached = lesson_plan is not None
         
-        prompt = f"""초등학교 {grade} 학생들을 대상으로 '{song_title}'를 가르치는 {duration}분 수업 계획을 작성해주세요.
-
-다음 형식으로 작성:
-도입 (5분): [활동 설명]
-전개 (25분): [단계별 활동]
-정리 (10분): [마무리 활동]
-
-각 부분은 2-3문장으로 간단하게 작성해주세요."""
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "당신은 경험 많은 초등학교 음악 교사입니다."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=800,
-            temperature=0.7
-        )
-        
-        lesson_plan = response.choices[0].message.content.strip()
+        if not cached:
+            lesson_plan = await ai_assistant.acomplete(
+                build_lesson_plan_messages(song_title, grade, duration), **AI_LESSON_PLAN_OPTIONS
+            )
+            await store_ai_cache(cache_scope, song_title, lesson_plan)
         
         return {
             "success": True,
             "plan": lesson_plan,
             "songTitle": song_title,
             "grade": grade,
-            "duration": duration
+            "duration": duration,
+            "cached": cached
         }
     except Exception as e:
         import traceback
@@ -1569,6 +1835,185 @@ async def generate_lesson_plan(request: dict):
             "error": f"수업 계획 생성 오류: {str(e)}"
         }
 
+# ---- 스트리밍 (Server-Sent Events) ----
+
+def sse_event(data: dict, event: Optional[str] = None) -> str:
+    """SSE 이벤트 문자열 생성"""
+    payload = json.dumps(data, ensure_ascii=False)
+    if event:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f"data: {payload}\n\n"
+
+async def ai_unavailable_response() -> Optional[JSONResponse]:
+    """AI Assistant를 사용할 수 없으면 오류 응답, 사용할 수 있으면 None"""
+    if not await ai_assistant.aget():
+        return JSONResponse(
+            status_code=503,
+            content={"success": False, "error": "AI Assistant 모듈을 사용할 수 없습니다."}
+        )
+    if not ai_assistant.api_key:
+        return JSONResponse(
+            status_code=503,
+            content={"success": False, "error": "OpenAI API 키가 설정되지 않았습니다."}
+        )
+    return None
+
+def ai_stream_response(request: Request, messages: list, options: dict,
+                       on_complete=None, meta: Optional[dict] = None) -> StreamingResponse:
+    """
+    AI 응답을 토큰 단위로 전달하는 SSE 응답
+    
+    이벤트 형식:
+        data: {"token": "..."}              - 토큰 조각
+        event: done / data: {"text": ...}   - 완료 (전체 텍스트 + meta)
+        event: error / data: {"error": ...} - 오류
+    
+    클라이언트 연결이 끊기면 업스트림 스트림을 닫아 남은 토큰 생성을 중단합니다.
+    on_complete는 전체 텍스트를 받는 코루틴 함수입니다 (대화 기록/캐시 저장).
+    """
+    async def events():
+        parts = []
+        tokens = ai_assistant.astream(messages, **options)
+        try:
+            async for token in tokens:
+                if await request.is_disconnected():
+                    print("[INFO] 클라이언트 연결 종료 - AI 스트리밍 중단")
+                    return
+                parts.append(token)
+                yield sse_event({"token": token})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[ERROR] AI 스트리밍 오류: {str(e)}")
+            yield sse_event({"error": f"AI 응답 오류: {str(e)}"}, event="error")
+            return
+        finally:
+            await tokens.aclose()
+        
+        text = "".join(parts).strip()
+        if on_complete:
+            await on_complete(text)
+        yield sse_event({"text": text, **(meta or {})}, event="done")
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def cached_stream_response(text: str, meta: Optional[dict] = None) -> StreamingResponse:
+    """캐시된 AI 응답을 스트리밍 형식 그대로 한 번에 전달"""
+    async def events():
+        yield sse_event({"token": text})
+        yield sse_event({"text": text, "cached": True, **(meta or {})}, event="done")
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/ai/chat/stream")
+async def ai_chat_stream(request: Request):
+    """AI 채팅 (스트리밍) - 토큰이 생성되는 대로 전달"""
+    body = await request.json()
+    question = body.get("question")
+    context = body.get("context")
+    session_id = resolve_session_id(body.get("sessionId"), request.headers.get("x-session-id"))
+    
+    if not question:
+        raise HTTPException(status_code=400, detail="질문을 입력해주세요.")
+    
+    error_response = await ai_unavailable_response()
+    if error_response:
+        return error_response
+    
+    return ai_stream_response(
+        request,
+        await build_chat_messages(question, context, session_id),
+        AI_CHAT_OPTIONS,
+        on_complete=lambda text: remember_chat_turn(session_id, question, text),
+        meta={"sessionId": session_id}
+    )
+
+@app.post("/api/ai/explain-theory/stream")
+async def explain_theory_stream(request: Request):
+    """음악 이론 설명 (스트리밍)"""
+    body = await request.json()
+    topic = body.get("topic")
+    age = body.get("age", 10)
+    
+    if not topic:
+        raise HTTPException(status_code=400, detail="주제를 입력해주세요.")
+    
+    error_response = await ai_unavailable_response()
+    if error_response:
+        return error_response
+    
+    cache_scope = theory_cache_scope(age)
+    cached = await lookup_ai_cache(cache_scope, topic, bool(body.get("noCache", False)))
+    if cached is not None:
+        return cached_stream_response(cached)
+    
+    return ai_stream_response(
+        request,
+        build_theory_messages(topic, age),
+        AI_THEORY_OPTIONS,
+        on_complete=lambda text: store_ai_cache(cache_scope, topic, text)
+    )
+
+@app.post("/api/ai/lesson-plan/stream")
+async def generate_lesson_plan_stream(request: Request):
+    """수업 계획 생성 (스트리밍)"""
+    body = await request.json()
+    song_title = body.get("songTitle")
+    grade = body.get("grade", "3-4학년")
+    duration = body.get("duration", 40)
+    
+    if not song_title:
+        raise HTTPException(status_code=400, detail="곡 제목을 입력해주세요.")
+    
+    error_response = await ai_unavailable_response()
+    if error_response:
+        return error_response
+    
+    meta = {"songTitle": song_title, "grade": grade, "duration": duration}
+    cache_scope = lesson_plan_cache_scope(grade, duration)
+    cached = await lookup_ai_cache(cache_scope, song_title, bool(body.get("noCache", False)))
+    if cached is not None:
+        return cached_stream_response(cached, meta)
+    
+    return ai_stream_response(
+        request,
+        build_lesson_plan_messages(song_title, grade, duration),
+        AI_LESSON_PLAN_OPTIONS,
+        on_complete=lambda text: store_ai_cache(cache_scope, song_title, text),
+        meta=meta
+    )
+
+@app.get("/api/ai/cache")
+async def get_ai_cache_stats():
+    """AI 응답 캐시 상태 (적중률 등)"""
+    if not await ai_assistant.aget():
+        raise HTTPException(status_code=503, detail="AI Assistant 모듈을 사용할 수 없습니다.")
+    
+    return {
+        "success": True,
+        "cache": ai_assistant.response_cache.stats()
+    }
+
+@app.post("/api/ai/cache/clear")
+async def clear_ai_cache():
+    """AI 응답 캐시 초기화"""
+    if not await ai_assistant.aget():
+        raise HTTPException(status_code=503, detail="AI Assistant 모듈을 사용할 수 없습니다.")
+    
+    ai_assistant.response_cache.clear()
+    return {
+        "success": True,
+        "message": "AI 응답 캐시가 초기화되었습니다."
+    }
+
 @app.post("/api/ai/lesson-plan/export-docx")
 async def export_lesson_plan_docx(request: dict, background_tasks: BackgroundTasks):
     """수업 계획을 DOCX 파일로 내보내기"""
@@ -1695,6 +2140,7 @@ async def perplexity_search(request: Request):
         body = await request.json()
         query = body.get("query")
         search_type = body.get("searchType", "음악 이론 조사")
+        use_cache = not body.get("noCache", False)
     except Exception as e:
         return JSONResponse(
             status_code=400,
@@ -1715,7 +2161,7 @@ async def perplexity_search(request: Request):
     
     try:
         # Perplexity Assistant 모듈 확인
-        if not HAS_PERPLEXITY_ASSISTANT or not perplexity_assistant:
+        if not await perplexity_assistant.aget():
             return JSONResponse(
                 status_code=503,
                 content={
@@ -1736,27 +2182,21 @@ async def perplexity_search(request: Request):
                 }
             )
         
-        # 검색 유형에 따라 다른 메서드 호출
+        # 검색 유형에 따라 다른 메서드 호출 (결과 캐시, 동시 동일 검색은 한 번만 호출)
         try:
             if search_type == "음악 이론 조사":
-                result = perplexity_assistant.search_music_theory(query)
+                result = await perplexity_assistant.search_music_theory_async(query, use_cache=use_cache)
             elif search_type == "곡 배경 정보":
-                result = perplexity_assistant.research_song_background(query)
+                result = await perplexity_assistant.research_song_background_async(query, use_cache=use_cache)
             elif search_type == "교육 자료 찾기":
-                result = perplexity_assistant.find_teaching_resources(query, "3-4학년")
+                result = await perplexity_assistant.find_teaching_resources_async(query, "3-4학년", use_cache=use_cache)
             elif search_type == "최신 트렌드":
-                if hasattr(perplexity_assistant, 'get_latest_education_trends'):
-                    result = perplexity_assistant.get_latest_education_trends(query)
-                else:
-                    result = perplexity_assistant.search_music_theory(f"{query} 최신 트렌드")
+                result = await perplexity_assistant.get_latest_education_trends_async(query, use_cache=use_cache)
             elif search_type == "교수법 비교":
-                if hasattr(perplexity_assistant, 'compare_teaching_methods'):
-                    # 두 개의 교수법이 필요하므로 기본 검색 사용
-                    result = perplexity_assistant.search_music_theory(f"{query} 교수법 비교")
-                else:
-                    result = perplexity_assistant.search_music_theory(f"{query} 교수법 비교")
+                # 두 개의 교수법이 필요하므로 기본 검색 사용
+                result = await perplexity_assistant.search_music_theory_async(f"{query} 교수법 비교", use_cache=use_cache)
             else:
-                result = perplexity_assistant.search_music_theory(query)
+                result = await perplexity_assistant.search_music_theory_async(query, use_cache=use_cache)
             
             # 결과가 None이거나 빈 문자열인 경우 처리
             if not result:
@@ -1810,17 +2250,20 @@ async def youtube_search(request: Request):
         query = body.get("query")
         max_results = body.get("maxResults", 5)
         min_views = body.get("minViews", 100000)  # 기본값: 10만 뷰
+        no_cache = bool(body.get("noCache", False))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"요청 데이터 파싱 오류: {str(e)}")
     
     if not query:
         raise HTTPException(status_code=400, detail="검색어를 입력해주세요.")
     
-    if not HAS_YOUTUBE_HELPER or not youtube_helper:
+    if not await youtube_helper.aget():
         raise HTTPException(status_code=503, detail="YouTube Helper 모듈을 사용할 수 없습니다.")
     
     try:
-        videos = youtube_helper.search_education_videos(query, max_results, min_views=min_views)
+        videos = await youtube_helper.search_education_videos_async(
+            query, max_results, min_views=min_views, bypass_cache=no_cache
+        )
         
         # 필터링된 결과가 요청한 개수보다 적을 경우 안내
         if len(videos) < max_results:
@@ -1850,11 +2293,11 @@ async def get_youtube_video_info(request: Request):
     if not video_id:
         raise HTTPException(status_code=400, detail="영상 ID를 입력해주세요.")
     
-    if not HAS_YOUTUBE_HELPER or not youtube_helper:
+    if not await youtube_helper.aget():
         raise HTTPException(status_code=503, detail="YouTube Helper 모듈을 사용할 수 없습니다.")
     
     try:
-        video_info = youtube_helper.get_video_info(video_id)
+        video_info = await youtube_helper.get_video_info_async(video_id)
         
         if not video_info:
             raise HTTPException(status_code=404, detail="영상을 찾을 수 없습니다.")
@@ -1871,6 +2314,18 @@ async def get_youtube_video_info(request: Request):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"YouTube 영상 정보 가져오기 오류: {str(e)}")
 
+@app.get("/api/youtube/quota")
+async def get_youtube_quota():
+    """YouTube API 할당량 사용량 및 응답 캐시 상태"""
+    if not await youtube_helper.aget():
+        raise HTTPException(status_code=503, detail="YouTube Helper 모듈을 사용할 수 없습니다.")
+    
+    return {
+        "success": True,
+        "quota": youtube_helper.quota.snapshot(),
+        "cache": youtube_helper.cache.stats()
+    }
+
 # ==================== Chord Analysis ====================
 
 @app.post("/api/chord/analyze")
@@ -1891,7 +2346,7 @@ async def analyze_chord(
             score = None
             
             # 모듈 확인
-            if not HAS_SCORE_PROCESSOR or not score_processor:
+            if not await score_processor.aget():
                 raise HTTPException(status_code=503, detail="Score Processor 모듈을 사용할 수 없습니다.")
             
             # 파일 타입에 따라 처리
@@ -1903,7 +2358,7 @@ async def analyze_chord(
                 
             elif fileType == "audio" or file_ext in ['mp3', 'wav', 'mpeg']:
                 # 오디오 파일을 MIDI로 변환 후 처리
-                if not HAS_AUDIO_PROCESSOR or not audio_processor:
+                if not await audio_processor.aget():
                     raise HTTPException(status_code=503, detail="Audio Processor 모듈을 사용할 수 없습니다.")
                 
                 score = audio_processor.process_audio_from_path(tmp_path)
@@ -1930,7 +2385,7 @@ async def analyze_chord(
             
             if score:
                 # 화음 분석
-                if not HAS_CHORD_ANALYZER or not chord_analyzer:
+                if not await chord_analyzer.aget():
                     raise HTTPException(status_code=503, detail="Chord Analyzer 모듈을 사용할 수 없습니다.")
                 
                 chords_info = chord_analyzer.analyze_midi_chords(score)
@@ -1972,6 +2427,9 @@ async def analyze_chord(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"화음 분석 오류: {str(e)}")
 
+# YouTube 구간 분석에서 한 번에 디코딩할 최대 길이(초) - start만 지정해도 이 길이까지만 디코딩
+YOUTUBE_WINDOW_MAX_SECONDS = 600
+
 @app.post("/api/chord/analyze-youtube")
 async def analyze_chord_youtube(request: dict):
     """YouTube URL에서 화음 분석"""
@@ -1988,129 +2446,113 @@ async def analyze_chord_youtube(request: dict):
         raise HTTPException(status_code=400, detail="유효한 YouTube URL을 입력해주세요.")
     
     video_id = match.group(1)
-    temp_audio_path = None
     
+    # 구간 분석 옵션: start/duration을 지정하면 전체 다운로드 없이 해당 구간만 디코딩
+    # (start만 지정하면 start부터 끝까지, 최대 YOUTUBE_WINDOW_MAX_SECONDS초)
     try:
-        # yt-dlp Python 모듈을 사용하여 오디오 다운로드
-        try:
-            import yt_dlp
-        except ImportError:
-            raise HTTPException(
-                status_code=500, 
-                detail="yt-dlp가 설치되지 않았습니다. 서버에 yt-dlp를 설치해주세요: pip install yt-dlp"
-            )
-        
-        # 임시 오디오 파일 경로
-        temp_audio_path = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3").name
-        base_path = temp_audio_path.replace('.mp3', '')
+        window_start = float(request.get("start") or 0)
+        window_duration = float(request["duration"]) if request.get("duration") is not None else None
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="start/duration은 초 단위 숫자여야 합니다.")
+    
+    if window_start < 0 or (
+        window_duration is not None and not 0 < window_duration <= YOUTUBE_WINDOW_MAX_SECONDS
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail=f"구간은 0초 이상, 길이는 0초 초과 {YOUTUBE_WINDOW_MAX_SECONDS}초 이하로 지정해주세요."
+        )
+    
+    use_window = window_start > 0 or window_duration is not None
+    variant = ""
+    if use_window:
+        if window_duration is None:
+            window_duration = YOUTUBE_WINDOW_MAX_SECONDS
+        variant = f"window:{window_start:g}:{window_duration:g}"
+    
+    # 모듈 확인
+    if not await audio_processor.aget():
+        raise HTTPException(status_code=503, detail="Audio Processor 모듈을 사용할 수 없습니다.")
+    
+    if not await score_processor.aget():
+        raise HTTPException(status_code=503, detail="Score Processor 모듈을 사용할 수 없습니다.")
+    
+    if not await chord_analyzer.aget():
+        raise HTTPException(status_code=503, detail="Chord Analyzer 모듈을 사용할 수 없습니다.")
+    
+    try:
+        from youtube_downloader import get_download_manager
+        manager = get_download_manager()
+        loop = asyncio.get_event_loop()
+        
+        # 같은 영상의 변환 결과가 캐시에 있으면 다운로드/변환 생략
+        score = None
+        cached_xml = manager.get_transcription(video_id, variant)
+        if cached_xml:
+            try:
+                from music21 import converter
+                score = converter.parse(cached_xml.decode("utf-8"), format="musicxml")
+                print(f"[INFO] 캐시된 변환 결과 사용: {video_id}")
+            except Exception as e:
+                print(f"[WARN] 캐시된 변환 결과를 읽을 수 없습니다: {e}")
+                score = None
         
-        # FFmpeg 경로 찾기
-        def get_ffmpeg_path() -> Optional[str]:
-            """FFmpeg 경로 찾기"""
-            import shutil
-            # 1. 환경 변수에서 확인
-            ffmpeg_path = os.getenv("FFMPEG_PATH")
-            if ffmpeg_path:
-                ffmpeg_bin = Path(ffmpeg_path) / "bin"
-                if (ffmpeg_bin / "ffmpeg.exe").exists() or (ffmpeg_bin / "ffmpeg").exists():
-                    return str(ffmpeg_bin)
+        if score is None and use_window:
+            # 필요한 구간만 저용량 스트림에서 PCM으로 디코딩 (MP3 재인코딩 없음)
+            try:
+                samples, sample_rate = await loop.run_in_executor(
+                    None, manager.get_audio_window, video_id, window_start, window_duration
+                )
+            except ImportError:
+                raise HTTPException(
+                    status_code=500, 
+                    detail="yt-dlp가 설치되지 않았습니다. 서버에 yt-dlp를 설치해주세요: pip install yt-dlp"
+                )
+            except Exception as e:
+                raise HTTPException(
+                    status_code=500, 
+                    detail=f"YouTube 오디오 구간 디코딩 실패: {str(e)}"
+                )
             
-            # 2. 일반적인 Windows 경로 확인
-            common_paths = [
-                r"C:\ffmpeg\bin",
-                r"C:\Program Files\ffmpeg\bin",
-                r"C:\Program Files (x86)\ffmpeg\bin",
-            ]
+            score = await loop.run_in_executor(
+                None, bind_context(audio_processor.process_audio_samples), samples, sample_rate
+            )
+            if not score:
+                raise HTTPException(status_code=500, detail="오디오 구간을 MIDI로 변환하는데 실패했습니다.")
             
-            for path_str in common_paths:
-                path = Path(path_str)
-                if (path / "ffmpeg.exe").exists():
-                    return str(path)
+            musicxml_bytes = score_processor.export_musicxml(score)
+            if musicxml_bytes:
+                manager.put_transcription(video_id, musicxml_bytes, variant)
+        
+        if score is None:
+            # 공용 다운로드 캐시에서 오디오 가져오기 (동시 요청은 한 번만 다운로드)
+            # 채보 중에 캐시 파일이 LRU에서 밀려나도 괜찮도록 이 요청 전용 경로(하드 링크)로 받음
+            try:
+                audio_path = await loop.run_in_executor(None, manager.checkout_audio, video_id)
+            except ImportError:
+                raise HTTPException(
+                    status_code=500, 
+                    detail="yt-dlp가 설치되지 않았습니다. 서버에 yt-dlp를 설치해주세요: pip install yt-dlp"
+                )
+            except Exception as e:
+                raise HTTPException(
+                    status_code=500, 
+                    detail=f"YouTube 오디오 다운로드 실패: {str(e)}"
+                )
             
-            # 3. PATH에서 ffmpeg 찾기
-            ffmpeg_exe = shutil.which("ffmpeg")
-            if ffmpeg_exe:
-                ffmpeg_path = Path(ffmpeg_exe).parent
-                return str(ffmpeg_path)
+            # 오디오를 MIDI로 변환
+            try:
+                score = await loop.run_in_executor(
+                    None, bind_context(audio_processor.process_audio_from_path), audio_path
+                )
+            finally:
+                manager.release_audio(audio_path)
+            if not score:
+                raise HTTPException(status_code=500, detail="오디오 파일을 MIDI로 변환하는데 실패했습니다.")
             
-            return None
-        
-        # yt-dlp 옵션 설정
-        ydl_opts = {
-            "format": "bestaudio/best",
-            "outtmpl": base_path + '.%(ext)s',
-            "postprocessors": [{
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "mp3",
-                "preferredquality": "192",
-            }],
-            "quiet": True,
-            "no_warnings": True,
-        }
-        
-        # FFmpeg 경로 설정 (있는 경우)
-        ffmpeg_path = get_ffmpeg_path()
-        if ffmpeg_path:
-            ydl_opts["ffmpeg_location"] = ffmpeg_path
-            print(f"[INFO] FFmpeg 경로 설정: {ffmpeg_path}")
-        else:
-            print("[WARN] FFmpeg 경로를 찾을 수 없습니다. PATH에 ffmpeg가 있는지 확인하세요.")
-        
-        # YouTube 오디오 다운로드
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([youtube_url])
-        except Exception as e:
-            raise HTTPException(
-                status_code=500, 
-                detail=f"YouTube 오디오 다운로드 실패: {str(e)}"
-            )
-        
-        # 실제 다운로드된 파일 경로 찾기 (yt-dlp가 확장자를 추가할 수 있음)
-        possible_paths = [
-            base_path + '.mp3',
-            temp_audio_path,
-            base_path + '.m4a',
-            base_path + '.webm',
-            base_path + '.opus',
-        ]
-        
-        actual_audio_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                actual_audio_path = path
-                break
-        
-        if not actual_audio_path:
-            # 디렉토리에서 파일 찾기
-            base_dir = os.path.dirname(base_path)
-            base_name = os.path.basename(base_path)
-            if os.path.exists(base_dir):
-                for file in os.listdir(base_dir):
-                    if file.startswith(base_name):
-                        actual_audio_path = os.path.join(base_dir, file)
-                        break
-        
-        if not actual_audio_path:
-            raise HTTPException(
-                status_code=500, 
-                detail="다운로드된 오디오 파일을 찾을 수 없습니다. 다운로드가 실패했을 수 있습니다."
-            )
-        
-        # 모듈 확인
-        if not HAS_AUDIO_PROCESSOR or not audio_processor:
-            raise HTTPException(status_code=503, detail="Audio Processor 모듈을 사용할 수 없습니다.")
-        
-        if not HAS_SCORE_PROCESSOR or not score_processor:
-            raise HTTPException(status_code=503, detail="Score Processor 모듈을 사용할 수 없습니다.")
-        
-        if not HAS_CHORD_ANALYZER or not chord_analyzer:
-            raise HTTPException(status_code=503, detail="Chord Analyzer 모듈을 사용할 수 없습니다.")
-        
-        # 오디오를 MIDI로 변환
-        score = audio_processor.process_audio_from_path(actual_audio_path)
-        if not score:
-            raise HTTPException(status_code=500, detail="오디오 파일을 MIDI로 변환하는데 실패했습니다.")
+            musicxml_bytes = score_processor.export_musicxml(score)
+            if musicxml_bytes:
+                manager.put_transcription(video_id, musicxml_bytes)
         
         # 다장조로 변환
         score = score_processor.transpose_to_c_major(score)
@@ -2149,19 +2591,20 @@ async def analyze_chord_youtube(request: dict):
         raise HTTPException(status_code=500, detail="YouTube 오디오 다운로드 시간이 초과되었습니다.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"YouTube 화음 분석 오류: {str(e)}")
-    finally:
-        # 임시 파일 정리
-        if temp_audio_path:
-            for path in [temp_audio_path, temp_audio_path.replace('.mp3', ''), 
-                         temp_audio_path.replace('.mp3', '.m4a'), 
-                         temp_audio_path.replace('.mp3', '.webm')]:
-                if os.path.exists(path):
-                    try:
-                        os.unlink(path)
-                    except:
-                        pass
+
+# 모듈 import에 걸린 시간 (무거운 구성 요소는 포함되지 않음)
+SERVER_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+print(f"[OK] API 서버 준비 완료 ({SERVER_IMPORT_SECONDS:.2f}초)")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8501)
+    workers = int(os.getenv("API_WORKERS", "1"))
+    if workers > 1:
+        # 여러 워커는 import 문자열로만 실행 가능 (SHARED_STATE_DIR로 상태 공유)
+        if not os.getenv("SHARED_STATE_DIR"):
+            os.environ["SHARED_STATE_DIR"] = str(project_root / "data" / "shared")
+        os.environ["WEB_CONCURRENCY"] = str(workers)
+        uvicorn.run("api_server:app", host="0.0.0.0", port=8501, workers=workers, app_dir=str(src_dir))
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8501)
 
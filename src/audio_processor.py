@@ -26,10 +26,22 @@ except ImportError:
     stream = note = tempo = meter = key = None
 
 from typing import Optional
+import functools
 import tempfile
+import threading
 import os
 from pathlib import Path
 
+try:
+    from metrics import stage_timer, timed_stage
+except ImportError:
+    from .metrics import stage_timer, timed_stage
+
+try:
+    from profiling import profiled
+except ImportError:
+    from .profiling import profiled
+
 class AudioProcessor:
     """Process audio files and convert to musical notation"""
     
@@ -43,12 +55,32 @@ class AudioProcessor:
         
         self.sample_rate = 22050
         self.model = None
+        self._predict = None
+        self._model_lock = threading.Lock()
     
     def _load_basic_pitch_model(self):
-        """Load basic-pitch model"""
+        """Load basic-pitch model
+        
+        모델은 처음 한 번만 불러와 재사용합니다 (predict에 경로를 넘기면 호출마다 모델을 다시 읽음).
+        
+        Returns:
+            오디오 경로를 받아 (model_output, midi_data, note_events)를 반환하는 함수, 실패 시 None
+        """
+        if self._predict is not None:
+            return self._predict
         try:
-            from basic_pitch.inference import predict
-            return predict
+            with self._model_lock:
+                if self._predict is None:
+                    from basic_pitch.inference import predict
+                    try:
+                        from basic_pitch import ICASSP_2022_MODEL_PATH
+                        from basic_pitch.inference import Model
+                        self.model = Model(ICASSP_2022_MODEL_PATH)
+                        self._predict = functools.partial(predict, model_or_model_path=self.model)
+                    except ImportError:
+                        # Model 클래스가 없는 이전 버전은 호출마다 모델 로드
+                        self._predict = predict
+            return self._predict
         except ImportError as e:
             error_msg = f"basic-pitch 라이브러리가 설치되지 않았습니다. pip install basic-pitch를 실행해주세요. 오류: {str(e)}"
             if HAS_STREAMLIT and st:
@@ -64,6 +96,10 @@ class AudioProcessor:
                 print(f"[WARN] {error_msg}")
             return None
     
+    def get_basic_pitch_predict(self):
+        """공유 basic-pitch 예측 함수 (모델을 한 번만 불러옴, 사용할 수 없으면 None)"""
+        return self._load_basic_pitch_model()
+    
     def _process_audio_with_librosa(self, audio_path: str) -> Optional[stream.Score]:
         """
         Process audio using librosa (fallback method when basic-pitch is not available)
@@ -88,6 +124,30 @@ class AudioProcessor:
                     print(f"[ERROR] 오디오 파일 재시도 실패: {str(e2)}")
                     return None
             
+            return self._samples_to_score_with_librosa(y, sr)
+            
+        except ImportError as e:
+            print(f"[ERROR] librosa가 설치되지 않았습니다: {str(e)}")
+            print("설치 방법: pip install librosa")
+            return None
+        except Exception as e:
+            print(f"[ERROR] librosa 오디오 처리 오류: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return None
+    
+    @timed_stage("transcription", "librosa")
+    def _samples_to_score_with_librosa(self, y: np.ndarray, sr: int) -> Optional[stream.Score]:
+        """
+        Extract melody from mono samples using librosa's pyin
+        
+        Args:
+            y: Mono audio samples (float32)
+            sr: Sample rate
+        """
+        try:
+            import librosa
+            
             if len(y) == 0:
                 print("[ERROR] 오디오 파일이 비어있습니다.")
                 return None
@@ -213,7 +273,8 @@ class AudioProcessor:
                 return None
             
             # Predict MIDI from audio
-            model_output, midi_data, note_events = predict(tmp_path)
+            with stage_timer("transcription", "basic_pitch"):
+                model_output, midi_data, note_events = predict(tmp_path)
             
             # Clean up temp file
             os.unlink(tmp_path)
@@ -231,6 +292,7 @@ class AudioProcessor:
                 print(f"오디오 처리 오류: {str(e)}")
             return None
     
+    @profiled("process_audio_from_path")
     def process_audio_from_path(self, audio_path: str) -> Optional[stream.Score]:
         """
         Process audio file from file path and convert to music21 score
@@ -247,7 +309,8 @@ class AudioProcessor:
             if predict is not None:
                 try:
                     # Predict MIDI from audio
-                    model_output, midi_data, note_events = predict(audio_path)
+                    with stage_timer("transcription", "basic_pitch"):
+                        model_output, midi_data, note_events = predict(audio_path)
                     
                     # Convert MIDI to music21 score
                     score = self._midi_to_score(midi_data, note_events)
@@ -277,6 +340,53 @@ class AudioProcessor:
             traceback.print_exc()
             return None
     
+    @profiled("process_audio_samples")
+    def process_audio_samples(self, y: np.ndarray, sr: int) -> Optional[stream.Score]:
+        """
+        Convert already-decoded mono samples to music21 score
+        
+        ffmpeg로 필요한 구간만 디코딩한 PCM을 MP3 재인코딩 없이 바로 변환할 때 사용합니다.
+        basic-pitch는 파일 경로를 받으므로 짧은 모노 WAV를 임시로 씁니다.
+        
+        Args:
+            y: Mono audio samples (float32, -1.0 ~ 1.0)
+            sr: Sample rate
+            
+        Returns:
+            music21.stream.Score object or None if failed
+        """
+        if y is None or len(y) == 0:
+            print("[ERROR] 디코딩된 오디오가 비어있습니다.")
+            return None
+        
+        predict = self._load_basic_pitch_model()
+        if predict is not None:
+            tmp_path = None
+            try:
+                with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp_file:
+                    tmp_path = tmp_file.name
+                sf.write(tmp_path, y, sr, subtype='PCM_16')
+                
+                with stage_timer("transcription", "basic_pitch"):
+                    model_output, midi_data, note_events = predict(tmp_path)
+                score = self._midi_to_score(midi_data, note_events)
+                
+                if score and len(score.flat.notes) > 0:
+                    return score
+            except Exception as e:
+                print(f"[WARN] basic-pitch 처리 실패, librosa로 대체 시도: {str(e)}")
+            finally:
+                if tmp_path and os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+        
+        print("[INFO] librosa를 사용하여 오디오 처리 중...")
+        score = self._samples_to_score_with_librosa(y, sr)
+        if score and len(score.flat.notes) > 0:
+            return score
+        
+        print("[ERROR] 오디오에서 음표를 추출할 수 없습니다.")
+        return None
+    
     def _midi_to_score(self, midi_data, note_events) -> stream.Score:
         """
         Convert MIDI data to music21 score
@@ -443,10 +553,11 @@ class AudioProcessor:
         
         Args:
             youtube_url: YouTube video URL
-            output_path: Optional output file path (if None, uses temp file)
+            output_path: Optional output file path (if None, returns the shared cache file)
             
         Returns:
             Path to downloaded MP3 file or None if failed
+            (output_path가 없으면 공용 캐시 파일 경로이므로 삭제하면 안 됩니다)
         """
         try:
             # Import yt-dlp
@@ -489,35 +600,15 @@ class AudioProcessor:
                         print(f"[ERROR] {error_msg}")
                     raise FileNotFoundError("FFmpeg를 찾을 수 없습니다. FFmpeg를 설치해주세요.")
             
-            # 출력 경로 설정
-            if output_path is None:
-                output_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-                output_path = output_file.name
-                output_file.close()
-            
-            base_path = str(Path(output_path).with_suffix(''))
-            
-            # yt-dlp 옵션 설정
-            ydl_opts = {
-                "format": "bestaudio/best",
-                "outtmpl": base_path + '.%(ext)s',
-                "ffmpeg_location": str(ffmpeg_bin_path),
-                "postprocessors": [{
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "mp3",
-                    "preferredquality": "192",
-                }],
-                "quiet": True,
-                "no_warnings": True,
-            }
-            
-            print(f"[INFO] YouTube 오디오 다운로드 시작: {youtube_url}")
-            print(f"[INFO] FFmpeg 경로: {ffmpeg_bin_path}")
+            # 공용 다운로드 캐시 사용 (같은 영상은 한 번만 다운로드)
+            try:
+                from youtube_downloader import get_download_manager
+            except ImportError:
+                from .youtube_downloader import get_download_manager
             
-            # YouTube 오디오 다운로드
+            print(f"[INFO] YouTube 오디오 준비: {youtube_url}")
             try:
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    ydl.download([youtube_url])
+                cached_path = get_download_manager().get_audio(youtube_url)
             except Exception as e:
                 error_msg = (
                     f"YouTube 오디오 다운로드 실패: {str(e)}\n\n"
@@ -533,45 +624,15 @@ class AudioProcessor:
                     print(f"[ERROR] {error_msg}")
                 raise
             
-            # 다운로드된 파일 찾기
-            possible_paths = [
-                base_path + '.mp3',
-                output_path,
-                base_path + '.m4a',
-                base_path + '.webm',
-                base_path + '.opus',
-            ]
-            
-            for path_str in possible_paths:
-                path = Path(path_str)
-                if path.exists():
-                    # MP3가 아니면 변환 필요 (이미 yt-dlp가 처리했을 가능성이 높음)
-                    if path.suffix != '.mp3' and path_str != output_path:
-                        # MP3로 변환 시도
-                        import shutil
-                        if shutil.which('ffmpeg') or ffmpeg_exists:
-                            import subprocess
-                            mp3_path = Path(output_path)
-                            try:
-                                subprocess.run([
-                                    str(ffmpeg_bin_path / "ffmpeg.exe") if (ffmpeg_bin_path / "ffmpeg.exe").exists() else "ffmpeg",
-                                    '-i', str(path),
-                                    '-acodec', 'libmp3lame', '-ab', '192k',
-                                    str(mp3_path), '-y'
-                                ], check=True, capture_output=True, timeout=60)
-                                if mp3_path.exists():
-                                    path.unlink()  # 원본 파일 삭제
-                                    return str(mp3_path)
-                            except Exception as conv_e:
-                                print(f"[WARN] MP3 변환 실패: {conv_e}")
-                    return str(path)
-            
-            error_msg = "다운로드는 완료되었지만 파일을 찾을 수 없습니다."
-            if HAS_STREAMLIT and st:
-                st.error(error_msg)
-            else:
-                print(f"[ERROR] {error_msg}")
-            return None
+            # 출력 경로를 지정한 경우에만 복사 (캐시 파일은 삭제하지 말 것)
+            if output_path is None:
+                return cached_path
+            
+            # 복사하는 중에 캐시에서 밀려나지 않도록 전용 경로(하드 링크)에서 복사
+            import shutil
+            with get_download_manager().audio_file(youtube_url) as private_path:
+                shutil.copyfile(private_path, output_path)
+            return output_path
             
         except ImportError:
             raise  # yt-dlp import 오류는 그대로 전달
@@ -0,0 +1,408 @@
+"""
+Batch Transcription Module
+학급 전체 녹음(과제 하나에 25~30개)을 한 번에 채보하는 작업자 프로세스 풀
+
+작업자 프로세스마다 AudioProcessor와 basic-pitch 모델을 처음 한 번만 불러와 이후 파일에
+재사용하고, 풀은 서버가 살아 있는 동안 유지해 다음 일괄 요청에서는 준비 비용이 들지 않습니다.
+basic-pitch 후처리와 music21 변환은 GIL을 오래 잡으므로 스레드 대신 프로세스로 나눠야
+코어 수만큼 처리량이 늘어납니다. 결과 악보는 freeze_score()로 직렬화해 돌려받습니다.
+"""
+
+import asyncio
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+try:
+    from metrics import STAGE_FAILURES, STAGE_LATENCY
+except ImportError:
+    from .metrics import STAGE_FAILURES, STAGE_LATENCY
+
+
+
+def batch_workers_per_api_worker() -> int:
+    """
+    API 워커 하나가 띄울 작업자 프로세스 수
+
+    BATCH_WORKERS(0이면 CPU 코어 수 - 1)는 서버 전체 예산이고, API 워커가 여러 개면
+    (WEB_CONCURRENCY 또는 API_WORKERS) 워커마다 풀이 생기므로 그 수로 나눕니다 (최소 1).
+    """
+    total = int(os.getenv("BATCH_WORKERS", "0")) or max(1, (os.cpu_count() or 2) - 1)
+    api_workers = int(os.getenv("WEB_CONCURRENCY") or os.getenv("API_WORKERS") or "1")
+    return max(1, total // max(1, api_workers))
+
+
+# API 워커 하나의 작업자 프로세스 수
+BATCH_WORKERS = batch_workers_per_api_worker()
+# 요청 하나에 받을 최대 파일 수와 전체 크기(압축 해제 후, MB)
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "40"))
+BATCH_MAX_MB = float(os.getenv("BATCH_MAX_MB", "500"))
+# 파일 하나의 채보 제한 시간(초) - 대기 시간은 포함하지 않음
+BATCH_FILE_TIMEOUT = float(os.getenv("BATCH_FILE_TIMEOUT", "180"))
+# 다른 파일 때문에 풀이 재시작되어 실패한 파일을 다시 넣는 최대 횟수
+BATCH_RETRIES = 2
+
+AUDIO_EXTENSIONS = ("mp3", "wav", "mpeg")
+MIDI_EXTENSIONS = ("mid", "midi")
+SUPPORTED_EXTENSIONS = AUDIO_EXTENSIONS + MIDI_EXTENSIONS
+
+
+# 작업자 프로세스 쪽
+
+_audio_processor = None
+_score_processor = None
+_timeout_queue = None
+_file_timeout = None
+_preload = True
+
+
+def _init_worker(timeout_queue=None, file_timeout: Optional[float] = None, preload: bool = True):
+    """작업자 프로세스 시작 시 한 번 실행 (AudioProcessor 생성과 basic-pitch 모델 로드)"""
+    global _audio_processor, _timeout_queue, _file_timeout, _preload
+    _timeout_queue = timeout_queue
+    _file_timeout = file_timeout
+    _preload = preload
+    if not preload:
+        return
+    started = time.perf_counter()
+    try:
+        if __package__:
+            from .audio_processor import AudioProcessor
+        else:
+            from audio_processor import AudioProcessor
+        _audio_processor = AudioProcessor()
+        _audio_processor.get_basic_pitch_predict()
+    except Exception as e:
+        # 여기서 예외를 내면 풀 전체가 깨지므로 기록만 하고 파일마다 오류로 돌려줌
+        print(f"[WARN] 일괄 채보 작업자 준비 실패 (PID {os.getpid()}): {e}")
+        _audio_processor = None
+        return
+    print(f"[OK] 일괄 채보 작업자 준비 완료 (PID {os.getpid()}, {time.perf_counter() - started:.2f}초)")
+
+
+def _get_score_processor():
+    global _score_processor
+    if _score_processor is None:
+        if __package__:
+            from .score_processor import ScoreProcessor
+        else:
+            from score_processor import ScoreProcessor
+        _score_processor = ScoreProcessor()
+    return _score_processor
+
+
+def _score_stats(score) -> Dict:
+    notes = list(score.flat.notes)
+    pitches = [p for n in notes for p in getattr(n, "pitches", ())]
+    measures = score.parts[0].getElementsByClass("Measure") if score.parts else []
+    return {
+        "notes": len(notes),
+        "measures": len(measures),
+        "quarterLength": float(score.highestTime),
+        "lowest": min(pitches).nameWithOctave if pitches else None,
+        "highest": max(pitches).nameWithOctave if pitches else None,
+    }
+
+
+def warm_worker(_: int = 0) -> Dict:
+    """작업자 준비 확인 (풀의 모든 프로세스를 띄우기 위해 잠시 머무름)"""
+    time.sleep(0.2)
+    # 채보가 아닌 작업(preload=False)은 모델 없이도 준비된 것으로 봄
+    return {"pid": os.getpid(), "ready": _audio_processor is not None or not _preload}
+
+
+def transcribe_file(path: str) -> Dict:
+    """
+    파일 하나 채보 (작업자 프로세스에서 실행)
+
+    MIDI는 단일 업로드(/api/audio/process)와 같이 바로 악보로 읽어 다장조로 옮깁니다.
+
+    Returns:
+        성공: score(freeze_score 바이트), stats, seconds, pid
+        실패: error, seconds, pid
+    """
+    started = time.perf_counter()
+    result = {"pid": os.getpid()}
+    try:
+        if __package__:
+            from .score_store import freeze_score
+        else:
+            from score_store import freeze_score
+        ext = Path(path).suffix.lstrip(".").lower()
+        if ext in MIDI_EXTENSIONS:
+            from music21 import converter
+            score = _get_score_processor().transpose_to_c_major(converter.parse(path))
+        else:
+            if _audio_processor is None:
+                raise RuntimeError("오디오 처리 모듈을 사용할 수 없습니다 (basic-pitch/librosa/music21 설치 확인)")
+            score = _audio_processor.process_audio_from_path(path)
+        if score is None or len(score.flat.notes) == 0:
+            raise RuntimeError("오디오에서 음표를 추출할 수 없습니다")
+        result.update(score=freeze_score(score), stats=_score_stats(score))
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"[:300]
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def _abort_worker(token: int):
+    """제한 시간을 넘긴 파일을 멈추기 위해 작업자 프로세스 종료 (풀이 새 프로세스로 교체됨)"""
+    print(f"[WARN] 일괄 채보 시간 초과 - 작업자 종료 (PID {os.getpid()})")
+    if _timeout_queue is not None:
+        _timeout_queue.put(token)
+        # 종료 전에 서버로 보낸 알림이 파이프에 다 쓰일 때까지 기다림
+        _timeout_queue.close()
+        _timeout_queue.join_thread()
+    os._exit(1)
+
+
+def _run_task(task: Callable[[str], Dict], path: str, token: int) -> Dict:
+    """
+    작업 하나 실행 (작업자 프로세스에서 실행)
+
+    제한 시간은 실제로 시작한 시각부터 잽니다. 넘기면 실행 중인 작업은 멈출 수 없으므로
+    프로세스를 끝내 작업자를 되살립니다.
+    """
+    timer = None
+    if _file_timeout:
+        timer = threading.Timer(_file_timeout, _abort_worker, (token,))
+        timer.daemon = True
+        timer.start()
+    try:
+        return task(path)
+    finally:
+        if timer is not None:
+            timer.cancel()
+
+
+# 서버 쪽
+
+def collect_uploads(uploads: List[Tuple[str, str]], workdir: Path) -> Tuple[List[Tuple[str, str]], List[Dict]]:
+    """
+    업로드한 파일(ZIP 포함)을 채보할 파일 목록으로 정리
+
+    ZIP 안의 파일은 원래 이름 대신 순번으로 풀어 경로 조작을 막고, 지원하지 않는 형식과
+    숨김 파일(__MACOSX 등)은 건너뜁니다.
+
+    Args:
+        uploads: [(원래 파일 이름, 저장한 경로), ...]
+        workdir: 압축을 풀 디렉토리
+
+    Returns:
+        ([(표시 이름, 경로), ...], [건너뛴 파일 정보, ...])
+
+    Raises:
+        ValueError: 파일 수나 전체 크기가 한도를 넘은 경우
+    """
+    files: List[Tuple[str, str]] = []
+    skipped: List[Dict] = []
+    total_bytes = 0
+    max_bytes = BATCH_MAX_MB * 1024 * 1024
+
+    def add(name: str, path: str, size: int):
+        nonlocal total_bytes
+        if len(files) >= BATCH_MAX_FILES:
+            raise ValueError(f"한 번에 최대 {BATCH_MAX_FILES}개 파일까지 처리할 수 있습니다.")
+        total_bytes += size
+        if total_bytes > max_bytes:
+            raise ValueError(f"전체 파일 크기가 {BATCH_MAX_MB:.0f}MB를 넘습니다.")
+        files.append((name, path))
+
+    for filename, saved_path in uploads:
+        ext = Path(filename).suffix.lstrip(".").lower()
+        if ext == "zip":
+            try:
+                archive = zipfile.ZipFile(saved_path)
+            except zipfile.BadZipFile:
+                skipped.append({"filename": filename, "reason": "ZIP 파일을 열 수 없습니다"})
+                continue
+            with archive:
+                for info in archive.infolist():
+                    name = info.filename
+                    base = Path(name).name
+                    if info.is_dir() or name.startswith("__MACOSX/") or base.startswith("."):
+                        continue
+                    member_ext = Path(base).suffix.lstrip(".").lower()
+                    if member_ext not in SUPPORTED_EXTENSIONS:
+                        skipped.append({"filename": name, "reason": "지원하지 않는 형식"})
+                        continue
+                    target = workdir / f"{len(files):03d}.{member_ext}"
+                    # 선언된 크기를 먼저 확인해 압축 폭탄을 풀기 전에 막음
+                    add(name, str(target), info.file_size)
+                    with archive.open(info) as src, open(target, "wb") as dst:
+                        dst.write(src.read(info.file_size + 1)[:info.file_size])
+        elif ext in SUPPORTED_EXTENSIONS:
+            add(filename, saved_path, os.path.getsize(saved_path))
+        else:
+            skipped.append({"filename": filename, "reason": "지원하지 않는 형식"})
+    return files, skipped
+
+
+class BatchTranscriber:
+    """일괄 채보 작업자 풀 (서버 프로세스에 하나, 처음 사용할 때 생성)
+
+    파일마다 작업자가 시작한 시각부터 file_timeout을 재고, 넘기면 그 작업자를 끝냅니다.
+    프로세스 하나가 끝나면 풀 전체가 깨지므로, 그때 함께 실패한 다른 파일(다른 요청 포함)은
+    새 풀에 다시 넣습니다.
+    """
+
+    def __init__(self, max_workers: int = BATCH_WORKERS, file_timeout: float = BATCH_FILE_TIMEOUT,
+                 task: Callable[[str], Dict] = transcribe_file):
+        """
+        Args:
+            max_workers: 작업자 프로세스 수
+            file_timeout: 파일 하나의 제한 시간(초, 대기 시간 제외)
+            task: 작업자에서 파일마다 실행할 함수 (모듈 수준 함수, 기본: transcribe_file)
+        """
+        self.max_workers = max_workers
+        self.file_timeout = file_timeout
+        self.task = task
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._timeout_queue = None
+        self._timed_out = set()
+        self._tokens = itertools.count()
+        self.batches = 0
+        self.files_completed = 0
+        self.files_failed = 0
+        self.files_timed_out = 0
+        self.pool_restarts = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # fork는 스레드/TensorFlow 상태를 그대로 복사하므로 spawn 사용 (Windows와 동작도 같음)
+                context = multiprocessing.get_context("spawn")
+                if self._timeout_queue is None:
+                    self._timeout_queue = context.Queue()
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=context, initializer=_init_worker,
+                    initargs=(self._timeout_queue, self.file_timeout, self.task is transcribe_file),
+                )
+                print(f"[INFO] 일괄 채보 작업자 풀 시작 (프로세스 {self.max_workers}개)")
+            return self._pool
+
+    def _reset_pool(self, broken: ProcessPoolExecutor):
+        """작업자가 비정상 종료(또는 시간 초과로 종료)해 깨진 풀 교체 (다음 제출에서 새로 만듦)"""
+        with self._lock:
+            if self._pool is broken:
+                self._pool = None
+                self.pool_restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def started(self) -> bool:
+        return self._pool is not None
+
+    def prewarm(self) -> Dict:
+        """모든 작업자 프로세스를 띄워 모델을 미리 불러옴 (워밍업 단계에서 호출)"""
+        pool = self._get_pool()
+        results = list(pool.map(warm_worker, range(self.max_workers)))
+        if not all(r["ready"] for r in results):
+            raise RuntimeError("오디오 처리 모듈을 불러오지 못한 작업자가 있습니다")
+        return {"workers": self.max_workers, "processes": len({r["pid"] for r in results})}
+
+    def _was_timed_out(self, token: int) -> bool:
+        """작업자가 보낸 시간 초과 알림을 읽어 token이 시간 초과로 끝났는지 확인"""
+        with self._lock:
+            while self._timeout_queue is not None:
+                try:
+                    self._timed_out.add(self._timeout_queue.get_nowait())
+                except (queue.Empty, OSError, ValueError):
+                    break
+            if token in self._timed_out:
+                self._timed_out.discard(token)
+                return True
+            return False
+
+    def _submit(self, path: str) -> Tuple[int, ProcessPoolExecutor, Future]:
+        token = next(self._tokens)
+        pool = self._get_pool()
+        try:
+            return token, pool, pool.submit(_run_task, self.task, path, token)
+        except BrokenProcessPool:
+            # 다른 요청의 파일 때문에 방금 깨진 풀이면 새 풀에 넣음
+            self._reset_pool(pool)
+            pool = self._get_pool()
+            return token, pool, pool.submit(_run_task, self.task, path, token)
+
+    async def transcribe(self, files: List[Tuple[str, str]]) -> AsyncIterator[Tuple[int, str, Dict]]:
+        """
+        파일 목록을 작업자 풀에 넣고 끝나는 순서대로 결과 전달
+
+        호출한 쪽이 중간에 멈추면(클라이언트 연결 종료 등) 아직 시작하지 않은 파일은 취소합니다.
+        이미 시작한 파일도 작업자 쪽 제한 시간이 지나면 멈춥니다.
+
+        Yields:
+            (입력 순번, 표시 이름, transcribe_file 결과)
+        """
+        self.batches += 1
+        # asyncio Future → (입력 순번, 표시 이름, 경로, 재시도 횟수, token, 풀, 원래 Future)
+        jobs: Dict[asyncio.Future, tuple] = {}
+
+        def submit(index: int, name: str, path: str, attempt: int = 0):
+            token, pool, original = self._submit(path)
+            jobs[asyncio.wrap_future(original)] = (index, name, path, attempt, token, pool, original)
+
+        try:
+            for index, (name, path) in enumerate(files):
+                submit(index, name, path)
+
+            while jobs:
+                done, _ = await asyncio.wait(list(jobs), return_when=asyncio.FIRST_COMPLETED)
+                for wrapped in done:
+                    index, name, path, attempt, token, pool, _ = jobs.pop(wrapped)
+                    try:
+                        result = wrapped.result()
+                    except BrokenProcessPool as e:
+                        self._reset_pool(pool)
+                        if self._was_timed_out(token):
+                            self.files_timed_out += 1
+                            result = {"error": "채보 시간이 초과되었습니다", "seconds": self.file_timeout}
+                        elif attempt < BATCH_RETRIES:
+                            submit(index, name, path, attempt + 1)
+                            continue
+                        else:
+                            result = {"error": f"작업자 프로세스가 비정상 종료되었습니다: {e}"}
+                    except Exception as e:
+                        result = {"error": f"{type(e).__name__}: {e}"[:300]}
+                    self._record(result)
+                    yield index, name, result
+        finally:
+            for job in jobs.values():
+                job[-1].cancel()
+
+    def _record(self, result: Dict):
+        if "error" in result:
+            self.files_failed += 1
+            STAGE_FAILURES.inc(stage="transcription", kind="batch")
+        else:
+            self.files_completed += 1
+        if result.get("seconds") is not None:
+            # 작업자 프로세스의 지표는 서버에 보이지 않으므로 결과의 처리 시간을 여기서 기록
+            STAGE_LATENCY.observe(result["seconds"], stage="transcription", kind="batch")
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.max_workers,
+            "started": self.started,
+            "batches": self.batches,
+            "files_completed": self.files_completed,
+            "files_failed": self.files_failed,
+            "files_timed_out": self.files_timed_out,
+            "pool_restarts": self.pool_restarts,
+        }
@@ -24,6 +24,16 @@ from typing import List, Dict, Tuple
 import base64
 from io import BytesIO
 
+try:
+    from metrics import timed_stage
+except ImportError:
+    from .metrics import timed_stage
+
+try:
+    from profiling import profiled
+except ImportError:
+    from .profiling import profiled
+
 class ChordAnalyzer:
     """Analyze chords and generate piano keyboard visualization"""
     
@@ -44,6 +54,8 @@ class ChordAnalyzer:
     def __init__(self):
         self.chords_by_measure = []
     
+    @timed_stage("chord_analysis", "midi")
+    @profiled("analyze_midi_chords")
     def analyze_midi_chords(self, midi_stream: stream.Stream) -> List[Dict]:
         """
         Analyze MIDI file and extract chords by measure
@@ -29,6 +29,11 @@ except ImportError as e:
 
 from typing import List, Optional
 
+try:
+    from metrics import timed_stage
+except ImportError:
+    from .metrics import timed_stage
+
 class ChordGenerator:
     """Generate simple chord accompaniment for melodies"""
     
@@ -50,6 +55,7 @@ class ChordGenerator:
         """Initialize chord generator"""
         pass
     
+    @timed_stage("transform", "accompaniment")
     def add_accompaniment(self, score: stream.Score) -> stream.Score:
         """
         Add simple block chord accompaniment to a melody
@@ -0,0 +1,262 @@
+"""
+Class Import/Export Module
+학급 명단과 진도 기록을 CSV/XLSX로 일괄 가져오기/내보내기
+
+내보내기는 DB 커서에서 행을 읽는 대로 조각(bytes) 단위로 만들어 반환하고,
+가져오기는 파일을 한 행씩 읽어 DatabaseManager의 일괄 입력(executemany)으로
+한 트랜잭션에 저장합니다. 학기 말 학급 전체 결과 입력을 빠르게 하기 위한 것입니다.
+"""
+
+import csv
+import io
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from database import DatabaseManager
+except ImportError:
+    from .database import DatabaseManager
+
+# (필드, 파일 머리글) - 가져올 때는 한글 머리글과 필드 이름 모두 인식
+ROSTER_COLUMNS = [
+    ("student_number", "번호"),
+    ("student_name", "이름"),
+    ("notes", "특이사항"),
+]
+
+PROGRESS_COLUMNS = [
+    ("student_number", "번호"),
+    ("student_name", "이름"),
+    ("activity_date", "날짜"),
+    ("activity_type", "활동 유형"),
+    ("song_title", "곡"),
+    ("progress_status", "상태"),
+    ("score", "점수"),
+    ("notes", "메모"),
+]
+
+# CSV 내보내기 시 한 번에 반환할 행 수
+CSV_CHUNK_ROWS = 500
+
+SUPPORTED_FORMATS = ("csv", "xlsx")
+
+
+def _load_openpyxl():
+    try:
+        import openpyxl
+        return openpyxl
+    except ImportError:
+        raise ImportError("XLSX 파일을 사용하려면 openpyxl을 설치하세요: pip install openpyxl")
+
+
+def _check_format(fmt: str) -> str:
+    fmt = fmt.lower().lstrip(".")
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {fmt} (csv, xlsx만 가능)")
+    return fmt
+
+
+# 내보내기
+
+def _iter_csv(header: List[str], rows: Iterable[tuple]) -> Iterator[bytes]:
+    """CSV 조각 생성 (Excel에서 한글이 깨지지 않도록 UTF-8 BOM 포함)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    first = True
+    count = 0
+    for row in rows:
+        writer.writerow(["" if value is None else value for value in row])
+        count += 1
+        if count % CSV_CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8-sig" if first else "utf-8")
+            first = False
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell() or first:
+        yield buffer.getvalue().encode("utf-8-sig" if first else "utf-8")
+
+
+def _iter_xlsx(title: str, header: List[str], rows: Iterable[tuple]) -> Iterator[bytes]:
+    """XLSX 생성 (write-only 모드라 행 수가 많아도 메모리 사용이 일정함)"""
+    openpyxl = _load_openpyxl()
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=title)
+    sheet.append(header)
+    for row in rows:
+        sheet.append(list(row))
+    output = io.BytesIO()
+    workbook.save(output)
+    yield output.getvalue()
+
+
+def export_class(db: DatabaseManager, class_id: int, kind: str = "roster",
+                 fmt: str = "csv") -> Iterator[bytes]:
+    """
+    학급 명단 또는 진도 기록 내보내기
+
+    Args:
+        db: DatabaseManager
+        class_id: 학급 ID
+        kind: "roster"(명단) 또는 "progress"(진도 기록)
+        fmt: "csv" 또는 "xlsx"
+
+    Returns:
+        파일 내용 조각(bytes) 이터레이터 - StreamingResponse 등에 그대로 전달 가능
+    """
+    fmt = _check_format(fmt)
+    if kind == "roster":
+        columns, rows, title = ROSTER_COLUMNS, db.iter_class_roster(class_id), "명단"
+    elif kind == "progress":
+        columns, rows, title = PROGRESS_COLUMNS, db.iter_class_progress(class_id), "진도"
+    else:
+        raise ValueError(f"알 수 없는 내보내기 종류: {kind}")
+
+    header = [label for _, label in columns]
+    if fmt == "csv":
+        return _iter_csv(header, rows)
+    return _iter_xlsx(title, header, rows)
+
+
+# 가져오기
+
+def _read_rows(fileobj: BinaryIO, fmt: str) -> Iterator[List]:
+    """파일을 한 행씩 읽기 (첫 행은 머리글)"""
+    if fmt == "csv":
+        text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+        try:
+            yield from csv.reader(text)
+        finally:
+            text.detach()
+    else:
+        openpyxl = _load_openpyxl()
+        workbook = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+        try:
+            for row in workbook.worksheets[0].iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            workbook.close()
+
+
+def _iter_records(fileobj: BinaryIO, fmt: str,
+                  columns: List[Tuple[str, str]]) -> Iterator[Dict]:
+    """머리글을 필드 이름에 맞춰 행을 딕셔너리로 변환 (빈 행은 건너뜀)"""
+    rows = _read_rows(fileobj, _check_format(fmt))
+    header = next(rows, None)
+    if header is None:
+        return
+
+    names = {}
+    for field, label in columns:
+        names[field] = field
+        names[label] = field
+    fields = [names.get(str(h).strip()) if h is not None else None for h in header]
+
+    for row in rows:
+        record = {}
+        for field, value in zip(fields, row):
+            if field is None:
+                continue
+            if isinstance(value, str):
+                value = value.strip()
+            record[field] = None if value == "" else value
+        if any(v is not None for v in record.values()):
+            yield record
+
+
+def _to_int(value) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_date(value) -> Optional[str]:
+    if value is None:
+        return None
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
+
+
+def import_roster(db: DatabaseManager, class_id: int, fileobj: BinaryIO,
+                  fmt: str = "csv") -> Dict[str, int]:
+    """
+    학급 명단 가져오기 (머리글: 번호, 이름, 특이사항)
+
+    이미 같은 번호/이름으로 등록된 학생은 건너뜁니다.
+
+    Args:
+        db: DatabaseManager
+        class_id: 학급 ID
+        fileobj: 바이너리 파일 객체 (업로드 파일 등)
+        fmt: "csv" 또는 "xlsx"
+
+    Returns:
+        {"imported": 추가된 학생 수, "skipped": 건너뛴 행 수}
+    """
+    existing = {(number, name) for number, name, _ in db.iter_class_roster(class_id)}
+    skipped = 0
+
+    def students():
+        nonlocal skipped
+        for record in _iter_records(fileobj, fmt, ROSTER_COLUMNS):
+            name = record.get("student_name")
+            number = _to_int(record.get("student_number"))
+            if not name or (number, str(name)) in existing:
+                skipped += 1
+                continue
+            existing.add((number, str(name)))
+            yield {"student_name": str(name), "student_number": number,
+                   "notes": record.get("notes") or ""}
+
+    imported = db.add_students_bulk(class_id, students())
+    return {"imported": imported, "skipped": skipped}
+
+
+def import_progress(db: DatabaseManager, class_id: int, fileobj: BinaryIO,
+                    fmt: str = "csv") -> Dict[str, int]:
+    """
+    학급 진도 기록 가져오기 (머리글: 번호, 이름, 날짜, 활동 유형, 곡, 상태, 점수, 메모)
+
+    학생은 번호(없으면 이름)로 찾고, 날짜/활동 유형/곡이 같은 활동이 없으면 새로 만듭니다.
+    학급에 없는 학생의 행과 이미 기록된 학생/활동의 행은 건너뜁니다.
+
+    Returns:
+        {"imported": 기록된 행 수, "skipped": 건너뛴 행 수, "activities_created": 새 활동 수}
+    """
+    students = db.get_students_by_class(class_id)
+    by_number = {s["student_number"]: s["id"] for s in students if s["student_number"] is not None}
+    by_name = {s["student_name"]: s["id"] for s in students}
+    skipped = 0
+    matched = 0
+
+    def records():
+        nonlocal skipped, matched
+        for record in _iter_records(fileobj, fmt, PROGRESS_COLUMNS):
+            number = _to_int(record.get("student_number"))
+            student_id = by_number.get(number) if number is not None else None
+            if student_id is None:
+                student_id = by_name.get(record.get("student_name"))
+            activity_date = _to_date(record.get("activity_date"))
+            if student_id is None or not activity_date:
+                skipped += 1
+                continue
+
+            matched += 1
+            yield {
+                "student_id": student_id,
+                "activity_date": activity_date,
+                "activity_type": record.get("activity_type") or "수업",
+                "song_title": str(record.get("song_title") or ""),
+                "progress_status": record.get("progress_status"),
+                "score": _to_int(record.get("score")),
+                "notes": record.get("notes") or "",
+            }
+
+    # 새 활동 생성과 진도 기록을 한 트랜잭션으로 저장 (실패하면 만든 활동도 되돌림)
+    imported, created = db.import_progress_bulk(class_id, records())
+    # 이미 있던 기록(다시 가져오기 등)도 건너뛴 행으로 집계
+    skipped += matched - imported
+    return {"imported": imported, "skipped": skipped, "activities_created": created}
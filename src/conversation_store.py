@@ -0,0 +1,290 @@
+"""
+Conversation Store Module
+세션별 AI 대화 기록 저장소 (메모리 LRU + TTL, 선택적 SQLite 영속 저장)
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수 추정
+
+    tiktoken이 설치되어 있으면 정확히 계산하고, 없으면 근사값을 사용합니다
+    (영문은 약 4글자당 1토큰, 한글 등 비ASCII 문자는 글자당 약 1토큰).
+
+    Args:
+        text: 입력 텍스트
+
+    Returns:
+        추정 토큰 수
+    """
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def new_session_id() -> str:
+    """새 대화 세션 ID"""
+    return uuid.uuid4().hex
+
+
+class ConversationStore:
+    """세션 ID별 대화 기록 저장소
+
+    세션마다 최근 max_messages개의 메시지를 보관하고, ttl 동안 사용하지 않은 세션은
+    버립니다. 프롬프트에 넣을 때는 history_for_prompt()로 토큰 예산 안에 들어가는
+    최근 메시지만 꺼내므로 대화가 길어져도 요청 크기와 지연 시간이 일정하게 유지됩니다.
+    """
+
+    def __init__(self, max_sessions: int = 1000, ttl: float = 2 * 3600,
+                 max_messages: int = 20, sqlite_path: Optional[str] = None):
+        """
+        대화 저장소 초기화
+
+        Args:
+            max_sessions: 메모리에 보관할 최대 세션 수 (LRU)
+            ttl: 세션 유효 시간(초) - 마지막 사용 이후 기준
+            max_messages: 세션당 보관할 최대 메시지 수
+            sqlite_path: SQLite 파일 경로 (None이면 메모리만 사용)
+        """
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_messages = max_messages
+        self.sqlite_path = sqlite_path
+
+        # 세션 ID → (마지막 사용 시각, 메시지 목록)
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        if sqlite_path:
+            self._init_sqlite()
+
+    # SQLite 영속 저장
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.sqlite_path, timeout=5)
+
+    def _init_sqlite(self):
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS conversations (
+                    session_id TEXT PRIMARY KEY,
+                    messages TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _sqlite_load(self, session_id: str) -> Optional[tuple]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT updated_at, messages FROM conversations WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _sqlite_append(self, session_id: str, new_messages: List[Dict[str, str]]) -> tuple:
+        """
+        SQLite의 세션 기록에 메시지를 덧붙임 (읽기-수정-쓰기를 한 쓰기 트랜잭션으로)
+
+        BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡으므로 다른 워커가 같은 세션에 동시에
+        덧붙여도 서로의 대화를 덮어쓰지 않습니다.
+
+        Returns:
+            (저장 시각, 저장된 메시지 목록)
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT updated_at, messages FROM conversations WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            now = time.time()
+            messages = json.loads(row[1]) if row is not None and now - row[0] <= self.ttl else []
+            messages = (messages + new_messages)[-self.max_messages:]
+            conn.execute(
+                "INSERT OR REPLACE INTO conversations (session_id, messages, updated_at) "
+                "VALUES (?, ?, ?)",
+                (session_id, json.dumps(messages, ensure_ascii=False), now),
+            )
+            conn.execute("DELETE FROM conversations WHERE updated_at < ?", (now - self.ttl,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return now, messages
+
+    def _sqlite_delete(self, session_id: str):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM conversations WHERE session_id = ?", (session_id,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    # 기본 연산
+    #
+    # sqlite_path가 있으면 SQLite가 원본이고 메모리는 캐시일 뿐입니다. 다른 워커가 덧붙이거나
+    # 지운 기록을 놓치지 않도록 조회/추가는 항상 SQLite를 거치고, SQLite를 쓸 수 없을 때만
+    # 이 워커의 메모리 기록으로 대신합니다.
+
+    def _remember(self, session_id: str, updated_at: float, messages: List[Dict[str, str]]):
+        with self._lock:
+            self._sessions[session_id] = (updated_at, messages)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def _load(self, session_id: str) -> List[Dict[str, str]]:
+        """세션 메시지 목록 (만료되었거나 없으면 빈 목록)"""
+        now = time.time()
+        entry = None
+        from_memory = True
+        if self.sqlite_path:
+            try:
+                entry = self._sqlite_load(session_id)
+                from_memory = False
+            except sqlite3.Error as e:
+                print(f"[WARN] 대화 기록(SQLite) 조회 실패: {e}")
+
+        if from_memory:
+            with self._lock:
+                entry = self._sessions.get(session_id)
+        elif entry is None:
+            # 다른 워커에서 지웠거나 만료되어 정리된 세션
+            with self._lock:
+                self._sessions.pop(session_id, None)
+        else:
+            self._remember(session_id, *entry)
+
+        if entry is None:
+            return []
+
+        updated_at, messages = entry
+        if now - updated_at > self.ttl:
+            self.clear(session_id)
+            return []
+        return list(messages)
+
+    def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        """세션의 전체 대화 기록 (복사본)"""
+        return self._load(session_id)
+
+    def history_for_prompt(self, session_id: str, token_budget: int = 1200) -> List[Dict[str, str]]:
+        """
+        토큰 예산 안에 들어가는 최근 대화 기록
+
+        가장 최근 메시지부터 거꾸로 채우며, 질문/답변 쌍이 잘리지 않도록
+        user 메시지로 시작하게 맞춥니다.
+
+        Args:
+            session_id: 세션 ID
+            token_budget: 대화 기록에 사용할 최대 토큰 수
+
+        Returns:
+            시간순 메시지 목록
+        """
+        selected: List[Dict[str, str]] = []
+        used = 0
+        for message in reversed(self._load(session_id)):
+            # 메시지마다 역할/구분자 오버헤드 약 4토큰
+            cost = estimate_tokens(message["content"]) + 4
+            if used + cost > token_budget:
+                break
+            selected.append(message)
+            used += cost
+
+        selected.reverse()
+        while selected and selected[0]["role"] != "user":
+            selected.pop(0)
+        return selected
+
+    def add_turn(self, session_id: str, question: str, answer: str):
+        """
+        질문/답변 한 쌍 추가
+
+        Args:
+            session_id: 세션 ID
+            question: 사용자 질문
+            answer: AI 답변
+        """
+        turn = [{"role": "user", "content": question}, {"role": "assistant", "content": answer}]
+        if self.sqlite_path:
+            try:
+                self._remember(session_id, *self._sqlite_append(session_id, turn))
+                return
+            except sqlite3.Error as e:
+                print(f"[WARN] 대화 기록(SQLite) 저장 실패: {e}")
+
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            now = time.time()
+            messages = list(entry[1]) if entry is not None and now - entry[0] <= self.ttl else []
+            self._remember(session_id, now, (messages + turn)[-self.max_messages:])
+
+    def clear(self, session_id: str):
+        """세션 대화 기록 삭제"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+        if self.sqlite_path:
+            try:
+                self._sqlite_delete(session_id)
+            except sqlite3.Error as e:
+                print(f"[WARN] 대화 기록(SQLite) 삭제 실패: {e}")
+
+    # 비동기 처리기용 (SQLite를 쓰면 조회/쓰기 트랜잭션이 이벤트 루프를 막지 않도록 실행기에서 실행)
+
+    async def _run(self, fn, *args):
+        if not self.sqlite_path:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def ahistory_for_prompt(self, session_id: str, token_budget: int = 1200) -> List[Dict[str, str]]:
+        """history_for_prompt()의 비동기 버전"""
+        return await self._run(self.history_for_prompt, session_id, token_budget)
+
+    async def aadd_turn(self, session_id: str, question: str, answer: str):
+        """add_turn()의 비동기 버전"""
+        await self._run(self.add_turn, session_id, question, answer)
+
+    async def aclear(self, session_id: str):
+        """clear()의 비동기 버전"""
+        await self._run(self.clear, session_id)
+
+    def stats(self) -> Dict:
+        """저장소 상태 정보"""
+        with self._lock:
+            active = len(self._sessions)
+        return {
+            "active_sessions": active,
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl,
+            "max_messages": self.max_messages,
+            "persistent": bool(self.sqlite_path),
+        }
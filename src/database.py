@@ -4,10 +4,333 @@ SQLite database for teacher dashboard functionality
 """
 
 import sqlite3
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
 import os
 
+# 연결마다 적용할 PRAGMA (WAL: 읽기와 쓰기가 서로 막지 않음)
+CONNECTION_PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA temp_store = MEMORY",
+]
+
+# 진도 기록 한 건이 집계 테이블에 주는 영향 (row: NEW/OLD, sign: "+"/"-")
+# 학생이 삭제된 진도 기록은 기존 통계와 같이 집계에서 제외
+def _progress_delta_sql(row: str, sign: str) -> str:
+    changes = f"""
+            progress_count = progress_count {sign} 1,
+            completed_count = completed_count {sign} (CASE WHEN {row}.progress_status = '완료' THEN 1 ELSE 0 END),
+            score_sum = score_sum {sign} COALESCE({row}.score, 0),
+            score_count = score_count {sign} ({row}.score IS NOT NULL)"""
+    student_exists = f"EXISTS (SELECT 1 FROM students WHERE id = {row}.student_id)"
+    month_row = ""
+    if sign == "+":
+        month_row = f"""
+        INSERT OR IGNORE INTO class_monthly_stats (class_id, month)
+        SELECT class_id, substr(activity_date, 1, 7) FROM activities WHERE id = {row}.activity_id;"""
+    return f"""
+        UPDATE class_stats SET {changes}
+        WHERE class_id = (SELECT class_id FROM students WHERE id = {row}.student_id);
+        UPDATE activity_stats SET {changes}
+        WHERE activity_id = {row}.activity_id AND {student_exists};{month_row}
+        UPDATE class_monthly_stats SET {changes}
+        WHERE (class_id, month) = (
+            SELECT class_id, substr(activity_date, 1, 7) FROM activities WHERE id = {row}.activity_id
+        ) AND {student_exists};"""
+
+
+# 진도 집계 컬럼 (class_stats, activity_stats, class_monthly_stats 공통)
+_PROGRESS_STAT_COLUMNS = """
+            progress_count INTEGER NOT NULL DEFAULT 0,
+            completed_count INTEGER NOT NULL DEFAULT 0,
+            score_sum INTEGER NOT NULL DEFAULT 0,
+            score_count INTEGER NOT NULL DEFAULT 0"""
+
+# 진도 기록 목록(sp)에서 집계 컬럼 값 계산 (백필용)
+_PROGRESS_STAT_SELECT = """
+            COUNT(sp.id),
+            COALESCE(SUM(CASE WHEN sp.progress_status = '완료' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(sp.score), 0),
+            COUNT(sp.score)"""
+
+
+# 스키마 마이그레이션 (PRAGMA user_version 순서대로 한 번씩 적용)
+MIGRATIONS = [
+    # 1: 대시보드 조회용 인덱스
+    [
+        "CREATE INDEX IF NOT EXISTS idx_students_class ON students(class_id, student_number, student_name)",
+        "CREATE INDEX IF NOT EXISTS idx_activities_class_date ON activities(class_id, activity_date)",
+        "CREATE INDEX IF NOT EXISTS idx_activities_date ON activities(activity_date)",
+        "CREATE INDEX IF NOT EXISTS idx_progress_student ON student_progress(student_id)",
+        "CREATE INDEX IF NOT EXISTS idx_progress_activity ON student_progress(activity_id)",
+    ],
+    # 2: 학급별 요약 뷰 (학생 수/활동 수/평균 점수를 학급 전체에 대해 한 번에 집계)
+    [
+        """
+        CREATE VIEW IF NOT EXISTS class_summary AS
+        SELECT c.id AS class_id, c.grade, c.class_number, c.class_name,
+               c.teacher_name, c.created_at,
+               COALESCE(st.total_students, 0) AS total_students,
+               COALESCE(ac.total_activities, 0) AS total_activities,
+               sc.average_score
+        FROM classes c
+        LEFT JOIN (
+            SELECT class_id, COUNT(*) AS total_students
+            FROM students GROUP BY class_id
+        ) st ON st.class_id = c.id
+        LEFT JOIN (
+            SELECT class_id, COUNT(*) AS total_activities
+            FROM activities GROUP BY class_id
+        ) ac ON ac.class_id = c.id
+        LEFT JOIN (
+            SELECT s.class_id, AVG(sp.score) AS average_score
+            FROM student_progress sp
+            JOIN students s ON sp.student_id = s.id
+            WHERE sp.score IS NOT NULL
+            GROUP BY s.class_id
+        ) sc ON sc.class_id = c.id
+        """,
+    ],
+    # 3: 통계 집계 테이블 + 트리거 (쓰기 시점에 갱신하여 통계 조회는 진도 기록을 다시 읽지 않음)
+    [
+        f"""
+        CREATE TABLE IF NOT EXISTS class_stats (
+            class_id INTEGER PRIMARY KEY,
+            total_students INTEGER NOT NULL DEFAULT 0,
+            total_activities INTEGER NOT NULL DEFAULT 0,{_PROGRESS_STAT_COLUMNS}
+        )
+        """,
+        f"""
+        CREATE TABLE IF NOT EXISTS activity_stats (
+            activity_id INTEGER PRIMARY KEY,
+            class_id INTEGER NOT NULL,{_PROGRESS_STAT_COLUMNS}
+        )
+        """,
+        f"""
+        CREATE TABLE IF NOT EXISTS class_monthly_stats (
+            class_id INTEGER NOT NULL,
+            month TEXT NOT NULL,{_PROGRESS_STAT_COLUMNS},
+            PRIMARY KEY (class_id, month)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_activity_stats_class ON activity_stats(class_id)",
+        # 기존 데이터 백필
+        f"""
+        INSERT OR IGNORE INTO class_stats (class_id, total_students, total_activities,
+                                 progress_count, completed_count, score_sum, score_count)
+        SELECT c.id,
+               (SELECT COUNT(*) FROM students WHERE class_id = c.id),
+               (SELECT COUNT(*) FROM activities WHERE class_id = c.id),
+               COALESCE(p.progress_count, 0), COALESCE(p.completed_count, 0),
+               COALESCE(p.score_sum, 0), COALESCE(p.score_count, 0)
+        FROM classes c
+        LEFT JOIN (
+            SELECT s.class_id AS class_id,
+                   COUNT(sp.id) AS progress_count,
+                   SUM(CASE WHEN sp.progress_status = '완료' THEN 1 ELSE 0 END) AS completed_count,
+                   SUM(sp.score) AS score_sum,
+                   COUNT(sp.score) AS score_count
+            FROM student_progress sp
+            JOIN students s ON sp.student_id = s.id
+            GROUP BY s.class_id
+        ) p ON p.class_id = c.id
+        """,
+        f"""
+        INSERT OR IGNORE INTO activity_stats (activity_id, class_id,
+                                    progress_count, completed_count, score_sum, score_count)
+        SELECT a.id, a.class_id,{_PROGRESS_STAT_SELECT}
+        FROM activities a
+        LEFT JOIN student_progress sp
+               ON sp.activity_id = a.id
+              AND sp.student_id IN (SELECT id FROM students)
+        GROUP BY a.id
+        """,
+        f"""
+        INSERT OR IGNORE INTO class_monthly_stats (class_id, month,
+                                         progress_count, completed_count, score_sum, score_count)
+        SELECT a.class_id, substr(a.activity_date, 1, 7),{_PROGRESS_STAT_SELECT}
+        FROM student_progress sp
+        JOIN students s ON sp.student_id = s.id
+        JOIN activities a ON sp.activity_id = a.id
+        GROUP BY a.class_id, substr(a.activity_date, 1, 7)
+        """,
+        # 학급
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_classes_insert AFTER INSERT ON classes
+        BEGIN
+            INSERT OR IGNORE INTO class_stats (class_id) VALUES (NEW.id);
+        END
+        """,
+        # 학생
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_students_insert AFTER INSERT ON students
+        BEGIN
+            INSERT OR IGNORE INTO class_stats (class_id) VALUES (NEW.class_id);
+            UPDATE class_stats SET total_students = total_students + 1
+            WHERE class_id = NEW.class_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_students_delete AFTER DELETE ON students
+        BEGIN
+            UPDATE class_stats SET
+                total_students = total_students - 1,
+                progress_count = progress_count
+                    - (SELECT COUNT(*) FROM student_progress WHERE student_id = OLD.id),
+                completed_count = completed_count
+                    - (SELECT COUNT(*) FROM student_progress
+                       WHERE student_id = OLD.id AND progress_status = '완료'),
+                score_sum = score_sum
+                    - (SELECT COALESCE(SUM(score), 0) FROM student_progress WHERE student_id = OLD.id),
+                score_count = score_count
+                    - (SELECT COUNT(score) FROM student_progress WHERE student_id = OLD.id)
+            WHERE class_id = OLD.class_id;
+            UPDATE activity_stats SET
+                progress_count = progress_count
+                    - (SELECT COUNT(*) FROM student_progress sp
+                       WHERE sp.student_id = OLD.id AND sp.activity_id = activity_stats.activity_id),
+                completed_count = completed_count
+                    - (SELECT COUNT(*) FROM student_progress sp
+                       WHERE sp.student_id = OLD.id AND sp.activity_id = activity_stats.activity_id
+                         AND sp.progress_status = '완료'),
+                score_sum = score_sum
+                    - (SELECT COALESCE(SUM(sp.score), 0) FROM student_progress sp
+                       WHERE sp.student_id = OLD.id AND sp.activity_id = activity_stats.activity_id),
+                score_count = score_count
+                    - (SELECT COUNT(sp.score) FROM student_progress sp
+                       WHERE sp.student_id = OLD.id AND sp.activity_id = activity_stats.activity_id)
+            WHERE activity_id IN (SELECT activity_id FROM student_progress WHERE student_id = OLD.id);
+            UPDATE class_monthly_stats SET
+                progress_count = progress_count - (
+                    SELECT COUNT(*) FROM student_progress sp JOIN activities a ON sp.activity_id = a.id
+                    WHERE sp.student_id = OLD.id AND a.class_id = class_monthly_stats.class_id
+                      AND substr(a.activity_date, 1, 7) = class_monthly_stats.month),
+                completed_count = completed_count - (
+                    SELECT COUNT(*) FROM student_progress sp JOIN activities a ON sp.activity_id = a.id
+                    WHERE sp.student_id = OLD.id AND a.class_id = class_monthly_stats.class_id
+                      AND substr(a.activity_date, 1, 7) = class_monthly_stats.month
+                      AND sp.progress_status = '완료'),
+                score_sum = score_sum - (
+                    SELECT COALESCE(SUM(sp.score), 0) FROM student_progress sp JOIN activities a ON sp.activity_id = a.id
+                    WHERE sp.student_id = OLD.id AND a.class_id = class_monthly_stats.class_id
+                      AND substr(a.activity_date, 1, 7) = class_monthly_stats.month),
+                score_count = score_count - (
+                    SELECT COUNT(sp.score) FROM student_progress sp JOIN activities a ON sp.activity_id = a.id
+                    WHERE sp.student_id = OLD.id AND a.class_id = class_monthly_stats.class_id
+                      AND substr(a.activity_date, 1, 7) = class_monthly_stats.month)
+            WHERE (class_id, month) IN (
+                SELECT a.class_id, substr(a.activity_date, 1, 7)
+                FROM student_progress sp JOIN activities a ON sp.activity_id = a.id
+                WHERE sp.student_id = OLD.id
+            );
+        END
+        """,
+        # 활동 (학급 평균 점수는 기존과 같이 학생 기준이므로 활동 삭제 시 유지)
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_activities_insert AFTER INSERT ON activities
+        BEGIN
+            INSERT OR IGNORE INTO class_stats (class_id) VALUES (NEW.class_id);
+            UPDATE class_stats SET total_activities = total_activities + 1
+            WHERE class_id = NEW.class_id;
+            INSERT OR IGNORE INTO activity_stats (activity_id, class_id) VALUES (NEW.id, NEW.class_id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_activities_delete AFTER DELETE ON activities
+        BEGIN
+            UPDATE class_stats SET total_activities = total_activities - 1
+            WHERE class_id = OLD.class_id;
+            UPDATE class_monthly_stats SET
+                progress_count = progress_count - (SELECT progress_count FROM activity_stats WHERE activity_id = OLD.id),
+                completed_count = completed_count - (SELECT completed_count FROM activity_stats WHERE activity_id = OLD.id),
+                score_sum = score_sum - (SELECT score_sum FROM activity_stats WHERE activity_id = OLD.id),
+                score_count = score_count - (SELECT score_count FROM activity_stats WHERE activity_id = OLD.id)
+            WHERE class_id = OLD.class_id AND month = substr(OLD.activity_date, 1, 7)
+              AND EXISTS (SELECT 1 FROM activity_stats WHERE activity_id = OLD.id);
+            DELETE FROM activity_stats WHERE activity_id = OLD.id;
+        END
+        """,
+        # 진도 기록
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_progress_insert AFTER INSERT ON student_progress
+        BEGIN{_progress_delta_sql("NEW", "+")}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_progress_delete AFTER DELETE ON student_progress
+        BEGIN{_progress_delta_sql("OLD", "-")}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_progress_update AFTER UPDATE ON student_progress
+        BEGIN{_progress_delta_sql("OLD", "-")}{_progress_delta_sql("NEW", "+")}
+        END
+        """,
+        # 요약 뷰가 집계 테이블을 읽도록 교체
+        "DROP VIEW IF EXISTS class_summary",
+        """
+        CREATE VIEW class_summary AS
+        SELECT c.id AS class_id, c.grade, c.class_number, c.class_name,
+               c.teacher_name, c.created_at,
+               COALESCE(cs.total_students, 0) AS total_students,
+               COALESCE(cs.total_activities, 0) AS total_activities,
+               CASE WHEN cs.score_count > 0 THEN cs.score_sum * 1.0 / cs.score_count END AS average_score,
+               COALESCE(cs.progress_count, 0) AS progress_count,
+               COALESCE(cs.completed_count, 0) AS completed_count
+        FROM classes c
+        LEFT JOIN class_stats cs ON cs.class_id = c.id
+        """,
+    ],
+]
+# 페이지 조회에서 선택할 수 있는 컬럼 (이름 → SQL 식)
+ACTIVITY_COLUMNS = {
+    "id": "id",
+    "activity_date": "activity_date",
+    "activity_type": "activity_type",
+    "song_title": "song_title",
+    "description": "description",
+    "file_path": "file_path",
+    "created_at": "created_at",
+}
+
+PROGRESS_COLUMNS = {
+    "id": "sp.id",
+    "activity_id": "sp.activity_id",
+    "activity_date": "a.activity_date",
+    "activity_type": "a.activity_type",
+    "song_title": "a.song_title",
+    "progress_status": "sp.progress_status",
+    "score": "sp.score",
+    "notes": "sp.notes",
+    "recorded_at": "sp.recorded_at",
+}
+
+
+def _dict_row_factory(cursor: sqlite3.Cursor, row: tuple) -> Dict:
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+# row_type별 row factory ("tuple"은 sqlite3 기본값으로 변환 비용이 없음)
+ROW_FACTORIES = {
+    "dict": _dict_row_factory,
+    "row": sqlite3.Row,
+    "tuple": None,
+}
+
+
+def _encode_cursor(activity_date: str, row_id: int) -> str:
+    return f"{activity_date}|{row_id}"
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    activity_date, row_id = cursor.rsplit("|", 1)
+    return activity_date, int(row_id)
+
+
 class DatabaseManager:
     """Manage SQLite database for teacher dashboard"""
     
@@ -16,14 +339,73 @@ class DatabaseManager:
         self.db_path = db_path
         
         # Create data directory if not exists
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        
+        # 스레드별 연결 (sqlite3 연결은 만든 스레드에서만 사용 가능)
+        self._local = threading.local()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
         
         # Initialize database
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """
+        현재 스레드의 공유 연결 반환 (없으면 생성)
+        
+        메서드마다 연결을 새로 열고 닫지 않고 스레드별로 재사용합니다.
+        Streamlit처럼 실행할 때마다 새 스레드를 쓰는 경우를 위해, 새 연결을 만들 때
+        이미 끝난 스레드의 연결을 닫습니다.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False는 끝난 스레드의 연결과 close()에서 한꺼번에 닫기 위한 것
+            # (사용은 만든 스레드에서만)
+            conn = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._connections_lock:
+                finished = [t for t in self._connections if not t.is_alive()]
+                stale = [self._connections.pop(t) for t in finished]
+                self._connections[threading.current_thread()] = conn
+            for old in stale:
+                old.close()
+        return conn
+    
+    def close(self):
+        """모든 스레드의 연결 종료"""
+        with self._connections_lock:
+            connections, self._connections = list(self._connections.values()), {}
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+    
+    def _migrate(self, conn: sqlite3.Connection):
+        """
+        아직 적용하지 않은 마이그레이션 적용
+        
+        여러 프로세스/세션이 같은 DB를 동시에 열 수 있으므로, 쓰기 잠금(BEGIN IMMEDIATE)을
+        먼저 잡은 뒤 user_version을 다시 읽어 다른 쪽이 이미 적용한 마이그레이션은 건너뜁니다.
+        """
+        while conn.execute("PRAGMA user_version").fetchone()[0] < len(MIGRATIONS):
+            # 마이그레이션 하나는 한 트랜잭션 (중간에 실패하면 적용하지 않은 상태로 되돌림)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version < len(MIGRATIONS):
+                    for statement in MIGRATIONS[version]:
+                        conn.execute(statement)
+                    conn.execute(f"PRAGMA user_version = {version + 1}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    
     def _init_database(self):
         """Create tables if they don't exist"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         # Classes table
@@ -83,14 +465,15 @@ class DatabaseManager:
         """)
         
         conn.commit()
-        conn.close()
+        
+        self._migrate(conn)
     
     # Class Management
     
     def add_class(self, grade: int, class_number: int, 
                   class_name: str = "", teacher_name: str = "") -> int:
         """Add a new class"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
@@ -104,16 +487,18 @@ class DatabaseManager:
             return class_id
         except sqlite3.IntegrityError:
             # Class already exists
+            conn.rollback()
             cursor.execute("""
                 SELECT id FROM classes WHERE grade = ? AND class_number = ?
             """, (grade, class_number))
             return cursor.fetchone()[0]
-        finally:
-            conn.close()
+        except Exception:
+            conn.rollback()
+            raise
     
     def get_all_classes(self) -> List[Dict]:
         """Get all classes"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -133,12 +518,11 @@ class DatabaseManager:
                 "created_at": row[5]
             })
         
-        conn.close()
         return classes
     
     def get_class(self, class_id: int) -> Optional[Dict]:
         """Get a specific class"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -148,7 +532,6 @@ class DatabaseManager:
         """, (class_id,))
         
         row = cursor.fetchone()
-        conn.close()
         
         if row:
             return {
@@ -166,23 +549,50 @@ class DatabaseManager:
     def add_student(self, class_id: int, student_name: str, 
                    student_number: int = None, notes: str = "") -> int:
         """Add a new student"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
-        cursor.execute("""
-            INSERT INTO students (class_id, student_name, student_number, notes)
-            VALUES (?, ?, ?, ?)
-        """, (class_id, student_name, student_number, notes))
+        # 실패하면 되돌림 (스레드별 연결을 재사용하므로 트랜잭션이 열린 채 남으면 다른 쓰기가 모두 막힘)
+        with conn:
+            cursor.execute("""
+                INSERT INTO students (class_id, student_name, student_number, notes)
+                VALUES (?, ?, ?, ?)
+            """, (class_id, student_name, student_number, notes))
         
-        student_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        return cursor.lastrowid
+    
+    def add_students_bulk(self, class_id: int, students: Iterable[Dict]) -> int:
+        """
+        Add many students in a single transaction
+        
+        Args:
+            class_id: 학급 ID
+            students: {"student_name", "student_number", "notes"} 딕셔너리 목록 (제너레이터 가능)
+            
+        Returns:
+            추가된 학생 수
+        """
+        conn = self._connect()
+        rows = (
+            (class_id, s["student_name"], s.get("student_number"), s.get("notes") or "")
+            for s in students
+        )
+        
+        try:
+            cursor = conn.executemany("""
+                INSERT INTO students (class_id, student_name, student_number, notes)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
         
-        return student_id
+        return cursor.rowcount
     
     def get_students_by_class(self, class_id: int) -> List[Dict]:
         """Get all students in a class"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -202,13 +612,12 @@ class DatabaseManager:
                 "created_at": row[4]
             })
         
-        conn.close()
         return students
     
     def update_student(self, student_id: int, student_name: str = None,
                       student_number: int = None, notes: str = None):
         """Update student information"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         updates = []
@@ -226,23 +635,21 @@ class DatabaseManager:
         
         if updates:
             params.append(student_id)
-            cursor.execute(f"""
-                UPDATE students
-                SET {', '.join(updates)}
-                WHERE id = ?
-            """, params)
-            conn.commit()
+            with conn:
+                cursor.execute(f"""
+                    UPDATE students
+                    SET {', '.join(updates)}
+                    WHERE id = ?
+                """, params)
         
-        conn.close()
     
     def delete_student(self, student_id: int):
         """Delete a student"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
-        cursor.execute("DELETE FROM students WHERE id = ?", (student_id,))
-        conn.commit()
-        conn.close()
+        with conn:
+            cursor.execute("DELETE FROM students WHERE id = ?", (student_id,))
     
     # Activity Management
     
@@ -250,26 +657,23 @@ class DatabaseManager:
                     activity_type: str, song_title: str = "",
                     description: str = "", file_path: str = "") -> int:
         """Add a new activity/lesson"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
-        cursor.execute("""
-            INSERT INTO activities 
-            (class_id, activity_date, activity_type, song_title, description, file_path)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (class_id, activity_date, activity_type, song_title, description, file_path))
-        
-        activity_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with conn:
+            cursor.execute("""
+                INSERT INTO activities 
+                (class_id, activity_date, activity_type, song_title, description, file_path)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (class_id, activity_date, activity_type, song_title, description, file_path))
         
-        return activity_id
+        return cursor.lastrowid
     
     def get_activities_by_class(self, class_id: int, 
                                start_date: str = None, 
                                end_date: str = None) -> List[Dict]:
         """Get activities for a class"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         query = """
@@ -303,17 +707,91 @@ class DatabaseManager:
                 "created_at": row[6]
             })
         
-        conn.close()
         return activities
     
+    def _select_columns(self, columns: Optional[List[str]], allowed: Dict[str, str]) -> List[str]:
+        """선택 컬럼 검증 (id와 activity_date는 다음 페이지 커서에 필요하므로 항상 포함)"""
+        columns = list(columns or allowed.keys())
+        unknown = [c for c in columns if c not in allowed]
+        if unknown:
+            raise ValueError(f"알 수 없는 컬럼: {', '.join(unknown)}")
+        for required in ("activity_date", "id"):
+            if required not in columns:
+                columns.append(required)
+        return columns
+    
+    def _fetch_page(self, query: str, params: list, columns: List[str],
+                    limit: int, row_type: str) -> Dict:
+        """limit + 1개를 읽어 다음 페이지 여부를 판단하고 커서 계산"""
+        if row_type not in ROW_FACTORIES:
+            raise ValueError(f"알 수 없는 row_type: {row_type}")
+        
+        cursor = self._connect().cursor()
+        cursor.row_factory = ROW_FACTORIES[row_type]
+        cursor.execute(query, params + [limit + 1])
+        items = cursor.fetchall()
+        
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            if row_type == "tuple":
+                last = dict(zip(columns, last))
+            next_cursor = _encode_cursor(last["activity_date"], last["id"])
+        
+        return {"items": items, "columns": columns, "next_cursor": next_cursor}
+    
+    def get_activities_page(self, class_id: int, limit: int = 50,
+                            cursor: Optional[str] = None,
+                            start_date: str = None, end_date: str = None,
+                            columns: Optional[List[str]] = None,
+                            row_type: str = "dict") -> Dict:
+        """
+        Get one page of activities for a class (newest first, keyset pagination)
+        
+        OFFSET 대신 마지막 행의 (activity_date, id)를 커서로 사용하므로
+        활동 기록이 수천 건이어도 어느 페이지든 인덱스로 바로 찾습니다.
+        
+        Args:
+            class_id: 학급 ID
+            limit: 페이지 크기
+            cursor: 이전 페이지의 next_cursor (None이면 첫 페이지)
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD)
+            columns: 가져올 컬럼 (None이면 전체, ACTIVITY_COLUMNS 참고)
+            row_type: "dict", "row"(sqlite3.Row), "tuple"(변환 없음, 가장 빠름)
+            
+        Returns:
+            {"items": 행 목록, "columns": 컬럼 순서, "next_cursor": 다음 페이지 커서 또는 None}
+        """
+        columns = self._select_columns(columns, ACTIVITY_COLUMNS)
+        query = f"""
+            SELECT {', '.join(ACTIVITY_COLUMNS[c] + ' AS ' + c for c in columns)}
+            FROM activities
+            WHERE class_id = ?
+        """
+        params = [class_id]
+        
+        if start_date:
+            query += " AND activity_date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND activity_date <= ?"
+            params.append(end_date)
+        if cursor:
+            query += " AND (activity_date, id) < (?, ?)"
+            params.extend(_decode_cursor(cursor))
+        
+        query += " ORDER BY activity_date DESC, id DESC LIMIT ?"
+        return self._fetch_page(query, params, columns, limit, row_type)
+    
     def delete_activity(self, activity_id: int):
         """Delete an activity"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
-        cursor.execute("DELETE FROM activities WHERE id = ?", (activity_id,))
-        conn.commit()
-        conn.close()
+        with conn:
+            cursor.execute("DELETE FROM activities WHERE id = ?", (activity_id,))
     
     # Student Progress
     
@@ -321,24 +799,117 @@ class DatabaseManager:
                        progress_status: str, score: int = None,
                        notes: str = "") -> int:
         """Record student progress for an activity"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
-        cursor.execute("""
-            INSERT INTO student_progress 
-            (student_id, activity_id, progress_status, score, notes)
-            VALUES (?, ?, ?, ?, ?)
-        """, (student_id, activity_id, progress_status, score, notes))
+        with conn:
+            cursor.execute("""
+                INSERT INTO student_progress 
+                (student_id, activity_id, progress_status, score, notes)
+                VALUES (?, ?, ?, ?, ?)
+            """, (student_id, activity_id, progress_status, score, notes))
         
-        progress_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        return cursor.lastrowid
+    
+    def record_progress_bulk(self, records: Iterable[Dict]) -> int:
+        """
+        Record many progress rows in a single transaction
         
-        return progress_id
+        한 활동에 대한 학급 전체 결과처럼 여러 건을 입력할 때 연결/커밋을 한 번만 합니다.
+        
+        Args:
+            records: {"student_id", "activity_id", "progress_status", "score", "notes"}
+                     딕셔너리 목록 (제너레이터 가능)
+            
+        Returns:
+            기록된 행 수
+        """
+        conn = self._connect()
+        rows = (
+            (r["student_id"], r["activity_id"], r.get("progress_status"),
+             r.get("score"), r.get("notes") or "")
+            for r in records
+        )
+        
+        try:
+            cursor = conn.executemany("""
+                INSERT INTO student_progress 
+                (student_id, activity_id, progress_status, score, notes)
+                VALUES (?, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        return cursor.rowcount
+    
+    def import_progress_bulk(self, class_id: int, records: Iterable[Dict]) -> Tuple[int, int]:
+        """
+        Record progress rows, creating missing activities, in a single transaction
+        
+        날짜/활동 유형/곡이 같은 활동이 없으면 만들고 진도 기록을 executemany로 넣습니다.
+        이미 같은 학생/활동의 진도 기록이 있으면 건너뛰므로 같은 파일을 다시 가져와도
+        기록이 중복되지 않습니다. 중간에 실패하면 새로 만든 활동까지 모두 되돌리므로, 다시 가져와도 진도 기록 없는
+        활동이 남지 않습니다.
+        
+        Args:
+            class_id: 학급 ID
+            records: {"student_id", "activity_date", "activity_type", "song_title",
+                      "progress_status", "score", "notes"} 딕셔너리 목록
+            
+        Returns:
+            (기록된 행 수, 새로 만든 활동 수) - 이미 있던 기록은 기록된 행 수에서 제외
+        """
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            activities = {
+                (row[1], row[2], row[3] or ""): row[0]
+                for row in conn.execute(
+                    "SELECT id, activity_date, activity_type, song_title FROM activities WHERE class_id = ?",
+                    (class_id,),
+                )
+            }
+            existing = set(conn.execute("""
+                SELECT sp.student_id, sp.activity_id
+                FROM student_progress sp
+                JOIN activities a ON sp.activity_id = a.id
+                WHERE a.class_id = ?
+            """, (class_id,)).fetchall())
+            created = 0
+            rows = []
+            for r in records:
+                key = (r["activity_date"], r["activity_type"], r.get("song_title") or "")
+                activity_id = activities.get(key)
+                if activity_id is None:
+                    activity_id = conn.execute("""
+                        INSERT INTO activities (class_id, activity_date, activity_type, song_title)
+                        VALUES (?, ?, ?, ?)
+                    """, (class_id, *key)).lastrowid
+                    activities[key] = activity_id
+                    created += 1
+                if (r["student_id"], activity_id) in existing:
+                    continue
+                existing.add((r["student_id"], activity_id))
+                rows.append((r["student_id"], activity_id, r.get("progress_status"),
+                             r.get("score"), r.get("notes") or ""))
+            
+            conn.executemany("""
+                INSERT INTO student_progress 
+                (student_id, activity_id, progress_status, score, notes)
+                VALUES (?, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        return len(rows), created
     
     def get_student_progress(self, student_id: int) -> List[Dict]:
         """Get all progress records for a student"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -363,39 +934,179 @@ class DatabaseManager:
                 "recorded_at": row[7]
             })
         
-        conn.close()
         return progress
     
+    # Import/Export (행 단위 스트리밍 - 전체 결과를 메모리에 올리지 않음)
+    
+    def iter_class_roster(self, class_id: int) -> Iterator[tuple]:
+        """Yield (student_number, student_name, notes) rows for a class"""
+        conn = self._connect()
+        yield from conn.execute("""
+            SELECT student_number, student_name, notes
+            FROM students
+            WHERE class_id = ?
+            ORDER BY student_number, student_name
+        """, (class_id,))
+    
+    def iter_class_progress(self, class_id: int) -> Iterator[tuple]:
+        """
+        Yield progress rows for a class
+        
+        (student_number, student_name, activity_date, activity_type, song_title,
+         progress_status, score, notes)
+        """
+        conn = self._connect()
+        yield from conn.execute("""
+            SELECT s.student_number, s.student_name, a.activity_date, a.activity_type,
+                   a.song_title, sp.progress_status, sp.score, sp.notes
+            FROM student_progress sp
+            JOIN students s ON sp.student_id = s.id
+            JOIN activities a ON sp.activity_id = a.id
+            WHERE a.class_id = ?
+            ORDER BY a.activity_date, a.id, s.student_number
+        """, (class_id,))
+    
+    def get_student_progress_page(self, student_id: int, limit: int = 50,
+                                  cursor: Optional[str] = None,
+                                  columns: Optional[List[str]] = None,
+                                  row_type: str = "dict") -> Dict:
+        """
+        Get one page of progress records for a student (newest activity first, keyset pagination)
+        
+        Args:
+            student_id: 학생 ID
+            limit: 페이지 크기
+            cursor: 이전 페이지의 next_cursor (None이면 첫 페이지)
+            columns: 가져올 컬럼 (None이면 전체, PROGRESS_COLUMNS 참고)
+            row_type: "dict", "row"(sqlite3.Row), "tuple"(변환 없음, 가장 빠름)
+            
+        Returns:
+            {"items": 행 목록, "columns": 컬럼 순서, "next_cursor": 다음 페이지 커서 또는 None}
+        """
+        columns = self._select_columns(columns, PROGRESS_COLUMNS)
+        query = f"""
+            SELECT {', '.join(PROGRESS_COLUMNS[c] + ' AS ' + c for c in columns)}
+            FROM student_progress sp
+            JOIN activities a ON sp.activity_id = a.id
+            WHERE sp.student_id = ?
+        """
+        params = [student_id]
+        
+        if cursor:
+            query += " AND (a.activity_date, sp.id) < (?, ?)"
+            params.extend(_decode_cursor(cursor))
+        
+        query += " ORDER BY a.activity_date DESC, sp.id DESC LIMIT ?"
+        return self._fetch_page(query, params, columns, limit, row_type)
+    
+    def get_class_summaries(self) -> List[Dict]:
+        """
+        Get all classes with student/activity counts and average score
+        
+        학급 수와 관계없이 쿼리 한 번으로 집계합니다 (class_summary 뷰).
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT class_id, grade, class_number, class_name, teacher_name, created_at,
+                   total_students, total_activities, average_score,
+                   progress_count, completed_count
+            FROM class_summary
+            ORDER BY grade, class_number
+        """)
+        
+        summaries = []
+        for row in cursor.fetchall():
+            summaries.append({
+                "id": row[0],
+                "grade": row[1],
+                "class_number": row[2],
+                "class_name": row[3],
+                "teacher_name": row[4],
+                "created_at": row[5],
+                "total_students": row[6],
+                "total_activities": row[7],
+                "average_score": round(row[8] or 0, 1),
+                "completion_rate": round(row[10] / row[9] * 100, 1) if row[9] else 0
+            })
+        
+        return summaries
+    
     def get_class_statistics(self, class_id: int) -> Dict:
-        """Get statistics for a class"""
-        conn = sqlite3.connect(self.db_path)
+        """
+        Get statistics for a class
+        
+        쓰기 시점에 트리거로 갱신되는 class_stats에서 읽으므로 진도 기록 수와 관계없이 일정한 시간에 조회합니다.
+        """
+        conn = self._connect()
         cursor = conn.cursor()
         
-        # Total students
         cursor.execute("""
-            SELECT COUNT(*) FROM students WHERE class_id = ?
+            SELECT total_students, total_activities, progress_count,
+                   completed_count, score_sum, score_count
+            FROM class_stats
+            WHERE class_id = ?
         """, (class_id,))
-        total_students = cursor.fetchone()[0]
+        row = cursor.fetchone() or (0, 0, 0, 0, 0, 0)
+        total_students, total_activities, progress_count, completed_count, score_sum, score_count = row
+        
+        return {
+            "total_students": total_students,
+            "total_activities": total_activities,
+            "average_score": round(score_sum / score_count, 1) if score_count else 0,
+            "progress_count": progress_count,
+            "completion_rate": round(completed_count / progress_count * 100, 1) if progress_count else 0
+        }
+    
+    def get_activity_statistics(self, class_id: int) -> List[Dict]:
+        """Get per-activity average score and completion rate for a class (newest first)"""
+        conn = self._connect()
+        cursor = conn.cursor()
         
-        # Total activities
         cursor.execute("""
-            SELECT COUNT(*) FROM activities WHERE class_id = ?
+            SELECT a.id, a.activity_date, a.activity_type, a.song_title,
+                   st.progress_count, st.completed_count, st.score_sum, st.score_count
+            FROM activity_stats st
+            JOIN activities a ON a.id = st.activity_id
+            WHERE st.class_id = ?
+            ORDER BY a.activity_date DESC, a.id DESC
         """, (class_id,))
-        total_activities = cursor.fetchone()[0]
         
-        # Average score
+        activities = []
+        for row in cursor.fetchall():
+            progress_count, completed_count, score_sum, score_count = row[4:8]
+            activities.append({
+                "id": row[0],
+                "activity_date": row[1],
+                "activity_type": row[2],
+                "song_title": row[3],
+                "progress_count": progress_count,
+                "average_score": round(score_sum / score_count, 1) if score_count else None,
+                "completion_rate": round(completed_count / progress_count * 100, 1) if progress_count else None
+            })
+        
+        return activities
+    
+    def get_class_trend(self, class_id: int) -> List[Dict]:
+        """Get monthly average score and completion rate for a class (oldest first)"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
         cursor.execute("""
-            SELECT AVG(sp.score)
-            FROM student_progress sp
-            JOIN students s ON sp.student_id = s.id
-            WHERE s.class_id = ? AND sp.score IS NOT NULL
+            SELECT month, progress_count, completed_count, score_sum, score_count
+            FROM class_monthly_stats
+            WHERE class_id = ? AND progress_count > 0
+            ORDER BY month
         """, (class_id,))
-        avg_score = cursor.fetchone()[0] or 0
         
-        conn.close()
+        trend = []
+        for month, progress_count, completed_count, score_sum, score_count in cursor.fetchall():
+            trend.append({
+                "month": month,
+                "progress_count": progress_count,
+                "average_score": round(score_sum / score_count, 1) if score_count else None,
+                "completion_rate": round(completed_count / progress_count * 100, 1)
+            })
         
-        return {
-            "total_students": total_students,
-            "total_activities": total_activities,
-            "average_score": round(avg_score, 1)
-        }
+        return trend
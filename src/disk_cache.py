@@ -0,0 +1,206 @@
+"""
+Disk Cache Module
+키 → 파일 형태의 디스크 기반 LRU 캐시 (용량 제한 포함)
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+
+def hash_key(*parts: Union[str, bytes]) -> str:
+    """
+    여러 조각을 합쳐 캐시 키(SHA-256 hex)를 생성
+
+    Args:
+        parts: 키를 구성하는 문자열/바이트 조각
+
+    Returns:
+        64자리 hex 문자열
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        # 조각 경계를 구분해 ("ab", "c")와 ("a", "bc")가 같은 키가 되지 않도록 함
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """파일 수정 시각(mtime)을 접근 시각으로 사용하는 디스크 LRU 캐시"""
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = 200 * 1024 * 1024,
+                 suffix: str = ""):
+        """
+        디스크 캐시 초기화
+
+        Args:
+            cache_dir: 캐시 파일을 저장할 디렉토리
+            max_bytes: 캐시 전체 최대 용량 (바이트)
+            suffix: 캐시 파일 확장자 (예: ".xml")
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def path_for(self, key: str) -> Path:
+        """키에 해당하는 캐시 파일 경로 (존재 여부와 무관)"""
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def get_path(self, key: str) -> Optional[Path]:
+        """
+        캐시된 파일 경로 조회 (적중 시 LRU 순서 갱신)
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            캐시 파일 경로 또는 None
+        """
+        path = self.path_for(key)
+        try:
+            os.utime(path, None)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """캐시된 내용을 바이트로 조회"""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:
+            # 읽는 사이 다른 요청이 삭제한 경우
+            return None
+
+    def put_bytes(self, key: str, data: bytes) -> Path:
+        """
+        내용을 캐시에 저장 (임시 파일에 쓴 뒤 원자적으로 교체)
+
+        Args:
+            key: 캐시 키
+            data: 저장할 바이트
+
+        Returns:
+            저장된 캐시 파일 경로
+        """
+        path = self.path_for(key)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.cache_dir), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.evict()
+        return path
+
+    def put_file(self, key: str, src_path: Union[str, Path]) -> Path:
+        """
+        기존 파일을 캐시로 이동하여 저장 (같은 파일시스템이면 복사 없이 rename)
+
+        Args:
+            key: 캐시 키
+            src_path: 캐시에 넣을 파일 경로 (이동 후 원본 경로는 사라짐)
+
+        Returns:
+            저장된 캐시 파일 경로
+        """
+        path = self.path_for(key)
+        try:
+            os.replace(str(src_path), path)
+        except OSError:
+            # 다른 파일시스템 간 이동은 복사 후 삭제
+            self.put_bytes(key, Path(src_path).read_bytes())
+            os.unlink(str(src_path))
+            return path
+        self.evict()
+        return path
+
+    def delete(self, key: str) -> bool:
+        """캐시 항목 삭제"""
+        try:
+            self.path_for(key).unlink()
+            return True
+        except OSError:
+            return False
+
+    def _entries(self):
+        """(mtime, size, path) 목록 - 작성 중인 .part 파일은 제외"""
+        entries = []
+        for path in self.cache_dir.iterdir():
+            if path.suffix == ".part" or not path.is_file():
+                continue
+            if self.suffix and not path.name.endswith(self.suffix):
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self) -> int:
+        """
+        최대 용량을 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+
+        Returns:
+            삭제한 항목 수
+        """
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return 0
+
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                    total -= size
+                    removed += 1
+                except OSError:
+                    pass
+            self.evictions += removed
+            return removed
+
+    def clear(self):
+        """모든 캐시 항목 삭제"""
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict:
+        """캐시 상태 정보"""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -103,6 +103,81 @@ class ApiClient {
     }
   }
 
+  // Server-Sent Events 스트리밍 요청: 토큰이 올 때마다 onToken 호출, 완료 시 done 이벤트 데이터 반환
+  // signal로 중단하면 서버도 생성을 멈춤
+  async stream<T = any>(
+    endpoint: string,
+    body: Record<string, any>,
+    onToken: (token: string) => void,
+    signal?: AbortSignal
+  ): Promise<ApiResponse<T>> {
+    try {
+      const response = await fetch(`${this.baseUrl}${endpoint}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+        body: JSON.stringify(body),
+        signal,
+      })
+
+      if (!response.ok || !response.body) {
+        const errorText = await response.text()
+        let errorMessage = `HTTP error! status: ${response.status}`
+        try {
+          const errorData = JSON.parse(errorText)
+          errorMessage = errorData.detail || errorData.error || errorMessage
+        } catch {
+          errorMessage = errorText || errorMessage
+        }
+        throw new Error(errorMessage)
+      }
+
+      const reader = response.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ''
+
+      while (true) {
+        const { value, done } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true })
+
+        // 이벤트는 빈 줄로 구분됨
+        let boundary = buffer.indexOf('\n\n')
+        while (boundary !== -1) {
+          const rawEvent = buffer.slice(0, boundary)
+          buffer = buffer.slice(boundary + 2)
+          boundary = buffer.indexOf('\n\n')
+
+          let eventName = 'message'
+          let data = ''
+          for (const line of rawEvent.split('\n')) {
+            if (line.startsWith('event:')) eventName = line.slice(6).trim()
+            else if (line.startsWith('data:')) data += line.slice(5).trim()
+          }
+          if (!data) continue
+
+          const payload = JSON.parse(data)
+          if (eventName === 'error') {
+            return { success: false, error: payload.error }
+          }
+          if (eventName === 'done') {
+            return { success: true, data: payload }
+          }
+          onToken(payload.token)
+        }
+      }
+
+      return { success: false, error: '응답이 중간에 끊어졌습니다.' }
+    } catch (error) {
+      if (error instanceof Error && error.name === 'AbortError') {
+        return { success: false, error: '요청이 취소되었습니다.' }
+      }
+      return {
+        success: false,
+        error: error instanceof Error ? error.message : '알 수 없는 오류가 발생했습니다.',
+      }
+    }
+  }
+
   async uploadFile<T>(
     endpoint: string,
     file: File,
@@ -204,16 +279,29 @@ export const scoreApi = {
     }, true), // blob 응답 처리
 }
 
+// AI 대화 세션 ID (브라우저 탭마다 따로 유지되어 다른 교실과 대화 기록이 섞이지 않음)
+const CHAT_SESSION_KEY = 'aiChatSessionId'
+
+const getChatSessionId = (): string => {
+  let sessionId = sessionStorage.getItem(CHAT_SESSION_KEY)
+  if (!sessionId) {
+    sessionId = crypto.randomUUID().replace(/-/g, '')
+    sessionStorage.setItem(CHAT_SESSION_KEY, sessionId)
+  }
+  return sessionId
+}
+
 export const aiApi = {
   chat: (question: string, context?: string) =>
     apiClient.request('/ai/chat', {
       method: 'POST',
-      body: JSON.stringify({ question, context }),
+      body: JSON.stringify({ question, context, sessionId: getChatSessionId() }),
     }),
   
   clearChat: () =>
     apiClient.request('/ai/chat/clear', {
       method: 'POST',
+      body: JSON.stringify({ sessionId: getChatSessionId() }),
     }),
   
   explainTheory: (topic: string, age: number) =>
@@ -228,6 +316,26 @@ export const aiApi = {
       body: JSON.stringify({ songTitle, grade, duration }),
     }),
   
+  // 스트리밍 버전: 토큰이 생성되는 대로 onToken으로 전달
+  chatStream: (question: string, onToken: (token: string) => void, context?: string, signal?: AbortSignal) =>
+    apiClient.stream<{ text: string; sessionId: string }>(
+      '/ai/chat/stream', { question, context, sessionId: getChatSessionId() }, onToken, signal
+    ),
+  
+  explainTheoryStream: (topic: string, age: number, onToken: (token: string) => void, signal?: AbortSignal) =>
+    apiClient.stream<{ text: string }>('/ai/explain-theory/stream', { topic, age }, onToken, signal),
+  
+  generateLessonPlanStream: (
+    songTitle: string,
+    grade: string,
+    duration: number,
+    onToken: (token: string) => void,
+    signal?: AbortSignal
+  ) =>
+    apiClient.stream<{ text: string; songTitle: string; grade: string; duration: number }>(
+      '/ai/lesson-plan/stream', { songTitle, grade, duration }, onToken, signal
+    ),
+  
   exportLessonPlanDocx: (plan: string, songTitle: string, grade: string, duration: number) =>
     apiClient.request('/ai/lesson-plan/export-docx', {
       method: 'POST',
@@ -261,10 +369,11 @@ export const chordApi = {
   analyze: (file: File, fileType: 'midi' | 'youtube' | 'pdf' | 'audio' | 'image') =>
     apiClient.uploadFile('/chord/analyze', file, { fileType }),
   
-  analyzeYouTube: (youtubeUrl: string) =>
+  // start/duration(초)을 지정하면 전체 다운로드 없이 해당 구간만 분석
+  analyzeYouTube: (youtubeUrl: string, window?: { start?: number; duration?: number }) =>
     apiClient.request('/chord/analyze-youtube', {
       method: 'POST',
-      body: JSON.stringify({ youtubeUrl }),
+      body: JSON.stringify({ youtubeUrl, ...window }),
     }),
 }
 
@@ -0,0 +1,143 @@
+"""
+Shared HTTP Client Module
+외부 API 호출용 공유 httpx 클라이언트 (keep-alive 연결 재사용, 타임아웃, 재시도)
+"""
+
+import asyncio
+import concurrent.futures
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+# 기본 타임아웃: 연결 5초, 전체 10초
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+# 연결 풀 크기 (프로세스당)
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=20,
+    max_keepalive_connections=10,
+    keepalive_expiry=30.0,
+)
+
+# 재시도할 HTTP 상태 코드 (일시적 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 이벤트 루프별 클라이언트 (httpx 연결은 생성된 루프에 묶이므로 루프마다 하나씩 유지)
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    현재 이벤트 루프의 공유 AsyncClient 반환 (없으면 생성)
+
+    Returns:
+        연결 풀을 공유하는 httpx.AsyncClient
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS)
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_client():
+    """현재 이벤트 루프의 공유 AsyncClient 종료 (서버 종료 시 호출)"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.pop(loop, None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+async def request_with_retry(method: str, url: str, *,
+                             params: Optional[Dict[str, Any]] = None,
+                             json: Optional[Any] = None,
+                             headers: Optional[Dict[str, str]] = None,
+                             timeout: Optional[float] = None,
+                             retries: int = 2,
+                             backoff: float = 0.3,
+                             total_timeout: Optional[float] = None,
+                             on_send: Optional[Callable[[], None]] = None) -> httpx.Response:
+    """
+    공유 클라이언트로 HTTP 요청 (일시적 오류는 지수 백오프로 재시도)
+
+    Args:
+        method: HTTP 메서드 ("GET", "POST" 등)
+        url: 요청 URL
+        params: 쿼리 파라미터
+        json: JSON 본문
+        headers: 요청 헤더
+        timeout: 요청 타임아웃(초), None이면 기본값 사용
+        retries: 최대 재시도 횟수
+        backoff: 첫 재시도 대기 시간(초), 재시도마다 2배씩 증가
+        total_timeout: 재시도를 포함한 전체 제한 시간(초) - 남은 시간 안에서만 재시도
+        on_send: 실제 요청을 보낼 때마다(재시도 포함) 호출할 함수 (할당량 집계 등)
+
+    Returns:
+        httpx.Response (재시도 후에도 오류 상태 코드면 마지막 응답을 그대로 반환)
+
+    Raises:
+        httpx.TimeoutException, httpx.TransportError: 재시도 후에도 연결에 실패한 경우
+    """
+    client = get_async_client()
+    request_timeout = httpx.Timeout(timeout, connect=min(timeout, 5.0)) if timeout else DEFAULT_TIMEOUT
+    deadline = time.monotonic() + total_timeout if total_timeout else None
+
+    for attempt in range(retries + 1):
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            attempt_timeout = min(timeout or DEFAULT_TIMEOUT.read, remaining)
+            request_timeout = httpx.Timeout(attempt_timeout, connect=min(attempt_timeout, 5.0))
+        if on_send is not None:
+            on_send()
+        try:
+            response = await client.request(
+                method, url, params=params, json=json, headers=headers, timeout=request_timeout
+            )
+        except (httpx.TimeoutException, httpx.TransportError):
+            if attempt >= retries or not _has_time_for_retry(deadline, backoff * (2 ** attempt)):
+                raise
+        else:
+            if (response.status_code not in RETRY_STATUS_CODES or attempt >= retries
+                    or not _has_time_for_retry(deadline, backoff * (2 ** attempt))):
+                return response
+        await asyncio.sleep(backoff * (2 ** attempt))
+
+    raise RuntimeError("unreachable")
+
+
+def _has_time_for_retry(deadline: Optional[float], delay: float) -> bool:
+    """재시도 대기 후에도 요청할 시간(최소 0.5초)이 남는지"""
+    return deadline is None or deadline - time.monotonic() - delay >= 0.5
+
+
+def run_sync(coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    동기 코드(Streamlit 등)에서 async 함수를 실행
+
+    새 이벤트 루프에서 실행하고, 그 루프에서 만든 공유 클라이언트는 끝나면 닫습니다.
+    이미 이벤트 루프가 실행 중인 스레드에서 호출되면 별도 스레드에서 실행합니다.
+
+    Args:
+        coro_factory: 코루틴을 만드는 함수 (예: lambda: helper.get_video_info_async(vid))
+
+    Returns:
+        코루틴의 반환값
+    """
+    async def runner():
+        try:
+            return await coro_factory()
+        finally:
+            await close_async_client()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(runner())
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, runner()).result()
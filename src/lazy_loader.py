@@ -0,0 +1,202 @@
+"""
+Lazy Loader Module
+무거운 구성 요소(music21, 오디오 처리, OpenAI SDK, OMR 등)를 처음 사용할 때 불러오기
+
+API 서버 시작 시 모든 모듈을 import하면 첫 요청을 받기까지 수 초가 걸립니다.
+구성 요소별 로더를 등록해 두고 처음 접근할 때 한 번만 불러오며, 구성 요소마다
+걸린 시간을 기록해 두었다가 시작 보고서로 보여 줍니다.
+서버가 요청을 받기 시작한 뒤 백그라운드에서 미리 불러오기(pre-warm)도 할 수 있습니다.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# 구성 요소 상태
+PENDING = "pending"   # 아직 불러오지 않음
+LOADING = "loading"   # 불러오는 중
+READY = "ready"       # 사용 가능
+FAILED = "failed"     # 불러오기 실패 (다시 시도하지 않음)
+
+
+class LazyComponent:
+    """처음 사용할 때 로더를 실행해 만드는 구성 요소
+
+    기존 전역 싱글톤 자리에 그대로 둘 수 있도록 속성 접근은 실제 객체로 넘기고,
+    `if not component:` 검사는 불러오기 성공 여부로 판단합니다.
+    비동기 처리기에서는 `if not await component.aget():`으로 검사합니다.
+    로더가 예외를 내거나 None을 반환하면 사용할 수 없는 것으로 기록하고
+    이후에는 다시 불러오지 않습니다.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        """
+        Args:
+            name: 구성 요소 이름 (보고서/로그용)
+            loader: 인스턴스를 만들어 반환하는 함수 (필요한 import를 함수 안에서 수행)
+        """
+        self.name = name
+        self._loader = loader
+        self._instance = None
+        self._state = PENDING
+        self._error: Optional[str] = None
+        self._load_seconds: Optional[float] = None
+        self._modules_imported = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def loaded(self) -> bool:
+        """불러오기를 시도하지 않고 사용 가능 여부만 확인"""
+        return self._state == READY
+
+    def get(self) -> Any:
+        """
+        구성 요소 반환 (처음 호출 시 불러옴)
+
+        Returns:
+            인스턴스, 사용할 수 없으면 None
+        """
+        if self._state == READY:
+            return self._instance
+        if self._state == FAILED:
+            return None
+
+        with self._lock:
+            if self._state in (READY, FAILED):
+                return self._instance
+            self._state = LOADING
+            modules_before = len(sys.modules)
+            started = time.perf_counter()
+            try:
+                instance = self._loader()
+                if instance is None:
+                    raise RuntimeError("사용할 수 없습니다")
+            except Exception as e:
+                self._load_seconds = time.perf_counter() - started
+                self._error = f"{type(e).__name__}: {e}"[:300]
+                self._state = FAILED
+                print(f"[WARN] {self.name}를 불러올 수 없습니다: {e}")
+                return None
+            self._load_seconds = time.perf_counter() - started
+            self._modules_imported = max(0, len(sys.modules) - modules_before)
+            self._instance = instance
+            self._state = READY
+            print(f"[OK] {self.name} 로드 완료 ({self._load_seconds:.2f}초)")
+            return instance
+
+    async def aget(self) -> Any:
+        """
+        get()의 비동기 버전 (비동기 처리기용)
+
+        아직 불러오지 않았거나 다른 스레드(미리 불러오기)가 불러오는 중이면 실행기에서
+        기다리므로, 무거운 import나 잠금 대기가 이벤트 루프를 막지 않습니다.
+        """
+        if self._state in (READY, FAILED):
+            return self.get()
+        return await asyncio.get_running_loop().run_in_executor(None, self.get)
+
+    def __bool__(self) -> bool:
+        return self.get() is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        # 내부 속성은 __dict__에서 바로 찾으므로 여기에는 실제 객체의 속성만 옴
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        instance = self.get()
+        if instance is None:
+            raise AttributeError(f"{self.name}를 사용할 수 없어 '{attr}'에 접근할 수 없습니다")
+        return getattr(instance, attr)
+
+    def status(self) -> Dict:
+        """상태 및 불러오기 시간"""
+        return {
+            "state": self._state,
+            "load_seconds": round(self._load_seconds, 3) if self._load_seconds is not None else None,
+            "modules_imported": self._modules_imported,
+            "error": self._error,
+        }
+
+
+# 이름 → 구성 요소 (등록 순서 유지)
+_components: Dict[str, LazyComponent] = {}
+
+
+def lazy_component(name: str, loader: Callable[[], Any]) -> LazyComponent:
+    """
+    구성 요소 등록
+
+    Args:
+        name: 구성 요소 이름
+        loader: 인스턴스를 만들어 반환하는 함수
+
+    Returns:
+        LazyComponent
+    """
+    component = LazyComponent(name, loader)
+    _components[name] = component
+    return component
+
+
+def get_component(name: str) -> Optional[LazyComponent]:
+    return _components.get(name)
+
+
+def component_names() -> List[str]:
+    return list(_components)
+
+
+def component_report() -> Dict[str, Dict]:
+    """모든 구성 요소의 상태 (불러오기를 일으키지 않음)"""
+    return {name: component.status() for name, component in _components.items()}
+
+
+def parse_component_list(value: Optional[str]) -> List[str]:
+    """
+    미리 불러올 구성 요소 목록 해석
+
+    Args:
+        value: "all" 또는 쉼표로 구분한 이름 (빈 값이면 미리 불러오지 않음)
+
+    Returns:
+        등록된 구성 요소 이름 목록
+    """
+    if not value or not value.strip():
+        return []
+    if value.strip().lower() in ("all", "1", "true", "yes"):
+        return component_names()
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in _components]
+    if unknown:
+        print(f"[WARN] 알 수 없는 구성 요소는 미리 불러오지 않습니다: {', '.join(unknown)}")
+    return [name for name in names if name in _components]
+
+
+def prewarm(names: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+    """
+    구성 요소를 차례로 미리 불러오기 (백그라운드 스레드에서 호출)
+
+    Args:
+        names: 불러올 구성 요소 이름 (None이면 전체)
+
+    Returns:
+        불러온 구성 요소의 상태
+    """
+    names = component_names() if names is None else list(names)
+    started = time.perf_counter()
+    for name in names:
+        component = _components.get(name)
+        if component is not None:
+            component.get()
+    print(f"[OK] 구성 요소 미리 불러오기 완료: {len(names)}개, {time.perf_counter() - started:.2f}초")
+    return {name: _components[name].status() for name in names if name in _components}
+
+
+# 서버 시작 시 미리 불러올 구성 요소 (예: "all" 또는 "audio_processor,score_processor")
+PREWARM_COMPONENTS = os.getenv("PREWARM_COMPONENTS", "")
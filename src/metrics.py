@@ -0,0 +1,325 @@
+"""
+Metrics Module
+Prometheus 텍스트 형식으로 내보내는 요청/처리 단계 지표 (외부 라이브러리 없음)
+
+라우트별 요청 수와 지연 시간 히스토그램, 디코딩/채보/악보 변환/화음 분석/OMR/내보내기
+단계별 처리 시간, 진행 중인 작업 수를 기록합니다. 캐시 적중률처럼 다른 모듈이 이미
+가지고 있는 통계는 수집 함수(collector)를 등록해 두고 /metrics 요청 때만 읽습니다.
+기록은 잠금 한 번과 덧셈 몇 번이라 요청 처리에 주는 부담이 거의 없습니다.
+"""
+
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 지표 이름 접두사
+PREFIX = "music_helper_"
+
+# 지연 시간 히스토그램 구간(초) - 짧은 API 응답부터 수십 초 걸리는 채보/OMR까지
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# 수집 함수가 반환하는 항목: (이름, 종류, 설명, [(레이블, 값), ...])
+Sample = Tuple[Dict[str, str], float]
+Family = Tuple[str, str, str, List[Sample]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """레이블 조합별 값을 가진 지표 (공통 부분)"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in sorted(items):
+            lines.append(f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """증가만 하는 값 (요청 수, 실패 수 등)"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """현재 값 (진행 중인 작업 수 등)"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """값의 분포 (구간별 누적 개수, 합계, 개수)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = [[0] * len(self.buckets), 0.0, 0]
+                self._values[key] = state
+            counts = state[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = [(key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()]
+        for key, (counts, total, count) in sorted(items):
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = dict(labels, le=_format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(dict(labels, le='+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """지표와 수집 함수 모음"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+
+    def _add(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(PREFIX + name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(PREFIX + name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(PREFIX + name, help_text, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]):
+        """
+        /metrics 요청 때 호출할 수집 함수 등록
+
+        Args:
+            collector: (이름, 종류, 설명, [(레이블, 값), ...]) 목록을 반환하는 함수
+                       (이름에는 접두사가 자동으로 붙음)
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                # 수집 함수 하나가 실패해도 나머지 지표는 내보냄
+                print(f"[WARN] 지표 수집 실패: {e}")
+                continue
+            for name, kind, help_text, samples in families:
+                lines.append(f"# HELP {PREFIX}{name} {help_text}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    lines.append(f"{PREFIX}{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 공용 레지스트리
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "라우트별 HTTP 요청 수", ("method", "route", "status"))
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "라우트별 응답 시간 (스트리밍은 전송 완료까지)", ("method", "route"))
+HTTP_IN_PROGRESS = REGISTRY.gauge(
+    "http_requests_in_progress", "처리 중인 HTTP 요청 수")
+
+STAGE_LATENCY = REGISTRY.histogram(
+    "stage_duration_seconds", "처리 단계별 소요 시간", ("stage", "kind"))
+STAGE_FAILURES = REGISTRY.counter(
+    "stage_failures_total", "처리 단계별 예외 발생 수", ("stage", "kind"))
+STAGE_IN_PROGRESS = REGISTRY.gauge(
+    "stage_in_progress", "처리 단계별 진행 중인 작업 수 (스레드 풀 대기 포함)", ("stage",))
+
+
+@contextmanager
+def stage_timer(stage: str, kind: str = ""):
+    """
+    처리 단계 시간 측정
+
+    Args:
+        stage: 단계 이름 (decode, transcription, transform, chord_analysis, omr, export)
+        kind: 세부 종류 (예: basic_pitch/librosa, transpose, midi)
+
+    Example:
+        with stage_timer("transcription", "basic_pitch"):
+            predict(path)
+    """
+    STAGE_IN_PROGRESS.inc(stage=stage)
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_FAILURES.inc(stage=stage, kind=kind)
+        raise
+    finally:
+        STAGE_LATENCY.observe(time.perf_counter() - started, stage=stage, kind=kind)
+        STAGE_IN_PROGRESS.dec(stage=stage)
+
+
+def timed_stage(stage: str, kind: str = ""):
+    """stage_timer를 적용하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def observe_request(method: str, route: str, status: int, seconds: float):
+    """HTTP 요청 하나 기록"""
+    HTTP_REQUESTS.inc(method=method, route=route, status=str(status))
+    HTTP_LATENCY.observe(seconds, method=method, route=route)
+
+
+class MetricsMiddleware:
+    """라우트별 요청 수/응답 시간 기록 ASGI 미들웨어
+
+    경로 대신 라우트 템플릿(/api/score/{score_id}/export/midi 등)을 레이블로 써서
+    점수 ID마다 시계열이 생기지 않게 합니다. 스트리밍 응답을 감싸지 않는 순수 ASGI
+    미들웨어라 SSE의 연결 끊김 감지에 영향을 주지 않습니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_PROGRESS.dec()
+            # 라우터가 매칭한 라우트를 scope에 기록함 (매칭되지 않으면 없음)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            observe_request(scope.get("method", ""), route, status, time.perf_counter() - started)
+
+
+def cache_families(caches: Dict[str, Optional[Dict]]) -> List[Family]:
+    """
+    캐시 통계(stats()) 여러 개를 지표로 변환
+
+    hits/misses가 없는 통계(SemanticCache)는 exact_hits + similar_hits를 적중으로 봅니다.
+
+    Args:
+        caches: 캐시 이름 → stats() 결과 (None이면 건너뜀)
+    """
+    hits, misses, ratio, entries = [], [], [], []
+    for name, stats in caches.items():
+        if not stats:
+            continue
+        labels = {"cache": name}
+        hit_count = stats.get("hits", stats.get("exact_hits", 0) + stats.get("similar_hits", 0))
+        miss_count = stats.get("misses", 0)
+        hits.append((labels, hit_count))
+        misses.append((labels, miss_count))
+        lookups = hit_count + miss_count
+        ratio.append((labels, round(hit_count / lookups, 4) if lookups else 0.0))
+        entries.append((labels, stats.get("entries")))
+    return [
+        ("cache_hits_total", "counter", "캐시 적중 수", hits),
+        ("cache_misses_total", "counter", "캐시 미스 수", misses),
+        ("cache_hit_ratio", "gauge", "캐시 적중률 (0~1)", ratio),
+        ("cache_entries", "gauge", "캐시 항목 수", entries),
+    ]
@@ -2,10 +2,33 @@
 OMR (Optical Music Recognition) Service
 이미지를 MusicXML로 변환하는 OMR 서비스
 """
+import os
+import shutil
 import subprocess
 from pathlib import Path
 import tempfile
-from typing import Union
+import zipfile
+from typing import Dict, List, Optional, Union
+
+# 결과 캐시 (optional)
+try:
+    from disk_cache import DiskCache, hash_key
+    HAS_DISK_CACHE = True
+except ImportError:
+    HAS_DISK_CACHE = False
+    DiskCache = None
+    hash_key = None
+
+try:
+    from metrics import timed_stage
+except ImportError:
+    from .metrics import timed_stage
+
+# OMR 처리 대상 이미지 확장자
+IMAGE_SUFFIXES = [".png", ".jpg", ".jpeg", ".gif", ".bmp"]
+
+# 캐시 항목 형식 버전 (.mxl 출력을 압축 해제하지 않고 저장하던 이전 항목은 다시 변환)
+CACHE_FORMAT_VERSION = "2"
 
 
 class OmrError(Exception):
@@ -13,27 +36,143 @@ class OmrError(Exception):
     pass
 
 
+def read_musicxml_output(path: Path) -> str:
+    """
+    Audiveris 출력 파일 읽기 (.mxl 압축 파일이면 내부 악보 파일을 꺼내서 읽음)
+
+    Args:
+        path: .xml / .musicxml / .mxl 파일 경로
+
+    Returns:
+        MusicXML 문자열
+
+    Raises:
+        OmrError: .mxl 파일이 손상되었거나 악보가 없는 경우
+    """
+    path = Path(path)
+    if path.suffix.lower() != ".mxl":
+        return path.read_text(encoding="utf-8", errors="ignore")
+
+    try:
+        with zipfile.ZipFile(path) as archive:
+            names = [n for n in archive.namelist()
+                     if n.lower().endswith((".xml", ".musicxml")) and not n.startswith("META-INF/")]
+            if not names:
+                raise OmrError(f"MXL 파일에 악보가 없습니다: {path.name}")
+            return archive.read(names[0]).decode("utf-8", errors="ignore")
+    except zipfile.BadZipFile as e:
+        raise OmrError(f"MXL 파일을 열 수 없습니다: {path.name}") from e
+
+
+def get_audiveris_path() -> Optional[str]:
+    """Audiveris 실행 파일 경로 찾기"""
+    # 0. 환경 변수로 지정된 경로 (최우선)
+    env_path = os.getenv("AUDIVERIS_PATH")
+    if env_path and Path(env_path).exists():
+        return env_path
+
+    # 1. 하드코딩된 경로 확인 (우선순위)
+    hardcoded_paths = [
+        r"C:\audiveris\bin\audiveris.bat",
+        r"C:\audiveris\bin\audiveris.exe",
+    ]
+    
+    for path_str in hardcoded_paths:
+        path = Path(path_str)
+        if path.exists():
+            return str(path)
+    
+    # 2. PATH에서 찾기
+    audiveris_exe = shutil.which("audiveris")
+    if audiveris_exe:
+        return audiveris_exe
+    
+    # 3. 일반적인 Windows 경로 확인
+    common_paths = [
+        r"C:\Program Files\Audiveris\bin\audiveris.exe",
+        r"C:\Program Files (x86)\Audiveris\bin\audiveris.exe",
+        r"C:\Audiveris\bin\audiveris.exe",
+    ]
+    
+    for path_str in common_paths:
+        path = Path(path_str)
+        if path.exists():
+            return str(path)
+    
+    return None
+
+
+def create_omr_cache() -> Optional["DiskCache"]:
+    """
+    환경 변수 설정으로 OMR 결과 캐시 생성
+
+    - OMR_CACHE_DIR: 캐시 디렉토리 (기본값: temp/omr_cache)
+    - OMR_CACHE_MAX_MB: 최대 용량 MB (기본값: 500, 0이면 캐시 비활성화)
+
+    Returns:
+        DiskCache 또는 None (비활성화/사용 불가 시)
+    """
+    if not HAS_DISK_CACHE:
+        return None
+
+    try:
+        max_mb = float(os.getenv("OMR_CACHE_MAX_MB", "500"))
+    except ValueError:
+        max_mb = 500
+    if max_mb <= 0:
+        return None
+
+    cache_dir = os.getenv("OMR_CACHE_DIR", "temp/omr_cache")
+    return DiskCache(cache_dir, max_bytes=int(max_mb * 1024 * 1024), suffix=".xml")
+
+
 class AudiverisOmr:
     """Audiveris를 사용한 OMR 서비스"""
     
-    def __init__(self, audiveris_bin: Union[str, Path]):
+    def __init__(self, audiveris_bin: Union[str, Path], cache: Optional["DiskCache"] = None,
+                 options: Optional[List[str]] = None):
         """
         Audiveris OMR 서비스 초기화
         
         Args:
             audiveris_bin: Audiveris 실행 파일 경로
+            cache: OMR 결과 캐시 (None이면 캐시하지 않음)
+            options: Audiveris에 추가로 전달할 명령행 옵션
             
         Raises:
             OmrError: Audiveris 실행 파일을 찾을 수 없을 때
         """
         self.audiveris_bin = Path(audiveris_bin)
+        self.cache = cache
+        self.options = list(options or [])
 
         if not self.audiveris_bin.exists():
             raise OmrError(f"Audiveris 실행 파일을 찾을 수 없습니다: {self.audiveris_bin}")
 
+        self.fingerprint = self._engine_fingerprint()
+
+    def _engine_fingerprint(self) -> str:
+        """
+        Audiveris 버전 식별값 (실행 파일 경로/크기/수정 시각 + 옵션)
+
+        Audiveris를 업그레이드하거나 옵션을 바꾸면 값이 달라져 기존 캐시가 자동으로 무효화됩니다.
+        """
+        stat = self.audiveris_bin.stat()
+        return "|".join([
+            str(self.audiveris_bin.resolve()),
+            str(stat.st_size),
+            str(int(stat.st_mtime)),
+            " ".join(self.options),
+        ])
+
+    def cache_key(self, image_bytes: bytes, suffix: str = ".png") -> str:
+        """이미지 내용 해시 + 엔진 식별값으로 캐시 키 생성"""
+        return hash_key(image_bytes, suffix.lower(), self.fingerprint, CACHE_FORMAT_VERSION)
+
     def image_to_musicxml(self, image_bytes: bytes, suffix: str = ".png") -> str:
         """
         이미지 바이너리를 Audiveris로 돌려 MusicXML 문자열을 반환.
+        같은 이미지가 캐시에 있으면 Audiveris를 실행하지 않고 바로 반환합니다.
         
         Args:
             image_bytes: 이미지 파일의 바이너리 데이터
@@ -45,6 +184,62 @@ class AudiverisOmr:
         Raises:
             OmrError: Audiveris 실행 실패 또는 MusicXML 생성 실패 시
         """
+        if self.cache is not None:
+            key = self.cache_key(image_bytes, suffix)
+            cached = self.cache.get_bytes(key)
+            if cached is not None:
+                return cached.decode("utf-8")
+
+        xml_text = self._run_audiveris(image_bytes, suffix)
+
+        if self.cache is not None:
+            try:
+                self.cache.put_bytes(key, xml_text.encode("utf-8"))
+            except OSError as e:
+                print(f"[WARN] OMR 캐시 저장 실패: {e}")
+
+        return xml_text
+
+    def prewarm(self, folder: Union[str, Path], recursive: bool = False) -> Dict[str, int]:
+        """
+        폴더의 악보 이미지를 미리 OMR 처리하여 캐시에 저장 (오프라인 일괄 처리용)
+
+        Args:
+            folder: 스캔 이미지(PNG/JPG/PDF 등)가 있는 폴더
+            recursive: 하위 폴더까지 처리할지 여부
+
+        Returns:
+            처리 결과 개수 {"processed", "cached", "failed"}
+        """
+        if self.cache is None:
+            raise OmrError("OMR 캐시가 비활성화되어 있어 미리 처리할 수 없습니다.")
+
+        pattern = "**/*" if recursive else "*"
+        result = {"processed": 0, "cached": 0, "failed": 0}
+
+        for path in sorted(Path(folder).glob(pattern)):
+            suffix = path.suffix.lower()
+            if not path.is_file() or suffix not in IMAGE_SUFFIXES + [".pdf"]:
+                continue
+
+            image_bytes = path.read_bytes()
+            if self.cache.path_for(self.cache_key(image_bytes, suffix)).exists():
+                result["cached"] += 1
+                continue
+
+            try:
+                self.image_to_musicxml(image_bytes, suffix=suffix)
+                result["processed"] += 1
+                print(f"[OK] {path.name}")
+            except OmrError as e:
+                result["failed"] += 1
+                print(f"[WARN] {path.name}: {e}")
+
+        return result
+
+    @timed_stage("omr", "audiveris")
+    def _run_audiveris(self, image_bytes: bytes, suffix: str) -> str:
+        """Audiveris를 실제로 실행하여 MusicXML 문자열 생성"""
         with tempfile.TemporaryDirectory() as tmpdir:
             tmpdir = Path(tmpdir)
             img_path = tmpdir / f"input{suffix}"
@@ -59,6 +254,7 @@ class AudiverisOmr:
                 str(self.audiveris_bin),
                 "-batch",
                 "-export",
+                *self.options,
                 "-output", str(out_dir),
                 str(img_path),
             ]
@@ -79,7 +275,6 @@ class AudiverisOmr:
             if not xml_files:
                 raise OmrError("Audiveris가 MusicXML 파일을 생성하지 못했습니다.")
 
-            # 가장 첫 번째 파일 읽기
-            xml_text = xml_files[0].read_text(encoding="utf-8", errors="ignore")
-            return xml_text
+            # 가장 첫 번째 파일 읽기 (.mxl은 압축을 풀어서 - 캐시에는 MusicXML 문자열만 저장)
+            return read_musicxml_output(xml_files[0])
 
@@ -9,153 +9,185 @@ try:
 except ImportError:
     HAS_STREAMLIT = False
     st = None
-from typing import Optional
+from typing import Iterator, Optional
 from pathlib import Path
+from contextlib import contextmanager
+from io import BytesIO
 import subprocess
 import os
-import shutil
+import tempfile
+import threading
+import zipfile
 
 # OMR Service (optional)
 try:
-    from omr_service import AudiverisOmr, OmrError
+    from omr_service import AudiverisOmr, OmrError, create_omr_cache, get_audiveris_path
     HAS_OMR_SERVICE = True
 except ImportError:
     HAS_OMR_SERVICE = False
     AudiverisOmr = None
     OmrError = None
+    create_omr_cache = None
+    get_audiveris_path = None
 
-def get_audiveris_path() -> Optional[str]:
-    """Audiveris 실행 파일 경로 찾기"""
-    # 1. PATH에서 찾기
-    audiveris_exe = shutil.which("audiveris")
-    if audiveris_exe:
-        return audiveris_exe
-    
-    # 2. 일반적인 Windows 경로 확인
-    common_paths = [
-        r"C:\Program Files\Audiveris\bin\audiveris.exe",
-        r"C:\Program Files (x86)\Audiveris\bin\audiveris.exe",
-        r"C:\Audiveris\bin\audiveris.exe",
-    ]
+# 공유 OMR 엔진 (변환할 때마다 엔진과 결과 캐시를 새로 만들지 않도록 하나만 유지)
+_omr_engine = None
+_omr_engine_lock = threading.Lock()
+
+def _get_omr_engine(audiveris_path: str):
+    """Audiveris 경로에 맞는 공유 OMR 엔진 반환 (경로가 바뀌면 새로 생성)"""
+    global _omr_engine
+    with _omr_engine_lock:
+        if _omr_engine is None or str(_omr_engine.audiveris_bin) != str(audiveris_path):
+            _omr_engine = AudiverisOmr(audiveris_path, cache=create_omr_cache())
+        return _omr_engine
+
+def _warn(message: str):
+    """Streamlit 환경이면 화면에, 아니면 콘솔에 경고 출력"""
+    if HAS_STREAMLIT and st:
+        st.warning(message)
+    else:
+        print(f"[WARN] {message}")
+
+def read_musicxml_file(path: Path) -> str:
+    """
+    MusicXML 파일 읽기 (.mxl 압축 파일이면 내부 악보 파일을 꺼내서 읽음)
     
-    for path_str in common_paths:
-        path = Path(path_str)
-        if path.exists():
-            return str(path)
+    Args:
+        path: .xml / .musicxml / .mxl 파일 경로
+        
+    Returns:
+        MusicXML 문자열
+    """
+    path = Path(path)
+    if path.suffix.lower() != ".mxl":
+        return path.read_text(encoding="utf-8", errors="ignore")
     
-    return None
+    with zipfile.ZipFile(path) as archive:
+        names = [n for n in archive.namelist()
+                 if n.lower().endswith((".xml", ".musicxml")) and not n.startswith("META-INF/")]
+        if not names:
+            raise ValueError(f"MXL 파일에 악보가 없습니다: {path}")
+        return archive.read(names[0]).decode("utf-8", errors="ignore")
 
 class PDFScoreParser:
-    """Parse PDF music scores using OMR (Optical Music Recognition)"""
+    """Parse PDF music scores using OMR (Optical Music Recognition)
+    
+    각 변환 작업은 temp/pdf 아래의 고유한 작업 디렉토리에서 실행되고 끝나면 삭제되므로,
+    여러 PDF를 동시에 변환해도 중간 파일이나 결과가 섞이지 않습니다.
+    """
     
     def __init__(self):
         self.temp_dir = Path("temp/pdf")
         self.temp_dir.mkdir(parents=True, exist_ok=True)
     
-    def parse_pdf_with_audiveris(self, pdf_path: str) -> Optional[str]:
+    @contextmanager
+    def job_workspace(self) -> Iterator[Path]:
         """
-        Parse PDF using Audiveris OMR
+        작업 전용 임시 디렉토리 (블록을 벗어나면 자동 삭제)
+        
+        Yields:
+            작업 디렉토리 경로
+        """
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix="job_", dir=str(self.temp_dir)) as job_dir:
+            yield Path(job_dir)
+    
+    def parse_pdf_to_musicxml(self, pdf_path: str) -> Optional[str]:
+        """
+        Parse PDF using Audiveris OMR and return MusicXML text
+        
+        결과를 공유 폴더에 남기지 않고 문자열로 반환합니다 (동시 요청에 안전).
         
         Args:
             pdf_path: Path to PDF file
             
         Returns:
-            Path to generated MusicXML file
+            MusicXML string or None
         """
         try:
-            # 방법 1: OMR Service 사용 (권장)
+            # 방법 1: OMR Service 사용 (권장, 결과 캐시 공유)
             if HAS_OMR_SERVICE and AudiverisOmr:
                 audiveris_path = get_audiveris_path()
                 if audiveris_path:
                     try:
-                        omr = AudiverisOmr(audiveris_path)
+                        omr = _get_omr_engine(audiveris_path)
                         
                         # PDF 파일을 바이너리로 읽기
                         pdf_bytes = Path(pdf_path).read_bytes()
                         
                         # OMR로 MusicXML 변환
-                        musicxml_text = omr.image_to_musicxml(pdf_bytes, suffix=".pdf")
-                        
-                        # MusicXML 파일로 저장
-                        xml_path = self.temp_dir / "output" / f"{Path(pdf_path).stem}.xml"
-                        xml_path.parent.mkdir(parents=True, exist_ok=True)
-                        xml_path.write_text(musicxml_text, encoding='utf-8')
-                        
-                        return str(xml_path)
+                        return omr.image_to_musicxml(pdf_bytes, suffix=".pdf")
                     except OmrError as e:
-                        if HAS_STREAMLIT and st:
-                            st.warning(f"OMR 변환 실패: {str(e)}")
-                        else:
-                            print(f"[WARN] OMR 변환 실패: {str(e)}")
+                        _warn(f"OMR 변환 실패: {str(e)}")
                     except Exception as e:
-                        if HAS_STREAMLIT and st:
-                            st.warning(f"OMR 처리 중 오류: {str(e)}")
-                        else:
-                            print(f"[WARN] OMR 처리 중 오류: {str(e)}")
-            
-            # 방법 2: 기존 방식 (fallback)
-            output_dir = self.temp_dir / "output"
-            output_dir.mkdir(exist_ok=True)
-            
-            # Run Audiveris CLI
-            audiveris_cmd = get_audiveris_path() or 'audiveris'
-            result = subprocess.run([
-                audiveris_cmd,
-                '-batch',
-                '-export',
-                '-output', str(output_dir),
-                pdf_path
-            ], capture_output=True, text=True, timeout=300)
+                        _warn(f"OMR 처리 중 오류: {str(e)}")
             
-            if result.returncode == 0:
-                # Find generated MusicXML file
-                xml_files = list(output_dir.glob("*.mxl")) + list(output_dir.glob("*.xml"))
-                if xml_files:
-                    return str(xml_files[0])
+            # 방법 2: 기존 방식 (fallback) - 작업 전용 출력 폴더 사용
+            with self.job_workspace() as job_dir:
+                output_dir = job_dir / "output"
+                output_dir.mkdir()
+                
+                # Run Audiveris CLI
+                audiveris_cmd = (get_audiveris_path() if get_audiveris_path else None) or 'audiveris'
+                result = subprocess.run([
+                    audiveris_cmd,
+                    '-batch',
+                    '-export',
+                    '-output', str(output_dir),
+                    pdf_path
+                ], capture_output=True, text=True, timeout=300)
+                
+                if result.returncode == 0:
+                    # Find generated MusicXML file (이 작업의 출력만 검색)
+                    xml_files = sorted(output_dir.rglob("*.mxl")) + sorted(output_dir.rglob("*.xml"))
+                    if xml_files:
+                        return read_musicxml_file(xml_files[0])
             
             return None
             
         except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-            if HAS_STREAMLIT and st:
-                st.warning(f"Audiveris를 찾을 수 없습니다: {str(e)}")
-            else:
-                print(f"[WARN] Audiveris를 찾을 수 없습니다: {str(e)}")
+            _warn(f"Audiveris를 찾을 수 없습니다: {str(e)}")
             return None
         except Exception as e:
-            if HAS_STREAMLIT and st:
-                st.warning(f"Audiveris 오류: {str(e)}")
-            else:
-                print(f"[WARN] Audiveris 오류: {str(e)}")
+            _warn(f"Audiveris 오류: {str(e)}")
             return None
     
-    def convert_pdf_to_images(self, pdf_path: str) -> list:
+    def render_pdf_pages(self, pdf_path: str, dpi: int = 200,
+                         first_page: Optional[int] = None,
+                         last_page: Optional[int] = None) -> list:
         """
-        Convert PDF pages to images for preview
+        Render PDF pages to in-memory PNG images
         
         Args:
             pdf_path: Path to PDF file
+            dpi: Render resolution
+            first_page: First page to render (1-based, None이면 처음부터)
+            last_page: Last page to render (None이면 끝까지)
             
         Returns:
-            List of image paths
+            List of PNG bytes (one per page)
         """
         try:
             from pdf2image import convert_from_path
             
-            images = convert_from_path(pdf_path, dpi=200)
-            image_paths = []
+            images = convert_from_path(
+                pdf_path, dpi=dpi, first_page=first_page, last_page=last_page
+            )
             
-            for i, image in enumerate(images):
-                img_path = self.temp_dir / f"page_{i+1}.png"
-                image.save(img_path, 'PNG')
-                image_paths.append(str(img_path))
+            pages = []
+            for image in images:
+                buffer = BytesIO()
+                image.save(buffer, 'PNG')
+                pages.append(buffer.getvalue())
             
-            return image_paths
+            return pages
             
         except ImportError:
-            st.warning("pdf2image 라이브러리가 필요합니다: pip install pdf2image")
+            _warn("pdf2image 라이브러리가 필요합니다: pip install pdf2image")
             return []
         except Exception as e:
-            st.warning(f"PDF 변환 오류: {str(e)}")
+            _warn(f"PDF 변환 오류: {str(e)}")
             return []
     
     def extract_text_from_pdf(self, pdf_path: str) -> str:
@@ -180,10 +212,10 @@ class PDFScoreParser:
             return text
             
         except ImportError:
-            st.warning("PyPDF2 라이브러리가 필요합니다: pip install PyPDF2")
+            _warn("PyPDF2 라이브러리가 필요합니다: pip install PyPDF2")
             return ""
         except Exception as e:
-            st.warning(f"텍스트 추출 오류: {str(e)}")
+            _warn(f"텍스트 추출 오류: {str(e)}")
             return ""
 
 
@@ -10,12 +10,26 @@ except ImportError:
     HAS_STREAMLIT = False
     st = None
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Callable
 import requests
+from requests.adapters import HTTPAdapter
+import httpx
+import asyncio
 import json
 import os
+import threading
+import time
 from pathlib import Path
 
+try:
+    from http_client import request_with_retry
+    from response_cache import TTLCache, normalize_key
+    from resilience import CircuitOpenError, get_breaker, is_upstream_failure
+except ImportError:
+    from .http_client import request_with_retry
+    from .response_cache import TTLCache, normalize_key
+    from .resilience import CircuitOpenError, get_breaker, is_upstream_failure
+
 # Load environment variables from .env file in project root
 try:
     from dotenv import load_dotenv
@@ -32,18 +46,61 @@ except ImportError:
 except Exception:
     pass  # Failed to load .env, use system env vars only
 
+# 기본 검색 모델
+DEFAULT_MODEL = "llama-3.1-sonar-large-128k-online"
+
+
+class PerplexityError(Exception):
+    """Perplexity API 호출 실패
+
+    kind: "timeout", "network", "http", "format", "unavailable"(서킷 열림) 중 하나
+    """
+    
+    def __init__(self, message: str, kind: str = "http", status_code: Optional[int] = None):
+        super().__init__(message)
+        self.kind = kind
+        self.status_code = status_code
+
+
 class PerplexityAssistant:
     """Perplexity AI for real-time music education research"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    # 같은 검색 결과 재사용 시간(초)
+    CACHE_TTL = 6 * 3600
+    # API 키 검증 결과 재사용 시간(초) - 유효/무효
+    VALIDATION_TTL = 600
+    INVALID_VALIDATION_TTL = 60
+    
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """
         Initialize Perplexity assistant
         
         Args:
             api_key: Perplexity API key (optional, can use st.secrets)
+            base_url: API URL (테스트용 로컬 목 서버 등, 기본값: PERPLEXITY_API_URL 또는 Perplexity API)
         """
         self.api_key = api_key or self._get_api_key()
-        self.base_url = "https://api.perplexity.ai/chat/completions"
+        self.base_url = (
+            base_url
+            or os.getenv("PERPLEXITY_API_URL")
+            or "https://api.perplexity.ai/chat/completions"
+        )
+        
+        # 동기 호출용 공유 세션 (keep-alive 연결 재사용)
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=10))
+        self.session.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=10))
+        
+        # 검색 결과 캐시 (PERPLEXITY_CACHE_DB를 지정하면 SQLite에도 저장)
+        self.cache = TTLCache(
+            max_entries=int(os.getenv("PERPLEXITY_CACHE_MAX_ENTRIES", "500")),
+            default_ttl=float(os.getenv("PERPLEXITY_CACHE_TTL", str(self.CACHE_TTL))),
+            sqlite_path=os.getenv("PERPLEXITY_CACHE_DB") or None,
+            namespace="perplexity",
+        )
+        
+        self._validation: Optional[tuple] = None  # (만료 시각, API 키, 결과)
+        self._validation_lock = threading.Lock()
     
     def _get_api_key(self) -> Optional[str]:
         """Get API key from multiple sources (priority order)"""
@@ -64,21 +121,23 @@ class PerplexityAssistant:
         # 3. No key found
         return None
     
-    def search_music_theory(self, topic: str, depth: str = "basic") -> str:
+    # ---- 요청 구성 ----
+    
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+    
+    def _build_request(self, method: str, *args) -> Dict:
         """
-        Search for music theory information with latest sources
+        검색 유형별 요청 본문과 후처리 설정
         
-        Args:
-            topic: Music theory topic to research
-            depth: Level of depth (basic, intermediate, advanced)
-            
         Returns:
-            Research results with sources
+            {"payload": 요청 JSON, "citation_title": 출처 제목 또는 None, "citation_limit": 출처 개수}
         """
-        if not self.api_key:
-            return self._fallback_theory_search(topic)
-        
-        try:
+        if method == "search_music_theory":
+            topic, depth = args
             prompt = f"""음악 이론 주제 '{topic}'에 대해 초등학교 음악 교육에 적합한 정보를 찾아주세요.
 
 난이도: {depth}
@@ -89,378 +148,372 @@ class PerplexityAssistant:
 4. 참고 자료
 
 초등학생과 교사가 이해하기 쉽게 정리해주세요."""
+            system = "당신은 초등학교 음악 교육 전문가입니다. 최신 정보와 신뢰할 수 있는 출처를 기반으로 답변합니다."
+            temperature, max_tokens = 0.2, 1000
+            citation_title, citation_limit = "**참고 자료:**", 3
+        
+        elif method == "research_song_background":
+            song_title, = args
+            prompt = f"""'{song_title}' 곡에 대한 배경 정보를 초등학교 음악 수업용으로 조사해주세요:
+
+포함 내용:
+1. 곡의 작곡가와 시대
+2. 곡의 의미와 배경
+3. 교육적 활용 방안
+4. 재미있는 사실
+
+초등학생이 흥미를 가질 수 있게 작성해주세요."""
+            system = "음악 교육 전문가로서 정확하고 흥미로운 정보를 제공합니다."
+            temperature, max_tokens = 0.3, 800
+            citation_title, citation_limit = None, 0
+        
+        elif method == "find_teaching_resources":
+            topic, grade_level = args
+            prompt = f"""초등학교 {grade_level} 학생을 위한 '{topic}' 교육 자료를 추천해주세요:
+
+포함 내용:
+1. 최신 교육 자료 (웹사이트, 앱 등)
+2. 무료 리소스
+3. 활용 방법
+4. 주의사항
 
-            response = requests.post(
-                self.base_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "llama-3.1-sonar-large-128k-online",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "당신은 초등학교 음악 교육 전문가입니다. 최신 정보와 신뢰할 수 있는 출처를 기반으로 답변합니다."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.2,
-                    "max_tokens": 1000
-                },
-                timeout=30
+실제로 사용 가능한 최신 자료 위주로 추천해주세요."""
+            system = "교육 자료 전문가로서 최신 정보를 제공합니다."
+            temperature, max_tokens = 0.2, 1000
+            citation_title, citation_limit = "**추천 링크:**", 5
+        
+        elif method == "get_latest_education_trends":
+            area, = args
+            prompt = f"""{area} 분야의 최신 트렌드와 연구 결과를 요약해주세요:
+
+포함 내용:
+1. 최근 1년 내 주요 트렌드
+2. 혁신적인 교수법
+3. 기술 활용 사례
+4. 전문가 의견
+
+한국 교육 현장에 적용 가능한 내용 위주로 작성해주세요."""
+            system = "교육 트렌드 분석 전문가입니다."
+            temperature, max_tokens = 0.2, 1000
+            citation_title, citation_limit = None, 0
+        
+        elif method == "compare_teaching_methods":
+            method1, method2 = args
+            prompt = f"""초등 음악 교육에서 '{method1}'와 '{method2}' 교수법을 비교 분석해주세요:
+
+비교 항목:
+1. 각 방법의 특징
+2. 장단점
+3. 적용 대상
+4. 효과성 연구 결과
+5. 실제 적용 사례
+
+객관적이고 연구 기반 정보로 작성해주세요."""
+            system = "음악 교육 연구자로서 객관적 분석을 제공합니다."
+            temperature, max_tokens = 0.2, 1200
+            citation_title, citation_limit = None, 0
+        
+        else:
+            raise ValueError(f"알 수 없는 검색 유형: {method}")
+        
+        return {
+            "payload": {
+                "model": DEFAULT_MODEL,
+                "messages": [
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt}
+                ],
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            },
+            "citation_title": citation_title,
+            "citation_limit": citation_limit,
+        }
+    
+    def _parse_response(self, status_code: int, result_text: str, result_json: Optional[Dict],
+                        request: Dict) -> str:
+        """API 응답에서 본문(+출처) 추출, 실패 시 PerplexityError"""
+        if status_code != 200:
+            error_msg = result_text
+            if isinstance(result_json, dict):
+                error = result_json.get('error')
+                if isinstance(error, dict):
+                    error_msg = error.get('message', result_text)
+            print(f"[ERROR] Perplexity API 오류 (HTTP {status_code}): {error_msg}")
+            raise PerplexityError(error_msg, kind="http", status_code=status_code)
+        
+        if not isinstance(result_json, dict) or not result_json.get('choices'):
+            print(f"[WARN] Perplexity API 응답 형식 오류: {result_json}")
+            raise PerplexityError("응답 형식 오류", kind="format")
+        
+        content = result_json['choices'][0]['message']['content']
+        
+        # Extract sources if available
+        citations = result_json.get('citations', [])
+        if request["citation_title"] and citations:
+            content += f"\n\n{request['citation_title']}\n"
+            for i, citation in enumerate(citations[:request["citation_limit"]], 1):
+                content += f"{i}. {citation}\n"
+        
+        return content
+    
+    # 업스트림 장애 시 요청마다 30초씩 기다리지 않도록 서킷 브레이커/적응형 타임아웃 적용
+    REQUEST_TIMEOUT = 30
+    
+    def _post(self, request: Dict) -> str:
+        """동기 요청 (공유 requests 세션)"""
+        def attempt(timeout: float) -> str:
+            response = self.session.post(
+                self.base_url, headers=self._headers(), json=request["payload"], timeout=timeout
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                
-                # 응답 구조 확인
-                if 'choices' in result and len(result['choices']) > 0:
-                    content = result['choices'][0]['message']['content']
-                    
-                    # Extract sources if available
-                    citations = result.get('citations', [])
-                    if citations:
-                        content += "\n\n**참고 자료:**\n"
-                        for i, citation in enumerate(citations[:3], 1):
-                            content += f"{i}. {citation}\n"
-                    
-                    return content
-                else:
-                    # 응답 구조가 예상과 다른 경우
-                    error_msg = f"Perplexity API 응답 형식 오류: {result}"
-                    print(f"[WARN] {error_msg}")
-                    return self._fallback_theory_search(topic)
-            else:
-                # HTTP 오류 응답 처리
-                error_text = response.text
-                try:
-                    error_json = response.json()
-                    error_msg = error_json.get('error', {}).get('message', error_text)
-                except:
-                    error_msg = error_text
-                
-                print(f"[ERROR] Perplexity API 오류 (HTTP {response.status_code}): {error_msg}")
-                return self._fallback_theory_search(topic)
-                
+            try:
+                result_json = response.json()
+            except ValueError:
+                result_json = None
+            return self._parse_response(response.status_code, response.text, result_json, request)
+        
+        try:
+            return get_breaker("perplexity").call_sync(
+                attempt, self.REQUEST_TIMEOUT, is_failure=is_upstream_failure
+            )
+        except CircuitOpenError as e:
+            raise PerplexityError(str(e), kind="unavailable")
         except requests.exceptions.Timeout:
-            error_msg = "Perplexity API 요청 시간이 초과되었습니다. 네트워크 연결을 확인하세요."
-            if HAS_STREAMLIT and st:
-                st.warning(error_msg)
-            else:
-                print(f"[ERROR] {error_msg}")
-            return self._fallback_theory_search(topic)
+            raise PerplexityError("요청 시간 초과", kind="timeout")
         except requests.exceptions.RequestException as e:
-            error_msg = f"Perplexity API 네트워크 오류: {str(e)}"
-            if HAS_STREAMLIT and st:
-                st.warning(error_msg)
-            else:
-                print(f"[ERROR] {error_msg}")
-            return self._fallback_theory_search(topic)
+            raise PerplexityError(str(e), kind="network")
+    
+    async def _post_async(self, request: Dict) -> str:
+        """비동기 요청 (공유 httpx 연결 풀, 일시적 오류 재시도)"""
+        async def attempt(timeout: float) -> str:
+            response = await request_with_retry(
+                "POST", self.base_url, headers=self._headers(), json=request["payload"],
+                timeout=timeout, retries=1, total_timeout=timeout
+            )
+            try:
+                result_json = response.json()
+            except ValueError:
+                result_json = None
+            return self._parse_response(response.status_code, response.text, result_json, request)
+        
+        try:
+            return await get_breaker("perplexity").call(
+                attempt, self.REQUEST_TIMEOUT, is_failure=is_upstream_failure
+            )
+        except CircuitOpenError as e:
+            raise PerplexityError(str(e), kind="unavailable")
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            raise PerplexityError("요청 시간 초과", kind="timeout")
+        except httpx.TransportError as e:
+            raise PerplexityError(str(e), kind="network")
+    
+    def _cache_key(self, method: str, *args) -> str:
+        return normalize_key(f"perplexity.{method}", *args)
+    
+    def _run(self, method: str, args: tuple, on_error: Callable[[PerplexityError], str],
+             use_cache: bool = True) -> str:
+        """
+        동기 검색 실행 (캐시 확인 → API 호출 → 캐시 저장, 실패 시 on_error 결과)
+        """
+        key = self._cache_key(method, *args)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        try:
+            content = self._post(self._build_request(method, *args))
+        except PerplexityError as e:
+            return on_error(e)
+        except Exception as e:
+            print(f"[ERROR] Perplexity 검색 오류: {str(e)}")
+            import traceback
+            print(traceback.format_exc())
+            return on_error(PerplexityError(str(e), kind="network"))
+        
+        self.cache.set(key, content)
+        return content
+    
+    async def _run_async(self, method: str, args: tuple, on_error: Callable[[PerplexityError], str],
+                         use_cache: bool = True) -> str:
+        """
+        비동기 검색 실행 - 같은 검색이 동시에 들어오면 API를 한 번만 호출
+        """
+        key = self._cache_key(method, *args)
+        try:
+            return await self.cache.get_or_compute(
+                key,
+                lambda: self._post_async(self._build_request(method, *args)),
+                bypass=not use_cache,
+            )
+        except PerplexityError as e:
+            return on_error(e)
         except Exception as e:
-            error_msg = f"Perplexity 검색 오류: {str(e)}"
-            if HAS_STREAMLIT and st:
-                st.warning(error_msg)
-            else:
-                print(f"[ERROR] {error_msg}")
+            print(f"[ERROR] Perplexity 검색 오류: {str(e)}")
             import traceback
             print(traceback.format_exc())
+            return on_error(PerplexityError(str(e), kind="network"))
+    
+    @staticmethod
+    def _warn(message: str):
+        if HAS_STREAMLIT and st:
+            st.warning(message)
+        else:
+            print(f"[ERROR] {message}")
+    
+    def _theory_error(self, topic: str) -> Callable[[PerplexityError], str]:
+        def handler(e: PerplexityError) -> str:
+            if e.kind == "unavailable":
+                print(f"[INFO] {str(e)} - 기본 자료로 대체합니다")
+            elif e.kind == "timeout":
+                self._warn("Perplexity API 요청 시간이 초과되었습니다. 네트워크 연결을 확인하세요.")
+            elif e.kind == "network":
+                self._warn(f"Perplexity API 네트워크 오류: {str(e)}")
             return self._fallback_theory_search(topic)
+        return handler
     
-    def research_song_background(self, song_title: str) -> str:
+    @staticmethod
+    def _message_error(failure_message: str) -> Callable[[PerplexityError], str]:
+        """실패 시 오류 문구를 반환하는 핸들러 (트렌드/교수법 비교용)"""
+        def handler(e: PerplexityError) -> str:
+            if e.kind == "unavailable":
+                return str(e)
+            if e.kind == "timeout":
+                return "요청 시간이 초과되었습니다. 네트워크 연결을 확인하세요."
+            if e.kind == "network":
+                return f"네트워크 오류가 발생했습니다: {str(e)}"
+            if e.kind == "http":
+                return f"{failure_message}: {str(e)}"
+            return f"{failure_message}."
+        return handler
+    
+    # ---- 검색 (동기) ----
+    
+    def search_music_theory(self, topic: str, depth: str = "basic", use_cache: bool = True) -> str:
+        """
+        Search for music theory information with latest sources
+        
+        Args:
+            topic: Music theory topic to research
+            depth: Level of depth (basic, intermediate, advanced)
+            use_cache: False면 캐시를 건너뛰고 새로 검색
+            
+        Returns:
+            Research results with sources
+        """
+        if not self.api_key:
+            return self._fallback_theory_search(topic)
+        return self._run("search_music_theory", (topic, depth), self._theory_error(topic), use_cache)
+    
+    def research_song_background(self, song_title: str, use_cache: bool = True) -> str:
         """
         Research background information about a song
         
         Args:
             song_title: Title of the song
+            use_cache: False면 캐시를 건너뛰고 새로 검색
             
         Returns:
             Song background information
         """
         if not self.api_key:
             return self._fallback_song_background(song_title)
-        
-        try:
-            prompt = f"""'{song_title}' 곡에 대한 배경 정보를 초등학교 음악 수업용으로 조사해주세요:
-
-포함 내용:
-1. 곡의 작곡가와 시대
-2. 곡의 의미와 배경
-3. 교육적 활용 방안
-4. 재미있는 사실
-
-초등학생이 흥미를 가질 수 있게 작성해주세요."""
-
-            response = requests.post(
-                self.base_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "llama-3.1-sonar-large-128k-online",
-                    "messages": [
-                        {"role": "system", "content": "음악 교육 전문가로서 정확하고 흥미로운 정보를 제공합니다."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "temperature": 0.3,
-                    "max_tokens": 800
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if 'choices' in result and len(result['choices']) > 0:
-                    return result['choices'][0]['message']['content']
-                else:
-                    print(f"[WARN] Perplexity API 응답 형식 오류: {result}")
-                    return self._fallback_song_background(song_title)
-            else:
-                error_text = response.text
-                try:
-                    error_json = response.json()
-                    error_msg = error_json.get('error', {}).get('message', error_text)
-                except:
-                    error_msg = error_text
-                print(f"[ERROR] Perplexity API 오류 (HTTP {response.status_code}): {error_msg}")
-                return self._fallback_song_background(song_title)
-                
-        except requests.exceptions.Timeout:
-            print("[ERROR] Perplexity API 요청 시간 초과")
-            return self._fallback_song_background(song_title)
-        except requests.exceptions.RequestException as e:
-            print(f"[ERROR] Perplexity API 네트워크 오류: {str(e)}")
-            return self._fallback_song_background(song_title)
-        except Exception as e:
-            print(f"[ERROR] Perplexity 검색 오류: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-            return self._fallback_song_background(song_title)
+        return self._run("research_song_background", (song_title,),
+                         lambda e: self._fallback_song_background(song_title), use_cache)
     
-    def find_teaching_resources(self, topic: str, grade_level: str) -> str:
+    def find_teaching_resources(self, topic: str, grade_level: str, use_cache: bool = True) -> str:
         """
         Find latest teaching resources and materials
         
         Args:
             topic: Teaching topic
             grade_level: Student grade level
+            use_cache: False면 캐시를 건너뛰고 새로 검색
             
         Returns:
             Teaching resource recommendations
         """
         if not self.api_key:
             return self._fallback_teaching_resources(topic, grade_level)
-        
-        try:
-            prompt = f"""초등학교 {grade_level} 학생을 위한 '{topic}' 교육 자료를 추천해주세요:
-
-포함 내용:
-1. 최신 교육 자료 (웹사이트, 앱 등)
-2. 무료 리소스
-3. 활용 방법
-4. 주의사항
-
-실제로 사용 가능한 최신 자료 위주로 추천해주세요."""
-
-            response = requests.post(
-                self.base_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "llama-3.1-sonar-large-128k-online",
-                    "messages": [
-                        {"role": "system", "content": "교육 자료 전문가로서 최신 정보를 제공합니다."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "temperature": 0.2,
-                    "max_tokens": 1000
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if 'choices' in result and len(result['choices']) > 0:
-                    content = result['choices'][0]['message']['content']
-                    
-                    # Add citations
-                    citations = result.get('citations', [])
-                    if citations:
-                        content += "\n\n**추천 링크:**\n"
-                        for i, citation in enumerate(citations[:5], 1):
-                            content += f"{i}. {citation}\n"
-                    
-                    return content
-                else:
-                    print(f"[WARN] Perplexity API 응답 형식 오류: {result}")
-                    return self._fallback_teaching_resources(topic, grade_level)
-            else:
-                error_text = response.text
-                try:
-                    error_json = response.json()
-                    error_msg = error_json.get('error', {}).get('message', error_text)
-                except:
-                    error_msg = error_text
-                print(f"[ERROR] Perplexity API 오류 (HTTP {response.status_code}): {error_msg}")
-                return self._fallback_teaching_resources(topic, grade_level)
-                
-        except requests.exceptions.Timeout:
-            print("[ERROR] Perplexity API 요청 시간 초과")
-            return self._fallback_teaching_resources(topic, grade_level)
-        except requests.exceptions.RequestException as e:
-            print(f"[ERROR] Perplexity API 네트워크 오류: {str(e)}")
-            return self._fallback_teaching_resources(topic, grade_level)
-        except Exception as e:
-            print(f"[ERROR] Perplexity 검색 오류: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-            return self._fallback_teaching_resources(topic, grade_level)
+        return self._run("find_teaching_resources", (topic, grade_level),
+                         lambda e: self._fallback_teaching_resources(topic, grade_level), use_cache)
     
-    def get_latest_education_trends(self, area: str = "초등 음악 교육") -> str:
+    def get_latest_education_trends(self, area: str = "초등 음악 교육", use_cache: bool = True) -> str:
         """
         Get latest education trends and research
         
         Args:
             area: Education area to research
+            use_cache: False면 캐시를 건너뛰고 새로 검색
             
         Returns:
             Latest trends and research findings
         """
         if not self.api_key:
             return "Perplexity API 키를 설정하면 최신 교육 트렌드를 확인할 수 있습니다."
-        
-        try:
-            prompt = f"""{area} 분야의 최신 트렌드와 연구 결과를 요약해주세요:
-
-포함 내용:
-1. 최근 1년 내 주요 트렌드
-2. 혁신적인 교수법
-3. 기술 활용 사례
-4. 전문가 의견
-
-한국 교육 현장에 적용 가능한 내용 위주로 작성해주세요."""
-
-            response = requests.post(
-                self.base_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "llama-3.1-sonar-large-128k-online",
-                    "messages": [
-                        {"role": "system", "content": "교육 트렌드 분석 전문가입니다."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "temperature": 0.2,
-                    "max_tokens": 1000
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if 'choices' in result and len(result['choices']) > 0:
-                    return result['choices'][0]['message']['content']
-                else:
-                    print(f"[WARN] Perplexity API 응답 형식 오류: {result}")
-                    return "최신 트렌드 정보를 가져오는데 실패했습니다."
-            else:
-                error_text = response.text
-                try:
-                    error_json = response.json()
-                    error_msg = error_json.get('error', {}).get('message', error_text)
-                except:
-                    error_msg = error_text
-                print(f"[ERROR] Perplexity API 오류 (HTTP {response.status_code}): {error_msg}")
-                return f"최신 트렌드 정보를 가져오는데 실패했습니다: {error_msg}"
-                
-        except requests.exceptions.Timeout:
-            return "요청 시간이 초과되었습니다. 네트워크 연결을 확인하세요."
-        except requests.exceptions.RequestException as e:
-            return f"네트워크 오류가 발생했습니다: {str(e)}"
-        except Exception as e:
-            print(f"[ERROR] Perplexity 검색 오류: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-            return f"오류가 발생했습니다: {str(e)}"
+        return self._run("get_latest_education_trends", (area,),
+                         self._message_error("최신 트렌드 정보를 가져오는데 실패했습니다"), use_cache)
     
-    def compare_teaching_methods(self, method1: str, method2: str) -> str:
+    def compare_teaching_methods(self, method1: str, method2: str, use_cache: bool = True) -> str:
         """
         Compare different teaching methods with research
         
         Args:
             method1: First teaching method
             method2: Second teaching method
+            use_cache: False면 캐시를 건너뛰고 새로 검색
             
         Returns:
             Comparison with research-backed information
         """
         if not self.api_key:
             return "Perplexity API 키를 설정하면 교수법 비교 분석이 가능합니다."
-        
-        try:
-            prompt = f"""초등 음악 교육에서 '{method1}'와 '{method2}' 교수법을 비교 분석해주세요:
-
-비교 항목:
-1. 각 방법의 특징
-2. 장단점
-3. 적용 대상
-4. 효과성 연구 결과
-5. 실제 적용 사례
-
-객관적이고 연구 기반 정보로 작성해주세요."""
-
-            response = requests.post(
-                self.base_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "llama-3.1-sonar-large-128k-online",
-                    "messages": [
-                        {"role": "system", "content": "음악 교육 연구자로서 객관적 분석을 제공합니다."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "temperature": 0.2,
-                    "max_tokens": 1200
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if 'choices' in result and len(result['choices']) > 0:
-                    return result['choices'][0]['message']['content']
-                else:
-                    print(f"[WARN] Perplexity API 응답 형식 오류: {result}")
-                    return "교수법 비교 정보를 가져오는데 실패했습니다."
-            else:
-                error_text = response.text
-                try:
-                    error_json = response.json()
-                    error_msg = error_json.get('error', {}).get('message', error_text)
-                except:
-                    error_msg = error_text
-                print(f"[ERROR] Perplexity API 오류 (HTTP {response.status_code}): {error_msg}")
-                return f"교수법 비교 정보를 가져오는데 실패했습니다: {error_msg}"
-                
-        except requests.exceptions.Timeout:
-            return "요청 시간이 초과되었습니다. 네트워크 연결을 확인하세요."
-        except requests.exceptions.RequestException as e:
-            return f"네트워크 오류가 발생했습니다: {str(e)}"
-        except Exception as e:
-            print(f"[ERROR] Perplexity 검색 오류: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-            return f"오류가 발생했습니다: {str(e)}"
+        return self._run("compare_teaching_methods", (method1, method2),
+                         self._message_error("교수법 비교 정보를 가져오는데 실패했습니다"), use_cache)
+    
+    # ---- 검색 (비동기, API 서버용) ----
+    
+    async def search_music_theory_async(self, topic: str, depth: str = "basic",
+                                        use_cache: bool = True) -> str:
+        """search_music_theory의 비동기 버전 (동시 동일 검색 병합)"""
+        if not self.api_key:
+            return self._fallback_theory_search(topic)
+        return await self._run_async("search_music_theory", (topic, depth),
+                                     self._theory_error(topic), use_cache)
+    
+    async def research_song_background_async(self, song_title: str, use_cache: bool = True) -> str:
+        """research_song_background의 비동기 버전"""
+        if not self.api_key:
+            return self._fallback_song_background(song_title)
+        return await self._run_async("research_song_background", (song_title,),
+                                     lambda e: self._fallback_song_background(song_title), use_cache)
+    
+    async def find_teaching_resources_async(self, topic: str, grade_level: str,
+                                            use_cache: bool = True) -> str:
+        """find_teaching_resources의 비동기 버전"""
+        if not self.api_key:
+            return self._fallback_teaching_resources(topic, grade_level)
+        return await self._run_async("find_teaching_resources", (topic, grade_level),
+                                     lambda e: self._fallback_teaching_resources(topic, grade_level),
+                                     use_cache)
+    
+    async def get_latest_education_trends_async(self, area: str = "초등 음악 교육",
+                                                use_cache: bool = True) -> str:
+        """get_latest_education_trends의 비동기 버전"""
+        if not self.api_key:
+            return "Perplexity API 키를 설정하면 최신 교육 트렌드를 확인할 수 있습니다."
+        return await self._run_async("get_latest_education_trends", (area,),
+                                     self._message_error("최신 트렌드 정보를 가져오는데 실패했습니다"),
+                                     use_cache)
+    
+    async def compare_teaching_methods_async(self, method1: str, method2: str,
+                                             use_cache: bool = True) -> str:
+        """compare_teaching_methods의 비동기 버전"""
+        if not self.api_key:
+            return "Perplexity API 키를 설정하면 교수법 비교 분석이 가능합니다."
+        return await self._run_async("compare_teaching_methods", (method1, method2),
+                                     self._message_error("교수법 비교 정보를 가져오는데 실패했습니다"),
+                                     use_cache)
     
     # Fallback methods
     
@@ -504,21 +557,21 @@ Perplexity API를 설정하면 곡의 배경, 작곡가 정보,
         return {
             "has_key": self.api_key is not None,
             "key_length": len(self.api_key) if self.api_key else 0,
-            "service": "Perplexity AI"
+            "service": "Perplexity AI",
+            "cache": self.cache.stats()
         }
     
-    def validate_api_key(self) -> Dict[str, any]:
-        """
-        Validate Perplexity API key by making a test API call
-        
-        Returns:
-            Dictionary with validation results:
-            {
-                "valid": bool,
-                "message": str,
-                "error": str (optional)
-            }
-        """
+    # ---- API 키 검증 ----
+    
+    # 검증 시 시도할 모델 (모델 이름 오류(400)면 다음 모델 시도)
+    VALIDATION_MODELS = [
+        "llama-3.1-sonar-large-128k-online",
+        "llama-3.1-sonar-small-128k-online",
+        "sonar",
+    ]
+    
+    def _precheck_key(self) -> Optional[Dict]:
+        """API 호출 없이 판단할 수 있는 검증 결과 (없으면 None)"""
         if not self.api_key:
             return {
                 "valid": False,
@@ -533,94 +586,139 @@ Perplexity API를 설정하면 곡의 배경, 작곡가 정보,
                 "message": "API 키 형식이 올바르지 않습니다.",
                 "error": f"Perplexity API 키는 'pplx-'로 시작해야 합니다. 현재 키: {self.api_key[:10]}..."
             }
-        
-        # 실제 API 호출로 검증
-        try:
-            import requests
-            
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            # 간단한 테스트 요청
-            test_models = [
-                "llama-3.1-sonar-large-128k-online",
-                "llama-3.1-sonar-small-128k-online",
-                "sonar",
-            ]
-            
-            for model in test_models:
-                data = {
-                    "model": model,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": "test"
-                        }
-                    ],
-                    "max_tokens": 10
-                }
-                
-                try:
-                    response = requests.post(
-                        self.base_url,
-                        headers=headers,
-                        json=data,
-                        timeout=10
-                    )
-                    
-                    if response.status_code == 200:
-                        return {
-                            "valid": True,
-                            "message": f"API 키가 유효합니다. (모델: {model})",
-                            "model": model
-                        }
-                    elif response.status_code == 401:
-                        return {
-                            "valid": False,
-                            "message": "API 키가 유효하지 않습니다.",
-                            "error": "401 Unauthorized - API 키를 확인하세요."
-                        }
-                    elif response.status_code == 400:
-                        # 모델 이름 오류일 수 있으므로 다음 모델 시도
-                        continue
-                    else:
-                        error_text = response.text
-                        try:
-                            error_json = response.json()
-                            error_msg = error_json.get('error', {}).get('message', error_text)
-                        except:
-                            error_msg = error_text
-                        
-                        # 400이 아닌 다른 오류는 키 문제일 수 있음
-                        if response.status_code != 400:
-                            return {
-                                "valid": False,
-                                "message": f"API 호출 실패 (HTTP {response.status_code})",
-                                "error": error_msg
-                            }
-                except requests.exceptions.Timeout:
-                    continue
-                except Exception as e:
-                    continue
-            
-            # 모든 모델 시도 실패
+        return None
+    
+    def _cached_validation(self) -> Optional[Dict]:
+        with self._validation_lock:
+            if self._validation is None:
+                return None
+            expires_at, api_key, result = self._validation
+            if api_key != self.api_key or time.time() > expires_at:
+                return None
+            return dict(result, cached=True)
+    
+    def _remember_validation(self, result: Dict) -> Dict:
+        # 네트워크 문제로 판단하지 못한 결과나 무효 결과는 짧게만 보관
+        ttl = self.VALIDATION_TTL if result.get("valid") else self.INVALID_VALIDATION_TTL
+        with self._validation_lock:
+            self._validation = (time.time() + ttl, self.api_key, result)
+        return result
+    
+    def _interpret_validation(self, model: str, status_code: int, text: str,
+                              result_json: Optional[Dict]) -> Optional[Dict]:
+        """검증 응답 해석 (다음 모델을 시도해야 하면 None)"""
+        if status_code == 200:
             return {
-                "valid": False,
-                "message": "API 키 검증 실패",
-                "error": "사용 가능한 모델을 찾을 수 없습니다. API 키와 네트워크 연결을 확인하세요."
+                "valid": True,
+                "message": f"API 키가 유효합니다. (모델: {model})",
+                "model": model
             }
-            
-        except ImportError:
+        if status_code == 401:
             return {
                 "valid": False,
-                "message": "requests 라이브러리가 설치되지 않았습니다.",
-                "error": "pip install requests 명령으로 설치하세요."
+                "message": "API 키가 유효하지 않습니다.",
+                "error": "401 Unauthorized - API 키를 확인하세요."
             }
-        except Exception as e:
-            return {
-                "valid": False,
-                "message": "API 키 검증 중 오류 발생",
-                "error": str(e)
-            }
\ No newline at end of file
+        if status_code == 400:
+            # 모델 이름 오류일 수 있으므로 다음 모델 시도
+            return None
+        
+        error_msg = text
+        if isinstance(result_json, dict) and isinstance(result_json.get('error'), dict):
+            error_msg = result_json['error'].get('message', text)
+        return {
+            "valid": False,
+            "message": f"API 호출 실패 (HTTP {status_code})",
+            "error": error_msg
+        }
+    
+    @staticmethod
+    def _validation_payload(model: str) -> Dict:
+        return {
+            "model": model,
+            "messages": [{"role": "user", "content": "test"}],
+            "max_tokens": 10
+        }
+    
+    VALIDATION_FAILED = {
+        "valid": False,
+        "message": "API 키 검증 실패",
+        "error": "사용 가능한 모델을 찾을 수 없습니다. API 키와 네트워크 연결을 확인하세요."
+    }
+    
+    def validate_api_key(self, force: bool = False) -> Dict[str, any]:
+        """
+        Validate Perplexity API key by making a test API call
+        
+        결과는 일정 시간 캐시되므로 상태 확인을 자주 해도 API를 매번 호출하지 않습니다.
+        
+        Args:
+            force: True면 캐시를 무시하고 다시 검증
+        
+        Returns:
+            Dictionary with validation results:
+            {
+                "valid": bool,
+                "message": str,
+                "error": str (optional)
+            }
+        """
+        precheck = self._precheck_key()
+        if precheck:
+            return precheck
+        
+        if not force:
+            cached = self._cached_validation()
+            if cached:
+                return cached
+        
+        for model in self.VALIDATION_MODELS:
+            try:
+                response = self.session.post(
+                    self.base_url, headers=self._headers(),
+                    json=self._validation_payload(model), timeout=10
+                )
+            except Exception:
+                continue
+            
+            try:
+                result_json = response.json()
+            except ValueError:
+                result_json = None
+            result = self._interpret_validation(model, response.status_code, response.text, result_json)
+            if result is not None:
+                return self._remember_validation(result)
+        
+        # 모든 모델 시도 실패
+        return self._remember_validation(dict(self.VALIDATION_FAILED))
+    
+    async def validate_api_key_async(self, force: bool = False) -> Dict[str, any]:
+        """validate_api_key의 비동기 버전 (같은 캐시 사용)"""
+        precheck = self._precheck_key()
+        if precheck:
+            return precheck
+        
+        if not force:
+            cached = self._cached_validation()
+            if cached:
+                return cached
+        
+        for model in self.VALIDATION_MODELS:
+            try:
+                response = await request_with_retry(
+                    "POST", self.base_url, headers=self._headers(),
+                    json=self._validation_payload(model), timeout=10, retries=0
+                )
+            except Exception:
+                continue
+            
+            try:
+                result_json = response.json()
+            except ValueError:
+                result_json = None
+            result = self._interpret_validation(model, response.status_code, response.text, result_json)
+            if result is not None:
+                return self._remember_validation(result)
+        
+        # 모든 모델 시도 실패
+        return self._remember_validation(dict(self.VALIDATION_FAILED))
@@ -0,0 +1,308 @@
+"""
+Profiling Module
+관리자용 요청 단위 프로파일링 (특정 파일이 유난히 느린 원인을 서버에서 바로 수집)
+
+요청에 X-Profile: 1 헤더(또는 ?profile=1)와 X-Admin-Token 헤더를 붙이면 그 요청에서
+실행된 채보/악보 변환/화음 분석 함수를 프로파일링합니다.
+- 스택 샘플링: 일정 간격으로 실행 중인 스택을 기록 (flamegraph.pl/speedscope용 folded 형식)
+- cProfile: 함수별 호출 수와 누적 시간 상위 목록
+결과는 PROFILE_DIR에 저장하고 응답 헤더 X-Profile-Id로 ID를 알려 줍니다.
+PROFILE_ADMIN_TOKEN이 설정되지 않았으면 프로파일링은 항상 꺼져 있습니다.
+"""
+
+import contextvars
+import cProfile
+import functools
+import json
+import os
+import pstats
+import secrets
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+# 관리자 토큰 (비어 있으면 프로파일링 비활성화)
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+# 결과 저장 위치와 보관 개수
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR") or Path(tempfile.gettempdir()) / "music_helper_profiles")
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+# 스택 샘플링 간격(초)
+SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+# cProfile 상위 함수 개수
+TOP_FUNCTIONS = 40
+
+# 현재 요청의 프로파일 (요청 밖에서는 None)
+_current_profile: contextvars.ContextVar = contextvars.ContextVar("request_profile", default=None)
+# 스레드별 프로파일링 중 여부 (중첩 호출은 바깥 구간에 포함)
+_local = threading.local()
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    """관리자 토큰 확인"""
+    if not PROFILE_ADMIN_TOKEN or not token:
+        return False
+    return secrets.compare_digest(token.encode(), PROFILE_ADMIN_TOKEN.encode())
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+# 샘플 스택에서 뺄 cProfile 실행 프레임
+_RUNCALL_CODE = getattr(cProfile.Profile.runcall, "__code__", None)
+
+
+class _StackSampler(threading.Thread):
+    """대상 스레드의 스택을 일정 간격으로 기록하는 샘플러
+
+    root_frame(프로파일링을 시작한 프레임) 아래 부분만 기록해 스레드 풀 등
+    바깥 프레임이 flame graph에 섞이지 않게 합니다.
+    """
+
+    def __init__(self, thread_id: int, interval: float, root_frame=None):
+        super().__init__(daemon=True, name="profile-sampler")
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root_frame = root_frame
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            in_call = _RUNCALL_CODE is None
+            while frame is not None and frame is not self.root_frame:
+                if frame.f_code is _RUNCALL_CODE:
+                    in_call = True
+                else:
+                    labels.append(_frame_label(frame))
+                frame = frame.f_back
+            # 대상 함수 실행 전후(샘플러 종료 대기 등)에 잡힌 스택은 제외
+            if labels and in_call:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def stop(self) -> Counter:
+        self._stop_event.set()
+        self.join()
+        return self.stacks
+
+
+def _top_functions(profiler: cProfile.Profile, limit: int = TOP_FUNCTIONS) -> List[Dict]:
+    """cProfile 결과에서 누적 시간 상위 함수"""
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        {
+            "function": f"{func} ({os.path.basename(filename)}:{line})",
+            "calls": calls,
+            "total_seconds": round(total, 4),
+            "cumulative_seconds": round(cumulative, 4),
+        }
+        for (filename, line, func), (_, calls, total, cumulative, _) in rows
+    ]
+
+
+class RequestProfile:
+    """요청 하나의 프로파일 (구간별 샘플 스택과 함수 통계)"""
+
+    def __init__(self, label: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.created_at = time.time()
+        self.total_seconds: Optional[float] = None
+        self.sections: List[Dict] = []
+        self.stacks: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add_section(self, name: str, seconds: float, stacks: Counter, functions: List[Dict]):
+        with self._lock:
+            self.sections.append({
+                "name": name,
+                "seconds": round(seconds, 4),
+                "samples": sum(stacks.values()),
+                "top_functions": functions,
+            })
+            for stack, count in stacks.items():
+                # 구간 이름을 루트로 두어 flame graph에서 구간별로 나뉘게 함
+                self.stacks[f"{name};{stack}"] += count
+
+    def folded(self) -> str:
+        """folded 스택 형식 ("a;b;c 횟수" 한 줄씩) - flamegraph.pl, speedscope에서 바로 열림"""
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            sections = list(self.sections)
+        return {
+            "id": self.id,
+            "label": self.label,
+            "created_at": self.created_at,
+            "total_seconds": self.total_seconds,
+            "sample_interval": SAMPLE_INTERVAL,
+            "sections": sections,
+        }
+
+    def save(self, directory: Path = PROFILE_DIR) -> Path:
+        """JSON 요약과 folded 스택 파일 저장 (오래된 결과는 PROFILE_KEEP개만 남김)"""
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.id}.json"
+        path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        (directory / f"{self.id}.folded").write_text(self.folded(), encoding="utf-8")
+        _prune(directory)
+        return path
+
+
+def _prune(directory: Path):
+    summaries = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in summaries[PROFILE_KEEP:]:
+        for path in (old, old.with_suffix(".folded")):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def list_profiles(directory: Path = PROFILE_DIR) -> List[Dict]:
+    """저장된 프로파일 요약 (최신순)"""
+    if not directory.exists():
+        return []
+    results = []
+    for path in sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        results.append({
+            "id": data.get("id"),
+            "label": data.get("label"),
+            "created_at": data.get("created_at"),
+            "total_seconds": data.get("total_seconds"),
+            "sections": [section["name"] for section in data.get("sections", [])],
+        })
+    return results
+
+
+def _profile_path(profile_id: str, suffix: str, directory: Path = PROFILE_DIR) -> Optional[Path]:
+    # ID는 uuid hex이므로 경로 조작 방지를 위해 영숫자만 허용
+    if not profile_id.isalnum():
+        return None
+    path = directory / f"{profile_id}{suffix}"
+    return path if path.exists() else None
+
+
+def load_profile(profile_id: str) -> Optional[Dict]:
+    path = _profile_path(profile_id, ".json")
+    return json.loads(path.read_text(encoding="utf-8")) if path else None
+
+
+def load_folded(profile_id: str) -> Optional[str]:
+    path = _profile_path(profile_id, ".folded")
+    return path.read_text(encoding="utf-8") if path else None
+
+
+@contextmanager
+def start_profile(label: str):
+    """현재 컨텍스트(요청)에서 프로파일링 시작"""
+    profile = RequestProfile(label)
+    token = _current_profile.set(profile)
+    started = time.perf_counter()
+    try:
+        yield profile
+    finally:
+        profile.total_seconds = round(time.perf_counter() - started, 4)
+        _current_profile.reset(token)
+
+
+def bind_context(func):
+    """
+    현재 컨텍스트(프로파일 포함)를 유지한 채 다른 스레드에서 실행하도록 감싸기
+
+    loop.run_in_executor는 contextvars를 넘기지 않으므로 프로파일링 대상 함수를
+    스레드 풀에서 실행할 때 사용합니다.
+    """
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+def profiled(name: str):
+    """
+    요청에서 프로파일링이 켜져 있을 때만 함수를 샘플링 + cProfile로 측정하는 데코레이터
+
+    켜져 있지 않으면 컨텍스트 변수 하나만 확인하고 바로 호출합니다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _current_profile.get()
+            if profile is None or getattr(_local, "active", False):
+                return func(*args, **kwargs)
+
+            _local.active = True
+            sampler = _StackSampler(threading.get_ident(), SAMPLE_INTERVAL, sys._getframe())
+            profiler = cProfile.Profile()
+            sampler.start()
+            started = time.perf_counter()
+            try:
+                return profiler.runcall(func, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                stacks = sampler.stop()
+                _local.active = False
+                profile.add_section(name, elapsed, stacks, _top_functions(profiler))
+        return wrapper
+    return decorator
+
+
+class ProfilingMiddleware:
+    """X-Profile 헤더(또는 ?profile=1)와 관리자 토큰이 있는 요청만 프로파일링하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not PROFILE_ADMIN_TOKEN:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1").lower(): value.decode("latin-1")
+                   for key, value in scope.get("headers", [])}
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        requested = headers.get("x-profile", "") in ("1", "true") or \
+            query.get("profile", [""])[0] in ("1", "true")
+        if not requested:
+            await self.app(scope, receive, send)
+            return
+        if not is_authorized(headers.get("x-admin-token")):
+            print(f"[WARN] 관리자 토큰 없이 프로파일링 요청: {scope.get('path')}")
+            await self.app(scope, receive, send)
+            return
+
+        profile = None
+        try:
+            with start_profile(f"{scope.get('method', '')} {scope.get('path', '')}") as profile:
+                async def send_with_profile_id(message):
+                    if message["type"] == "http.response.start":
+                        message = dict(message)
+                        message["headers"] = list(message.get("headers", [])) + [
+                            (b"x-profile-id", profile.id.encode()),
+                        ]
+                    await send(message)
+
+                await self.app(scope, receive, send_with_profile_id)
+        finally:
+            # 요청이 실패해도 수집한 프로파일은 저장
+            if profile is not None:
+                try:
+                    profile.save()
+                    print(f"[INFO] 프로파일 저장: {profile.id} ({profile.label}, {profile.total_seconds}초)")
+                except OSError as e:
+                    print(f"[WARN] 프로파일 저장 실패: {e}")
@@ -0,0 +1,339 @@
+"""
+Resilience Module
+외부 API(OpenAI, Perplexity, YouTube)별 서킷 브레이커와 지연 시간 기반 적응형 타임아웃
+
+업스트림이 느리거나 장애일 때 요청마다 전체 타임아웃(10~30초)을 기다리지 않고
+바로 실패 처리하여 호출한 쪽이 대체 응답으로 넘어갈 수 있게 합니다.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# 서킷 상태
+CLOSED = "closed"        # 정상 - 모든 요청 통과
+OPEN = "open"            # 차단 - 요청을 바로 실패 처리
+HALF_OPEN = "half_open"  # 복구 확인 - 시험 요청 하나만 통과
+
+# 기본 설정 (환경 변수로 조정)
+FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+RECOVERY_TIME = float(os.getenv("CIRCUIT_RECOVERY_TIME", "30"))
+MIN_TIMEOUT = float(os.getenv("ADAPTIVE_TIMEOUT_MIN", "3"))
+TIMEOUT_MULTIPLIER = float(os.getenv("ADAPTIVE_TIMEOUT_MULTIPLIER", "3"))
+
+# 호출한 쪽의 타임아웃이 먼저 동작하도록 강제 취소는 조금 늦게
+TIMEOUT_GRACE = 1.0
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 요청을 보내지 않고 실패 처리한 경우"""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(
+            f"{provider} 서비스가 일시적으로 응답하지 않아 요청을 건너뜁니다 "
+            f"({retry_after:.0f}초 후 다시 시도)"
+        )
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """
+    예외가 업스트림 장애인지 판단 (서킷 브레이커 실패로 셀지)
+
+    요청 자체의 문제인 4xx 응답(잘못된 요청, 인증 오류 등)은 업스트림이 정상 응답한
+    것이므로 제외하고, 타임아웃/연결 오류/5xx/429는 장애로 봅니다.
+    예외의 status_code 속성을 확인합니다 (openai.APIStatusError 등).
+    """
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int) and 400 <= status < 500 and status not in (408, 429):
+        return False
+    return True
+
+
+class CircuitBreaker:
+    """업스트림 하나에 대한 서킷 브레이커 + 지연 시간 기록
+
+    연속 실패가 failure_threshold번 쌓이면 서킷을 열고, recovery_time 동안은
+    요청을 보내지 않습니다. 그 뒤 시험 요청 하나가 성공하면 다시 닫습니다.
+
+    성공한 요청의 지연 시간을 최근 window개까지 기록해 두고, 타임아웃을
+    p95 × multiplier로 줄여서(기본 타임아웃을 넘지 않음) 느려진 업스트림이
+    요청당 수십 초씩 잡아먹지 않게 합니다.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD,
+                 recovery_time: float = RECOVERY_TIME, window: int = 100,
+                 min_samples: int = 20, percentile: float = 0.95,
+                 timeout_multiplier: float = TIMEOUT_MULTIPLIER,
+                 min_timeout: float = MIN_TIMEOUT):
+        """
+        서킷 브레이커 초기화
+
+        Args:
+            name: 업스트림 이름 (로그/통계용)
+            failure_threshold: 서킷을 여는 연속 실패 횟수
+            recovery_time: 서킷을 연 뒤 시험 요청까지 기다리는 시간(초)
+            window: 지연 시간 기록 개수
+            min_samples: 적응형 타임아웃을 쓰기 위한 최소 기록 수
+            percentile: 타임아웃 계산에 쓸 백분위수 (0~1)
+            timeout_multiplier: 백분위 지연 시간에 곱할 배수
+            min_timeout: 적응형 타임아웃 하한(초)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+
+        self._latencies: deque = deque(maxlen=window)
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+        # 통계
+        self._calls = 0
+        self._successes = 0
+        self._failures = 0
+        self._timeouts = 0
+        self._short_circuited = 0
+        self._last_error: Optional[str] = None
+
+    # 상태 관리
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_time:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def before_call(self):
+        """
+        요청을 보내도 되는지 확인
+
+        Raises:
+            CircuitOpenError: 서킷이 열려 있거나 다른 시험 요청이 진행 중인 경우
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                self._calls += 1
+                return
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._calls += 1
+                return
+            self._short_circuited += 1
+            retry_after = max(0.0, self.recovery_time - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self, latency: float):
+        """성공 기록 (지연 시간 포함)"""
+        with self._lock:
+            self._successes += 1
+            self._latencies.append(latency)
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+            if self._state != CLOSED:
+                print(f"[INFO] {self.name} 서킷 복구 (closed)")
+            self._state = CLOSED
+
+    def record_failure(self, error: Optional[BaseException] = None):
+        """실패 기록 - 연속 실패가 임계값에 도달하거나 시험 요청이 실패하면 서킷을 엶"""
+        with self._lock:
+            self._failures += 1
+            self._consecutive_failures += 1
+            if isinstance(error, asyncio.TimeoutError) or "Timeout" in type(error).__name__:
+                self._timeouts += 1
+            if error is not None:
+                self._last_error = f"{type(error).__name__}: {error}"[:200]
+            was_probe = self._state == HALF_OPEN
+            self._probe_in_flight = False
+            if was_probe or self._consecutive_failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    print(f"[WARN] {self.name} 서킷 열림 - {self.recovery_time:.0f}초 동안 요청을 건너뜁니다")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        """결과를 판단하지 않고 요청 종료 (취소된 경우 등)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def reset(self):
+        """서킷 닫기 및 기록 초기화"""
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+            self._latencies.clear()
+
+    # 적응형 타임아웃
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """최근 성공 요청의 지연 시간 백분위수 (기록이 없으면 None)"""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(percentile * (len(samples) - 1))))
+        return samples[index]
+
+    def timeout(self, default: float) -> float:
+        """
+        이번 요청에 쓸 타임아웃
+
+        기록이 min_samples개 이상이면 p95 × multiplier (min_timeout ~ default 범위),
+        아니면 default를 그대로 사용합니다.
+
+        Args:
+            default: 기본(최대) 타임아웃(초)
+
+        Returns:
+            타임아웃(초)
+        """
+        with self._lock:
+            enough = len(self._latencies) >= self.min_samples
+        if not enough:
+            return default
+        p = self.latency_percentile(self.percentile)
+        return max(min(self.min_timeout, default), min(default, p * self.timeout_multiplier))
+
+    # 호출 래퍼
+
+    async def call(self, func: Callable[[float], Awaitable[Any]], default_timeout: float,
+                   is_failure: Optional[Callable[[BaseException], bool]] = None) -> Any:
+        """
+        서킷 브레이커와 적응형 타임아웃을 적용해 async 함수 호출
+
+        func에는 이번 요청의 타임아웃을 넘겨 주므로 func가 직접 적용해야 합니다
+        (httpx/SDK timeout 등). 여기서는 timeout + TIMEOUT_GRACE 초가 지나면
+        강제로 취소하는 안전장치만 둡니다.
+
+        Args:
+            func: 타임아웃(초)을 받아 코루틴을 만드는 함수
+            default_timeout: 기본(최대) 타임아웃(초)
+            is_failure: 예외가 업스트림 장애인지 판단하는 함수 (기본: 모든 예외)
+
+        Returns:
+            func의 결과
+
+        Raises:
+            CircuitOpenError: 서킷이 열려 있는 경우 (요청을 보내지 않음)
+            asyncio.TimeoutError: 타임아웃 안에 끝나지 않은 경우
+        """
+        self.before_call()
+        timeout = self.timeout(default_timeout)
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(func(timeout), timeout=timeout + TIMEOUT_GRACE)
+        except asyncio.CancelledError:
+            self.release()
+            raise
+        except Exception as e:
+            if is_failure is None or is_failure(e):
+                self.record_failure(e)
+            else:
+                self.release()
+            raise
+        self.record_success(time.monotonic() - started)
+        return result
+
+    def call_sync(self, func: Callable[[float], Any], default_timeout: float,
+                  is_failure: Optional[Callable[[BaseException], bool]] = None) -> Any:
+        """
+        call()의 동기 버전 (Streamlit 등)
+
+        타임아웃은 func에 전달만 하므로 func가 직접 적용해야 합니다 (예: requests timeout=).
+        """
+        self.before_call()
+        timeout = self.timeout(default_timeout)
+        started = time.monotonic()
+        try:
+            result = func(timeout)
+        except Exception as e:
+            if is_failure is None or is_failure(e):
+                self.record_failure(e)
+            else:
+                self.release()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success(time.monotonic() - started)
+        return result
+
+    def snapshot(self) -> Dict:
+        """상태 및 통계"""
+        p50 = self.latency_percentile(0.5)
+        p95 = self.latency_percentile(0.95)
+        with self._lock:
+            state = self._current_state()
+            retry_after = (
+                max(0.0, self.recovery_time - (time.monotonic() - self._opened_at))
+                if state == OPEN else 0.0
+            )
+            return {
+                "state": state,
+                "consecutive_failures": self._consecutive_failures,
+                "retry_after_seconds": round(retry_after, 1),
+                "calls": self._calls,
+                "successes": self._successes,
+                "failures": self._failures,
+                "timeouts": self._timeouts,
+                "short_circuited": self._short_circuited,
+                "latency_p50": round(p50, 3) if p50 is not None else None,
+                "latency_p95": round(p95, 3) if p95 is not None else None,
+                "samples": len(self._latencies),
+                "last_error": self._last_error,
+            }
+
+
+# 업스트림 이름 → 브레이커 (프로세스 공유)
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """
+    업스트림별 공유 서킷 브레이커 반환 (없으면 생성)
+
+    Args:
+        name: 업스트림 이름 (예: "openai", "perplexity", "youtube")
+
+    Returns:
+        CircuitBreaker
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name)
+            _breakers[name] = breaker
+        return breaker
+
+
+def breaker_stats() -> Dict[str, Dict]:
+    """모든 업스트림의 서킷 상태"""
+    with _breakers_lock:
+        breakers = list(_breakers.items())
+    return {name: breaker.snapshot() for name, breaker in breakers}
+
+
+def reset_breakers():
+    """모든 서킷 초기화"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    for breaker in breakers:
+        breaker.reset()
@@ -0,0 +1,518 @@
+"""
+Response Cache Module
+외부 API 응답용 메모리 LRU + TTL 캐시 (선택적 SQLite 영속 저장, 동시 요청 병합)
+및 비슷한 질문을 묶어주는 유사도 캐시
+"""
+
+import asyncio
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import zlib
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+def normalize_key(namespace: str, *parts: Any, **params: Any) -> str:
+    """
+    정규화된 캐시 키 생성
+
+    문자열은 유니코드 정규화(NFC), 소문자 변환, 공백 정리를 거치므로
+    "리코더 " 와 "리코더" 처럼 사실상 같은 요청은 같은 키가 됩니다.
+
+    Args:
+        namespace: 키 구분용 이름 (예: "youtube.search")
+        parts: 위치 기반 키 조각
+        params: 이름 기반 키 조각 (이름순으로 정렬됨)
+
+    Returns:
+        캐시 키 문자열
+    """
+    def norm(value: Any) -> Any:
+        if isinstance(value, str):
+            return " ".join(unicodedata.normalize("NFC", value).lower().split())
+        return value
+
+    payload = [norm(p) for p in parts] + [[k, norm(params[k])] for k in sorted(params)]
+    return f"{namespace}:{json.dumps(payload, ensure_ascii=False, separators=(',', ':'))}"
+
+
+class TTLCache:
+    """메모리 LRU + TTL 캐시
+
+    만료된 항목도 LRU에서 밀려날 때까지는 보관하므로, 외부 API를 쓸 수 없을 때
+    get(key, allow_stale=True)로 마지막 응답을 돌려줄 수 있습니다.
+    sqlite_path를 지정하면 값(JSON 직렬화 가능해야 함)을 SQLite에도 저장해
+    서버 재시작 후에도 재사용합니다.
+    """
+
+    def __init__(self, max_entries: int = 512, default_ttl: float = 300.0,
+                 sqlite_path: Optional[str] = None, namespace: str = "default"):
+        """
+        캐시 초기화
+
+        Args:
+            max_entries: 메모리에 보관할 최대 항목 수
+            default_ttl: 기본 유효 시간(초)
+            sqlite_path: SQLite 파일 경로 (None이면 메모리만 사용)
+            namespace: SQLite 테이블 안에서 캐시를 구분하는 이름
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.namespace = namespace
+        self.sqlite_path = sqlite_path
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.coalesced = 0
+
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        if sqlite_path:
+            self._init_sqlite()
+
+    # SQLite 영속 저장
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.sqlite_path, timeout=5)
+
+    def _init_sqlite(self):
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _sqlite_get(self, key: str) -> Optional[Tuple[float, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT expires_at, value FROM response_cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _sqlite_set(self, key: str, expires_at: float, value: Any):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache (namespace, key, value, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value, ensure_ascii=False), expires_at),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    # 기본 연산
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """
+        캐시 조회
+
+        Args:
+            key: 캐시 키
+            allow_stale: True면 만료된 항목도 반환
+
+        Returns:
+            저장된 값 또는 None
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None and self.sqlite_path:
+            try:
+                entry = self._sqlite_get(key)
+            except sqlite3.Error as e:
+                print(f"[WARN] 응답 캐시(SQLite) 조회 실패: {e}")
+                entry = None
+            if entry is not None:
+                self._remember(key, entry)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at >= now:
+            self.hits += 1
+            return value
+        if allow_stale:
+            self.stale_hits += 1
+            return value
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        캐시 저장
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값
+            ttl: 유효 시간(초), None이면 기본값
+        """
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        self._remember(key, (expires_at, value))
+        if self.sqlite_path:
+            try:
+                self._sqlite_set(key, expires_at, value)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                print(f"[WARN] 응답 캐시(SQLite) 저장 실패: {e}")
+
+    # 비동기 처리기용 (SQLite 입출력이 이벤트 루프를 막지 않도록 실행기에서 실행)
+
+    async def aget(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """get()의 비동기 버전 - 메모리에 없어 SQLite를 조회해야 할 때만 실행기에서 처리"""
+        with self._lock:
+            in_memory = key in self._entries
+        if in_memory or not self.sqlite_path:
+            return self.get(key, allow_stale)
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, key, allow_stale)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None):
+        """set()의 비동기 버전 - SQLite를 쓰면 저장을 실행기에서 처리"""
+        if not self.sqlite_path:
+            self.set(key, value, ttl)
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self.set, key, value, ttl)
+
+    def _remember(self, key: str, entry: Tuple[float, Any]):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        """캐시 항목 삭제"""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.sqlite_path:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "DELETE FROM response_cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+    def clear(self):
+        """모든 항목 삭제"""
+        with self._lock:
+            self._entries.clear()
+        if self.sqlite_path:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM response_cache WHERE namespace = ?", (self.namespace,))
+                conn.commit()
+            finally:
+                conn.close()
+
+    async def get_or_compute(self, key: str, factory: Callable[[], Awaitable[Any]],
+                             ttl: Optional[float] = None,
+                             bypass: bool = False) -> Any:
+        """
+        캐시에 있으면 반환하고, 없으면 계산 후 저장
+
+        같은 키로 동시에 들어온 요청은 하나의 계산 결과를 함께 기다립니다 (요청 병합).
+        factory가 None을 반환하면 캐시하지 않습니다.
+
+        Args:
+            key: 캐시 키
+            factory: 값을 계산하는 코루틴 함수
+            ttl: 유효 시간(초)
+            bypass: True면 캐시 조회를 건너뛰고 새로 계산 (결과는 저장)
+
+        Returns:
+            캐시된 값 또는 새로 계산한 값
+        """
+        if not bypass:
+            cached = await self.aget(key)
+            if cached is not None:
+                return cached
+
+        loop = asyncio.get_running_loop()
+        pending = self._inflight.get(key)
+        # 다른 이벤트 루프(동기 래퍼의 별도 루프)의 작업은 기다릴 수 없으므로 병합하지 않음
+        if pending is not None and pending.get_loop() is loop:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        async def compute():
+            value = await factory()
+            if value is not None:
+                await self.aset(key, value, ttl)
+            return value
+
+        # 계산은 별도 작업으로 실행 - 처음 요청한 쪽이 취소돼도(클라이언트 연결 끊김 등)
+        # 함께 기다리던 요청은 그대로 결과를 받음
+        task = loop.create_task(compute())
+        self._inflight[key] = task
+
+        def cleanup(done: asyncio.Task):
+            if self._inflight.get(key) is done:
+                del self._inflight[key]
+            # 기다리는 요청이 없으면 "exception was never retrieved" 경고 방지
+            if not done.cancelled():
+                done.exception()
+
+        task.add_done_callback(cleanup)
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict:
+        """캐시 상태 정보"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "persistent": bool(self.sqlite_path),
+        }
+
+
+def ngram_vector(text: str, sizes: Tuple[int, ...] = (2, 3), dims: int = 1024) -> Dict[int, float]:
+    """
+    문자 n-gram을 해싱한 희소 벡터 (L2 정규화)
+
+    임베딩 모델 없이도 "장조와 단조" / "장조 와 단조의 차이"처럼 표현만 조금 다른
+    질문을 가깝게 만들어 줍니다. 공백과 문장부호는 무시하며, crc32를 사용하므로
+    프로세스가 달라도 같은 값이 나옵니다.
+
+    Args:
+        text: 입력 문자열
+        sizes: 사용할 n-gram 길이들
+        dims: 해시 버킷 수
+
+    Returns:
+        {버킷 번호: 가중치} 딕셔너리
+    """
+    normalized = "".join(
+        ch for ch in unicodedata.normalize("NFC", text).lower() if ch.isalnum()
+    )
+    counts: Dict[int, float] = {}
+    for n in sizes:
+        for i in range(max(1, len(normalized) - n + 1)):
+            gram = f"{n}:{normalized[i:i + n]}"
+            bucket = zlib.crc32(gram.encode("utf-8")) % dims
+            counts[bucket] = counts.get(bucket, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {k: v / norm for k, v in counts.items()}
+
+
+def cosine_similarity(a: Dict[int, float], b: Dict[int, float]) -> float:
+    """정규화된 희소 벡터 간 코사인 유사도"""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+# 뜻을 바꾸는 음악 용어 (조성, 장/단조, 변화표, 숫자) - 하나만 달라도 다른 질문으로 봄
+# 앞쪽 패턴이 먼저 맞으므로 "다장조"는 "장조"가 아니라 조 이름 하나로 뽑힘
+SIGNIFICANT_TOKEN_PATTERN = re.compile(
+    r"(?:올림|내림)?\s?[다라마바사가나]\s?(?:장조|단조|장음계|단음계)"
+    r"|\b[a-g](?:\s?(?:#|♯|♭|b|sharp|flat))?\s?(?:major|minor|장조|단조)"
+    r"|장조|단조|장음계|단음계|major|minor"
+    r"|올림표|내림표|제자리표|올림|내림|샵|플랫|sharp|flat|natural|[#♯♭♮]"
+    r"|\d+(?:\.\d+)?"
+    r"|(?:한|두|세|네|다섯|여섯)\s?(?:박자|마디|음)"
+)
+
+# 유사도 단계에서 두 텍스트의 (공백/문장부호를 뺀) 길이 비율 하한
+# "나비야"와 "나비야 나비야"처럼 같은 글자가 반복된 텍스트는 n-gram이 거의 같아도 다른 요청
+MIN_LENGTH_RATIO = 0.8
+
+
+def significant_tokens(text: str) -> Counter:
+    """
+    유사도 캐시에서 반드시 같아야 하는 용어 (조 이름, 장/단조, 변화표, 숫자)
+
+    n-gram 유사도는 "다장조"와 "사장조", "올림표"와 "내림표"처럼 한 글자만 다른
+    반대 뜻의 질문을 구분하지 못하므로, 이 용어들이 모두 같을 때만 유사 적중을 허용합니다.
+
+    Returns:
+        공백을 뺀 용어별 개수
+    """
+    normalized = unicodedata.normalize("NFC", text).lower()
+    return Counter(
+        "".join(match.split()) for match in SIGNIFICANT_TOKEN_PATTERN.findall(normalized)
+    )
+
+
+def text_length(text: str) -> int:
+    """공백과 문장부호를 뺀 글자 수 (ngram_vector와 같은 기준)"""
+    return sum(1 for ch in unicodedata.normalize("NFC", text) if ch.isalnum())
+
+
+class SemanticCache:
+    """정확 일치 + 유사도 2단계 응답 캐시
+
+    1단계: scope와 정규화된 텍스트로 만든 키가 정확히 일치하면 반환
+    2단계(선택): 같은 scope 안에서 n-gram 유사도가 threshold 이상이고, 조 이름/장단조/
+             변화표/숫자 용어가 모두 같고, 길이가 비슷한 항목이 있으면 반환
+
+    scope에는 학년/시간/모델처럼 반드시 같아야 하는 조건을 넣고,
+    text에는 표현이 조금씩 달라질 수 있는 주제/곡 제목을 넣습니다.
+    2단계는 뜻이 다른 질문에 캐시된 답을 돌려줄 위험이 있어 기본으로 꺼져 있습니다 (threshold=1).
+    유사도 색인은 메모리에만 있으며, SQLite를 쓰면 정확 일치 단계만 재시작 후에도 유지됩니다.
+    """
+
+    def __init__(self, max_entries: int = 500, default_ttl: float = 7 * 24 * 3600,
+                 threshold: float = 1.0, sqlite_path: Optional[str] = None,
+                 namespace: str = "semantic"):
+        """
+        유사도 캐시 초기화
+
+        Args:
+            max_entries: 최대 항목 수 (LRU)
+            default_ttl: 기본 유효 시간(초)
+            threshold: 유사도 단계 기준값 (1 이상이면 유사도 단계 비활성화, 기본값)
+            sqlite_path: SQLite 파일 경로 (None이면 메모리만 사용)
+            namespace: SQLite 테이블 안에서 캐시를 구분하는 이름
+        """
+        self.exact = TTLCache(max_entries=max_entries, default_ttl=default_ttl,
+                              sqlite_path=sqlite_path, namespace=namespace)
+        self.threshold = threshold
+        self.lookups = 0
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.bypassed = 0
+
+        # 키 → (scope, 벡터, 필수 용어, 글자 수), 정확 일치 캐시와 같은 크기로 유지
+        self._index: "OrderedDict[str, Tuple[str, Dict[int, float], Counter, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, scope: str, text: str) -> Optional[Any]:
+        """
+        캐시 조회
+
+        Args:
+            scope: 반드시 일치해야 하는 조건 (예: "theory:age=10")
+            text: 비교할 텍스트 (예: 주제)
+
+        Returns:
+            캐시된 값 또는 None
+        """
+        self.lookups += 1
+        key = normalize_key(scope, text)
+        value = self.exact.get(key)
+        if value is not None:
+            self.exact_hits += 1
+            return value
+
+        if self.threshold >= 1:
+            return None
+
+        vector = ngram_vector(text)
+        tokens = significant_tokens(text)
+        length = text_length(text)
+        best_key, best_score = None, 0.0
+        with self._lock:
+            for candidate, (candidate_scope, candidate_vector, candidate_tokens,
+                            candidate_length) in self._index.items():
+                if candidate_scope != scope or candidate_tokens != tokens:
+                    continue
+                if min(length, candidate_length) < MIN_LENGTH_RATIO * max(length, candidate_length):
+                    continue
+                score = cosine_similarity(vector, candidate_vector)
+                if score > best_score:
+                    best_key, best_score = candidate, score
+
+        if best_key is None or best_score < self.threshold:
+            return None
+
+        value = self.exact.get(best_key)
+        if value is None:
+            # 만료된 항목은 색인에서도 제거
+            with self._lock:
+                self._index.pop(best_key, None)
+            return None
+
+        self.similar_hits += 1
+        return value
+
+    def store(self, scope: str, text: str, value: Any, ttl: Optional[float] = None):
+        """
+        캐시 저장
+
+        Args:
+            scope: 반드시 일치해야 하는 조건
+            text: 비교할 텍스트
+            value: 저장할 값
+            ttl: 유효 시간(초)
+        """
+        key = normalize_key(scope, text)
+        self.exact.set(key, value, ttl)
+        with self._lock:
+            self._index[key] = (scope, ngram_vector(text), significant_tokens(text), text_length(text))
+            self._index.move_to_end(key)
+            while len(self._index) > self.exact.max_entries:
+                self._index.popitem(last=False)
+
+    async def alookup(self, scope: str, text: str) -> Optional[Any]:
+        """lookup()의 비동기 버전 - SQLite를 쓰면 실행기에서 처리"""
+        if not self.exact.sqlite_path:
+            return self.lookup(scope, text)
+        return await asyncio.get_running_loop().run_in_executor(None, self.lookup, scope, text)
+
+    async def astore(self, scope: str, text: str, value: Any, ttl: Optional[float] = None):
+        """store()의 비동기 버전 - SQLite를 쓰면 실행기에서 처리"""
+        if not self.exact.sqlite_path:
+            self.store(scope, text, value, ttl)
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self.store, scope, text, value, ttl)
+
+    def record_bypass(self):
+        """캐시를 건너뛴 요청 수 기록"""
+        self.bypassed += 1
+
+    def clear(self):
+        """모든 항목 삭제"""
+        self.exact.clear()
+        with self._lock:
+            self._index.clear()
+
+    def stats(self) -> Dict:
+        """캐시 상태 정보"""
+        hits = self.exact_hits + self.similar_hits
+        return {
+            "entries": len(self.exact._entries),
+            "max_entries": self.exact.max_entries,
+            "lookups": self.lookups,
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.lookups - hits,
+            "bypassed": self.bypassed,
+            "hit_rate": round(hits / self.lookups, 3) if self.lookups else 0.0,
+            "similarity_threshold": self.threshold,
+            "persistent": bool(self.exact.sqlite_path),
+        }
@@ -33,6 +33,16 @@ import tempfile
 import os
 from io import BytesIO
 
+try:
+    from metrics import timed_stage
+except ImportError:
+    from .metrics import timed_stage
+
+try:
+    from profiling import profiled
+except ImportError:
+    from .profiling import profiled
+
 class ScoreProcessor:
     """Process musical scores - simplify, transpose, add solfege"""
     
@@ -118,6 +128,8 @@ class ScoreProcessor:
                 print(f"악보 로딩 오류: {str(e)}")
             return None
     
+    @timed_stage("transform", "simplify_rhythm")
+    @profiled("simplify_rhythm")
     def simplify_rhythm(self, score: stream.Score, 
                        allowed_durations: list = [0.5, 1.0, 2.0, 4.0]) -> stream.Score:
         """
@@ -182,6 +194,8 @@ class ScoreProcessor:
         nearest = min(allowed, key=lambda x: abs(x - duration))
         return nearest
     
+    @timed_stage("transform", "transpose")
+    @profiled("transpose_to_c_major")
     def transpose_to_c_major(self, score: stream.Score) -> stream.Score:
         """
         Transpose score to C major and constrain to C4-C5 range
@@ -257,6 +271,8 @@ class ScoreProcessor:
         
         return constrained
     
+    @timed_stage("transform", "solfege")
+    @profiled("add_solfege")
     def add_solfege(self, score: stream.Score) -> stream.Score:
         """
         Add solfege syllables (do, re, mi...) as lyrics
@@ -321,6 +337,7 @@ class ScoreProcessor:
                 print(f"악보 이미지 생성 실패: {str(e)}")
             return None
     
+    @timed_stage("export", "midi")
     def export_midi(self, score: stream.Score) -> Optional[bytes]:
         """
         Export score as MIDI file
@@ -350,6 +367,7 @@ class ScoreProcessor:
                 print(f"MIDI 내보내기 실패: {str(e)}")
             return None
     
+    @timed_stage("export", "musicxml")
     def export_musicxml(self, score: stream.Score) -> Optional[bytes]:
         """
         Export score as MusicXML file
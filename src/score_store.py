@@ -0,0 +1,293 @@
+"""
+Score Store Module
+처리된 악보 저장소 (메모리 LRU + TTL, 선택적 SQLite 공유 저장)
+
+여러 워커 프로세스로 서버를 실행하면 악보를 만든 워커와 내보내기 요청을 받은 워커가
+다를 수 있습니다. sqlite_path를 지정하면 악보를 직렬화해 SQLite에도 저장하므로 어느
+워커에서든 점수 ID로 악보를 찾을 수 있습니다. 점수 ID는 워커끼리 겹치지 않도록 UUID로 만듭니다.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+def freeze_score(score: Any) -> bytes:
+    """music21 Score → 바이트 (프로세스/워커 사이 전달과 SQLite 저장용, 손실 없음)"""
+    from music21 import converter
+    return converter.freezeStr(score, fmt="pickle")
+
+
+def thaw_score(data: bytes) -> Any:
+    """freeze_score()로 만든 바이트 → music21 Score"""
+    from music21 import converter
+    return converter.thawStr(data)
+
+
+class _FrozenScore:
+    """아직 역직렬화하지 않은 악보 (처음 조회할 때 풀어서 메모리에 바꿔 넣음)"""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+class ScoreStore:
+    """점수 ID별 악보 저장소
+
+    기존 dict 자리에 그대로 둘 수 있도록 `in`, `[]`, `len()`을 지원합니다.
+    메모리에는 최근 max_scores개만 보관하고, ttl이 지난 악보는 버립니다.
+    """
+
+    def __init__(self, max_scores: int = 500, ttl: float = 24 * 3600,
+                 sqlite_path: Optional[str] = None,
+                 serializer: Optional[Callable[[Any], bytes]] = None,
+                 deserializer: Optional[Callable[[bytes], Any]] = None):
+        """
+        악보 저장소 초기화
+
+        Args:
+            max_scores: 메모리에 보관할 최대 악보 수 (LRU)
+            ttl: 악보 유효 시간(초) - 저장 시각 기준
+            sqlite_path: SQLite 파일 경로 (None이면 메모리만 사용)
+            serializer: 악보 → 바이트 (SQLite 저장 시 필요)
+            deserializer: 바이트 → 악보 (SQLite 조회 시 필요)
+        """
+        if sqlite_path and (serializer is None or deserializer is None):
+            raise ValueError("SQLite 저장에는 serializer와 deserializer가 필요합니다")
+        self.max_scores = max_scores
+        self.ttl = ttl
+        self.sqlite_path = sqlite_path
+        self._serializer = serializer
+        self._deserializer = deserializer
+        self.shared_hits = 0
+
+        # 점수 ID → (저장 시각, 악보)
+        self._scores: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        if sqlite_path:
+            self._init_sqlite()
+
+    # SQLite 공유 저장
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.sqlite_path, timeout=10)
+
+    def _init_sqlite(self):
+        conn = self._connect()
+        try:
+            # 여러 프로세스가 동시에 읽고 쓰므로 WAL 모드 사용 (읽기가 쓰기를 기다리지 않음)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scores (
+                    score_id TEXT PRIMARY KEY,
+                    data BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _sqlite_load(self, score_id: str) -> Optional[tuple]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT created_at, data FROM scores WHERE score_id = ?", (score_id,),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return row[0], self._deserializer(row[1])
+
+    def _sqlite_save(self, score_id: str, created_at: float, data: bytes):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO scores (score_id, data, created_at) VALUES (?, ?, ?)",
+                (score_id, sqlite3.Binary(data), created_at),
+            )
+            # 오래된 악보 정리
+            conn.execute("DELETE FROM scores WHERE created_at < ?", (time.time() - self.ttl,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _sqlite_delete(self, score_id: str):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM scores WHERE score_id = ?", (score_id,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _sqlite_count(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        finally:
+            conn.close()
+
+    # 기본 연산
+
+    def new_id(self, prefix: str = "score") -> str:
+        """워커끼리 겹치지 않는 새 점수 ID (예: score_3f2a...)"""
+        return f"{prefix}_{uuid.uuid4().hex}"
+
+    def _remember(self, score_id: str, entry: tuple):
+        with self._lock:
+            self._scores[score_id] = entry
+            self._scores.move_to_end(score_id)
+            while len(self._scores) > self.max_scores:
+                self._scores.popitem(last=False)
+
+    def put(self, score_id: str, score: Any, data: Optional[bytes] = None):
+        """
+        악보 저장
+
+        Args:
+            score_id: 점수 ID (new_id()로 생성)
+            score: music21 Score
+            data: 이미 직렬화한 악보 (있으면 SQLite 저장 시 다시 직렬화하지 않음)
+        """
+        now = time.time()
+        self._remember(score_id, (now, score))
+        if self.sqlite_path:
+            try:
+                self._sqlite_save(score_id, now, data if data is not None else self._serializer(score))
+            except Exception as e:
+                # 공유 저장에 실패해도 이 워커에서는 계속 사용할 수 있음
+                print(f"[WARN] 악보(SQLite) 저장 실패: {e}")
+
+    def put_frozen(self, score_id: str, data: bytes):
+        """
+        직렬화된 악보 저장 (일괄 채보 작업자 결과 등)
+
+        역직렬화는 내보내기 등으로 처음 조회할 때 하므로, 결과를 받는 쪽에서는 바이트만 보관합니다.
+
+        Args:
+            score_id: 점수 ID (new_id()로 생성)
+            data: serializer(freeze_score)로 만든 바이트
+        """
+        if self._deserializer is None:
+            raise ValueError("직렬화된 악보 저장에는 deserializer가 필요합니다")
+        now = time.time()
+        self._remember(score_id, (now, _FrozenScore(data)))
+        if self.sqlite_path:
+            try:
+                self._sqlite_save(score_id, now, data)
+            except Exception as e:
+                print(f"[WARN] 악보(SQLite) 저장 실패: {e}")
+
+    def get(self, score_id: str) -> Optional[Any]:
+        """
+        악보 조회 (메모리에 없으면 SQLite에서 불러와 메모리에 보관)
+
+        Returns:
+            music21 Score, 없거나 만료되었으면 None
+        """
+        with self._lock:
+            entry = self._scores.get(score_id)
+            if entry is not None:
+                self._scores.move_to_end(score_id)
+
+        if entry is None and self.sqlite_path:
+            try:
+                entry = self._sqlite_load(score_id)
+            except Exception as e:
+                print(f"[WARN] 악보(SQLite) 조회 실패: {e}")
+                entry = None
+            if entry is not None:
+                self.shared_hits += 1
+                self._remember(score_id, entry)
+
+        if entry is None:
+            return None
+        created_at, score = entry
+        if time.time() - created_at > self.ttl:
+            self.delete(score_id)
+            return None
+        if isinstance(score, _FrozenScore):
+            score = self._deserializer(score.data)
+            with self._lock:
+                if score_id in self._scores:
+                    self._scores[score_id] = (created_at, score)
+        return score
+
+    # 비동기 처리기용 (SQLite 입출력과 직렬화가 이벤트 루프를 막지 않도록 실행기에서 실행)
+
+    async def aput(self, score_id: str, score: Any, data: Optional[bytes] = None):
+        """put()의 비동기 버전 - SQLite를 쓰면 직렬화와 저장을 실행기에서 처리"""
+        if not self.sqlite_path:
+            self.put(score_id, score, data)
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self.put, score_id, score, data)
+
+    async def aput_frozen(self, score_id: str, data: bytes):
+        """put_frozen()의 비동기 버전 - SQLite를 쓰면 저장을 실행기에서 처리"""
+        if not self.sqlite_path:
+            self.put_frozen(score_id, data)
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self.put_frozen, score_id, data)
+
+    async def aget(self, score_id: str) -> Optional[Any]:
+        """get()의 비동기 버전 - SQLite 조회나 역직렬화가 필요할 때만 실행기에서 처리"""
+        with self._lock:
+            entry = self._scores.get(score_id)
+        ready = entry is not None and not isinstance(entry[1], _FrozenScore)
+        if ready or (entry is None and not self.sqlite_path):
+            return self.get(score_id)
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, score_id)
+
+    def delete(self, score_id: str):
+        """악보 삭제"""
+        with self._lock:
+            self._scores.pop(score_id, None)
+        if self.sqlite_path:
+            try:
+                self._sqlite_delete(score_id)
+            except sqlite3.Error as e:
+                print(f"[WARN] 악보(SQLite) 삭제 실패: {e}")
+
+    # dict 호환
+
+    def __contains__(self, score_id: str) -> bool:
+        return self.get(score_id) is not None
+
+    def __getitem__(self, score_id: str) -> Any:
+        score = self.get(score_id)
+        if score is None:
+            raise KeyError(score_id)
+        return score
+
+    def __setitem__(self, score_id: str, score: Any):
+        self.put(score_id, score)
+
+    def __len__(self) -> int:
+        """이 워커의 메모리에 있는 악보 수"""
+        with self._lock:
+            return len(self._scores)
+
+    def stats(self) -> Dict:
+        """저장소 상태 정보"""
+        shared = None
+        if self.sqlite_path:
+            try:
+                shared = self._sqlite_count()
+            except sqlite3.Error:
+                shared = None
+        return {
+            "memory_scores": len(self),
+            "shared_scores": shared,
+            "shared_hits": self.shared_hits,
+            "max_scores": self.max_scores,
+            "ttl_seconds": self.ttl,
+            "persistent": bool(self.sqlite_path),
+        }
@@ -0,0 +1,105 @@
+"""
+Shared State Module
+여러 워커 프로세스가 함께 쓰는 상태(악보, 대화 기록, 응답 캐시)의 위치 설정과 프로세스 간 잠금
+
+SHARED_STATE_DIR를 지정하면 저장소별 SQLite 파일/캐시 디렉토리 환경 변수의 기본값을
+그 디렉토리 아래로 맞춥니다. 개별 환경 변수(SCORE_STORE_DB, CHAT_HISTORY_DB 등)를
+이미 지정했다면 그 값을 그대로 씁니다. 각 모듈이 환경 변수를 읽기 전에 호출해야 합니다.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+if sys.platform == "win32":
+    import msvcrt
+    fcntl = None
+else:
+    import fcntl
+    msvcrt = None
+
+# 환경 변수 → SHARED_STATE_DIR 아래 SQLite 파일 이름
+SHARED_STATE_FILES = {
+    "SCORE_STORE_DB": "scores.db",
+    "CHAT_HISTORY_DB": "chat_history.db",
+    "AI_CACHE_DB": "ai_cache.db",
+    "PERPLEXITY_CACHE_DB": "perplexity_cache.db",
+    "YOUTUBE_CACHE_DB": "youtube_api_cache.db",
+}
+# 환경 변수 → SHARED_STATE_DIR 아래 디렉토리 이름
+SHARED_STATE_DIRS = {
+    "OMR_CACHE_DIR": "omr_cache",
+    "YOUTUBE_CACHE_DIR": "youtube",
+    "PROFILE_DIR": "profiles",
+}
+
+
+def configure_shared_state(directory: Optional[str] = None) -> Dict[str, str]:
+    """
+    공유 상태 환경 변수 기본값 설정
+
+    Args:
+        directory: 공유 상태 디렉토리 (None이면 SHARED_STATE_DIR 환경 변수)
+
+    Returns:
+        적용된 환경 변수 (공유 상태를 쓰지 않으면 빈 dict)
+    """
+    directory = directory or os.getenv("SHARED_STATE_DIR")
+    if not directory:
+        return {}
+    base = Path(directory).resolve()
+    base.mkdir(parents=True, exist_ok=True)
+    os.environ["SHARED_STATE_DIR"] = str(base)
+
+    applied = {}
+    for name, filename in SHARED_STATE_FILES.items():
+        applied[name] = os.environ.setdefault(name, str(base / filename))
+    for name, dirname in SHARED_STATE_DIRS.items():
+        applied[name] = os.environ.setdefault(name, str(base / dirname))
+    return applied
+
+
+def shared_state_report() -> Dict:
+    """현재 워커의 공유 상태 설정 (시작 보고서용)"""
+    directory = os.getenv("SHARED_STATE_DIR") or None
+    return {
+        "pid": os.getpid(),
+        "directory": directory,
+        "paths": {name: os.getenv(name) for name in (*SHARED_STATE_FILES, *SHARED_STATE_DIRS)},
+    }
+
+
+@contextmanager
+def file_lock(path: Union[str, Path]):
+    """
+    프로세스 간 배타 잠금 (같은 경로를 잠그는 다른 워커는 풀릴 때까지 대기)
+
+    Example:
+        with file_lock(work_dir / f"{video_id}.lock"):
+            download(video_id)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    # LK_LOCK은 10초 정도 재시도한 뒤 실패하므로 풀릴 때까지 반복
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,216 @@
+"""
+Warmup Module
+서버 시작 후 무거운 구성 요소를 미리 준비하고 준비 상태(readiness)를 관리
+
+basic-pitch 모델 로드, music21 변환기 초기화, Audiveris/ffmpeg 경로 탐색,
+아주 짧은 합성 음원 채보, 일괄 채보 작업자 풀 시작을 차례로 실행하고 단계별 시간을 기록합니다.
+로드 밸런서는 준비 확인 엔드포인트가 200을 반환하는 워커에만 요청을 보내면 됩니다.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# 단계 상태
+PENDING = "pending"
+RUNNING = "running"
+OK = "ok"
+FAILED = "failed"
+
+# 실행 순서대로
+STEP_NAMES = ("components", "basic_pitch", "music21", "paths", "transcription", "batch_pool")
+
+# 서버 시작 시 실행할 단계 ("all" 또는 쉼표로 구분, 빈 값이면 실행하지 않음)
+WARMUP_STEPS = os.getenv("WARMUP_STEPS", "")
+# 실패하면 준비되지 않은 것으로 볼 단계 (비우면 실행하는 모든 단계, 예: "basic_pitch,transcription")
+WARMUP_REQUIRED = os.getenv("WARMUP_REQUIRED", "")
+
+# 합성 채보에 쓸 음원 (A4 사인파)
+SYNTHETIC_SAMPLE_RATE = 22050
+SYNTHETIC_SECONDS = 1.0
+SYNTHETIC_FREQUENCY = 440.0
+
+# music21 초기화에 쓸 짧은 악보
+WARMUP_TINY_NOTATION = "tinyNotation: 4/4 c4 d4 e4 f4 g2 g2"
+
+
+def parse_step_list(value: Optional[str]) -> List[str]:
+    """
+    단계 목록 해석
+
+    Args:
+        value: "all" 또는 쉼표로 구분한 단계 이름
+
+    Returns:
+        실행 순서대로 정렬한 단계 이름 목록
+    """
+    if not value or not value.strip():
+        return []
+    if value.strip().lower() in ("all", "1", "true", "yes"):
+        return list(STEP_NAMES)
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = names - set(STEP_NAMES)
+    if unknown:
+        print(f"[WARN] 알 수 없는 워밍업 단계는 건너뜁니다: {', '.join(sorted(unknown))}")
+    return [name for name in STEP_NAMES if name in names]
+
+
+class WarmupState:
+    """워밍업 진행 상황과 준비 상태
+
+    워밍업을 설정하지 않았으면 바로 준비된 것으로 봅니다. 설정했으면 모든 단계가
+    끝나고 필수 단계(required, 따로 정하지 않으면 실행하는 모든 단계)가 모두 성공해야
+    준비된 것으로 봅니다.
+    """
+
+    def __init__(self):
+        self._steps: Dict[str, Dict] = {}
+        self._required: List[str] = []
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def configure(self, steps: Iterable[str], required: Optional[Iterable[str]] = None):
+        """
+        실행할 단계와 필수 단계 설정 (실행 전에 호출)
+
+        Args:
+            steps: 실행할 단계 이름
+            required: 필수 단계 (None이면 실행할 모든 단계, 지정하면 그 단계로 좁힘)
+        """
+        with self._lock:
+            self._steps = {
+                name: {"status": PENDING, "seconds": None, "detail": None, "error": None}
+                for name in steps
+            }
+            if required is None:
+                self._required = list(self._steps)
+            else:
+                self._required = [name for name in required if name in self._steps]
+            self._started_at = None
+            self._finished_at = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self._steps)
+
+    @property
+    def finished(self) -> bool:
+        return not self._steps or self._finished_at is not None
+
+    @property
+    def ready(self) -> bool:
+        """요청을 받을 준비가 되었는지"""
+        if not self.finished:
+            return False
+        with self._lock:
+            return all(self._steps[name]["status"] == OK for name in self._required)
+
+    def run(self, steps: Dict[str, Callable[[], Any]]):
+        """
+        설정한 단계를 차례로 실행 (백그라운드 스레드에서 호출)
+
+        단계 함수가 예외를 내면 실패로 기록하고 다음 단계로 넘어갑니다.
+        단계 함수의 반환값은 detail로 보고서에 포함됩니다.
+
+        Args:
+            steps: 단계 이름 → 실행 함수
+        """
+        self._started_at = time.time()
+        started = time.perf_counter()
+        for name in list(self._steps):
+            func = steps.get(name)
+            record = self._steps[name]
+            if func is None:
+                record.update(status=FAILED, error="단계 함수가 없습니다")
+                continue
+            record["status"] = RUNNING
+            step_started = time.perf_counter()
+            try:
+                detail = func()
+                record.update(status=OK, detail=detail)
+            except Exception as e:
+                record.update(status=FAILED, error=f"{type(e).__name__}: {e}"[:300])
+                print(f"[WARN] 워밍업 단계 실패 ({name}): {e}")
+            record["seconds"] = round(time.perf_counter() - step_started, 3)
+        self._finished_at = time.time()
+        print(f"[OK] 워밍업 완료 ({time.perf_counter() - started:.2f}초) - "
+              f"{'준비됨' if self.ready else '필수 단계 실패'}")
+
+    def snapshot(self) -> Dict:
+        """워밍업 보고서"""
+        with self._lock:
+            steps = {name: dict(record) for name, record in self._steps.items()}
+            required = list(self._required)
+        total = None
+        if self._started_at is not None and self._finished_at is not None:
+            total = round(self._finished_at - self._started_at, 3)
+        return {
+            "configured": bool(steps),
+            "finished": self.finished,
+            "total_seconds": total,
+            "required": required,
+            "steps": steps,
+        }
+
+
+# 단계 구현 (구성 요소는 api_server의 LazyComponent를 받음)
+
+def warm_basic_pitch(audio_processor) -> Dict:
+    """basic-pitch 모델 로드 (이후 채보 요청은 같은 모델을 재사용)"""
+    if not audio_processor:
+        raise RuntimeError("audio_processor를 사용할 수 없습니다")
+    if audio_processor.get_basic_pitch_predict() is None:
+        raise RuntimeError("basic-pitch를 사용할 수 없습니다")
+    model = audio_processor.model
+    return {"model": type(model).__name__ if model is not None else None}
+
+
+def warm_music21(score_processor) -> Dict:
+    """music21 파서/내보내기와 조성 분석 초기화 (짧은 악보를 MusicXML로 왕복 변환)"""
+    import music21
+    from music21 import converter
+
+    score = converter.parse(WARMUP_TINY_NOTATION)
+    score.analyze("key")
+    if score_processor:
+        score = score_processor.transpose_to_c_major(score)
+        xml_bytes = score_processor.export_musicxml(score)
+        if not xml_bytes:
+            raise RuntimeError("MusicXML 내보내기 실패")
+        converter.parse(xml_bytes)
+    return {"version": music21.__version__}
+
+
+def warm_paths(omr_engine) -> Dict:
+    """Audiveris/ffmpeg 경로를 한 번 찾아 둠 (없는 도구는 None)"""
+    try:
+        from youtube_downloader import get_ffmpeg_path
+        ffmpeg_path = get_ffmpeg_path()
+    except ImportError:
+        ffmpeg_path = None
+    audiveris_path = str(omr_engine.audiveris_bin) if omr_engine else None
+    return {"ffmpeg": ffmpeg_path, "audiveris": audiveris_path}
+
+
+def synthetic_samples(seconds: float = SYNTHETIC_SECONDS,
+                      sample_rate: int = SYNTHETIC_SAMPLE_RATE,
+                      frequency: float = SYNTHETIC_FREQUENCY) -> Tuple[Any, int]:
+    """채보 확인용 사인파 (모노 float32)"""
+    import numpy as np
+
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    y = (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+    return y, sample_rate
+
+
+def warm_transcription(audio_processor) -> Dict:
+    """짧은 합성 음원 채보 (basic-pitch 추론 경로와 악보 변환을 한 번 실행)"""
+    if not audio_processor:
+        raise RuntimeError("audio_processor를 사용할 수 없습니다")
+    y, sr = synthetic_samples()
+    score = audio_processor.process_audio_samples(y, sr)
+    if score is None:
+        raise RuntimeError("합성 음원에서 음표를 추출하지 못했습니다")
+    return {"notes": len(score.flat.notes)}
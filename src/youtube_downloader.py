@@ -10,14 +10,62 @@ except ImportError:
     HAS_STREAMLIT = False
     st = None
 
-from typing import Optional, Dict
+from contextlib import contextmanager
+from typing import Optional, Dict, Iterator, List
+import functools
 import re
 import requests
 import subprocess
 import os
 import shutil
+import tempfile
+import threading
 from pathlib import Path
 
+try:
+    from disk_cache import DiskCache, hash_key
+except ImportError:
+    from .disk_cache import DiskCache, hash_key
+
+try:
+    from metrics import timed_stage
+except ImportError:
+    from .metrics import timed_stage
+
+try:
+    from shared_state import file_lock
+except ImportError:
+    from .shared_state import file_lock
+
+# YouTube 영상 ID 패턴
+VIDEO_ID_PATTERNS = [
+    r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',
+    r'(?:embed\/)([0-9A-Za-z_-]{11})',
+    r'(?:watch\?v=)([0-9A-Za-z_-]{11})'
+]
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """
+    Extract video ID from YouTube URL
+    
+    Args:
+        url: YouTube URL (또는 11자리 영상 ID)
+        
+    Returns:
+        Video ID or None
+    """
+    if re.fullmatch(r'[0-9A-Za-z_-]{11}', url):
+        return url
+    
+    for pattern in VIDEO_ID_PATTERNS:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+    
+    return None
+
+@functools.lru_cache(maxsize=1)
 def get_ffmpeg_path() -> Optional[str]:
     """
     FFmpeg 경로 찾기
@@ -25,6 +73,9 @@ def get_ffmpeg_path() -> Optional[str]:
     2. 일반적인 설치 경로 확인
     3. PATH에서 ffmpeg 찾기
     
+    요청마다 파일 시스템을 뒤지지 않도록 결과는 프로세스당 한 번만 계산합니다
+    (설치 경로를 바꾼 경우 get_ffmpeg_path.cache_clear() 호출).
+    
     Returns:
         FFmpeg bin 디렉토리 경로 또는 None
     """
@@ -55,12 +106,366 @@ def get_ffmpeg_path() -> Optional[str]:
     
     return None
 
+def get_ffmpeg_executable() -> str:
+    """ffmpeg 실행 파일 경로 (찾지 못하면 PATH의 "ffmpeg")"""
+    ffmpeg_dir = get_ffmpeg_path()
+    if ffmpeg_dir:
+        for name in ("ffmpeg.exe", "ffmpeg"):
+            candidate = Path(ffmpeg_dir) / name
+            if candidate.exists():
+                return str(candidate)
+    return "ffmpeg"
+
+
+@timed_stage("decode", "ffmpeg")
+def decode_audio_window(source: str, start: float = 0.0, duration: Optional[float] = None,
+                        sample_rate: int = 22050, headers: Optional[Dict[str, str]] = None,
+                        timeout: int = 120):
+    """
+    ffmpeg로 필요한 구간만 모노 PCM(float32)으로 디코딩
+    
+    -ss를 입력 앞에 두어 구간 시작으로 바로 탐색하고, -t 구간이 끝나면 ffmpeg가
+    입력 읽기를 멈추므로 원격 스트림도 필요한 만큼만 내려받습니다.
+    MP3 등으로 다시 인코딩하지 않고 PCM을 파이프로 바로 받습니다.
+    
+    Args:
+        source: 로컬 파일 경로 또는 오디오 스트림 URL
+        start: 시작 위치(초)
+        duration: 길이(초), None이면 끝까지
+        sample_rate: 출력 샘플 레이트
+        headers: 스트림 URL 요청 시 보낼 HTTP 헤더
+        timeout: ffmpeg 최대 실행 시간(초)
+        
+    Returns:
+        numpy float32 배열 (모노)
+        
+    Raises:
+        RuntimeError: ffmpeg 디코딩 실패
+    """
+    import numpy as np
+    
+    cmd = [get_ffmpeg_executable(), "-nostdin", "-hide_banner", "-loglevel", "error"]
+    if headers:
+        cmd += ["-headers", "".join(f"{k}: {v}\r\n" for k, v in headers.items())]
+    if start and start > 0:
+        cmd += ["-ss", f"{start:.3f}"]
+    if duration:
+        cmd += ["-t", f"{duration:.3f}"]
+    cmd += ["-i", source, "-vn", "-ac", "1", "-ar", str(sample_rate), "-f", "f32le", "pipe:1"]
+    
+    result = subprocess.run(cmd, capture_output=True, timeout=timeout)
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffmpeg 디코딩 실패: {message[-500:]}")
+    
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+def resolve_audio_stream(url: str) -> Dict:
+    """
+    yt-dlp로 다운로드 없이 저용량 오디오 스트림 URL 조회
+    
+    Args:
+        url: YouTube URL
+        
+    Returns:
+        {"url": 스트림 URL, "headers": HTTP 헤더, "duration": 영상 길이(초)}
+    """
+    try:
+        import yt_dlp
+    except ImportError:
+        raise ImportError("yt-dlp가 설치되지 않았습니다. pip install yt-dlp를 실행해주세요.")
+    
+    ydl_opts = {
+        # 분석에는 고음질이 필요 없으므로 낮은 비트레이트 오디오 우선
+        "format": "bestaudio[abr<=96]/worstaudio/bestaudio/best",
+        "quiet": True,
+        "no_warnings": True,
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+    
+    return {
+        "url": info["url"],
+        "headers": info.get("http_headers") or {},
+        "duration": info.get("duration") or 0,
+    }
+
+
+class YouTubeDownloadManager:
+    """
+    영상 ID 기준 YouTube 오디오 다운로드 관리자
+    
+    - 다운로드한 오디오를 용량 제한이 있는 디스크 캐시(LRU)에 보관
+    - 같은 영상을 동시에 요청하면 한 번만 다운로드하고 나머지는 결과를 기다림 (워커 프로세스 사이 포함)
+    - 오디오 → 악보 변환 결과(MusicXML)도 함께 캐시
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_mb: Optional[int] = None):
+        """
+        다운로드 관리자 초기화
+        
+        Args:
+            cache_dir: 캐시 디렉토리 (기본값: YOUTUBE_CACHE_DIR 또는 temp/youtube)
+            max_mb: 오디오 캐시 최대 용량 MB (기본값: YOUTUBE_CACHE_MAX_MB 또는 1000)
+        """
+        self.cache_dir = Path(cache_dir or os.getenv("YOUTUBE_CACHE_DIR", "temp/youtube"))
+        if max_mb is None:
+            max_mb = int(os.getenv("YOUTUBE_CACHE_MAX_MB", "1000"))
+        
+        self.audio_cache = DiskCache(self.cache_dir, max_bytes=max_mb * 1024 * 1024, suffix=".mp3")
+        self.transcription_cache = DiskCache(
+            self.cache_dir / "transcriptions", max_bytes=50 * 1024 * 1024, suffix=".musicxml"
+        )
+        self._work_dir = self.cache_dir / "downloading"
+        self._work_dir.mkdir(parents=True, exist_ok=True)
+        
+        # 영상 ID → [잠금, 사용 중인 요청 수]
+        self._locks: Dict[str, List] = {}
+        self._locks_guard = threading.Lock()
+    
+    @contextmanager
+    def _video_lock(self, video_id: str) -> Iterator[None]:
+        """영상별 다운로드 잠금 (기다리는 요청까지 모두 끝나면 사전에서 제거)"""
+        with self._locks_guard:
+            entry = self._locks.get(video_id)
+            if entry is None:
+                entry = self._locks[video_id] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._locks_guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[video_id]
+    
+    def cached_audio_path(self, video_id: str) -> Optional[str]:
+        """캐시된 오디오 경로 (없으면 None)"""
+        path = self.audio_cache.get_path(video_id)
+        return str(path) if path else None
+    
+    def get_audio(self, url: str) -> str:
+        """
+        오디오 파일 경로 반환 (캐시에 없으면 다운로드)
+        
+        Args:
+            url: YouTube URL 또는 영상 ID
+            
+        Returns:
+            캐시에 저장된 MP3 파일 경로
+            
+        Raises:
+            ValueError: 영상 ID를 추출할 수 없는 경우
+            ImportError: yt-dlp가 설치되지 않은 경우
+            RuntimeError: 다운로드에 실패한 경우
+        """
+        video_id = extract_video_id(url)
+        if not video_id:
+            raise ValueError(f"유효한 YouTube URL이 아닙니다: {url}")
+        
+        cached = self.cached_audio_path(video_id)
+        if cached:
+            return cached
+        
+        # 같은 캐시 디렉토리를 쓰는 다른 워커 프로세스와도 다운로드를 한 번만 하도록 파일 잠금
+        with self._video_lock(video_id), file_lock(self._work_dir / f"{video_id}.lock"):
+            # 잠금을 기다리는 동안 다른 요청이 다운로드를 끝냈을 수 있음
+            cached = self.cached_audio_path(video_id)
+            if cached:
+                return cached
+            
+            job_dir = tempfile.mkdtemp(prefix=f"{video_id}_", dir=str(self._work_dir))
+            try:
+                audio_path = self._download(f"https://www.youtube.com/watch?v={video_id}", job_dir)
+                return str(self.audio_cache.put_file(video_id, audio_path))
+            finally:
+                shutil.rmtree(job_dir, ignore_errors=True)
+    
+    def checkout_audio(self, url: str) -> str:
+        """
+        오디오 파일을 호출한 쪽 전용 경로로 받기 (사용 후 release_audio() 호출)
+        
+        get_audio()가 반환하는 캐시 파일은 다른 요청의 다운로드로 LRU에서 밀려 언제든 삭제될 수
+        있으므로, 채보처럼 파일을 여러 번 여는 작업에는 작업 디렉토리의 하드 링크(지원하지 않으면
+        복사본)를 넘깁니다. 하드 링크는 캐시 항목이 삭제되어도 내용이 남고 추가 공간을 쓰지 않습니다.
+        
+        Args:
+            url: YouTube URL 또는 영상 ID
+            
+        Returns:
+            전용 MP3 파일 경로
+        """
+        job_dir = tempfile.mkdtemp(prefix="checkout_", dir=str(self._work_dir))
+        try:
+            # 받은 직후 캐시에서 밀려난 경우 한 번 더 받음
+            for attempt in range(2):
+                cached = self.get_audio(url)
+                private = os.path.join(job_dir, os.path.basename(cached))
+                try:
+                    os.link(cached, private)
+                    return private
+                except FileNotFoundError:
+                    if attempt:
+                        raise
+                except OSError:
+                    # 하드 링크를 지원하지 않는 파일시스템이면 복사
+                    shutil.copyfile(cached, private)
+                    return private
+        except Exception:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+    
+    def release_audio(self, path: str):
+        """checkout_audio()로 받은 파일 정리"""
+        job_dir = Path(path).parent
+        if job_dir.parent == self._work_dir and job_dir.name.startswith("checkout_"):
+            shutil.rmtree(job_dir, ignore_errors=True)
+    
+    @contextmanager
+    def audio_file(self, url: str) -> Iterator[str]:
+        """checkout_audio()/release_audio()를 with 블록으로 (블록이 끝나면 정리)"""
+        path = self.checkout_audio(url)
+        try:
+            yield path
+        finally:
+            self.release_audio(path)
+    
+    def _download(self, url: str, job_dir: str) -> str:
+        """
+        yt-dlp로 오디오를 job_dir에 MP3로 다운로드
+        
+        Returns:
+            다운로드된 MP3 파일 경로
+        """
+        try:
+            import yt_dlp
+        except ImportError:
+            raise ImportError("yt-dlp가 설치되지 않았습니다. pip install yt-dlp를 실행해주세요.")
+        
+        base_path = Path(job_dir) / "audio"
+        ydl_opts = {
+            "format": "bestaudio/best",
+            "outtmpl": str(base_path) + '.%(ext)s',
+            "postprocessors": [{
+                "key": "FFmpegExtractAudio",
+                "preferredcodec": "mp3",
+                "preferredquality": "192",
+            }],
+            "quiet": True,
+            "no_warnings": True,
+        }
+        
+        ffmpeg_path = get_ffmpeg_path()
+        if ffmpeg_path:
+            ydl_opts["ffmpeg_location"] = ffmpeg_path
+        else:
+            print("[WARN] FFmpeg 경로를 찾을 수 없습니다. PATH에 ffmpeg가 있는지 확인하세요.")
+        
+        print(f"[INFO] YouTube 오디오 다운로드 시작: {url}")
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            ydl.download([url])
+        
+        mp3_path = base_path.with_suffix('.mp3')
+        if mp3_path.exists():
+            return str(mp3_path)
+        
+        # 후처리가 실패해 원본 컨테이너만 남은 경우 MP3로 변환
+        for path in Path(job_dir).glob("audio.*"):
+            ffmpeg_exe = str(Path(ffmpeg_path) / "ffmpeg") if ffmpeg_path else "ffmpeg"
+            try:
+                subprocess.run([
+                    ffmpeg_exe, '-i', str(path),
+                    '-acodec', 'libmp3lame', '-ab', '192k',
+                    str(mp3_path), '-y'
+                ], check=True, capture_output=True, timeout=60)
+            except Exception as e:
+                print(f"[WARN] MP3 변환 실패: {e}")
+            if mp3_path.exists():
+                return str(mp3_path)
+        
+        raise RuntimeError("다운로드는 완료되었지만 오디오 파일을 찾을 수 없습니다.")
+    
+    def get_audio_window(self, url: str, start: float = 0.0, duration: Optional[float] = 60.0,
+                         sample_rate: int = 22050):
+        """
+        전체 다운로드 없이 필요한 구간만 모노 PCM으로 가져오기
+        
+        캐시에 전체 오디오가 있으면 그 파일에서, 없으면 저용량 스트림에서 직접 디코딩합니다.
+        url 대신 로컬 미디어 파일 경로를 넘기면 그 파일을 사용합니다 (테스트용).
+        
+        Args:
+            url: YouTube URL, 영상 ID 또는 로컬 파일 경로
+            start: 시작 위치(초)
+            duration: 길이(초), None이면 끝까지
+            sample_rate: 샘플 레이트
+            
+        Returns:
+            (samples, sample_rate) 튜플
+        """
+        if os.path.isfile(url):
+            return decode_audio_window(url, start, duration, sample_rate), sample_rate
+        
+        video_id = extract_video_id(url)
+        if not video_id:
+            raise ValueError(f"유효한 YouTube URL이 아닙니다: {url}")
+        
+        cached = self.cached_audio_path(video_id)
+        if cached:
+            return decode_audio_window(cached, start, duration, sample_rate), sample_rate
+        
+        stream_info = resolve_audio_stream(f"https://www.youtube.com/watch?v={video_id}")
+        samples = decode_audio_window(
+            stream_info["url"], start, duration, sample_rate, headers=stream_info["headers"]
+        )
+        return samples, sample_rate
+    
+    def transcription_key(self, video_id: str, variant: str = "") -> str:
+        """악보 변환 결과 캐시 키 (variant: 구간/변환 옵션 등)"""
+        return hash_key(video_id, variant)
+    
+    def get_transcription(self, video_id: str, variant: str = "") -> Optional[bytes]:
+        """캐시된 악보 변환 결과(MusicXML) 조회"""
+        return self.transcription_cache.get_bytes(self.transcription_key(video_id, variant))
+    
+    def put_transcription(self, video_id: str, musicxml: bytes, variant: str = ""):
+        """악보 변환 결과(MusicXML) 저장"""
+        self.transcription_cache.put_bytes(self.transcription_key(video_id, variant), musicxml)
+    
+    def stats(self) -> Dict:
+        """캐시 상태 정보"""
+        return {
+            "audio": self.audio_cache.stats(),
+            "transcriptions": self.transcription_cache.stats(),
+        }
+
+
+_download_manager: Optional[YouTubeDownloadManager] = None
+_download_manager_lock = threading.Lock()
+
+
+def get_download_manager() -> YouTubeDownloadManager:
+    """프로세스 공용 다운로드 관리자 (API 서버, Streamlit, AudioProcessor가 함께 사용)"""
+    global _download_manager
+    with _download_manager_lock:
+        if _download_manager is None:
+            _download_manager = YouTubeDownloadManager()
+        return _download_manager
+
+
+def download_manager_stats() -> Optional[Dict]:
+    """다운로드 관리자가 이미 만들어진 경우에만 캐시 통계 (지표 수집용, 새로 만들지 않음)"""
+    manager = _download_manager
+    return manager.stats() if manager is not None else None
+
+
 class YouTubeDownloader:
     """Download audio from YouTube videos"""
     
     def __init__(self):
-        self.download_dir = Path("temp/youtube")
-        self.download_dir.mkdir(parents=True, exist_ok=True)
+        self.manager = get_download_manager()
+        self.download_dir = self.manager.cache_dir
     
     def extract_video_id(self, url: str) -> Optional[str]:
         """
@@ -72,18 +477,7 @@ class YouTubeDownloader:
         Returns:
             Video ID or None
         """
-        patterns = [
-            r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',
-            r'(?:embed\/)([0-9A-Za-z_-]{11})',
-            r'(?:watch\?v=)([0-9A-Za-z_-]{11})'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        
-        return None
+        return extract_video_id(url)
     
     def get_video_info(self, url: str) -> Optional[Dict]:
         """
@@ -131,7 +525,7 @@ class YouTubeDownloader:
     
     def download_audio(self, url: str) -> Optional[str]:
         """
-        Download audio from YouTube
+        Download audio from YouTube (공용 다운로드 캐시 사용)
         
         Args:
             url: YouTube URL
@@ -139,79 +533,17 @@ class YouTubeDownloader:
         Returns:
             Path to downloaded audio file
         """
-        video_id = self.extract_video_id(url)
-        if not video_id:
+        if not self.extract_video_id(url):
             return None
         
-        output_path = self.download_dir / f"{video_id}.mp3"
-        
-        # Check if already downloaded
-        if output_path.exists():
-            return str(output_path)
-        
         try:
-            # Use yt-dlp Python module to download
-            try:
-                import yt_dlp
-            except ImportError:
-                if HAS_STREAMLIT and st:
-                    st.error("yt-dlp가 설치되지 않았습니다. pip install yt-dlp를 실행해주세요.")
-                else:
-                    print("[ERROR] yt-dlp가 설치되지 않았습니다. pip install yt-dlp를 실행해주세요.")
-                return None
-            
-            # yt-dlp 옵션 설정
-            ydl_opts = {
-                "format": "bestaudio/best",
-                "outtmpl": str(output_path.with_suffix('')) + '.%(ext)s',
-                "postprocessors": [{
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "mp3",
-                    "preferredquality": "192",
-                }],
-                "quiet": True,
-                "no_warnings": True,
-            }
-            
-            # FFmpeg 경로 설정 (있는 경우)
-            ffmpeg_path = get_ffmpeg_path()
-            if ffmpeg_path:
-                ydl_opts["ffmpeg_location"] = ffmpeg_path
-                print(f"[INFO] FFmpeg 경로 설정: {ffmpeg_path}")
+            return self.manager.get_audio(url)
+        except ImportError as e:
+            if HAS_STREAMLIT and st:
+                st.error(str(e))
             else:
-                print("[WARN] FFmpeg 경로를 찾을 수 없습니다. PATH에 ffmpeg가 있는지 확인하세요.")
-            
-            # YouTube 오디오 다운로드
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
-            
-            # 다운로드된 파일 찾기
-            possible_paths = [
-                output_path,
-                output_path.with_suffix('.m4a'),
-                output_path.with_suffix('.webm'),
-                output_path.with_suffix('.opus'),
-            ]
-            
-            for path in possible_paths:
-                if path.exists():
-                    # MP3가 아니면 변환 필요
-                    if path.suffix != '.mp3':
-                        # FFmpeg로 변환 (있는 경우)
-                        if shutil.which('ffmpeg'):
-                            import subprocess
-                            subprocess.run([
-                                'ffmpeg', '-i', str(path), 
-                                '-acodec', 'libmp3lame', '-ab', '192k',
-                                str(output_path), '-y'
-                            ], capture_output=True, timeout=30)
-                            if output_path.exists():
-                                path.unlink()  # 원본 파일 삭제
-                                return str(output_path)
-                    return str(path)
-            
+                print(f"[ERROR] {e}")
             return None
-                
         except Exception as e:
             error_msg = f"다운로드 실패: {str(e)}"
             if HAS_STREAMLIT and st:
@@ -221,9 +553,6 @@ class YouTubeDownloader:
             import traceback
             traceback.print_exc()
             return None
-        except Exception as e:
-            st.error(f"다운로드 오류: {str(e)}")
-            return None
     
     def download_with_fallback(self, url: str) -> Optional[str]:
         """
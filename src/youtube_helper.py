@@ -11,10 +11,23 @@ except ImportError:
     st = None
 
 from typing import Optional, List, Dict
-import requests
+from datetime import datetime, timedelta, timezone
+import asyncio
 import os
+import threading
 from pathlib import Path
 
+import httpx
+
+try:
+    from http_client import request_with_retry, run_sync
+    from response_cache import TTLCache, normalize_key
+    from resilience import get_breaker, is_upstream_failure
+except ImportError:
+    from .http_client import request_with_retry, run_sync
+    from .response_cache import TTLCache, normalize_key
+    from .resilience import get_breaker, is_upstream_failure
+
 # Load environment variables from .env file in project root
 try:
     from dotenv import load_dotenv
@@ -31,18 +44,162 @@ except ImportError:
 except Exception:
     pass  # Failed to load .env, use system env vars only
 
+# YouTube 할당량은 태평양 시간 자정에 초기화됨
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+except Exception:
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+
+class YouTubeApiError(Exception):
+    """YouTube Data API 호출 실패"""
+    pass
+
+
+class QuotaMeter:
+    """YouTube Data API 일일 할당량 사용량 추정"""
+    
+    # 엔드포인트별 요청당 소모 단위 (YouTube Data API v3 기준)
+    UNIT_COSTS = {
+        "search": 100,
+        "videos": 1,
+        "channels": 1,
+        "playlistItems": 1,
+    }
+    
+    def __init__(self, daily_limit: int = 10000, reserve_ratio: float = 0.1):
+        """
+        할당량 측정기 초기화
+        
+        Args:
+            daily_limit: 하루 할당량 (기본값: 10,000 단위)
+            reserve_ratio: 남겨둘 비율 - 남은 양이 이보다 적으면 새 검색 대신 캐시/대체 결과 사용
+        """
+        self.daily_limit = daily_limit
+        self.reserve_units = int(daily_limit * reserve_ratio)
+        self._day = self._today()
+        self._used = 0
+        self._calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+    
+    def _roll_over(self):
+        """날짜가 바뀌었으면 사용량 초기화"""
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._used = 0
+            self._calls = {}
+    
+    def record(self, endpoint: str):
+        """API 호출 1회 기록"""
+        with self._lock:
+            self._roll_over()
+            self._used += self.UNIT_COSTS.get(endpoint, 1)
+            self._calls[endpoint] = self._calls.get(endpoint, 0) + 1
+    
+    @property
+    def used(self) -> int:
+        with self._lock:
+            self._roll_over()
+            return self._used
+    
+    @property
+    def remaining(self) -> int:
+        return max(0, self.daily_limit - self.used)
+    
+    def can_spend(self, units: int) -> bool:
+        """예비분을 남기고 units만큼 더 쓸 수 있는지 여부"""
+        return self.remaining - units >= self.reserve_units
+    
+    def snapshot(self) -> Dict:
+        """현재 사용량 정보"""
+        with self._lock:
+            self._roll_over()
+            return {
+                "day": self._day,
+                "used_units": self._used,
+                "daily_limit": self.daily_limit,
+                "remaining_units": max(0, self.daily_limit - self._used),
+                "reserve_units": self.reserve_units,
+                "calls": dict(self._calls),
+            }
+
+
 class YouTubeHelper:
     """YouTube API helper for finding music education videos"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    # 엔드포인트별 응답 캐시 유효 시간(초)
+    CACHE_TTLS = {
+        "search": 6 * 3600,
+        "video_info": 3600,
+        "channel": 24 * 3600,
+        "playlist": 3600,
+    }
+    
+    # 검색 1회에 드는 최대 할당량 (search 2회 + 대체 검색 1회 + videos 1회)
+    SEARCH_COST = 3 * QuotaMeter.UNIT_COSTS["search"] + QuotaMeter.UNIT_COSTS["videos"]
+    
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """
         Initialize YouTube helper
         
         Args:
             api_key: YouTube Data API key (optional, can use st.secrets)
+            base_url: API base URL (테스트용 로컬 목 서버 등, 기본값: YOUTUBE_API_BASE_URL 또는 Google API)
         """
         self.api_key = api_key or self._get_api_key()
-        self.base_url = "https://www.googleapis.com/youtube/v3"
+        self.base_url = (
+            base_url
+            or os.getenv("YOUTUBE_API_BASE_URL")
+            or "https://www.googleapis.com/youtube/v3"
+        )
+        
+        # 응답 캐시 (YOUTUBE_CACHE_DB를 지정하면 SQLite에도 저장)
+        self.cache = TTLCache(
+            max_entries=1024,
+            default_ttl=self.CACHE_TTLS["search"],
+            sqlite_path=os.getenv("YOUTUBE_CACHE_DB") or None,
+            namespace="youtube",
+        )
+        self.quota = QuotaMeter(daily_limit=int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000")))
+    
+    async def _api_get(self, endpoint: str, params: Dict) -> httpx.Response:
+        """
+        YouTube Data API GET 요청 (공유 연결 풀, 타임아웃/재시도 포함)
+        
+        Args:
+            endpoint: API 엔드포인트 (search, videos, channels, playlistItems)
+            params: 쿼리 파라미터 (API 키는 자동 추가)
+            
+        Returns:
+            httpx.Response
+            
+        Raises:
+            CircuitOpenError: YouTube API 서킷이 열려 있는 경우
+            YouTubeApiError: 5xx 응답
+        """
+        async def attempt(timeout: float) -> httpx.Response:
+            # 재시도도 할당량을 소모하므로 실제 전송마다 기록
+            response = await request_with_retry(
+                "GET",
+                f"{self.base_url}/{endpoint}",
+                params={**params, "key": self.api_key},
+                timeout=timeout,
+                total_timeout=timeout,
+                on_send=lambda: self.quota.record(endpoint),
+            )
+            if response.status_code >= 500:
+                # 서킷 브레이커가 장애로 집계하도록 예외로 전달
+                raise YouTubeApiError(f"YouTube API 오류: {response.status_code}")
+            return response
+        
+        # 장애가 이어지면 서킷이 열려 요청 없이 바로 실패 → 캐시/대체 결과로 전환
+        return await get_breaker("youtube").call(attempt, 10, is_failure=is_upstream_failure)
     
     def _get_api_key(self) -> Optional[str]:
         """Get API key from multiple sources (priority order)"""
@@ -63,16 +220,72 @@ class YouTubeHelper:
         # 3. No key found
         return None
     
+    async def _cached_call(self, kind: str, endpoint: str, resource_id: str,
+                           fetch, **params):
+        """
+        단건 조회(영상/채널/재생목록)를 캐시와 할당량을 고려해 실행
+        
+        신선한 캐시가 있으면 바로 반환하고, 할당량 예비분을 건드려야 하거나
+        요청이 실패하면 만료된 캐시라도 반환합니다.
+        
+        Args:
+            kind: CACHE_TTLS 키 (video_info, channel, playlist)
+            endpoint: 할당량 계산용 API 엔드포인트
+            resource_id: 영상/채널/재생목록 ID
+            fetch: 실제 API 요청 코루틴 함수 (실패 시 None 반환)
+            params: 캐시 키에 포함할 추가 파라미터
+            
+        Returns:
+            조회 결과 또는 None
+        """
+        key = normalize_key(kind, resource_id, **params)
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            return cached
+        
+        if not self.quota.can_spend(QuotaMeter.UNIT_COSTS.get(endpoint, 1)):
+            return await self.cache.aget(key, allow_stale=True)
+        
+        result = await self.cache.get_or_compute(key, fetch, ttl=self.CACHE_TTLS[kind], bypass=True)
+        if result is None:
+            return await self.cache.aget(key, allow_stale=True)
+        return result
+    
     def search_education_videos(self, query: str, max_results: int = 5,
                                 language: str = "ko", min_views: int = 100000) -> List[Dict]:
         """
         Search for educational videos with minimum view count filter
+        (동기 버전 - Streamlit 등에서 사용, 내부적으로 async 버전을 실행)
+        
+        Args:
+            query: Search query
+            max_results: Maximum number of results (1-50)
+            language: Language code (ko, en)
+            min_views: Minimum view count (default: 100,000)
+            
+        Returns:
+            List of video information dictionaries (filtered by view count)
+        """
+        return run_sync(lambda: self.search_education_videos_async(
+            query, max_results, language=language, min_views=min_views
+        ))
+    
+    async def search_education_videos_async(self, query: str, max_results: int = 5,
+                                            language: str = "ko",
+                                            min_views: int = 100000,
+                                            bypass_cache: bool = False) -> List[Dict]:
+        """
+        Search for educational videos with minimum view count filter
+        
+        같은 검색은 캐시에서 바로 반환하고, 동시에 들어온 같은 검색은 한 번만 요청합니다.
+        할당량이 거의 소진되었거나 API 오류가 나면 만료된 캐시 또는 대체 결과를 반환합니다.
         
         Args:
             query: Search query
             max_results: Maximum number of results (1-50)
             language: Language code (ko, en)
             min_views: Minimum view count (default: 100,000)
+            bypass_cache: True면 캐시를 무시하고 새로 검색
             
         Returns:
             List of video information dictionaries (filtered by view count)
@@ -80,193 +293,208 @@ class YouTubeHelper:
         if not self.api_key:
             return self._fallback_video_search(query)
         
+        key = normalize_key("search", query, max_results=max_results,
+                            language=language, min_views=min_views)
+        
+        if not bypass_cache:
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                return cached
+        
+        if not self.quota.can_spend(self.SEARCH_COST):
+            print(f"[WARN] YouTube 할당량이 부족하여 캐시/대체 결과를 반환합니다: {query}")
+            return await self.cache.aget(key, allow_stale=True) or self._fallback_video_search(query)
+        
         try:
-            # 악보와 음원이 포함된 영상을 우선 검색하도록 키워드 추가
-            # 여러 검색 쿼리를 시도하여 악보/음원이 잘 나오는 영상 찾기
-            search_queries = [
-                f"{query} 악보 음원 초등 음악",
-                f"{query} 악보 연주 초등",
-                f"{query} 악기 연주 악보",
-                f"{query} 초등 음악 교육"
-            ]
-            
-            # 더 많은 결과를 가져와서 필터링 (최대 50개)
-            search_max_results = min(max_results * 3, 50)  # 필터링을 위해 더 많이 가져옴
-            
-            all_video_ids = []
-            all_video_snippets = {}
-            
-            # 여러 쿼리로 검색하여 악보/음원 관련 영상 우선 수집
-            for enhanced_query in search_queries[:2]:  # 상위 2개 쿼리만 사용
-                # Step 1: Search for videos
-                search_params = {
-                    "part": "snippet",
-                    "q": enhanced_query,
-                    "type": "video",
-                    "maxResults": min(search_max_results // 2, 25),
-                    "relevanceLanguage": language,
-                    "videoCategoryId": "27",  # Education category
-                    "safeSearch": "strict",
-                    "order": "viewCount",  # 조회수 순으로 정렬
-                    "key": self.api_key
-                }
-                
-                search_response = requests.get(
-                    f"{self.base_url}/search",
-                    params=search_params,
-                    timeout=10
-                )
-                
-                if search_response.status_code == 200:
-                    search_data = search_response.json()
-                    for item in search_data.get('items', []):
-                        video_id = item['id']['videoId']
-                        if video_id not in all_video_ids:
-                            all_video_ids.append(video_id)
-                            all_video_snippets[video_id] = item['snippet']
-            
-            if not all_video_ids:
-                # 기본 검색으로 대체
-                enhanced_query = f"{query} 초등 음악 교육"
-                search_params = {
-                    "part": "snippet",
-                    "q": enhanced_query,
-                    "type": "video",
-                    "maxResults": search_max_results,
-                    "relevanceLanguage": language,
-                    "videoCategoryId": "27",
-                    "safeSearch": "strict",
-                    "order": "viewCount",
-                    "key": self.api_key
-                }
-                
-                search_response = requests.get(
-                    f"{self.base_url}/search",
-                    params=search_params,
-                    timeout=10
-                )
-                
-                if search_response.status_code != 200:
-                    if HAS_STREAMLIT and st:
-                        st.warning(f"YouTube API 오류: {search_response.status_code}")
-                    else:
-                        print(f"YouTube API 오류: {search_response.status_code}")
-                    return self._fallback_video_search(query)
-                
-                search_data = search_response.json()
-                all_video_ids = [item['id']['videoId'] for item in search_data.get('items', [])]
-                for item in search_data.get('items', []):
-                    all_video_snippets[item['id']['videoId']] = item['snippet']
-            
-            if not all_video_ids:
-                return []
-            
-            # Step 2: Get video statistics (view count)
-            videos_params = {
-                "part": "snippet,statistics",
-                "id": ",".join(all_video_ids),
-                "key": self.api_key
-            }
-            
-            videos_response = requests.get(
-                f"{self.base_url}/videos",
-                params=videos_params,
-                timeout=10
+            return await self.cache.get_or_compute(
+                key,
+                lambda: self._fetch_education_videos(query, max_results, language, min_views),
+                ttl=self.CACHE_TTLS["search"],
+                bypass=True,  # 캐시는 위에서 이미 확인함
             )
-            
-            if videos_response.status_code != 200:
-                # 통계 정보를 가져올 수 없으면 기본 정보만 반환
-                videos = []
-                for item in search_data.get('items', [])[:max_results]:
-                    video_info = {
-                        "title": item['snippet']['title'],
-                        "description": item['snippet']['description'][:200] + "...",
-                        "video_id": item['id']['videoId'],
-                        "url": f"https://www.youtube.com/watch?v={item['id']['videoId']}",
-                        "thumbnail": item['snippet']['thumbnails']['medium']['url'],
-                        "channel": item['snippet']['channelTitle'],
-                        "published_at": item['snippet']['publishedAt'][:10],
-                        "view_count": 0  # 알 수 없음
-                    }
-                    videos.append(video_info)
-                return videos
-            
-            videos_data = videos_response.json()
-            
-            # Step 3: Filter by view count and score by content quality
-            videos = []
-            score_keywords = {
-                '악보': 3,
-                '음원': 2,
-                '연주': 2,
-                '악기': 1,
-                '멜로디': 1,
-                '반주': 1,
-                'MR': 1,
-                '악기 연주': 2,
-                '피아노': 1,
-                '리코더': 1
-            }
-            
-            for item in videos_data.get('items', []):
-                view_count = int(item.get('statistics', {}).get('viewCount', 0))
-                
-                # 10만 뷰 이상인 영상만 포함
-                if view_count >= min_views:
-                    title = item['snippet']['title']
-                    description = item['snippet']['description']
-                    combined_text = (title + " " + description).lower()
-                    
-                    # 악보/음원 관련 키워드 점수 계산
-                    content_score = 0
-                    has_score = False
-                    has_audio = False
-                    
-                    for keyword, score in score_keywords.items():
-                        if keyword.lower() in combined_text:
-                            content_score += score
-                            if keyword in ['악보', '악기 연주']:
-                                has_score = True
-                            if keyword in ['음원', '연주', '멜로디', '반주', 'MR']:
-                                has_audio = True
-                    
-                    video_info = {
-                        "title": title,
-                        "description": description[:200] + "...",
-                        "video_id": item['id'],
-                        "url": f"https://www.youtube.com/watch?v={item['id']}",
-                        "thumbnail": item['snippet']['thumbnails']['medium']['url'],
-                        "channel": item['snippet']['channelTitle'],
-                        "published_at": item['snippet']['publishedAt'][:10],
-                        "view_count": view_count,
-                        "content_score": content_score,
-                        "has_score": has_score,
-                        "has_audio": has_audio
-                    }
-                    videos.append(video_info)
-            
-            # 콘텐츠 점수와 조회수를 고려하여 정렬
-            # 악보/음원이 있는 영상을 우선순위로 정렬
-            videos.sort(key=lambda x: (
-                x.get('has_score', False) and x.get('has_audio', False),  # 둘 다 있으면 최우선
-                x.get('has_score', False) or x.get('has_audio', False),   # 하나라도 있으면 우선
-                x.get('content_score', 0),  # 콘텐츠 점수
-                x.get('view_count', 0)       # 조회수
-            ), reverse=True)
-            
-            # 요청한 개수만큼만 반환
-            videos = videos[:max_results]
-            
-            return videos
-                
         except Exception as e:
             if HAS_STREAMLIT and st:
                 st.warning(f"YouTube 검색 오류: {str(e)}")
             else:
                 print(f"YouTube 검색 오류: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return self._fallback_video_search(query)
+            return await self.cache.aget(key, allow_stale=True) or self._fallback_video_search(query)
+    
+    async def _fetch_education_videos(self, query: str, max_results: int,
+                                      language: str, min_views: int) -> List[Dict]:
+        """
+        YouTube API로 교육 영상 검색 (캐시 없이 실제 요청)
+        
+        검색 쿼리들을 동시에 요청하므로 순차 요청보다 왕복 횟수가 줄어듭니다.
+        
+        Raises:
+            YouTubeApiError: API가 오류 응답을 반환한 경우
+        """
+        # 악보와 음원이 포함된 영상을 우선 검색하도록 키워드 추가
+        # 여러 검색 쿼리를 시도하여 악보/음원이 잘 나오는 영상 찾기
+        search_queries = [
+            f"{query} 악보 음원 초등 음악",
+            f"{query} 악보 연주 초등",
+            f"{query} 악기 연주 악보",
+            f"{query} 초등 음악 교육"
+        ]
+        
+        # 더 많은 결과를 가져와서 필터링 (최대 50개)
+        search_max_results = min(max_results * 3, 50)  # 필터링을 위해 더 많이 가져옴
+        
+        all_video_ids = []
+        all_video_snippets = {}
+        
+        # 여러 쿼리로 검색하여 악보/음원 관련 영상 우선 수집 (상위 2개 쿼리를 동시에 요청)
+        search_responses = await asyncio.gather(*[
+            self._api_get("search", self._search_params(
+                enhanced_query, min(search_max_results // 2, 25), language
+            ))
+            for enhanced_query in search_queries[:2]
+        ], return_exceptions=True)
+        
+        for search_response in search_responses:
+            if isinstance(search_response, Exception):
+                print(f"YouTube 검색 요청 실패: {search_response}")
+                continue
+            if search_response.status_code == 200:
+                search_data = search_response.json()
+                for item in search_data.get('items', []):
+                    video_id = item['id']['videoId']
+                    if video_id not in all_video_ids:
+                        all_video_ids.append(video_id)
+                        all_video_snippets[video_id] = item['snippet']
+        
+        if not all_video_ids:
+            # 기본 검색으로 대체
+            search_response = await self._api_get("search", self._search_params(
+                f"{query} 초등 음악 교육", search_max_results, language
+            ))
+            
+            if search_response.status_code != 200:
+                raise YouTubeApiError(f"YouTube API 오류: {search_response.status_code}")
+            
+            search_data = search_response.json()
+            all_video_ids = [item['id']['videoId'] for item in search_data.get('items', [])]
+            for item in search_data.get('items', []):
+                all_video_snippets[item['id']['videoId']] = item['snippet']
+        
+        if not all_video_ids:
+            return []
+        
+        # Step 2: Get video statistics (view count)
+        videos_response = await self._api_get("videos", {
+            "part": "snippet,statistics",
+            "id": ",".join(all_video_ids),
+        })
+        
+        if videos_response.status_code != 200:
+            # 통계 정보를 가져올 수 없으면 기본 정보만 반환
+            videos = []
+            for video_id in all_video_ids[:max_results]:
+                snippet = all_video_snippets[video_id]
+                video_info = {
+                    "title": snippet['title'],
+                    "description": snippet['description'][:200] + "...",
+                    "video_id": video_id,
+                    "url": f"https://www.youtube.com/watch?v={video_id}",
+                    "thumbnail": snippet['thumbnails']['medium']['url'],
+                    "channel": snippet['channelTitle'],
+                    "published_at": snippet['publishedAt'][:10],
+                    "view_count": 0  # 알 수 없음
+                }
+                videos.append(video_info)
+            return videos
+        
+        return self._rank_videos(videos_response.json(), max_results, min_views)
+    
+    def _search_params(self, enhanced_query: str, max_results: int, language: str) -> Dict:
+        """search 엔드포인트 파라미터 구성"""
+        return {
+            "part": "snippet",
+            "q": enhanced_query,
+            "type": "video",
+            "maxResults": max_results,
+            "relevanceLanguage": language,
+            "videoCategoryId": "27",  # Education category
+            "safeSearch": "strict",
+            "order": "viewCount",  # 조회수 순으로 정렬
+        }
+    
+    def _rank_videos(self, videos_data: Dict, max_results: int, min_views: int) -> List[Dict]:
+        """
+        조회수로 필터링하고 악보/음원 관련 콘텐츠 점수로 정렬
+        
+        Args:
+            videos_data: videos 엔드포인트 응답 JSON
+            max_results: 반환할 최대 개수
+            min_views: 최소 조회수
+            
+        Returns:
+            정렬된 영상 정보 목록
+        """
+        # Step 3: Filter by view count and score by content quality
+        videos = []
+        score_keywords = {
+            '악보': 3,
+            '음원': 2,
+            '연주': 2,
+            '악기': 1,
+            '멜로디': 1,
+            '반주': 1,
+            'MR': 1,
+            '악기 연주': 2,
+            '피아노': 1,
+            '리코더': 1
+        }
+        
+        for item in videos_data.get('items', []):
+            view_count = int(item.get('statistics', {}).get('viewCount', 0))
+            
+            # 10만 뷰 이상인 영상만 포함
+            if view_count >= min_views:
+                title = item['snippet']['title']
+                description = item['snippet']['description']
+                combined_text = (title + " " + description).lower()
+                
+                # 악보/음원 관련 키워드 점수 계산
+                content_score = 0
+                has_score = False
+                has_audio = False
+                
+                for keyword, score in score_keywords.items():
+                    if keyword.lower() in combined_text:
+                        content_score += score
+                        if keyword in ['악보', '악기 연주']:
+                            has_score = True
+                        if keyword in ['음원', '연주', '멜로디', '반주', 'MR']:
+                            has_audio = True
+                
+                video_info = {
+                    "title": title,
+                    "description": description[:200] + "...",
+                    "video_id": item['id'],
+                    "url": f"https://www.youtube.com/watch?v={item['id']}",
+                    "thumbnail": item['snippet']['thumbnails']['medium']['url'],
+                    "channel": item['snippet']['channelTitle'],
+                    "published_at": item['snippet']['publishedAt'][:10],
+                    "view_count": view_count,
+                    "content_score": content_score,
+                    "has_score": has_score,
+                    "has_audio": has_audio
+                }
+                videos.append(video_info)
+        
+        # 콘텐츠 점수와 조회수를 고려하여 정렬
+        # 악보/음원이 있는 영상을 우선순위로 정렬
+        videos.sort(key=lambda x: (
+            x.get('has_score', False) and x.get('has_audio', False),  # 둘 다 있으면 최우선
+            x.get('has_score', False) or x.get('has_audio', False),   # 하나라도 있으면 우선
+            x.get('content_score', 0),  # 콘텐츠 점수
+            x.get('view_count', 0)       # 조회수
+        ), reverse=True)
+        
+        # 요청한 개수만큼만 반환
+        return videos[:max_results]
     
     def find_tutorial_videos(self, instrument: str, song_title: str = None) -> List[Dict]:
         """
@@ -316,6 +544,18 @@ class YouTubeHelper:
         """
         Get information about an educational channel
         
+        Args:
+            channel_id: YouTube channel ID
+            
+        Returns:
+            Channel information dictionary
+        """
+        return run_sync(lambda: self.get_channel_info_async(channel_id))
+    
+    async def get_channel_info_async(self, channel_id: str) -> Optional[Dict]:
+        """
+        Get information about an educational channel (async, cached)
+        
         Args:
             channel_id: YouTube channel ID
             
@@ -325,18 +565,18 @@ class YouTubeHelper:
         if not self.api_key:
             return None
         
+        return await self._cached_call(
+            "channel", "channels", channel_id,
+            lambda: self._fetch_channel_info(channel_id),
+        )
+    
+    async def _fetch_channel_info(self, channel_id: str) -> Optional[Dict]:
+        """채널 정보 API 요청 (캐시 없이)"""
         try:
-            params = {
+            response = await self._api_get("channels", {
                 "part": "snippet,statistics",
                 "id": channel_id,
-                "key": self.api_key
-            }
-            
-            response = requests.get(
-                f"{self.base_url}/channels",
-                params=params,
-                timeout=10
-            )
+            })
             
             if response.status_code == 200:
                 data = response.json()
@@ -390,6 +630,18 @@ class YouTubeHelper:
         """
         Get video information by video ID
         
+        Args:
+            video_id: YouTube video ID
+            
+        Returns:
+            Video information dictionary with view count, or None if not found
+        """
+        return run_sync(lambda: self.get_video_info_async(video_id))
+    
+    async def get_video_info_async(self, video_id: str) -> Optional[Dict]:
+        """
+        Get video information by video ID (async, cached)
+        
         Args:
             video_id: YouTube video ID
             
@@ -399,18 +651,18 @@ class YouTubeHelper:
         if not self.api_key:
             return None
         
+        return await self._cached_call(
+            "video_info", "videos", video_id,
+            lambda: self._fetch_video_info(video_id),
+        )
+    
+    async def _fetch_video_info(self, video_id: str) -> Optional[Dict]:
+        """영상 정보 API 요청 (캐시 없이)"""
         try:
-            params = {
+            response = await self._api_get("videos", {
                 "part": "snippet,statistics",
                 "id": video_id,
-                "key": self.api_key
-            }
-            
-            response = requests.get(
-                f"{self.base_url}/videos",
-                params=params,
-                timeout=10
-            )
+            })
             
             if response.status_code != 200:
                 return None
@@ -525,13 +777,29 @@ class YouTubeHelper:
         return {
             "has_key": self.api_key is not None,
             "key_length": len(self.api_key) if self.api_key else 0,
-            "service": "YouTube Data API"
+            "service": "YouTube Data API",
+            "quota": self.quota.snapshot(),
+            "cache": self.cache.stats(),
         }
     
     def get_playlist_videos(self, playlist_id: str, max_results: int = 10) -> List[Dict]:
         """
         Get videos from a playlist
         
+        Args:
+            playlist_id: YouTube playlist ID
+            max_results: Maximum number of videos
+            
+        Returns:
+            List of videos in playlist
+        """
+        return run_sync(lambda: self.get_playlist_videos_async(playlist_id, max_results))
+    
+    async def get_playlist_videos_async(self, playlist_id: str,
+                                        max_results: int = 10) -> List[Dict]:
+        """
+        Get videos from a playlist (async, cached)
+        
         Args:
             playlist_id: YouTube playlist ID
             max_results: Maximum number of videos
@@ -542,19 +810,22 @@ class YouTubeHelper:
         if not self.api_key:
             return []
         
+        videos = await self._cached_call(
+            "playlist", "playlistItems", playlist_id,
+            lambda: self._fetch_playlist_videos(playlist_id, max_results),
+            max_results=max_results,
+        )
+        return videos or []
+    
+    async def _fetch_playlist_videos(self, playlist_id: str,
+                                     max_results: int) -> Optional[List[Dict]]:
+        """재생목록 API 요청 (캐시 없이, 실패 시 None)"""
         try:
-            params = {
+            response = await self._api_get("playlistItems", {
                 "part": "snippet",
                 "playlistId": playlist_id,
                 "maxResults": max_results,
-                "key": self.api_key
-            }
-            
-            response = requests.get(
-                f"{self.base_url}/playlistItems",
-                params=params,
-                timeout=10
-            )
+            })
             
             if response.status_code == 200:
                 data = response.json()
@@ -574,7 +845,7 @@ class YouTubeHelper:
                 
                 return videos
             
-            return []
+            return None
             
         except Exception as e:
-            return []
+            return None
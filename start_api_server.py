@@ -1,8 +1,16 @@
 """
 API 서버 시작 스크립트
 FastAPI 서버를 실행합니다.
+
+사용법:
+    python start_api_server.py [--workers 4] [--shared-state-dir data/shared]
+
+워커를 2개 이상 쓰면 악보/대화 기록/응답 캐시를 SHARED_STATE_DIR(기본: data/shared)의
+SQLite와 디스크 캐시로 공유하므로 어느 워커가 요청을 받아도 같은 점수 ID를 쓸 수 있습니다.
 """
 
+import argparse
+import os
 import uvicorn
 import sys
 from pathlib import Path
@@ -22,6 +30,21 @@ if __name__ == "__main__":
         except:
             pass
     
+    parser = argparse.ArgumentParser(description="초등 음악 도우미 API 서버")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("API_WORKERS", "1")),
+                        help="워커 프로세스 수 (기본: API_WORKERS 또는 1)")
+    parser.add_argument("--shared-state-dir", default=os.getenv("SHARED_STATE_DIR"),
+                        help="워커끼리 공유할 상태 디렉토리 (워커가 2개 이상이면 기본: data/shared)")
+    args = parser.parse_args()
+
+    if args.workers > 1 and not args.shared_state_dir:
+        args.shared_state_dir = str(project_root / "data" / "shared")
+    if args.shared_state_dir:
+        # 워커 프로세스는 환경 변수를 물려받아 같은 저장소를 씀
+        os.environ["SHARED_STATE_DIR"] = args.shared_state_dir
+    # 일괄 채보 작업자 수를 워커 수로 나누도록 알려줌
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+
     print("=" * 60)
     print("[API] 초등 음악 도우미 API 서버 시작")
     print("=" * 60)
@@ -29,6 +52,8 @@ if __name__ == "__main__":
     print("[주소] API 서버: http://localhost:8501")
     print("[문서] API 문서: http://localhost:8501/docs")
     print("[문서] 대화형 API: http://localhost:8501/redoc")
+    if args.workers > 1:
+        print(f"[워커] {args.workers}개 (공유 상태: {args.shared_state_dir})")
     print()
     print("[참고] React 프론트엔드는 http://localhost:5173 에서 실행하세요")
     print()
@@ -40,6 +65,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8501,
         reload=False,  # Python 3.14 호환성 문제로 reload 비활성화
+        workers=args.workers,
         log_level="info"
     )
 
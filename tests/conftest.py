@@ -0,0 +1,35 @@
+"""
+테스트 공통 설정
+src 모듈을 서버와 같은 방식(src를 경로에 추가한 뒤 바로 import)으로 불러옵니다.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# 공유 저장소 환경 변수가 있으면 테스트가 실제 캐시/DB를 건드리므로 비움
+SHARED_ENV_VARS = (
+    "SHARED_STATE_DIR", "SCORE_STORE_DB", "CHAT_HISTORY_DB",
+    "AI_CACHE_DB", "PERPLEXITY_CACHE_DB", "YOUTUBE_CACHE_DB",
+    "AI_CACHE_SIMILARITY",
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_env(monkeypatch):
+    for name in SHARED_ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    """테스트끼리 서킷 상태/지연 시간 기록을 공유하지 않도록 초기화"""
+    from resilience import _breakers, _breakers_lock
+    with _breakers_lock:
+        _breakers.clear()
+    yield
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,187 @@
+"""AIAssistant 비동기 클라이언트 테스트 (가짜 AsyncOpenAI, 네트워크 없음)"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from ai_assistant import AIAssistant
+
+
+class FakeStream:
+    """AsyncOpenAI 스트리밍 응답 흉내 (청크 반복 + response.aclose)"""
+
+    def __init__(self, pieces, delay: float = 0.0):
+        self.pieces = pieces
+        self.delay = delay
+        self.closed = False
+        self.response = SimpleNamespace(aclose=self._aclose)
+
+    async def _aclose(self):
+        self.closed = True
+
+    async def __aiter__(self):
+        # 역할만 담긴 첫 청크와 choices가 빈 사용량 청크도 실제 응답처럼 섞어 보냄
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=None))])
+        for piece in self.pieces:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+        yield SimpleNamespace(choices=[])
+
+
+class FakeCompletions:
+    def __init__(self, reply: str = "  안녕하세요!  ", delay: float = 0.0, pieces=("도", "레", "미")):
+        self.reply = reply
+        self.delay = delay
+        self.pieces = pieces
+        self.calls = []
+        self.streams = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs.get("stream"):
+            stream = FakeStream(self.pieces, self.delay)
+            self.streams.append(stream)
+            return stream
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.reply))])
+
+
+def install_fake_client(assistant: AIAssistant, completions: FakeCompletions, concurrency: int = 8):
+    """현재 이벤트 루프의 (AsyncOpenAI, Semaphore) 자리에 가짜 클라이언트를 넣음"""
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    assistant._async_clients[asyncio.get_running_loop()] = (client, asyncio.Semaphore(concurrency))
+
+
+@pytest.fixture
+def assistant(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    return AIAssistant()
+
+
+def test_acomplete_returns_stripped_text_and_passes_options(assistant):
+    completions = FakeCompletions()
+
+    async def scenario():
+        install_fake_client(assistant, completions)
+        return await assistant.acomplete(
+            [{"role": "user", "content": "계이름이 뭐예요?"}], model="gpt-4o-mini", max_tokens=400,
+        )
+
+    assert asyncio.run(scenario()) == "안녕하세요!"
+    call = completions.calls[0]
+    assert call["model"] == "gpt-4o-mini"
+    assert call["max_tokens"] == 400
+    assert call["messages"][0]["content"] == "계이름이 뭐예요?"
+    # 서킷 브레이커가 정한 타임아웃이 요청마다 전달됨
+    assert call["timeout"] > 0
+
+
+def test_acomplete_semaphore_limits_concurrency(assistant):
+    completions = FakeCompletions(delay=0.05)
+
+    async def scenario():
+        install_fake_client(assistant, completions, concurrency=2)
+        messages = [{"role": "user", "content": "박자"}]
+        return await asyncio.gather(*(assistant.acomplete(messages) for _ in range(6)))
+
+    results = asyncio.run(scenario())
+    assert len(results) == 6
+    assert len(completions.calls) == 6
+    assert completions.max_in_flight == 2
+
+
+def test_async_client_is_reused_within_loop(assistant):
+    completions = FakeCompletions()
+
+    async def scenario():
+        install_fake_client(assistant, completions)
+        first = assistant._get_async_client()
+        second = assistant._get_async_client()
+        return first is second
+
+    assert asyncio.run(scenario())
+
+
+def test_astream_yields_text_pieces(assistant):
+    completions = FakeCompletions(pieces=("도", "레", "미"))
+
+    async def scenario():
+        install_fake_client(assistant, completions)
+        return [piece async for piece in assistant.astream([{"role": "user", "content": "음계"}])]
+
+    assert asyncio.run(scenario()) == ["도", "레", "미"]
+    assert completions.calls[0]["stream"] is True
+    assert completions.streams[0].closed
+
+
+def test_astream_closes_upstream_when_consumer_stops(assistant):
+    completions = FakeCompletions(pieces=("솔", "라", "시", "도"), delay=0.01)
+
+    async def scenario():
+        install_fake_client(assistant, completions, concurrency=1)
+        tokens = assistant.astream([{"role": "user", "content": "음계"}])
+        first = await tokens.__anext__()
+        await tokens.aclose()
+        # 세마포어도 풀려서 다음 요청이 바로 진행됨
+        second = await asyncio.wait_for(assistant.acomplete([{"role": "user", "content": "다음"}]), 1.0)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == "솔"
+    assert second == "안녕하세요!"
+    assert completions.streams[0].closed
+
+
+def test_endpoints_learn_timeouts_separately(assistant):
+    from ai_assistant import OPENAI_TIMEOUT
+    from resilience import MIN_TIMEOUT, breaker_stats
+    completions = FakeCompletions()
+
+    async def scenario():
+        install_fake_client(assistant, completions)
+        messages = [{"role": "user", "content": "계이름"}]
+        # 짧은 채팅 응답이 많이 쌓여 채팅 타임아웃은 하한까지 줄어듦
+        for _ in range(25):
+            await assistant.acomplete(messages, endpoint="chat")
+        await assistant.acomplete(messages, endpoint="lesson_plan", max_tokens=800)
+
+    asyncio.run(scenario())
+    assert completions.calls[-2]["timeout"] == MIN_TIMEOUT
+    # 수업 계획은 채팅 지연 시간 기록을 쓰지 않으므로 기본 타임아웃 그대로
+    assert completions.calls[-1]["timeout"] == OPENAI_TIMEOUT
+    stats = breaker_stats()
+    assert stats["openai:chat"]["successes"] == 25
+    assert stats["openai:lesson_plan"]["successes"] == 1
+
+
+def test_lesson_plan_failures_do_not_open_chat_circuit(assistant):
+    from resilience import CLOSED, OPEN, get_breaker
+
+    class FailingCompletions(FakeCompletions):
+        async def create(self, **kwargs):
+            if kwargs["max_tokens"] == 800:
+                raise asyncio.TimeoutError()
+            return await super().create(**kwargs)
+
+    completions = FailingCompletions()
+
+    async def scenario():
+        install_fake_client(assistant, completions)
+        messages = [{"role": "user", "content": "수업"}]
+        for _ in range(6):
+            with pytest.raises(Exception):
+                await assistant.acomplete(messages, endpoint="lesson_plan", max_tokens=800)
+        return await assistant.acomplete(messages, endpoint="chat", max_tokens=400)
+
+    assert asyncio.run(scenario()) == "안녕하세요!"
+    assert get_breaker("openai:lesson_plan").state == OPEN
+    assert get_breaker("openai:chat").state == CLOSED
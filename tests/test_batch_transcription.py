@@ -0,0 +1,104 @@
+"""일괄 채보 작업자 수, 업로드 정리, 파일별 제한 시간 테스트
+
+제한 시간 테스트는 채보 대신 가짜 작업(_fake_task)을 실제 작업자 프로세스에서 실행합니다.
+"""
+
+import asyncio
+import os
+import time
+import zipfile
+
+import pytest
+
+import batch_transcription
+from batch_transcription import BatchTranscriber, batch_workers_per_api_worker, collect_uploads
+
+
+@pytest.fixture(autouse=True)
+def eight_cores(monkeypatch):
+    monkeypatch.setattr(batch_transcription.os, "cpu_count", lambda: 8)
+    for name in ("BATCH_WORKERS", "WEB_CONCURRENCY", "API_WORKERS"):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.mark.parametrize("env, expected", [
+    ({}, 7),
+    ({"WEB_CONCURRENCY": "4"}, 1),
+    ({"API_WORKERS": "2"}, 3),
+    ({"WEB_CONCURRENCY": "2", "API_WORKERS": "8"}, 3),
+    ({"BATCH_WORKERS": "6", "WEB_CONCURRENCY": "3"}, 2),
+    ({"BATCH_WORKERS": "2", "WEB_CONCURRENCY": "8"}, 1),
+])
+def test_pool_is_split_across_api_workers(monkeypatch, env, expected):
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    assert batch_workers_per_api_worker() == expected
+
+
+def test_collect_uploads_unpacks_zip_and_skips_unsupported(tmp_path):
+    archive = tmp_path / "class3.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("student01.wav", b"RIFF")
+        zf.writestr("nested/student02.mid", b"MThd")
+        zf.writestr("__MACOSX/._student01.wav", b"")
+        zf.writestr("readme.txt", b"hello")
+    single = tmp_path / "student03.mp3"
+    single.write_bytes(b"ID3")
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+
+    files, skipped = collect_uploads([("class3.zip", str(archive)), ("student03.mp3", str(single)),
+                                      ("notes.docx", str(single))], workdir)
+    assert [name for name, _ in files] == ["student01.wav", "nested/student02.mid", "student03.mp3"]
+    assert (workdir / "000.wav").read_bytes() == b"RIFF"
+    assert [s["filename"] for s in skipped] == ["readme.txt", "notes.docx"]
+
+
+def test_collect_uploads_enforces_file_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_transcription, "BATCH_MAX_FILES", 2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"s{i}.wav"
+        path.write_bytes(b"RIFF")
+        paths.append((path.name, str(path)))
+    with pytest.raises(ValueError):
+        collect_uploads(paths, tmp_path)
+
+
+def _fake_task(path: str) -> dict:
+    """작업자 프로세스에서 실행되는 가짜 채보 (경로 이름이 곧 동작)"""
+    if path == "hang":
+        time.sleep(60)
+    elif path.startswith("slow"):
+        time.sleep(0.4)
+    return {"pid": os.getpid(), "score": b"", "stats": {"path": path}, "seconds": 0.0}
+
+
+def run_batches(transcriber, *batches):
+    async def collect(files):
+        return {name: result async for _, name, result in transcriber.transcribe(files)}
+
+    async def scenario():
+        return await asyncio.gather(*(collect(files) for files in batches))
+
+    try:
+        return asyncio.run(scenario())
+    finally:
+        transcriber.shutdown()
+
+
+def test_timeout_counts_from_start_and_stops_the_worker():
+    transcriber = BatchTranscriber(max_workers=2, file_timeout=1.5, task=_fake_task)
+    transcriber.prewarm()
+    stuck, queued = run_batches(
+        transcriber,
+        [("hang.wav", "hang"), ("a.wav", "ok-a")],
+        # 다른 요청의 파일은 작업자를 기다린 시간과 관계없이 각자 0.4초만 걸림
+        [(f"s{i}.wav", f"slow-{i}") for i in range(6)],
+    )
+    assert stuck["hang.wav"]["error"] == "채보 시간이 초과되었습니다"
+    assert stuck["a.wav"]["stats"] == {"path": "ok-a"}
+    assert all("error" not in result for result in queued.values()), queued
+    stats = transcriber.stats()
+    assert stats["files_timed_out"] == 1
+    assert stats["pool_restarts"] >= 1
@@ -0,0 +1,72 @@
+"""학급 진도 기록 가져오기 테스트 (임시 SQLite DB)"""
+
+import io
+import sqlite3
+
+import pytest
+
+from class_io import import_progress
+from database import DatabaseManager
+
+PROGRESS_CSV = """번호,이름,날짜,활동 유형,곡,상태,점수,메모
+1,김하늘,2024-03-04,가창,학교종,완료,90,
+2,이바다,2024-03-04,가창,학교종,진행중,70,
+1,김하늘,2024-03-11,기악,나비야,완료,85,{note}
+3,없는학생,2024-03-11,기악,나비야,완료,80,
+"""
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "class.db"))
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def class_id(db):
+    class_id = db.add_class(3, 1)
+    db.add_student(class_id, "김하늘", 1)
+    db.add_student(class_id, "이바다", 2)
+    return class_id
+
+
+def progress_file(note: str = "") -> io.BytesIO:
+    return io.BytesIO(PROGRESS_CSV.format(note=note).encode("utf-8-sig"))
+
+
+def count(db, table: str) -> int:
+    return db._connect().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_import_creates_activities_and_progress(db, class_id):
+    result = import_progress(db, class_id, progress_file())
+    assert result == {"imported": 3, "skipped": 1, "activities_created": 2}
+    assert count(db, "activities") == 2
+
+    # 같은 파일을 다시 가져오면 활동은 재사용하고 이미 있는 기록은 건너뜀
+    again = import_progress(db, class_id, progress_file())
+    assert again == {"imported": 0, "skipped": 4, "activities_created": 0}
+    assert count(db, "activities") == 2
+    assert count(db, "student_progress") == 3
+
+
+def test_failed_import_leaves_no_orphan_activities(db, class_id):
+    conn = db._connect()
+    conn.execute("""
+        CREATE TRIGGER reject_progress BEFORE INSERT ON student_progress
+        WHEN NEW.notes = 'boom' BEGIN SELECT RAISE(ABORT, 'rejected'); END
+    """)
+    conn.commit()
+
+    with pytest.raises(sqlite3.DatabaseError):
+        import_progress(db, class_id, progress_file(note="boom"))
+    # 활동 생성까지 되돌려져 진도 기록 없는 활동이 남지 않음
+    assert count(db, "activities") == 0
+    assert count(db, "student_progress") == 0
+
+    conn.execute("DROP TRIGGER reject_progress")
+    conn.commit()
+    result = import_progress(db, class_id, progress_file())
+    assert result["activities_created"] == 2
+    assert count(db, "student_progress") == 3
@@ -0,0 +1,103 @@
+"""ConversationStore 테스트 - 같은 SQLite 파일을 쓰는 두 워커가 대화 기록을 공유하는지"""
+
+import asyncio
+import threading
+
+import pytest
+
+from conversation_store import ConversationStore
+
+
+@pytest.fixture
+def workers(tmp_path):
+    path = str(tmp_path / "chat_history.db")
+    return ConversationStore(sqlite_path=path), ConversationStore(sqlite_path=path)
+
+
+def contents(store, session_id):
+    return [m["content"] for m in store.get_history(session_id)]
+
+
+def test_turns_from_other_worker_are_visible(workers):
+    a, b = workers
+    a.add_turn("s1", "계이름이 뭐예요?", "도레미...")
+    assert contents(a, "s1") == ["계이름이 뭐예요?", "도레미..."]
+    b.add_turn("s1", "박자는요?", "박자는...")
+    # A는 이미 메모리에 s1이 있어도 B가 덧붙인 기록을 봄
+    assert contents(a, "s1") == ["계이름이 뭐예요?", "도레미...", "박자는요?", "박자는..."]
+    assert [m["role"] for m in a.history_for_prompt("s1")] == ["user", "assistant"] * 2
+
+
+def test_add_turn_does_not_drop_other_worker_turns(workers):
+    a, b = workers
+    a.add_turn("s1", "q1", "a1")
+    b.add_turn("s1", "q2", "a2")
+    a.add_turn("s1", "q3", "a3")
+    assert contents(b, "s1") == ["q1", "a1", "q2", "a2", "q3", "a3"]
+
+
+def test_clear_on_one_worker_is_seen_by_other(workers):
+    a, b = workers
+    a.add_turn("s1", "q1", "a1")
+    assert contents(b, "s1") == ["q1", "a1"]
+    b.clear("s1")
+    assert a.get_history("s1") == []
+    # A에 남아 있던 메모리 사본이 다음 저장 때 되살아나지 않음
+    a.add_turn("s1", "q2", "a2")
+    assert contents(b, "s1") == ["q2", "a2"]
+
+
+def test_concurrent_appends_keep_every_turn(workers):
+    a, b = workers
+
+    def worker(store, name):
+        for i in range(5):
+            store.add_turn("s1", f"{name}-q{i}", f"{name}-a{i}")
+
+    threads = [threading.Thread(target=worker, args=(store, name)) for store, name in ((a, "A"), (b, "B"))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    history = contents(a, "s1")
+    assert len(history) == 20
+    assert sorted(history[::2]) == sorted([f"{n}-q{i}" for n in "AB" for i in range(5)])
+
+
+def test_max_messages_and_memory_only_mode():
+    store = ConversationStore(max_messages=4)
+    for i in range(3):
+        store.add_turn("s1", f"q{i}", f"a{i}")
+    assert contents(store, "s1") == ["q1", "a1", "q2", "a2"]
+    store.clear("s1")
+    assert store.get_history("s1") == []
+
+
+def record_threads(store, names):
+    threads = []
+    for name in names:
+        original = getattr(store, name)
+
+        def wrapper(*args, _original=original):
+            threads.append(threading.get_ident())
+            return _original(*args)
+
+        setattr(store, name, wrapper)
+    return threads
+
+
+def test_async_wrappers_keep_sqlite_off_event_loop(workers):
+    a, b = workers
+    threads = record_threads(a, ["_sqlite_load", "_sqlite_append", "_sqlite_delete"])
+
+    async def scenario():
+        await a.aadd_turn("s1", "q1", "a1")
+        history = await a.ahistory_for_prompt("s1")
+        await a.aclear("s1")
+        return threading.get_ident(), history
+
+    loop_thread, history = asyncio.run(scenario())
+    assert [m["content"] for m in history] == ["q1", "a1"]
+    assert b.get_history("s1") == []
+    assert len(threads) == 3
+    assert loop_thread not in threads
@@ -0,0 +1,97 @@
+"""DatabaseManager 연결/트랜잭션 테스트 (임시 SQLite DB)"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from database import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "dashboard.db"))
+    yield manager
+    manager.close()
+
+
+def run_in_thread(fn):
+    result = {}
+
+    def target():
+        try:
+            result["value"] = fn()
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result.get("value")
+
+
+def test_failed_write_does_not_leave_transaction_open(db):
+    class_id = db.add_class(3, 1)
+    with pytest.raises(sqlite3.IntegrityError):
+        db.add_student(class_id, None)
+    assert not db._connect().in_transaction
+
+    # 다른 스레드의 쓰기와 같은 스레드의 명시적 트랜잭션이 막히지 않음
+    run_in_thread(lambda: db.add_student(class_id, "김하늘", 1))
+    imported, created = db.import_progress_bulk(class_id, [])
+    assert (imported, created) == (0, 0)
+    assert [s["student_name"] for s in db.get_students_by_class(class_id)] == ["김하늘"]
+
+
+def test_failed_progress_write_is_rolled_back(db):
+    class_id = db.add_class(3, 1)
+    student_id = db.add_student(class_id, "김하늘", 1)
+    with pytest.raises(sqlite3.IntegrityError):
+        db.record_progress(student_id, None, "완료", 90)
+    assert not db._connect().in_transaction
+    activity_id = db.add_activity(class_id, "2024-03-04", "가창")
+    db.record_progress(student_id, activity_id, "완료", 90)
+    assert db.get_class_statistics(class_id)["progress_count"] == 1
+
+
+def test_connections_of_finished_threads_are_closed(db):
+    db.add_class(3, 1)
+    for _ in range(5):
+        run_in_thread(db.get_all_classes)
+    # 끝난 스레드의 연결은 새 연결을 만들 때 닫힘 (현재 스레드 + 마지막 스레드만 남음)
+    assert len(db._connections) <= 2
+
+
+def test_concurrent_open_applies_migrations_once(tmp_path):
+    for attempt in range(10):
+        path = str(tmp_path / f"legacy_{attempt}.db")
+        # 마이그레이션 전 스키마(user_version 0)에 학급이 있는 기존 DB
+        legacy = DatabaseManager(path)
+        class_id = legacy.add_class(3, 1)
+        legacy.add_student(class_id, "김하늘", 1)
+        conn = legacy._connect()
+        conn.executescript("""
+            DROP VIEW class_summary;
+            DROP TABLE class_stats; DROP TABLE activity_stats; DROP TABLE class_monthly_stats;
+            PRAGMA user_version = 0;
+        """)
+        legacy.close()
+
+        barrier = threading.Barrier(2)
+        managers = []
+
+        def open_db():
+            barrier.wait()
+            managers.append(DatabaseManager(path))
+
+        threads = [threading.Thread(target=open_db) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(managers) == 2
+        assert managers[0].get_class_statistics(class_id)["total_students"] == 1
+        for manager in managers:
+            manager.close()
@@ -0,0 +1,139 @@
+"""http_client.request_with_retry 테스트 (httpx.MockTransport, 네트워크 없음)"""
+
+import asyncio
+
+import httpx
+import pytest
+
+import http_client
+from http_client import request_with_retry
+
+
+def run_with_transport(handler, make_coro):
+    """공유 클라이언트를 목 전송 계층으로 바꿔 끼우고 코루틴 실행"""
+    async def runner():
+        loop = asyncio.get_running_loop()
+        http_client._async_clients[loop] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await make_coro()
+        finally:
+            await http_client.close_async_client()
+    return asyncio.run(runner())
+
+
+def test_success_does_not_retry():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"ok": True})
+
+    response = run_with_transport(handler, lambda: request_with_retry(
+        "GET", "https://api.test/items", params={"q": "학교종"}, backoff=0.01,
+    ))
+    assert response.status_code == 200
+    assert len(calls) == 1
+    assert calls[0].url.params["q"] == "학교종"
+
+
+def test_retries_transient_status_then_succeeds():
+    statuses = iter([503, 429, 200])
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(next(statuses))
+
+    response = run_with_transport(handler, lambda: request_with_retry(
+        "GET", "https://api.test/items", retries=2, backoff=0.01,
+    ))
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+def test_on_send_is_called_for_every_attempt():
+    statuses = iter([503, 200])
+    sent = []
+
+    def handler(request):
+        return httpx.Response(next(statuses))
+
+    response = run_with_transport(handler, lambda: request_with_retry(
+        "GET", "https://api.test/items", retries=2, backoff=0.01,
+        on_send=lambda: sent.append(1),
+    ))
+    assert response.status_code == 200
+    assert len(sent) == 2
+
+
+def test_returns_last_error_response_after_retries():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(502)
+
+    response = run_with_transport(handler, lambda: request_with_retry(
+        "GET", "https://api.test/items", retries=2, backoff=0.01,
+    ))
+    assert response.status_code == 502
+    assert len(calls) == 3
+
+
+def test_client_error_is_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(403)
+
+    response = run_with_transport(handler, lambda: request_with_retry(
+        "GET", "https://api.test/items", retries=3, backoff=0.01,
+    ))
+    assert response.status_code == 403
+    assert len(calls) == 1
+
+
+def test_transport_error_is_retried_then_raised():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    with pytest.raises(httpx.ConnectError):
+        run_with_transport(handler, lambda: request_with_retry(
+            "GET", "https://api.test/items", retries=2, backoff=0.01,
+        ))
+    assert len(calls) == 3
+
+
+def test_total_timeout_stops_retrying():
+    # 재시도 대기(0.3초, 0.6초, ...) 뒤에 0.5초 이상 남지 않으면 더 시도하지 않음
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    response = run_with_transport(handler, lambda: request_with_retry(
+        "GET", "https://api.test/items", retries=5, backoff=0.3, total_timeout=1.0,
+    ))
+    assert response.status_code == 503
+    assert len(calls) == 2
+
+
+def test_total_timeout_caps_each_attempt_timeout():
+    timeouts = []
+
+    def handler(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(503 if len(timeouts) == 1 else 200)
+
+    response = run_with_transport(handler, lambda: request_with_retry(
+        "GET", "https://api.test/items", timeout=30.0, backoff=0.2, total_timeout=2.0,
+    ))
+    assert response.status_code == 200
+    assert timeouts[0] <= 2.0
+    # 두 번째 시도는 첫 시도와 대기 시간을 뺀 남은 시간만 기다림
+    assert timeouts[1] < timeouts[0] - 0.1
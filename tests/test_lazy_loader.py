@@ -0,0 +1,74 @@
+"""LazyComponent 테스트 - 비동기 처리기에서 불러오기가 이벤트 루프를 막지 않는지"""
+
+import asyncio
+import threading
+import time
+
+from lazy_loader import FAILED, READY, LazyComponent
+
+
+def test_aget_loads_off_event_loop_and_keeps_loop_responsive():
+    load_threads = []
+
+    def slow_loader():
+        load_threads.append(threading.get_ident())
+        time.sleep(0.3)
+        return object()
+
+    component = LazyComponent("slow", slow_loader)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        instance = await component.aget()
+        again = await component.aget()
+        task.cancel()
+        return threading.get_ident(), instance, again, ticks
+
+    loop_thread, instance, again, ticks = asyncio.run(scenario())
+    assert instance is again is component.get()
+    assert component.state == READY
+    assert load_threads and loop_thread not in load_threads
+    # 불러오는 동안 다른 작업이 계속 실행됨
+    assert ticks >= 10
+
+
+def test_aget_waits_for_prewarm_in_progress():
+    started = threading.Event()
+
+    def loader():
+        started.set()
+        time.sleep(0.2)
+        return "ready"
+
+    component = LazyComponent("prewarmed", loader)
+    prewarm = threading.Thread(target=component.get)
+    prewarm.start()
+    started.wait()
+
+    async def scenario():
+        return await asyncio.wait_for(component.aget(), timeout=5)
+
+    assert asyncio.run(scenario()) == "ready"
+    prewarm.join()
+
+
+def test_failed_component_is_falsy_without_retry():
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ImportError("no module")
+
+    component = LazyComponent("broken", broken)
+    assert asyncio.run(component.aget()) is None
+    assert asyncio.run(component.aget()) is None
+    assert component.state == FAILED
+    assert len(calls) == 1
@@ -0,0 +1,33 @@
+"""omr_service 출력 파일 읽기 테스트"""
+
+import zipfile
+
+import pytest
+
+from omr_service import OmrError, read_musicxml_output
+
+MUSICXML = '<?xml version="1.0" encoding="UTF-8"?><score-partwise version="3.1"><part-list/></score-partwise>'
+
+
+def test_mxl_output_is_unzipped(tmp_path):
+    path = tmp_path / "input.mxl"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("META-INF/container.xml", "<container/>")
+        archive.writestr("input.xml", MUSICXML)
+
+    assert read_musicxml_output(path) == MUSICXML
+
+
+def test_plain_xml_output_is_read_as_text(tmp_path):
+    path = tmp_path / "input.xml"
+    path.write_text(MUSICXML, encoding="utf-8")
+
+    assert read_musicxml_output(path) == MUSICXML
+
+
+def test_corrupt_mxl_raises_omr_error(tmp_path):
+    path = tmp_path / "input.mxl"
+    path.write_bytes(b"not a zip")
+
+    with pytest.raises(OmrError):
+        read_musicxml_output(path)
@@ -0,0 +1,222 @@
+"""PerplexityAssistant 요청 구성/응답 해석/캐시 병합 테스트 (네트워크 없음)"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import http_client
+from perplexity_assistant import DEFAULT_MODEL, PerplexityAssistant, PerplexityError
+
+API_URL = "https://pplx.test/chat/completions"
+
+
+@pytest.fixture
+def assistant():
+    return PerplexityAssistant(api_key="pplx-test", base_url=API_URL)
+
+
+def chat_response(content: str, citations=None) -> dict:
+    return {"choices": [{"message": {"role": "assistant", "content": content}}],
+            "citations": citations or []}
+
+
+def run_with_transport(handler, make_coro):
+    async def runner():
+        loop = asyncio.get_running_loop()
+        http_client._async_clients[loop] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await make_coro()
+        finally:
+            await http_client.close_async_client()
+    return asyncio.run(runner())
+
+
+# 요청 구성
+
+def test_build_request_music_theory(assistant):
+    request = assistant._build_request("search_music_theory", "셈여림", "basic")
+    payload = request["payload"]
+    assert payload["model"] == DEFAULT_MODEL
+    assert [m["role"] for m in payload["messages"]] == ["system", "user"]
+    assert "셈여림" in payload["messages"][1]["content"]
+    assert "난이도: basic" in payload["messages"][1]["content"]
+    assert (payload["temperature"], payload["max_tokens"]) == (0.2, 1000)
+    assert request["citation_title"] == "**참고 자료:**"
+    assert request["citation_limit"] == 3
+
+
+@pytest.mark.parametrize("method, args, max_tokens, citation_limit", [
+    ("research_song_background", ("학교종",), 800, 0),
+    ("find_teaching_resources", ("리코더", "3학년"), 1000, 5),
+    ("get_latest_education_trends", ("초등 음악 교육",), 1000, 0),
+    ("compare_teaching_methods", ("코다이", "오르프"), 1200, 0),
+])
+def test_build_request_other_methods(assistant, method, args, max_tokens, citation_limit):
+    request = assistant._build_request(method, *args)
+    prompt = request["payload"]["messages"][1]["content"]
+    assert all(arg in prompt for arg in args)
+    assert request["payload"]["max_tokens"] == max_tokens
+    assert request["citation_limit"] == citation_limit
+
+
+def test_build_request_unknown_method(assistant):
+    with pytest.raises(ValueError):
+        assistant._build_request("search_everything", "x")
+
+
+# 응답 해석
+
+def test_parse_response_appends_limited_citations(assistant):
+    request = assistant._build_request("search_music_theory", "박자", "basic")
+    body = chat_response("박자는 음악의 맥박입니다.", ["https://a.test", "https://b.test",
+                                                   "https://c.test", "https://d.test"])
+    content = assistant._parse_response(200, "", body, request)
+    assert content.startswith("박자는 음악의 맥박입니다.")
+    assert "**참고 자료:**" in content
+    assert "3. https://c.test" in content
+    assert "https://d.test" not in content
+
+
+def test_parse_response_without_citation_title_ignores_citations(assistant):
+    request = assistant._build_request("research_song_background", "학교종")
+    content = assistant._parse_response(200, "", chat_response("배경", ["https://a.test"]), request)
+    assert content == "배경"
+
+
+def test_parse_response_http_error_uses_api_message(assistant):
+    request = assistant._build_request("research_song_background", "학교종")
+    with pytest.raises(PerplexityError) as info:
+        assistant._parse_response(429, "raw", {"error": {"message": "rate limited"}}, request)
+    assert info.value.kind == "http"
+    assert info.value.status_code == 429
+    assert str(info.value) == "rate limited"
+
+
+@pytest.mark.parametrize("body", [None, {}, {"choices": []}, ["not", "a", "dict"]])
+def test_parse_response_bad_format(assistant, body):
+    request = assistant._build_request("research_song_background", "학교종")
+    with pytest.raises(PerplexityError) as info:
+        assistant._parse_response(200, "", body, request)
+    assert info.value.kind == "format"
+
+
+# 비동기 검색: 캐시와 동시 요청 병합
+
+def test_run_async_coalesces_concurrent_searches_and_caches(assistant):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=chat_response("리코더 자료"))
+
+    async def scenario():
+        results = await asyncio.gather(*(
+            assistant.find_teaching_resources_async("리코더", "3학년") for _ in range(5)
+        ))
+        # 표기만 다른 같은 검색도 캐시에서 반환
+        results.append(await assistant.find_teaching_resources_async("리코더 ", "3학년"))
+        return results
+
+    results = run_with_transport(handler, scenario)
+    assert results == ["리코더 자료"] * 6
+    assert len(calls) == 1
+
+
+def test_run_async_bypass_cache_calls_again(assistant):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=chat_response(f"응답 {len(calls)}"))
+
+    async def scenario():
+        first = await assistant.research_song_background_async("학교종")
+        second = await assistant.research_song_background_async("학교종", use_cache=False)
+        third = await assistant.research_song_background_async("학교종")
+        return first, second, third
+
+    assert run_with_transport(handler, scenario) == ("응답 1", "응답 2", "응답 2")
+    assert len(calls) == 2
+
+
+def test_run_async_error_goes_to_handler_and_is_not_cached(assistant):
+    responses = iter([
+        httpx.Response(401, json={"error": {"message": "invalid key"}}),
+        httpx.Response(200, json=chat_response("비교 결과")),
+    ])
+
+    async def scenario():
+        failed = await assistant.compare_teaching_methods_async("코다이", "오르프")
+        ok = await assistant.compare_teaching_methods_async("코다이", "오르프")
+        return failed, ok
+
+    failed, ok = run_with_transport(lambda request: next(responses), scenario)
+    assert "invalid key" in failed
+    assert ok == "비교 결과"
+
+
+# API 키 검증 캐시
+
+def test_validation_result_is_cached(assistant):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=chat_response("ok"))
+
+    async def scenario():
+        return [await assistant.validate_api_key_async() for _ in range(3)]
+
+    results = run_with_transport(handler, scenario)
+    assert results[0]["valid"] and "cached" not in results[0]
+    assert all(r["cached"] for r in results[1:])
+    assert len(calls) == 1
+
+
+def test_validation_tries_next_model_on_400_and_force_revalidates(assistant):
+    models = []
+
+    def handler(request):
+        model = json.loads(request.content)["model"]
+        models.append(model)
+        return httpx.Response(400 if model != "sonar" else 200, json={})
+
+    async def scenario():
+        first = await assistant.validate_api_key_async()
+        forced = await assistant.validate_api_key_async(force=True)
+        return first, forced
+
+    first, forced = run_with_transport(handler, scenario)
+    assert first["model"] == forced["model"] == "sonar"
+    assert models == PerplexityAssistant.VALIDATION_MODELS * 2
+
+
+def test_validation_cache_is_per_api_key(assistant):
+    calls = []
+
+    def handler(request):
+        calls.append(request.headers["Authorization"])
+        return httpx.Response(401 if "other" in calls[-1] else 200, json={})
+
+    async def scenario():
+        first = await assistant.validate_api_key_async()
+        assistant.api_key = "pplx-other"
+        second = await assistant.validate_api_key_async()
+        return first, second
+
+    first, second = run_with_transport(handler, scenario)
+    assert first["valid"] and not second["valid"]
+    assert len(calls) == 2
+
+
+def test_validation_precheck_skips_request():
+    assistant = PerplexityAssistant(api_key="sk-wrong-prefix", base_url=API_URL)
+
+    def handler(request):
+        raise AssertionError("형식이 틀린 키로는 요청하지 않아야 함")
+
+    result = run_with_transport(handler, assistant.validate_api_key_async)
+    assert not result["valid"]
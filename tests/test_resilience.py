@@ -0,0 +1,191 @@
+"""서킷 브레이커 상태 전이와 적응형 타임아웃 테스트"""
+
+import asyncio
+import time
+
+import pytest
+
+from resilience import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, get_breaker, is_upstream_failure,
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+async def fail(timeout: float):
+    raise ConnectionError("업스트림 연결 실패")
+
+
+async def succeed(timeout: float):
+    return "ok"
+
+
+def make_breaker(**kwargs) -> CircuitBreaker:
+    options = dict(failure_threshold=3, recovery_time=0.05, min_samples=5, min_timeout=1.0,
+                   timeout_multiplier=3.0)
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+# 상태 전이
+
+def test_opens_after_consecutive_failures():
+    breaker = make_breaker()
+
+    async def scenario():
+        for _ in range(3):
+            with pytest.raises(ConnectionError):
+                await breaker.call(fail, 5)
+        assert breaker.state == OPEN
+        # 열린 동안에는 요청 함수를 부르지 않고 바로 실패
+        with pytest.raises(CircuitOpenError) as info:
+            await breaker.call(succeed, 5)
+        assert 0 < info.value.retry_after <= 0.05
+
+    asyncio.run(scenario())
+    snapshot = breaker.snapshot()
+    assert snapshot["failures"] == 3
+    assert snapshot["short_circuited"] == 1
+
+
+def test_success_resets_failure_count():
+    breaker = make_breaker()
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await breaker.call(fail, 5)
+        await breaker.call(succeed, 5)
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await breaker.call(fail, 5)
+
+    asyncio.run(scenario())
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_success_closes():
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure(ConnectionError())
+    assert breaker.state == OPEN
+
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    # 시험 요청은 하나만 통과
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_half_open_probe_failure_reopens():
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure(ConnectionError())
+    time.sleep(0.06)
+
+    breaker.before_call()
+    breaker.record_failure(ConnectionError())
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_cancelled_probe_releases_half_open_slot():
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure(ConnectionError())
+    time.sleep(0.06)
+
+    async def slow(timeout: float):
+        await asyncio.sleep(10)
+
+    async def scenario():
+        task = asyncio.ensure_future(breaker.call(slow, 5))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return await breaker.call(succeed, 5)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_client_errors_do_not_count_as_failures():
+    breaker = make_breaker()
+
+    async def bad_request(timeout: float):
+        raise StatusError(400)
+
+    async def scenario():
+        for _ in range(5):
+            with pytest.raises(StatusError):
+                await breaker.call(bad_request, 5, is_failure=is_upstream_failure)
+
+    asyncio.run(scenario())
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["failures"] == 0
+
+
+@pytest.mark.parametrize("status, expected", [(400, False), (401, False), (404, False),
+                                              (408, True), (429, True), (500, True), (503, True)])
+def test_is_upstream_failure(status, expected):
+    assert is_upstream_failure(StatusError(status)) is expected
+    assert is_upstream_failure(TimeoutError())
+
+
+# 적응형 타임아웃
+
+def test_timeout_uses_default_until_enough_samples():
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record_success(0.1)
+    assert breaker.timeout(30) == 30
+    breaker.record_success(0.1)
+    # p95(0.1) × 3 = 0.3초 → 하한 1초
+    assert breaker.timeout(30) == 1.0
+
+
+def test_timeout_is_p95_times_multiplier_within_bounds():
+    breaker = make_breaker(min_samples=20)
+    for i in range(1, 21):
+        breaker.record_success(i * 0.5)     # 0.5 ~ 10초
+    p95 = breaker.latency_percentile(0.95)
+    assert p95 == 9.5
+    assert breaker.timeout(60) == pytest.approx(28.5)
+    # 기본 타임아웃을 넘지 않음
+    assert breaker.timeout(20) == 20
+
+
+def test_timeout_failures_are_counted_as_timeouts():
+    breaker = make_breaker(min_samples=1, min_timeout=0.05, timeout_multiplier=1.0)
+    breaker.record_success(0.01)
+
+    async def hang(timeout: float):
+        await asyncio.sleep(timeout + 5)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(hang, 5)
+
+    started = time.monotonic()
+    asyncio.run(scenario())
+    # 적응형 타임아웃(0.05초) + TIMEOUT_GRACE(1초) 뒤에 취소
+    assert time.monotonic() - started < 2
+    assert breaker.snapshot()["timeouts"] == 1
+
+
+def test_get_breaker_is_shared_per_name():
+    assert get_breaker("openai:chat") is get_breaker("openai:chat")
+    assert get_breaker("openai:chat") is not get_breaker("openai:lesson_plan")
@@ -0,0 +1,133 @@
+"""SemanticCache 테스트 - 뜻이 다른 음악 이론 질문은 유사도가 높아도 적중하지 않아야 함"""
+
+import asyncio
+import threading
+
+import pytest
+
+from response_cache import SemanticCache, TTLCache, normalize_key, significant_tokens
+
+SCOPE = "theory|age=10|model=gpt-4"
+
+# (캐시에 저장된 질문, 뜻이 다른 새 질문) - 모두 n-gram 유사도 0.88 이상
+OPPOSITE_PAIRS = [
+    ("장조 음계의 특징과 예시", "단조 음계의 특징과 예시"),
+    ("다장조 음계를 쉽게 알려줘", "사장조 음계를 쉽게 알려줘"),
+    ("올림표가 붙은 음의 의미", "내림표가 붙은 음의 의미"),
+    ("나비야", "나비야 나비야"),
+    ("C major scale", "G major scale"),
+]
+
+
+def test_similarity_tier_is_off_by_default():
+    cache = SemanticCache()
+    cache.store(SCOPE, "다장조 음계를 쉽게 알려줘", "다장조 설명")
+    assert cache.lookup(SCOPE, "다장조 음계를 쉽게 알려줘") == "다장조 설명"
+    assert cache.lookup(SCOPE, "다장조 음계를 쉽게 알려주세요") is None
+    assert cache.stats()["similar_hits"] == 0
+
+
+def test_assistant_cache_is_exact_only_unless_configured(monkeypatch):
+    from ai_assistant import AIAssistant
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    assert AIAssistant().response_cache.threshold >= 1
+    monkeypatch.setenv("AI_CACHE_SIMILARITY", "0.9")
+    assert AIAssistant().response_cache.threshold == 0.9
+
+
+@pytest.mark.parametrize("stored, asked", OPPOSITE_PAIRS)
+def test_opposite_meaning_misses_even_with_similarity_enabled(stored, asked):
+    cache = SemanticCache(threshold=0.8)
+    cache.store(SCOPE, stored, f"{stored} 설명")
+    assert cache.lookup(SCOPE, asked) is None
+    # 반대 방향도 마찬가지
+    cache.store(SCOPE, asked, f"{asked} 설명")
+    assert cache.lookup(SCOPE, stored) == f"{stored} 설명"
+    assert cache.stats()["similar_hits"] == 0
+
+
+def test_paraphrase_hits_when_similarity_enabled():
+    cache = SemanticCache(threshold=0.8)
+    cache.store(SCOPE, "다장조 음계를 쉽게 알려줘", "다장조 설명")
+    assert cache.lookup(SCOPE, "다장조 음계를 쉽게 알려주세요") == "다장조 설명"
+    assert cache.lookup(SCOPE, "다장조  음계를 쉽게 알려 줘") == "다장조 설명"
+    assert cache.stats()["similar_hits"] == 2
+
+
+def test_similarity_never_crosses_scope():
+    cache = SemanticCache(threshold=0.8)
+    cache.store("lesson-plan|grade=3-4학년", "학교종", "3-4학년 계획")
+    assert cache.lookup("lesson-plan|grade=5-6학년", "학교 종") is None
+
+
+def test_significant_tokens():
+    assert significant_tokens("다장조 음계") == significant_tokens("다장조의 음계")
+    assert significant_tokens("다장조 음계") != significant_tokens("사장조 음계")
+    assert significant_tokens("3박자와 4박자") != significant_tokens("3박자와 3박자")
+    assert significant_tokens("올림 바장조") != significant_tokens("바장조")
+    assert significant_tokens("학교종") == significant_tokens("학교 종")
+
+
+def test_sqlite_lookups_run_off_event_loop(tmp_path):
+    path = str(tmp_path / "ai_cache.db")
+    writer, reader = SemanticCache(sqlite_path=path), SemanticCache(sqlite_path=path)
+    threads = []
+    for cache in (writer, reader):
+        for name in ("_sqlite_get", "_sqlite_set"):
+            original = getattr(cache.exact, name)
+
+            def wrapper(*args, _original=original):
+                threads.append(threading.get_ident())
+                return _original(*args)
+
+            setattr(cache.exact, name, wrapper)
+
+    async def scenario():
+        await writer.astore(SCOPE, "계이름", "도레미파솔라시")
+        value = await reader.alookup(SCOPE, "계이름")
+        # 두 번째 조회는 메모리에서 바로 반환
+        again = await reader.exact.aget(normalize_key(SCOPE, "계이름"))
+        return threading.get_ident(), value, again
+
+    loop_thread, value, again = asyncio.run(scenario())
+    assert value == again == "도레미파솔라시"
+    assert len(threads) == 2
+    assert loop_thread not in threads
+
+
+def test_get_or_compute_persists_through_executor(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first, second = TTLCache(sqlite_path=path), TTLCache(sqlite_path=path)
+
+    async def compute():
+        return {"answer": 42}
+
+    async def scenario():
+        await first.get_or_compute("k", compute)
+        return await second.get_or_compute("k", lambda: pytest.fail("다시 계산하면 안 됨"))
+
+    assert asyncio.run(scenario()) == {"answer": 42}
+
+
+def test_get_or_compute_waiters_survive_leader_cancellation():
+    cache = TTLCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "결과"
+
+    async def scenario():
+        leader = asyncio.ensure_future(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter
+
+    assert asyncio.run(scenario()) == "결과"
+    assert calls == [1]
+    assert cache.get("k") == "결과"
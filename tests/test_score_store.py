@@ -0,0 +1,112 @@
+"""ScoreStore 테스트 (music21 대신 pickle로 직렬화하는 가짜 악보 사용)"""
+
+import asyncio
+import pickle
+import threading
+
+import pytest
+
+from score_store import ScoreStore
+
+
+class RecordingSerializer:
+    """직렬화/역직렬화가 어느 스레드에서 실행됐는지 기록"""
+
+    def __init__(self):
+        self.threads = []
+
+    def dumps(self, score):
+        self.threads.append(threading.get_ident())
+        return pickle.dumps(score)
+
+    def loads(self, data):
+        self.threads.append(threading.get_ident())
+        return pickle.loads(data)
+
+
+@pytest.fixture
+def serializer():
+    return RecordingSerializer()
+
+
+@pytest.fixture
+def make_store(tmp_path, serializer):
+    def make(**kwargs):
+        return ScoreStore(sqlite_path=str(tmp_path / "scores.db"), serializer=serializer.dumps,
+                          deserializer=serializer.loads, **kwargs)
+    return make
+
+
+def test_score_is_shared_between_workers(make_store):
+    a, b = make_store(), make_store()
+    score_id = a.new_id()
+    a[score_id] = {"notes": ["C4", "E4", "G4"]}
+    assert score_id in b
+    assert b[score_id] == {"notes": ["C4", "E4", "G4"]}
+    assert b.stats()["shared_hits"] == 1
+    assert b.get("score_missing") is None
+
+
+def test_async_put_and_get_run_off_event_loop(make_store, serializer):
+    a, b = make_store(), make_store()
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        score_id = a.new_id()
+        await a.aput(score_id, {"notes": ["D4"]})
+        shared = await b.aget(score_id)
+        cached = await b.aget(score_id)
+        return loop_thread, shared, cached
+
+    loop_thread, shared, cached = asyncio.run(scenario())
+    assert shared == cached == {"notes": ["D4"]}
+    # 직렬화(저장)와 역직렬화(다른 워커 조회) 모두 이벤트 루프 스레드 밖에서 실행
+    assert len(serializer.threads) == 2
+    assert loop_thread not in serializer.threads
+
+
+def test_memory_only_store_does_not_serialize():
+    store = ScoreStore()
+
+    async def scenario():
+        await store.aput("score_1", {"notes": []})
+        return await store.aget("score_1"), await store.aget("score_2")
+
+    assert asyncio.run(scenario()) == ({"notes": []}, None)
+
+
+def test_expired_scores_are_dropped(make_store):
+    store = make_store(ttl=-1)
+    store["score_1"] = {"notes": []}
+    assert store.get("score_1") is None
+    assert make_store().get("score_1") is None
+
+
+def test_memory_is_bounded(make_store):
+    store = make_store(max_scores=2)
+    for i in range(3):
+        store[f"score_{i}"] = {"i": i}
+    assert len(store) == 2
+    # 메모리에서 밀려난 악보도 SQLite에서 다시 불러옴
+    assert store["score_0"] == {"i": 0}
+
+
+def test_frozen_scores_are_thawed_lazily_off_event_loop(make_store, serializer):
+    a, b = make_store(), make_store()
+    data = pickle.dumps({"notes": ["E4"]})
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        await a.aput_frozen("score_1", data)
+        stored_without_thaw = list(serializer.threads)
+        first = await a.aget("score_1")
+        second = await a.aget("score_1")
+        shared = await b.aget("score_1")
+        return loop_thread, stored_without_thaw, first, second, shared
+
+    loop_thread, stored_without_thaw, first, second, shared = asyncio.run(scenario())
+    assert stored_without_thaw == []
+    assert first == second == shared == {"notes": ["E4"]}
+    # 첫 조회에서 한 번만 풀고 이후에는 메모리의 악보를 그대로 사용 (+ 다른 워커의 SQLite 조회 1번)
+    assert len(serializer.threads) == 2
+    assert loop_thread not in serializer.threads
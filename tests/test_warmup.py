@@ -0,0 +1,27 @@
+"""WarmupState 준비 상태 테스트"""
+
+from warmup import WarmupState
+
+
+def fail():
+    raise RuntimeError("모델 없음")
+
+
+def test_all_configured_steps_are_required_by_default():
+    state = WarmupState()
+    state.configure(["components", "basic_pitch", "transcription"])
+    state.run({"components": lambda: None, "basic_pitch": fail, "transcription": fail})
+    assert state.finished
+    assert not state.ready
+    assert state.snapshot()["required"] == ["components", "basic_pitch", "transcription"]
+
+
+def test_required_list_narrows_readiness():
+    state = WarmupState()
+    state.configure(["components", "basic_pitch", "batch_pool"], required=["basic_pitch"])
+    state.run({"components": lambda: None, "basic_pitch": lambda: None, "batch_pool": fail})
+    assert state.ready
+
+
+def test_unconfigured_warmup_is_ready():
+    assert WarmupState().ready
@@ -0,0 +1,53 @@
+"""YouTubeDownloadManager 테스트 - 캐시 파일 전용 경로와 영상별 잠금 정리 (다운로드는 가짜)"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from youtube_downloader import YouTubeDownloadManager
+
+VIDEO_A = "aaaaaaaaaaa"
+VIDEO_B = "bbbbbbbbbbb"
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    manager = YouTubeDownloadManager(cache_dir=str(tmp_path / "youtube"), max_mb=1)
+    downloads = []
+
+    def fake_download(url, job_dir):
+        downloads.append(url)
+        time.sleep(0.05)
+        path = Path(job_dir) / "audio.mp3"
+        # 캐시 용량(1MB)에 한 개만 들어가는 크기
+        path.write_bytes(url[-11:].encode() * (700 * 1024 // 11))
+        return str(path)
+
+    monkeypatch.setattr(manager, "_download", fake_download)
+    manager.downloads = downloads
+    return manager
+
+
+def test_checked_out_audio_survives_eviction(manager):
+    with manager.audio_file(VIDEO_A) as path:
+        assert Path(path).read_bytes().startswith(VIDEO_A.encode())
+        # 다른 영상을 받으면 용량 초과로 A가 캐시에서 밀려남
+        manager.get_audio(VIDEO_B)
+        assert manager.cached_audio_path(VIDEO_A) is None
+        assert Path(path).read_bytes().startswith(VIDEO_A.encode())
+    assert not os.path.exists(path)
+    assert not any(p.name.startswith("checkout_") for p in manager._work_dir.iterdir())
+
+
+def test_video_locks_are_dropped_after_use(manager):
+    threads = [threading.Thread(target=manager.get_audio, args=(VIDEO_A,)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 동시에 요청해도 한 번만 다운로드하고, 끝나면 잠금이 남지 않음
+    assert len(manager.downloads) == 1
+    assert manager._locks == {}
@@ -0,0 +1,125 @@
+"""YouTubeHelper 캐시/재시도 테스트 (httpx.MockTransport로 YouTube Data API 흉내)"""
+
+import asyncio
+
+import httpx
+
+import http_client
+from youtube_helper import YouTubeHelper
+
+
+def video_payload(video_id: str, views: int = 250000) -> dict:
+    return {"items": [{
+        "snippet": {
+            "title": f"리코더 연주 {video_id}",
+            "description": "초등 음악 수업",
+            "thumbnails": {"medium": {"url": f"https://img.test/{video_id}.jpg"}},
+            "channelTitle": "음악교실",
+            "publishedAt": "2024-03-02T00:00:00Z",
+        },
+        "statistics": {"viewCount": str(views)},
+    }]}
+
+
+def run_with_transport(handler, make_coro):
+    async def runner():
+        loop = asyncio.get_running_loop()
+        http_client._async_clients[loop] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await make_coro()
+        finally:
+            await http_client.close_async_client()
+    return asyncio.run(runner())
+
+
+def make_helper() -> YouTubeHelper:
+    return YouTubeHelper(api_key="test-key", base_url="https://yt.test/youtube/v3")
+
+
+def test_video_info_cache_miss_then_hit():
+    helper = make_helper()
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        assert request.url.path == "/youtube/v3/videos"
+        assert request.url.params["key"] == "test-key"
+        return httpx.Response(200, json=video_payload(request.url.params["id"]))
+
+    async def scenario():
+        first = await helper.get_video_info_async("abc123")
+        second = await helper.get_video_info_async("abc123")
+        other = await helper.get_video_info_async("xyz789")
+        return first, second, other
+
+    first, second, other = run_with_transport(handler, scenario)
+    assert first["title"] == "리코더 연주 abc123"
+    assert second == first
+    assert other["video_id"] == "xyz789"
+    # abc123은 두 번째 조회가 캐시에서 나오므로 요청은 영상마다 한 번씩
+    assert [r.url.params["id"] for r in calls] == ["abc123", "xyz789"]
+    assert helper.quota.snapshot()["calls"] == {"videos": 2}
+
+
+def test_video_info_concurrent_requests_share_one_call():
+    helper = make_helper()
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=video_payload("abc123"))
+
+    async def scenario():
+        return await asyncio.gather(*(helper.get_video_info_async("abc123") for _ in range(5)))
+
+    results = run_with_transport(handler, scenario)
+    assert all(r == results[0] for r in results)
+    assert len(calls) == 1
+
+
+def test_video_info_retries_transient_error():
+    helper = make_helper()
+    statuses = iter([503, 200])
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        status = next(statuses)
+        return httpx.Response(status, json=video_payload("abc123") if status == 200 else {})
+
+    info = run_with_transport(handler, lambda: helper.get_video_info_async("abc123"))
+    assert info["view_count"] == 250000
+    assert len(calls) == 2
+    # 재시도한 요청도 할당량을 소모
+    assert helper.quota.snapshot()["calls"] == {"videos": 2}
+
+
+def test_search_is_skipped_when_budget_cannot_cover_fallback_search():
+    helper = make_helper()
+    # 남은 양이 search 2회 + videos 1회는 되지만 대체 검색까지는 부족한 상태
+    helper.quota._used = helper.quota.daily_limit - helper.quota.reserve_units - 250
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"items": []})
+
+    videos = run_with_transport(handler, lambda: helper.search_education_videos_async("학교종"))
+    assert calls == []
+    assert videos == helper._fallback_video_search("학교종")
+
+
+def test_failed_lookup_is_not_cached():
+    helper = make_helper()
+    responses = iter([httpx.Response(404, json={}), httpx.Response(200, json=video_payload("abc123"))])
+
+    def handler(request):
+        return next(responses)
+
+    async def scenario():
+        return await helper.get_video_info_async("abc123"), await helper.get_video_info_async("abc123")
+
+    missing, found = run_with_transport(handler, scenario)
+    assert missing is None
+    assert found["video_id"] == "abc123"